@@ -0,0 +1,78 @@
+"""
+Benchmark: tamanho e custo de codificação JSON vs Avro de um evento de upsert.
+
+Mede, para tabelas de tamanhos diferentes, os bytes de cada formato (antes e
+depois do gzip) e o tempo de codificação e decodificação.
+
+Uso:
+    python benchmarks/bench_avro_encoding.py
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.serialization.avro import AvroSerializer  # noqa: E402
+from modules.shared.serialization.schema_registry import InMemorySchemaRegistry  # noqa: E402
+from modules.lambda_upsert_asset_event_producer.infrastructure.producers.kafka_event_producer import EVENT_SCHEMA  # noqa: E402
+
+ITERATIONS = 50
+
+def payload(columns):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'orders',
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f'col_{i}',
+                'data_type': 'varchar',
+                'is_primary_key': i == 0,
+                'is_nullable': True,
+                'default_value': None,
+                'comment_description': f'coluna {i}'
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': ['col_0']}]
+    }
+
+def median_ms(fn, arg):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+def json_encode(value):
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+def main():
+    serializer = AvroSerializer(InMemorySchemaRegistry(), 'assets-avro-value', EVENT_SCHEMA)
+    print(f"{'colunas':>8} {'json B':>9} {'avro B':>9} {'json gz':>8} {'avro gz':>8} "
+          f"{'enc json':>9} {'enc avro':>9} {'dec json':>9} {'dec avro':>9}")
+    for columns in (10, 200, 2000):
+        value = payload(columns)
+        as_json = json_encode(value)
+        as_avro = serializer(value)
+        print(
+            f"{columns:>8} {len(as_json):>9} {len(as_avro):>9} "
+            f"{len(gzip.compress(as_json)):>8} {len(gzip.compress(as_avro)):>8} "
+            f"{median_ms(json_encode, value):>7.2f}ms {median_ms(serializer, value):>7.2f}ms "
+            f"{median_ms(json.loads, as_json):>7.2f}ms {median_ms(serializer.decode, as_avro):>7.2f}ms"
+        )
+
+if __name__ == '__main__':
+    main()
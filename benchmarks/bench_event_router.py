@@ -0,0 +1,92 @@
+"""
+Benchmark do overhead do EventRouter por invocação.
+
+Mede o tempo de route() com um handler vazio para lotes SQS homogêneos e
+para lotes mistos (SQS de duas filas + Kinesis).
+
+Uso:
+    python benchmarks/bench_event_router.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('DD_TRACE_ENABLED', 'true')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.routing.event_router import EventRouter  # noqa: E402
+from modules.shared.events.interfaces import EventType  # noqa: E402
+
+ITERATIONS = 2000
+
+
+class Context:
+    function_name = 'bench'
+    function_version = '1'
+    memory_limit_in_mb = 128
+    aws_request_id = 'bench'
+
+
+def sqs_record(i, queue='upsert-queue'):
+    return {
+        'messageId': f'm-{i}',
+        'receiptHandle': f'r-{i}',
+        'body': '{"event_type": "upsert", "event_location": "s3://bucket/key"}',
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': f'arn:aws:sqs:us-east-1:123456789012:{queue}'
+    }
+
+
+def kinesis_record(i):
+    return {
+        'eventSource': 'aws:kinesis',
+        'eventSourceARN': 'arn:aws:kinesis:us-east-1:123456789012:stream/asset-input',
+        'kinesis': {'data': 'eyJrIjogInYifQ==', 'sequenceNumber': str(i)}
+    }
+
+
+async def noop(event, context, metadata=None):
+    return {'records': len(event.get('Records', []))}
+
+
+def build_router():
+    router = EventRouter()
+    router.register(EventType.SQS, noop)
+    router.register(EventType.KINESIS, noop)
+    return router
+
+
+async def measure(router, event):
+    context = Context()
+    for _ in range(50):
+        await router.route(event, context)
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await router.route(event, context)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+async def main():
+    router = build_router()
+    scenarios = {
+        'sqs_10': {'Records': [sqs_record(i) for i in range(10)]},
+        'sqs_100': {'Records': [sqs_record(i) for i in range(100)]},
+        'mixed_100': {'Records': [
+            sqs_record(i, 'upsert-queue') if i % 3 == 0 else
+            sqs_record(i, 'drop-queue') if i % 3 == 1 else
+            kinesis_record(i)
+            for i in range(100)
+        ]},
+    }
+    for name, event in scenarios.items():
+        try:
+            micros = await measure(router, event)
+            print(f"{name:>10}: {micros:8.1f} us/route")
+        except Exception as e:
+            print(f"{name:>10}: erro ({type(e).__name__}: {e})")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
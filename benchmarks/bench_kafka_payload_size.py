@@ -0,0 +1,67 @@
+"""
+Benchmark do tamanho dos payloads de upsert por largura de tabela.
+
+Compara o JSON anterior (separadores padrão), o JSON compacto do publicador e
+o lote comprimido com gzip (codec disponível sem dependências nativas), além
+do tempo de compressão.
+
+Uso:
+    python benchmarks/bench_kafka_payload_size.py
+"""
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.kafka.batch_publisher import json_serializer  # noqa: E402
+
+BATCH = 10
+
+
+def upsert_event(columns, table=0):
+    return {
+        'correlation_id': f'c-{table}',
+        'status': 'running',
+        'asset_name': f'table_{table}',
+        'asset_parent_name': 'sales',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f't{table}_column_{i}',
+                'data_type': 'varchar(255)' if i % 3 else 'bigint',
+                'is_primary_key': i == 0,
+                'is_nullable': i != 0,
+                'default_value': None,
+                'comment_description': f'Descrição da coluna {i} da tabela {table}'
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': 'column_0'}]
+    }
+
+
+def main():
+    for columns in (50, 500, 2000):
+        event = upsert_event(columns)
+        legacy = len(json.dumps(event).encode('utf-8'))
+        compact_payload = json_serializer(event)
+        batch = b''.join(json_serializer(upsert_event(columns, table)) for table in range(BATCH))
+        start = time.perf_counter()
+        compressed = len(gzip.compress(batch))
+        gzip_ms = (time.perf_counter() - start) * 1000
+        print(
+            f"{columns:>5} colunas: json {legacy:>8} B  compacto {len(compact_payload):>8} B  "
+            f"gzip (lote de {BATCH}) {compressed / BATCH:>8.0f} B/msg ({compressed / len(batch) * 100:4.1f}%)  "
+            f"gzip {gzip_ms:6.2f} ms/lote"
+        )
+
+
+if __name__ == '__main__':
+    main()
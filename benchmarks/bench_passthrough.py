@@ -0,0 +1,83 @@
+"""
+Benchmark: caminho decodifica/reconstrói/serializa vs passthrough dos bytes do S3.
+
+Mede, por evento de upsert, o custo de transformar o payload lido do S3 no
+valor da mensagem Kafka em cada modo.
+
+Uso:
+    python benchmarks/bench_passthrough.py
+"""
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.kafka.batch_publisher import json_serializer  # noqa: E402
+from modules.shared.kafka.passthrough import PassthroughEvent  # noqa: E402
+from modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import UpsertEvent  # noqa: E402
+from modules.lambda_upsert_asset_event_producer.infrastructure.producers.kafka_event_producer import (  # noqa: E402
+    KafkaEventProducer
+)
+
+ITERATIONS = 200
+
+
+def payload(columns):
+    return json.dumps({
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'orders',
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f'col_{i}',
+                'data_type': 'varchar',
+                'is_primary_key': i == 0,
+                'is_nullable': True,
+                'default_value': None,
+                'comment_description': f'coluna {i}'
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': ['col_0']}]
+    }).encode('utf-8')
+
+
+def decode_rebuild(raw, producer):
+    event = UpsertEvent.from_dict(json.loads(raw))
+    return json_serializer(producer._to_dict(event))
+
+
+def passthrough(raw, producer):
+    data = json.loads(raw)
+    UpsertEvent.validate_schema(data)
+    return PassthroughEvent.from_payload(raw, data).payload
+
+
+def measure(fn, raw, producer):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(raw, producer)
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+def main():
+    producer = KafkaEventProducer.__new__(KafkaEventProducer)
+    for columns in (10, 200, 2000):
+        raw = payload(columns)
+        legacy = measure(decode_rebuild, raw, producer)
+        fast = measure(passthrough, raw, producer)
+        print(f"{columns:>5} colunas: decode_rebuild {legacy:9.1f} us  passthrough {fast:9.1f} us  "
+              f"({legacy / fast:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
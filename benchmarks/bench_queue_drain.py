@@ -0,0 +1,61 @@
+"""
+Benchmark: um lote por invocação vs drenagem com pré-busca.
+
+Simula uma fila com backlog, recebimentos e publicações com latência fixa e
+compara quantas mensagens cada estratégia processa em uma invocação.
+
+Uso:
+    python benchmarks/bench_queue_drain.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.aws.queue_drain import DrainSettings, drain  # noqa: E402
+
+RECEIVE_MS = 20.0
+PROCESS_MS = 25.0
+BACKLOG = 500
+BUDGET_MS = 5000
+
+
+class SimulatedQueue:
+    def __init__(self, backlog):
+        self.backlog = backlog
+
+    def receive(self, wait_time_seconds=0):
+        time.sleep(RECEIVE_MS / 1000)
+        batch = min(10, self.backlog)
+        self.backlog -= batch
+        return list(range(batch))
+
+
+def process(batch):
+    time.sleep(PROCESS_MS / 1000)
+
+
+def main():
+    queue = SimulatedQueue(BACKLOG)
+    start = time.perf_counter()
+    batch = queue.receive()
+    process(batch)
+    single_ms = (time.perf_counter() - start) * 1000
+    print(f"single_batch: {len(batch):4d} msgs em {single_ms:7.1f} ms  ({len(batch) / single_ms * 1000:7.0f} msg/s)")
+
+    queue = SimulatedQueue(BACKLOG)
+    deadline = time.perf_counter() + BUDGET_MS / 1000
+    report = drain(
+        queue.receive,
+        process,
+        lambda: int((deadline - time.perf_counter()) * 1000),
+        settings=DrainSettings(enabled=True, safety_margin_ms=500, wait_time_seconds=0)
+    )
+    print(f"drain:        {report.messages:4d} msgs em {report.elapsed_ms:7.1f} ms  "
+          f"({report.throughput:7.0f} msg/s, {report.batches} lotes, parada: {report.stop_reason})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: serialização manual vs funções geradas (codegen) em uma tabela de 2.000 colunas.
+
+Compara a decodificação (dict -> UpsertEvent) e a codificação
+(UpsertEvent -> dict) do caminho antigo, com Attribute(**attr) e montagem
+campo a campo, com as funções geradas pela camada de codegen.
+
+Uso:
+    python benchmarks/bench_serialization.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import (  # noqa: E402
+    Attribute,
+    IndexedField,
+    UpsertEvent
+)
+
+COLUMNS = 2000
+ITERATIONS = 100
+
+PAYLOAD = {
+    'correlation_id': 'c-1',
+    'status': 'completed',
+    'asset_name': 'orders',
+    'asset_parent_name': 'db',
+    'asset_counts': '1',
+    'aws_account_number': '123456789012',
+    'technology_service_name': 'rds',
+    'asset_type': 'table',
+    'instance_technology_name': 'postgres',
+    'attributes': [
+        {
+            'attribute_name': f'col_{i}',
+            'data_type': 'varchar',
+            'is_primary_key': i == 0,
+            'is_nullable': True,
+            'default_value': None,
+            'comment_description': f'coluna {i}'
+        }
+        for i in range(COLUMNS)
+    ],
+    'indexed_field_list': [{'indexed_field_composition': ['col_0']}]
+}
+
+
+def legacy_decode(data):
+    return UpsertEvent(
+        correlation_id=data['correlation_id'],
+        status=data['status'],
+        asset_name=data['asset_name'],
+        asset_parent_name=data['asset_parent_name'],
+        asset_counts=data['asset_counts'],
+        aws_account_number=data['aws_account_number'],
+        technology_service_name=data['technology_service_name'],
+        asset_type=data['asset_type'],
+        instance_technology_name=data['instance_technology_name'],
+        attributes=[Attribute(**attr) for attr in data.get('attributes', [])],
+        indexed_field_list=[IndexedField(**field) for field in data.get('indexed_field_list', [])],
+        change_type=data.get('change_type', 'snapshot'),
+        added_attributes=data.get('added_attributes', []),
+        modified_attributes=data.get('modified_attributes', []),
+        removed_attributes=data.get('removed_attributes', [])
+    )
+
+
+def legacy_encode(event):
+    return {
+        'correlation_id': event.correlation_id,
+        'status': event.status,
+        'asset_name': event.asset_name,
+        'asset_parent_name': event.asset_parent_name,
+        'asset_counts': event.asset_counts,
+        'aws_account_number': event.aws_account_number,
+        'technology_service_name': event.technology_service_name,
+        'asset_type': event.asset_type,
+        'instance_technology_name': event.instance_technology_name,
+        'attributes': [
+            {
+                'attribute_name': attr.attribute_name,
+                'data_type': attr.data_type,
+                'is_primary_key': attr.is_primary_key,
+                'is_nullable': attr.is_nullable,
+                'default_value': attr.default_value,
+                'comment_description': attr.comment_description
+            }
+            for attr in event.attributes
+        ],
+        'indexed_field_list': [
+            {'indexed_field_composition': field.indexed_field_composition}
+            for field in event.indexed_field_list
+        ],
+        'change_type': event.change_type,
+        'added_attributes': event.added_attributes,
+        'modified_attributes': event.modified_attributes,
+        'removed_attributes': event.removed_attributes
+    }
+
+
+def measure(fn, arg):
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    event = UpsertEvent.from_dict(PAYLOAD)
+    assert event.to_dict() == legacy_encode(event)
+    cases = (
+        ('decode legacy', legacy_decode, PAYLOAD),
+        ('decode codegen', UpsertEvent.from_dict, PAYLOAD),
+        ('encode legacy', legacy_encode, event),
+        ('encode codegen', UpsertEvent.to_dict, event),
+    )
+    print(f"payload de {COLUMNS} colunas")
+    for name, fn, arg in cases:
+        p50, p99 = measure(fn, arg)
+        print(f"{name:>15}: p50 {p50:6.2f} ms  p99 {p99:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: pico de memória da leitura completa vs leitura incremental de payloads de upsert.
+
+O caminho completo lê o objeto inteiro, decodifica o JSON, materializa o
+UpsertEvent e serializa de novo; o incremental lê blocos de 64 KB, valida e
+reescreve atributo a atributo. O corpo do S3 é simulado por um gerador de
+blocos, para que o payload de origem não conte no pico de memória.
+
+Uso:
+    python benchmarks/bench_streaming_parse.py
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import UpsertEvent  # noqa: E402
+from modules.lambda_upsert_asset_event_producer.infrastructure.storage.streaming_event_encoder import (  # noqa: E402
+    encode_event_stream
+)
+from modules.shared.kafka.batch_publisher import json_serializer  # noqa: E402
+from modules.shared.serialization.json_stream import DEFAULT_CHUNK_SIZE  # noqa: E402
+
+HEADER = {
+    'correlation_id': 'c-1',
+    'status': 'completed',
+    'asset_name': 'orders',
+    'asset_parent_name': 'db',
+    'asset_counts': '1',
+    'aws_account_number': '123456789012',
+    'technology_service_name': 'rds',
+    'asset_type': 'table',
+    'instance_technology_name': 'postgres',
+    'indexed_field_list': [{'indexed_field_composition': ['col_0']}]
+}
+
+def body_chunks(columns):
+    """Gera o payload (com indentação, como gravado no S3) em blocos, sem montá-lo inteiro."""
+    pending = json.dumps(HEADER, indent=2)[:-2] + ',\n  "attributes": ['
+    for i in range(columns):
+        attr = {
+            'attribute_name': f'col_{i}',
+            'data_type': 'varchar',
+            'is_primary_key': i == 0,
+            'is_nullable': True,
+            'default_value': None,
+            'comment_description': f'coluna {i} da tabela de pedidos'
+        }
+        pending += ('\n    ' if i == 0 else ',\n    ') + json.dumps(attr, indent=2).replace('\n', '\n    ')
+        if len(pending) >= DEFAULT_CHUNK_SIZE:
+            yield pending.encode('utf-8')
+            pending = ''
+    yield (pending + '\n  ]\n}').encode('utf-8')
+
+def full_read(columns):
+    raw = b''.join(body_chunks(columns))
+    data = json.loads(raw)
+    UpsertEvent.validate_schema(data)
+    return json_serializer(UpsertEvent.from_dict(data).to_dict())
+
+def streaming_read(columns):
+    return encode_event_stream(body_chunks(columns)).payload
+
+def measure(fn, columns):
+    tracemalloc.start()
+    start = time.perf_counter()
+    payload = fn(columns)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(payload), peak, elapsed
+
+def main():
+    print(f"{'colunas':>8} {'saída MB':>9} {'pico completo MB':>17} {'pico incremental MB':>20} {'completo ms':>12} {'incremental ms':>15}")
+    for columns in (2000, 20000, 50000):
+        size, full_peak, full_ms = measure(full_read, columns)
+        _, stream_peak, stream_ms = measure(streaming_read, columns)
+        print(
+            f"{columns:>8} {size / 2**20:>9.2f} {full_peak / 2**20:>17.2f} "
+            f"{stream_peak / 2**20:>20.2f} {full_ms:>12.0f} {stream_ms:>15.0f}"
+        )
+
+if __name__ == '__main__':
+    main()
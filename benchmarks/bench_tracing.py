@@ -0,0 +1,110 @@
+"""
+Benchmark do overhead de tracing na latência por invocação (p50/p99).
+
+Simula a cadeia de uma invocação (handler -> roteador -> validador -> lote de
+100 registros SQS) sob diferentes políticas:
+    per_record:        span por registro com amostragem total (comportamento anterior)
+    per_batch:         span por lote com amostragem total
+    per_batch_sampled: span por lote com TRACE_SAMPLE_RATE=0.1
+    disabled:          tracing desabilitado (decorators sem wrapper)
+
+O overhead de cada cenário é a diferença para o cenário disabled.
+
+Uso:
+    python benchmarks/bench_tracing.py
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('DD_TRACE_ENABLED', 'true')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.tracing.datadog_config import (  # noqa: E402
+    TracingPolicy,
+    add_trace_context,
+    datadog_trace,
+    set_tracing_policy,
+    traced_span
+)
+
+RECORDS = 100
+ITERATIONS = 2000
+
+EVENT = {'Records': [
+    {
+        'messageId': f'm-{i}',
+        'body': json.dumps({'event_type': 'upsert', 'event_location': f's3://bucket/{i}'}),
+        'eventSource': 'aws:sqs'
+    }
+    for i in range(RECORDS)
+]}
+
+
+def build_chain(per_record):
+    """Monta a cadeia decorada sob a política corrente (a decoração depende dela)."""
+
+    @datadog_trace(service="bench", name="validate")
+    def validate(event):
+        return all('body' in record for record in event['Records'])
+
+    def process(record):
+        return json.loads(record['body'])['event_location']
+
+    @datadog_trace(service="bench", name="route")
+    def route(event):
+        validate(event)
+        if per_record:
+            results = []
+            for record in event['Records']:
+                with traced_span("process_record") as span:
+                    add_trace_context(span, {"message_id": record['messageId']})
+                    results.append(process(record))
+            return results
+        with traced_span("process_batch") as span:
+            results = [process(record) for record in event['Records']]
+            add_trace_context(span, {"records_count": len(results)})
+        return results
+
+    @datadog_trace(service="bench", name="lambda_handler")
+    def handler(event):
+        return route(event)
+
+    return handler
+
+
+def measure(policy, per_record):
+    set_tracing_policy(policy)
+    handler = build_chain(per_record)
+    for _ in range(100):
+        handler(EVENT)
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        handler(EVENT)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    scenarios = {
+        'per_record': (TracingPolicy(), True),
+        'per_batch': (TracingPolicy(), False),
+        'per_batch_sampled': (TracingPolicy(sample_rate=0.1), False),
+        'disabled': (TracingPolicy(enabled=False), False),
+    }
+    results = {name: measure(policy, per_record) for name, (policy, per_record) in scenarios.items()}
+    base_p50, base_p99 = results['disabled']
+    for name, (p50, p99) in results.items():
+        print(
+            f"{name:>18}: p50 {p50:8.1f} us  p99 {p99:8.1f} us  "
+            f"overhead p99 {p99 - base_p99:8.1f} us ({(p99 - base_p99) / p99 * 100:5.1f}%)"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark dos validadores de evento em lotes sintéticos de 10k registros.
+
+Compara, para SQS e Kinesis:
+    legacy_first:      validador legado (verifica apenas records[0], com span)
+    legacy_per_record: validador legado aplicado a cada registro (cobertura total)
+    batch:             validador de lote (todos os registros, passada única, sem spans)
+
+Uso:
+    python benchmarks/bench_validators.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault('POWERTOOLS_LOG_LEVEL', 'WARNING')
+os.environ.setdefault('DD_TRACE_ENABLED', 'true')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from modules.shared.events.validators import (  # noqa: E402
+    SQSEventValidator,
+    SQSBatchValidator,
+    KinesisEventValidator,
+    KinesisBatchValidator
+)
+
+RECORDS = 10_000
+ITERATIONS = 20
+
+
+def sqs_record(i):
+    return {
+        'messageId': f'm-{i}',
+        'receiptHandle': f'r-{i}',
+        'body': '{"event_type": "upsert", "event_location": "s3://bucket/key"}',
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': 'arn:aws:sqs:us-east-1:123456789012:upsert-queue'
+    }
+
+
+def kinesis_record(i):
+    return {
+        'eventSource': 'aws:kinesis',
+        'eventSourceARN': 'arn:aws:kinesis:us-east-1:123456789012:stream/asset-input',
+        'kinesis': {'data': 'eyJrIjogInYifQ==', 'sequenceNumber': str(i)}
+    }
+
+
+def measure(fn, iterations=ITERATIONS):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main():
+    scenarios = {
+        'sqs': (SQSEventValidator(), SQSBatchValidator(), sqs_record),
+        'kinesis': (KinesisEventValidator(), KinesisBatchValidator(), kinesis_record),
+    }
+    for name, (legacy, batch, make_record) in scenarios.items():
+        records = [make_record(i) for i in range(RECORDS)]
+        # 1% de registros inválidos espalhados pelo lote
+        for i in range(0, RECORDS, 100):
+            records[i] = {'eventSource': 'aws:unknown'}
+        event = {'Records': records}
+        singles = [{'Records': [record]} for record in records]
+
+        first_ms = measure(lambda: legacy.validate(event))
+        per_record_ms = measure(lambda: [legacy.validate(single) for single in singles], iterations=2)
+        batch_ms = measure(lambda: batch.validate_batch(event))
+        invalid = len(batch.validate_batch(event).invalid_indices)
+
+        print(f"{name:>8} legacy_first:      {first_ms:9.3f} ms/lote (inspeciona só records[0])")
+        print(f"{name:>8} legacy_per_record: {per_record_ms:9.3f} ms/lote")
+        print(f"{name:>8} batch:             {batch_ms:9.3f} ms/lote (detecta {invalid} inválidos)")
+
+
+if __name__ == '__main__':
+    main()
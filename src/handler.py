@@ -9,6 +9,12 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.metrics import MetricUnit
 
 from modules.shared.routing.event_router import EventRouter, EventType
+from modules.shared.routing.sqs_source_router import (
+    SQSSourceRouter,
+    batch_item_failures,
+    event_source_mode_enabled,
+    merge_batch_item_failures
+)
 from modules.lambda_event_decisor.presentation.handlers.event_decisor_handler import handler as event_decisor_handler
 from modules.lambda_upsert_asset_event_producer.presentation.handlers.upsert_handler import handler as upsert_handler
 from modules.lambda_drop_asset_event_producer.presentation.handlers.drop_handler import handler as drop_handler
@@ -22,9 +28,16 @@ metrics = Metrics(namespace="MetadataProcessor")
 # Inicializa o roteador
 router = EventRouter()
 
+# Mensagens SQS são roteadas pela fila de origem (eventSourceARN) configurada no ambiente
+sqs_router = SQSSourceRouter()
+sqs_router.register_queue('UPSERT_QUEUE', upsert_handler)
+sqs_router.register_queue('DROP_QUEUE', drop_handler)
+sqs_router.register_queue('UPSERT_QUEUE_DLQ', redrive_handler)
+sqs_router.register_queue('DROP_QUEUE_DLQ', redrive_handler)
+
 # Registra os handlers
 router.register(EventType.KINESIS, event_decisor_handler)
-router.register(EventType.SQS, lambda e, c: upsert_handler(e, c) if 'UPSERT' in str(e) else drop_handler(e, c))
+router.register(EventType.SQS, sqs_router.route)
 router.register(EventType.CLOUDWATCH, redrive_handler)
 
 @logger.inject_lambda_context
@@ -48,6 +61,11 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         # Roteia o evento
         result = await router.route(event, context)
         
+        # No modo event source a Lambda espera as falhas de todos os sub-lotes em uma única resposta
+        partial_batch = merge_batch_item_failures(result)
+        if partial_batch is not None:
+            result = partial_batch
+        
         # Adiciona métricas de sucesso
         metrics.add_metric(name="EventsProcessedSuccess", unit=MetricUnit.Count, value=1)
         
@@ -60,6 +78,10 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         # Log do erro
         logger.exception("Error processing event")
         
+        if event_source_mode_enabled() and event.get('Records'):
+            # Todo o lote volta para a fila
+            return batch_item_failures(record.get('messageId') for record in event['Records'])
+        
         # Retorna erro formatado
         return {
             'statusCode': 500,
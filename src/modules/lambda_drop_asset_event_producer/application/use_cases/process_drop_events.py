@@ -1,13 +1,37 @@
 import json
-from typing import Dict
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from aws_lambda_powertools import Logger
 from ...domain.interfaces.message_queue import MessageQueue
 from ...domain.interfaces.event_producer import EventProducer
 from ...domain.entities.drop_event import DropEvent
+from ....shared.kafka.dedupe_ledger import DedupeLedger, dedupe_key
+from ....shared.aws.queue_drain import DrainSettings, drain
+from ....shared.kafka.passthrough import PassthroughEvent
+
+logger = Logger()
 
 class ProcessDropEventsUseCase:
-    def __init__(self, message_queue: MessageQueue, event_producer: EventProducer):
+    def __init__(
+        self,
+        message_queue: MessageQueue,
+        event_producer: EventProducer,
+        dedupe_ledger: Optional[DedupeLedger] = None,
+        dedupe_scope: str = 'drop'
+    ):
+        """
+        Inicializa o caso de uso
+
+        Parâmetros:
+            message_queue: Fila de mensagens de origem
+            event_producer: Produtor de eventos de destino
+            dedupe_ledger: Registro de mensagens já publicadas (opcional). Quando
+                informado, reentregas do SQS são removidas da fila sem nova publicação
+            dedupe_scope: Escopo das chaves de deduplicação
+        """
         self.message_queue = message_queue
         self.event_producer = event_producer
+        self.dedupe_ledger = dedupe_ledger
+        self.dedupe_scope = dedupe_scope
     
     def execute(self, queue_url: str, kafka_topic: str) -> Dict:
         """
@@ -22,36 +46,234 @@ class ProcessDropEventsUseCase:
         """
         results = {
             'processed': 0,
+            'duplicates_skipped': 0,
             'errors': []
         }
         
         try:
             # Recebe mensagens da fila SQS
             messages = self.message_queue.receive_messages(queue_url)
-            
-            for message in messages:
-                try:
-                    # Converte a mensagem em um evento
-                    event_data = json.loads(message['Body'])
-                    event = DropEvent.from_dict(event_data)
-                    
-                    # Produz o evento para o Kafka
-                    self.event_producer.produce_event(kafka_topic, event)
-                    
-                    # Remove a mensagem da fila SQS
-                    self.message_queue.delete_message(queue_url, message['ReceiptHandle'])
-                    
-                    results['processed'] += 1
-                    
-                except Exception as e:
-                    results['errors'].append({
-                        'message_id': message.get('MessageId'),
-                        'error': str(e)
-                    })
+            self._process_batch(queue_url, messages, kafka_topic, results)
                     
         except Exception as e:
             results['errors'].append({
                 'error': str(e)
             })
         
-        return results 
\ No newline at end of file
+        return results
+
+    def drain(
+        self,
+        queue_url: str,
+        kafka_topic: str,
+        remaining_time_ms: Callable[[], int],
+        settings: Optional[DrainSettings] = None
+    ) -> Dict:
+        """
+        Processa lotes da fila SQS até esvaziá-la ou esgotar o tempo da invocação
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            kafka_topic: Tópico Kafka de destino
+            remaining_time_ms: Tempo restante da invocação (context.get_remaining_time_in_millis)
+            settings: Parâmetros da drenagem (opcional, padrão lido do ambiente)
+        
+        Retorno:
+            Dicionário com o resultado agregado e o relatório da drenagem em 'drain'
+        """
+        results = {
+            'processed': 0,
+            'duplicates_skipped': 0,
+            'errors': []
+        }
+        report = drain(
+            # Contagem bruta: mensagens que falham ao carregar do S3 não indicam fila vazia
+            receive=lambda wait_time_seconds: self.message_queue.receive_batch(
+                queue_url, wait_time_seconds=wait_time_seconds
+            ),
+            process=lambda messages: self._process_batch(queue_url, messages, kafka_topic, results),
+            remaining_time_ms=remaining_time_ms,
+            settings=settings,
+            name=queue_url,
+            # Lote pré-buscado e não processado volta à fila sem esperar o visibility timeout
+            release=lambda messages: self.message_queue.release_messages(
+                queue_url, [message['ReceiptHandle'] for message in messages]
+            )
+        )
+        if report.error:
+            results['errors'].append({
+                'error': report.error
+            })
+        results['drain'] = report.to_dict()
+        return results
+
+    def _process_batch(self, queue_url: str, messages: List[Dict], kafka_topic: str, results: Dict) -> None:
+        """
+        Publica um lote recebido da fila e remove da fila as mensagens confirmadas
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            messages: Mensagens recebidas
+            kafka_topic: Tópico Kafka de destino
+            results: Resultado do processamento (atualizado)
+        """
+        delivered_messages, duplicates = self._publish(messages, kafka_topic, results)
+        
+        # Remove da fila SQS, em lote, apenas as mensagens confirmadas pelo broker
+        failed = self._acknowledge(queue_url, duplicates + delivered_messages, results)
+        results['duplicates_skipped'] += sum(1 for message in duplicates if message['ReceiptHandle'] not in failed)
+        results['processed'] += sum(1 for message in delivered_messages if message['ReceiptHandle'] not in failed)
+
+    def process_records(self, records: List[Dict], kafka_topic: str) -> Dict:
+        """
+        Processa os registros SQS entregues pelo trigger da Lambda e produz para o Kafka
+        
+        Não consulta nem remove mensagens da fila: a remoção fica a cargo do
+        event source mapping, que reenvia apenas as mensagens listadas em
+        batch_item_failures (ReportBatchItemFailures).
+        
+        Parâmetros:
+            records: Registros SQS do evento Lambda
+            kafka_topic: Tópico Kafka de destino
+        
+        Retorno:
+            Dicionário com o resultado do processamento e os messageIds com falha
+        """
+        results = {
+            'processed': 0,
+            'duplicates_skipped': 0,
+            'errors': [],
+            'batch_item_failures': []
+        }
+        succeeded = set()
+        
+        try:
+            messages, load_failures = self.message_queue.load_records(records)
+            for message_id, error in load_failures.items():
+                results['errors'].append({
+                    'message_id': message_id,
+                    'error': error
+                })
+            
+            delivered_messages, duplicates = self._publish(messages, kafka_topic, results)
+            results['processed'] = len(delivered_messages)
+            results['duplicates_skipped'] = len(duplicates)
+            succeeded = {message['MessageId'] for message in delivered_messages + duplicates}
+            
+        except Exception as e:
+            results['errors'].append({
+                'error': str(e)
+            })
+        
+        # Toda mensagem sem confirmação de publicação volta para a fila
+        results['batch_item_failures'] = [
+            record['messageId'] for record in records if record.get('messageId') not in succeeded
+        ]
+        return results
+
+    def _publish(self, messages: List[Dict], kafka_topic: str, results: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Converte as mensagens em eventos e publica o lote no Kafka
+        
+        Falhas de conversão e de entrega são registradas em results['errors'].
+        
+        Parâmetros:
+            messages: Mensagens com o evento carregado em 'Body'
+            kafka_topic: Tópico Kafka de destino
+            results: Resultado do processamento
+        
+        Retorno:
+            Mensagens publicadas e reentregas já publicadas anteriormente
+        """
+        pending = []
+        for message in messages:
+            try:
+                # Converte a mensagem em um evento
+                event = self._to_event(message['Body'])
+                # Chave estável entre reentregas da mesma mensagem
+                key = dedupe_key(self.dedupe_scope, message.get('MessageId'))
+                pending.append((key, message, event))
+                
+            except Exception as e:
+                results['errors'].append({
+                    'message_id': message.get('MessageId'),
+                    'error': str(e)
+                })
+        
+        duplicates = []
+        if pending and self.dedupe_ledger is not None:
+            # Reentregas de mensagens já publicadas não são publicadas novamente
+            seen = self.dedupe_ledger.filter_seen([key for key, _, _ in pending])
+            duplicates = [message for key, message, _ in pending if key in seen]
+            pending = [entry for entry in pending if entry[0] not in seen]
+        
+        if not pending:
+            return [], duplicates
+        
+        # Produz o lote inteiro para o Kafka com um único flush
+        published = self.event_producer.produce_events(
+            kafka_topic,
+            [(key, event) for key, _, event in pending]
+        )
+        delivered = set(published.delivered)
+        
+        if self.dedupe_ledger is not None and delivered:
+            try:
+                # Registra antes da remoção: se a remoção falhar, a reentrega é descartada
+                self.dedupe_ledger.mark([key for key, _, _ in pending if key in delivered])
+            except Exception as e:
+                logger.warning("Falha ao registrar chaves de deduplicação", extra={"error": str(e)})
+        
+        delivered_messages = []
+        for key, message, _ in pending:
+            if key in delivered:
+                delivered_messages.append(message)
+            else:
+                # Mensagens não entregues permanecem na fila para nova tentativa
+                results['errors'].append({
+                    'message_id': message.get('MessageId'),
+                    'error': published.failed.get(key, 'not_delivered')
+                })
+        return delivered_messages, duplicates
+
+    @staticmethod
+    def _to_event(body: Union[bytes, str, Dict]) -> Union[DropEvent, PassthroughEvent]:
+        """
+        Converte o corpo de uma mensagem em evento
+        
+        Bytes (modo passthrough) são decodificados uma única vez para validação
+        do esquema e encaminhados sem alteração; dicionários já decodificados
+        pelo consumidor não são decodificados novamente.
+        
+        Parâmetros:
+            body: Bytes originais, JSON ou dicionário do evento
+            
+        Retorno:
+            Evento de domínio ou evento de passthrough
+        """
+        if isinstance(body, (bytes, bytearray)):
+            data = json.loads(body)
+            DropEvent.validate_schema(data)
+            return PassthroughEvent.from_payload(bytes(body), data)
+        return DropEvent.from_dict(body if isinstance(body, dict) else json.loads(body))
+
+    def _acknowledge(self, queue_url: str, messages: List[Dict], results: Dict) -> Dict[str, str]:
+        """
+        Remove as mensagens da fila em lote, registrando as falhas no resultado
+
+        Retorno:
+            Mapa receipt handle -> erro das mensagens não removidas
+        """
+        if not messages:
+            return {}
+        try:
+            failed = self.message_queue.delete_messages(queue_url, [message['ReceiptHandle'] for message in messages])
+        except Exception as e:
+            failed = {message['ReceiptHandle']: str(e) for message in messages}
+        for message in messages:
+            if message['ReceiptHandle'] in failed:
+                results['errors'].append({
+                    'message_id': message.get('MessageId'),
+                    'error': failed[message['ReceiptHandle']]
+                })
+        return failed 
\ No newline at end of file
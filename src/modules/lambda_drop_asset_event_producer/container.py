@@ -1,5 +1,10 @@
-from typing import Dict
+from typing import Dict, Optional
 from ..shared.container.dependency_container import DependencyContainer
+from ..shared.kafka.batch_publisher import exactly_once_enabled, kafka_producer_config
+from ..shared.kafka.dedupe_ledger import DedupeLedger, dedupe_ledger_from_env
+from ..shared.kafka.passthrough import passthrough_enabled
+from ..shared.kafka.routing_headers import header_fields
+from ..shared.serialization.schema_registry import SchemaRegistry, binary_topic, schema_registry_from_env
 from .infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
 from .infrastructure.storage.s3_event_reader import S3EventReader
 from .infrastructure.producers.kafka_event_producer import KafkaEventProducer
@@ -22,6 +27,15 @@ class DropEventContainer(DependencyContainer):
                 - DROP_QUEUE_URL
                 - KAFKA_TOPIC
                 - KAFKA_BOOTSTRAP_SERVERS
+            Opcionais do modo exactly-once:
+                - KAFKA_EXACTLY_ONCE
+                - DEDUPE_TABLE_NAME
+                - DEDUPE_TTL_HOURS
+            Opcional do modo passthrough:
+                - KAFKA_PASSTHROUGH
+            Opcionais da cópia binária (Avro):
+                - KAFKA_BINARY_TOPIC
+                - SCHEMA_REGISTRY_PATH
         """
         required_vars = [
             'DROP_QUEUE_URL',
@@ -40,7 +54,7 @@ class DropEventContainer(DependencyContainer):
         """
         Cria o leitor de eventos do S3 com TTL de 1 hora
         """
-        return self._get_or_create(
+        return self.get_or_create(
             's3_event_reader',
             lambda: S3EventReader(),
             ttl_minutes=self.EVENT_READER_TTL
@@ -51,10 +65,11 @@ class DropEventContainer(DependencyContainer):
         Cria o consumidor de mensagens SQS
         Usa o mesmo TTL do event_reader pois depende dele
         """
-        return self._get_or_create(
+        return self.get_or_create(
             'sqs_message_consumer',
             lambda: SQSMessageConsumer(
-                event_reader=self.create_event_reader()
+                event_reader=self.create_event_reader(),
+                passthrough=passthrough_enabled(self.env)
             ),
             ttl_minutes=self.EVENT_READER_TTL
         )
@@ -63,14 +78,47 @@ class DropEventContainer(DependencyContainer):
         """
         Cria o produtor de eventos Kafka com TTL de 30 minutos
         """
-        return self._get_or_create(
+        return self.get_or_create(
             'kafka_event_producer',
             lambda: KafkaEventProducer(
-                bootstrap_servers=self.env['KAFKA_BOOTSTRAP_SERVERS']
+                bootstrap_servers=self.env['KAFKA_BOOTSTRAP_SERVERS'],
+                producer_config=kafka_producer_config(
+                    self.env,
+                    transactional_id_prefix='drop-asset-event-producer'
+                ),
+                binary_topic=binary_topic(self.env),
+                schema_registry=self.create_schema_registry(),
+                header_fields=header_fields(self.env)
             ),
-            ttl_minutes=self.KAFKA_PRODUCER_TTL
+            ttl_minutes=self.KAFKA_PRODUCER_TTL,
+            on_close=lambda producer: producer.close()
         )
         
+    @property
+    def process_drop_events_use_case(self) -> ProcessDropEventsUseCase:
+        """
+        Caso de uso montado com as dependências em cache
+        """
+        return self.create_use_case()
+        
+    def create_schema_registry(self) -> Optional[SchemaRegistry]:
+        """
+        Cria o registro de esquemas da cópia binária dos eventos
+        Sem TTL: os ids registrados valem por toda a vida do ambiente
+        """
+        if binary_topic(self.env) is None:
+            return None
+        return self.get_or_create('schema_registry', lambda: schema_registry_from_env(self.env)[1])
+        
+    def create_dedupe_ledger(self) -> Optional[DedupeLedger]:
+        """
+        Cria o registro de deduplicação do modo exactly-once
+        Sem TTL: as chaves registradas valem por toda a vida do ambiente
+        """
+        if not exactly_once_enabled(self.env):
+            return None
+        return self.get_or_create('dedupe_ledger', lambda: dedupe_ledger_from_env(self.env))
+        
     def create_use_case(self) -> ProcessDropEventsUseCase:
         """
         Cria o caso de uso principal
@@ -78,5 +126,7 @@ class DropEventContainer(DependencyContainer):
         """
         return ProcessDropEventsUseCase(
             message_queue=self.create_message_consumer(),
-            event_producer=self.create_event_producer()
+            event_producer=self.create_event_producer(),
+            dedupe_ledger=self.create_dedupe_ledger(),
+            dedupe_scope='drop'
         ) 
\ No newline at end of file
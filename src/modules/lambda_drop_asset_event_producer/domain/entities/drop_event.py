@@ -1,7 +1,29 @@
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from ....shared.kafka.passthrough import check_optional_fields, require_fields
+from ....shared.serialization.codegen import decoder_for, encoder_for
 
-@dataclass
+# Campos obrigatórios do payload e seus tipos
+EVENT_FIELDS = {
+    'correlation_id': str,
+    'status': str,
+    'asset_name': str,
+    'asset_parent_name': str,
+    'asset_counts': (str, int),
+    'aws_account_number': str,
+    'technology_service_name': str,
+    'asset_type': str,
+    'instance_technology_name': str
+}
+# Campos opcionais repassados aos cabeçalhos de roteamento
+ROUTING_FIELDS = {
+    'hash_value': (str, type(None))
+}
+
+# Versão do esquema do corpo das mensagens (cabeçalho schema_version)
+SCHEMA_VERSION = '1'
+
+@dataclass(slots=True)
 class DropEvent:
     correlation_id: str
     status: str
@@ -12,17 +34,31 @@ class DropEvent:
     technology_service_name: str
     asset_type: str
     instance_technology_name: str
+    # Hash do decisor: segue apenas no cabeçalho de roteamento, fora do corpo
+    hash_value: Optional[str] = field(default=None, metadata={'encode': False})
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'DropEvent':
-        return cls(
-            correlation_id=data['correlation_id'],
-            status=data['status'],
-            asset_name=data['asset_name'],
-            asset_parent_name=data['asset_parent_name'],
-            asset_counts=data['asset_counts'],
-            aws_account_number=data['aws_account_number'],
-            technology_service_name=data['technology_service_name'],
-            asset_type=data['asset_type'],
-            instance_technology_name=data['instance_technology_name']
-        ) 
\ No newline at end of file
+        return _decode_drop_event(data)
+
+    def to_dict(self) -> Dict:
+        """Converte o evento para dicionário (para serialização)"""
+        return _encode_drop_event(self)
+
+    @staticmethod
+    def validate_schema(data: Dict) -> None:
+        """
+        Valida o payload decodificado contra o esquema do evento, sem construir a entidade
+        
+        Parâmetros:
+            data: Payload decodificado
+            
+        Raises:
+            SchemaValidationError: Se o payload não seguir o esquema
+        """
+        require_fields(data, EVENT_FIELDS)
+        check_optional_fields(data, ROUTING_FIELDS)
+
+# Funções especializadas geradas uma única vez por processo
+_decode_drop_event = decoder_for(DropEvent)
+_encode_drop_event = encoder_for(DropEvent)
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import Any, Sequence, Tuple
 from ..entities.drop_event import DropEvent
+from ....shared.kafka.batch_publisher import PublishResult
 
 class EventProducer(ABC):
     @abstractmethod
@@ -11,4 +13,18 @@ class EventProducer(ABC):
             topic: Nome do tópico Kafka
             event: Evento a ser produzido
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def produce_events(self, topic: str, events: Sequence[Tuple[Any, DropEvent]]) -> PublishResult:
+        """
+        Produz um lote de eventos com um único flush
+        
+        Parâmetros:
+            topic: Nome do tópico Kafka
+            events: Pares (chave, evento); a chave identifica o resultado da entrega
+        
+        Retorno:
+            Chaves entregues e falhas de entrega por chave
+        """
+        pass
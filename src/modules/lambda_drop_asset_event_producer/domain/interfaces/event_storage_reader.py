@@ -20,4 +20,21 @@ class EventStorageReader(ABC):
             EventNotFoundError: Se o evento não for encontrado
             InvalidLocationError: Se a localização for inválida
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def read_raw(self, event_location: str) -> bytes:
+        """
+        Lê os bytes originais de um evento armazenado, sem decodificá-los
+        
+        Parâmetros:
+            event_location: Localização do evento (ex: s3://bucket/key)
+            
+        Retorno:
+            bytes: Conteúdo do evento
+            
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a localização for inválida
+        """
+        pass
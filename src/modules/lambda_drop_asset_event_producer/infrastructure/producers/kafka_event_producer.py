@@ -1,29 +1,82 @@
-import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from kafka import KafkaProducer
 from ...domain.interfaces.event_producer import EventProducer
-from ...domain.entities.drop_event import DropEvent
+from ...domain.entities.drop_event import SCHEMA_VERSION, DropEvent
+from ....shared.kafka.batch_publisher import BatchPublisher, OutboundMessage, PublishResult, kafka_producer_config
+from ....shared.kafka.keys import event_asset_key
+from ....shared.kafka.passthrough import PassthroughEvent
+from ....shared.kafka.binary_copy import BinaryCopyPublisher
+from ....shared.kafka.routing_headers import DEFAULT_HEADER_FIELDS, RoutingHeaders
+from ....shared.serialization.avro import avro_schema
+from ....shared.serialization.schema_registry import SchemaRegistry
+
+# Esquema Avro dos eventos publicados no tópico binário
+EVENT_SCHEMA = avro_schema(DropEvent, namespace='assets.events')
 
 class KafkaEventProducer(EventProducer):
-    def __init__(self, bootstrap_servers: str):
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        producer_config: Optional[Dict[str, Any]] = None,
+        binary_topic: Optional[str] = None,
+        schema_registry: Optional[SchemaRegistry] = None,
+        header_fields: Sequence[str] = DEFAULT_HEADER_FIELDS
+    ):
+        """
+        Inicializa o produtor
+        
+        Parâmetros:
+            bootstrap_servers: Endereços dos brokers Kafka
+            producer_config: Parâmetros adicionais do KafkaProducer (opcional, padrão lido do ambiente)
+            binary_topic: Tópico que recebe a cópia Avro dos eventos publicados (opcional)
+            schema_registry: Registro de esquemas da cópia Avro (obrigatório com binary_topic)
+            header_fields: Cabeçalhos de roteamento publicados em cada mensagem (opcional)
+        """
+        # Os valores são serializados pelo publicador, que valida o tamanho antes do envio
         self.producer = KafkaProducer(
             bootstrap_servers=bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8')
+            **(producer_config if producer_config is not None else kafka_producer_config())
+        )
+        self.publisher = BatchPublisher(self.producer)
+        self.binary_copy = (
+            BinaryCopyPublisher(self.producer, binary_topic, schema_registry, EVENT_SCHEMA)
+            if binary_topic else None
         )
+        self.routing_headers = RoutingHeaders('drop', SCHEMA_VERSION, header_fields)
+
+    def _to_dict(self, event: DropEvent) -> Dict[str, Any]:
+        # Converte o evento para dicionário com o encoder gerado da entidade
+        return event.to_dict()
     
     def produce_event(self, topic: str, event: DropEvent) -> None:
-        # Converte o evento para dicionário
-        event_dict = {
-            'correlation_id': event.correlation_id,
-            'status': event.status,
-            'asset_name': event.asset_name,
-            'asset_parent_name': event.asset_parent_name,
-            'asset_counts': event.asset_counts,
-            'aws_account_number': event.aws_account_number,
-            'technology_service_name': event.technology_service_name,
-            'asset_type': event.asset_type,
-            'instance_technology_name': event.instance_technology_name
-        }
-        
-        # Envia o evento para o tópico Kafka
-        self.producer.send(topic, event_dict)
-        self.producer.flush() 
\ No newline at end of file
+        # Envia um único evento e aguarda a confirmação do broker
+        result = self.produce_events(topic, [(0, event)])
+        if not result.all_delivered:
+            raise RuntimeError(f"Falha ao publicar evento: {result.failed[0]}")
+
+    def produce_events(self, topic: str, events: Sequence[Tuple[Any, DropEvent]]) -> PublishResult:
+        # Envia o lote inteiro com um único flush, chaveado pela identidade do asset
+        messages = [
+            OutboundMessage(key, self._value(event), event_asset_key(event), self._headers(key, event))
+            for key, event in events
+        ]
+        result = self.publisher.publish(topic, messages)
+        if self.binary_copy is not None and result.delivered:
+            # Migração de formato: o tópico JSON segue como fonte da verdade
+            self.binary_copy.publish(messages, result.delivered)
+        return result
+
+    def _value(self, event: Union[DropEvent, PassthroughEvent]) -> Any:
+        # Eventos em passthrough seguem com os bytes originais do payload
+        return event.payload if isinstance(event, PassthroughEvent) else self._to_dict(event)
+
+    def _headers(self, key: Any, event: Union[DropEvent, PassthroughEvent]) -> Optional[List[Tuple[str, bytes]]]:
+        # Chaves de deduplicação seguem no cabeçalho para consumidores idempotentes
+        headers = [('dedupe_id', key.encode('utf-8'))] if isinstance(key, str) else []
+        # Metadados de roteamento: consumidores filtram sem decodificar o corpo
+        headers.extend(self.routing_headers(event))
+        return headers or None
+
+    def close(self) -> None:
+        # Libera as conexões com os brokers
+        self.producer.close()
\ No newline at end of file
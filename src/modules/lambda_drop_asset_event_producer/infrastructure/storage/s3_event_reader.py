@@ -3,6 +3,7 @@ from typing import Dict, Optional
 import boto3
 from botocore.exceptions import ClientError
 from ...domain.interfaces.event_storage_reader import EventStorageReader
+from ....shared.aws import get_client
 
 class EventNotFoundError(Exception):
     """Erro lançado quando o evento não é encontrado no S3"""
@@ -23,7 +24,7 @@ class S3EventReader(EventStorageReader):
         Parâmetros:
             s3_client: Cliente boto3 S3 (opcional, para injeção em testes)
         """
-        self.s3 = s3_client or boto3.client('s3')
+        self.s3 = s3_client or get_client('s3')
         
     def read_event(self, event_location: str) -> Dict:
         """
@@ -35,6 +36,23 @@ class S3EventReader(EventStorageReader):
         Retorno:
             Dict: Payload completo do evento
             
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a URI for inválida
+        """
+        # Decodifica o conteúdo JSON
+        return json.loads(self.read_raw(event_location))
+
+    def read_raw(self, event_location: str) -> bytes:
+        """
+        Lê os bytes originais de um evento do S3, sem decodificá-los
+        
+        Parâmetros:
+            event_location: URI do objeto no S3 (s3://bucket/key)
+            
+        Retorno:
+            bytes: Conteúdo do objeto
+            
         Raises:
             EventNotFoundError: Se o evento não for encontrado
             InvalidLocationError: Se a URI for inválida
@@ -52,14 +70,11 @@ class S3EventReader(EventStorageReader):
                 Bucket=bucket,
                 Key=key
             )
-            
-            # Decodifica o conteúdo JSON
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
+            return response['Body'].read()
             
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
                 raise EventNotFoundError(f"Evento não encontrado: {event_location}")
             raise
         except (ValueError, IndexError):
-            raise InvalidLocationError(f"URI inválida: {event_location}") 
\ No newline at end of file
+            raise InvalidLocationError(f"URI inválida: {event_location}")
@@ -1,8 +1,9 @@
 from dataclasses import dataclass
 from typing import Optional, Dict
 from ...domain.entities.asset import Asset
+from ....shared.serialization.codegen import encoder_for
 
-@dataclass
+@dataclass(slots=True)
 class ProcessEventResult:
     event_type: str
     asset: Asset
@@ -11,17 +12,7 @@ class ProcessEventResult:
         """
         Converte o resultado para dicionário (para serialização)
         """
-        return {
-            "event_type": self.event_type,
-            "asset": {
-                "technology_name": self.asset.technology_name,
-                "instance_technology_name": self.asset.instance_technology_name,
-                "asset_parent_name": self.asset.asset_parent_name,
-                "asset_name": self.asset.asset_name,
-                "aws_account_number": self.asset.aws_account_number,
-                "hash_value": self.asset.hash_value,
-                "correlation_id": self.asset.correlation_id,
-                "created_at": self.asset.created_at.isoformat(),
-                "updated_at": self.asset.updated_at.isoformat()
-            }
-        } 
\ No newline at end of file
+        return _encode_result(self)
+
+# Encoder especializado gerado uma única vez por processo
+_encode_result = encoder_for(ProcessEventResult)
@@ -8,10 +8,11 @@ from ...domain.services.event_decision_service import EventDecisionService
 class ProcessEventUseCase:
     def __init__(self, 
                  asset_repository: AssetRepository,
-                 event_queue_producer: EventQueueProducer):
+                 event_queue_producer: EventQueueProducer,
+                 decision_service: Optional[EventDecisionService] = None):
         self.asset_repository = asset_repository
         self.event_queue_producer = event_queue_producer
-        self.decision_service = EventDecisionService()
+        self.decision_service = decision_service or EventDecisionService()
 
     def execute(self, event: Event) -> None:
         """
@@ -32,7 +33,8 @@ class ProcessEventUseCase:
         
         # Produz evento se necessário
         if decision.is_upsert():
-            self.event_queue_producer.send_upsert_event([decision.asset])
+            # Snapshot ou delta dos atributos, conforme a decisão
+            self.event_queue_producer.send_upsert_event(decision.asset, decision.change)
         elif decision.is_drop():
             self.event_queue_producer.send_drop_event([decision.asset])
     
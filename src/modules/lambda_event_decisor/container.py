@@ -2,13 +2,15 @@
 Container de dependências para o lambda event_decisor.
 """
 from typing import Dict
+import os
 from modules.shared.container.dependency_container import DependencyContainer
+from modules.shared.aws import get_client
 from .infrastructure.repositories.dynamodb_asset_repository import DynamoDBAssetRepository
 from .infrastructure.producers.sqs_event_producer import SQSEventProducer
 from .infrastructure.storage.s3_event_storage import S3EventStorage
 from .infrastructure.consumers.kinesis_stream_consumer import KinesisStreamConsumer
 from .application.use_cases.process_event import ProcessEventUseCase
-from .domain.services.event_decision_service import EventDecisionService
+from .domain.services.event_decision_service import DEFAULT_SNAPSHOT_INTERVAL, EventDecisionService
 from .domain.services.hash_generator_service import HashGeneratorService
 
 class EventDecisionContainer:
@@ -17,15 +19,19 @@ class EventDecisionContainer:
     def __init__(self):
         # Inicializa repositórios e serviços
         self.asset_repository = DynamoDBAssetRepository()
-        self.event_storage = S3EventStorage()
-        self.event_producer = SQSEventProducer(self.event_storage)
+        self.event_storage = S3EventStorage(bucket_name=os.getenv('EVENTS_BUCKET_NAME'))
+        self.event_producer = SQSEventProducer(
+            upsert_queue_url=os.getenv('UPSERT_QUEUE_URL'),
+            drop_queue_url=os.getenv('DROP_QUEUE_URL'),
+            event_storage=self.event_storage
+        )
         self.stream_consumer = KinesisStreamConsumer()
         
         # Inicializa serviços de domínio
         self.hash_generator_service = HashGeneratorService()
+        # Deltas de atributos entre snapshots completos (UPSERT_SNAPSHOT_INTERVAL)
         self.event_decision_service = EventDecisionService(
-            self.asset_repository,
-            self.hash_generator_service
+            snapshot_interval=int(os.getenv('UPSERT_SNAPSHOT_INTERVAL', DEFAULT_SNAPSHOT_INTERVAL))
         )
         
         # Inicializa caso de uso
@@ -43,7 +49,7 @@ class EventDecisionContainer:
             'dynamodb_repository',
             lambda: DynamoDBAssetRepository(
                 table_name=self.env['DYNAMODB_TABLE_NAME'],
-                dynamodb_client=self._create_boto3_client('dynamodb')
+                dynamodb_client=get_client('dynamodb')
             ),
             ttl_minutes=self.REPOSITORY_TTL
         )
@@ -56,7 +62,7 @@ class EventDecisionContainer:
             's3_event_storage',
             lambda: S3EventStorage(
                 bucket_name=self.env['EVENTS_BUCKET_NAME'],
-                s3_client=self._create_boto3_client('s3')
+                s3_client=get_client('s3')
             ),
             ttl_minutes=self.EVENT_STORAGE_TTL
         )
@@ -70,7 +76,7 @@ class EventDecisionContainer:
             upsert_queue_url=self.env['UPSERT_QUEUE_URL'],
             drop_queue_url=self.env['DROP_QUEUE_URL'],
             event_storage=self.create_event_storage(),
-            sqs_client=self._create_boto3_client('sqs')
+            sqs_client=get_client('sqs')
         )
         
     def create_stream_consumer(self) -> KinesisStreamConsumer:
@@ -1,9 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from .event import Event
+from ....shared.serialization.codegen import encoder_for
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     technology_name: str
     instance_technology_name: str
@@ -14,6 +15,18 @@ class Asset:
     correlation_id: str
     created_at: datetime
     updated_at: datetime
+    # Estado interno do delta de atributos: persistido no repositório, fora dos eventos
+    attribute_fingerprints: Dict[str, str] = field(default_factory=dict, metadata={'encode': False})
+    deltas_since_snapshot: int = field(default=0, metadata={'encode': False})
+    
+    def to_dict(self) -> Dict:
+        """
+        Converte o asset para dicionário (para serialização)
+        
+        Retorno:
+            Dicionário com as datas em ISO 8601
+        """
+        return _encode_asset(self)
     
     @property
     def partition_key(self) -> str:
@@ -36,7 +49,13 @@ class Asset:
         return self.hash_value != event_hash
 
     @classmethod
-    def create_from_event(cls, event: Event, event_hash: str, timestamp: datetime) -> 'Asset':
+    def create_from_event(
+        cls,
+        event: Event,
+        event_hash: str,
+        timestamp: datetime,
+        attribute_fingerprints: Optional[Dict[str, str]] = None
+    ) -> 'Asset':
         """
         Cria um novo Asset a partir de um Event
         
@@ -44,6 +63,7 @@ class Asset:
             event: Evento fonte
             event_hash: Hash calculado do evento
             timestamp: Data/hora da criação
+            attribute_fingerprints: Fingerprints dos atributos do evento (opcional)
             
         Retorno:
             Nova instância de Asset
@@ -57,10 +77,18 @@ class Asset:
             hash_value=event_hash,
             correlation_id=event.correlation_id,
             created_at=timestamp,
-            updated_at=timestamp
+            updated_at=timestamp,
+            attribute_fingerprints=attribute_fingerprints or {}
         )
     
-    def update_from_event(self, event: Event, event_hash: str, timestamp: datetime) -> None:
+    def update_from_event(
+        self,
+        event: Event,
+        event_hash: str,
+        timestamp: datetime,
+        attribute_fingerprints: Optional[Dict[str, str]] = None,
+        snapshot: bool = True
+    ) -> None:
         """
         Atualiza o asset com informações do evento
         
@@ -68,7 +96,15 @@ class Asset:
             event: Evento fonte
             event_hash: Hash calculado do evento
             timestamp: Data/hora da atualização
+            attribute_fingerprints: Fingerprints dos atributos do evento (opcional)
+            snapshot: Se a mudança foi publicada como snapshot (zera a contagem de deltas)
         """
         self.hash_value = event_hash
         self.correlation_id = event.correlation_id
-        self.updated_at = timestamp 
\ No newline at end of file
+        self.updated_at = timestamp
+        if attribute_fingerprints is not None:
+            self.attribute_fingerprints = attribute_fingerprints
+        self.deltas_since_snapshot = 0 if snapshot else self.deltas_since_snapshot + 1
+
+# Encoder especializado gerado uma única vez por processo
+_encode_asset = encoder_for(Asset)
@@ -1,18 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 from ..entities.asset import Asset
+from ..value_objects.attribute_change import AttributeChange
 
 class EventQueueProducer(ABC):
     """
     Interface para produtores de eventos para filas
     """
     @abstractmethod
-    def send_upsert_event(self, asset: Asset) -> None:
+    def send_upsert_event(self, asset: Asset, change: Optional[AttributeChange] = None) -> None:
         """
         Envia um evento de upsert para a fila apropriada
         
         Parâmetros:
             asset: Asset a ser enviado
+            change: Mudança de atributos (snapshot ou delta) a incluir no evento (opcional)
         """
         pass
         
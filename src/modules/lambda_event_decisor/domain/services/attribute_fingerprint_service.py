@@ -0,0 +1,58 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+# Bytes de cada fingerprint: 64 bits tornam colisões irrelevantes para o número de colunas de uma tabela
+FINGERPRINT_BYTES = 8
+
+# Orçamento para os fingerprints no item do DynamoDB (limite do item: 400 KB)
+MAX_FINGERPRINTS_BYTES = 256 * 1024
+
+class AttributeFingerprintService:
+    @staticmethod
+    def fingerprint(attribute: Dict[str, Any]) -> str:
+        """
+        Gera o fingerprint da definição de um atributo
+        
+        Parâmetros:
+            attribute: Definição do atributo (nome, tipo, nulidade, default, ...)
+            
+        Retorno:
+            Hash BLAKE2b de 64 bits em hexadecimal
+        """
+        content = json.dumps(attribute, sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=FINGERPRINT_BYTES).hexdigest()
+
+    def fingerprints(self, attributes: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Gera os fingerprints de todos os atributos, por nome
+        
+        Parâmetros:
+            attributes: Atributos do evento
+            
+        Retorno:
+            Nome do atributo -> fingerprint, ou vazio se não couber no orçamento do item
+            (sem fingerprints, toda mudança é publicada como snapshot)
+        """
+        fingerprints = {attr['attribute_name']: self.fingerprint(attr) for attr in attributes}
+        size = sum(len(name.encode('utf-8')) + 1 + FINGERPRINT_BYTES for name in fingerprints)
+        if size > MAX_FINGERPRINTS_BYTES:
+            return {}
+        return fingerprints
+
+    @staticmethod
+    def diff(previous: Dict[str, str], current: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compara os fingerprints armazenados com os do evento
+        
+        Parâmetros:
+            previous: Fingerprints armazenados no asset
+            current: Fingerprints do evento
+            
+        Retorno:
+            Tupla (adicionados, modificados, removidos) com os nomes dos atributos
+        """
+        added = [name for name in current if name not in previous]
+        modified = [name for name, value in current.items() if name in previous and previous[name] != value]
+        removed = [name for name in previous if name not in current]
+        return added, modified, removed
@@ -1,14 +1,36 @@
 from datetime import datetime, UTC
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 from ..entities.event import Event
 from ..entities.asset import Asset
 from ..interfaces.asset_repository import AssetRepository
+from ..value_objects.attribute_change import AttributeChange
 from ..value_objects.event_decision import EventDecision
+from .attribute_fingerprint_service import AttributeFingerprintService
 from .hash_generator_service import HashGeneratorService
 
+# Deltas publicados entre dois snapshots completos do mesmo asset
+DEFAULT_SNAPSHOT_INTERVAL = 20
+
+# Fração de atributos alterados a partir da qual o snapshot é mais barato que o delta
+DEFAULT_MAX_DELTA_RATIO = 0.5
+
 class EventDecisionService:
-    def __init__(self):
+    def __init__(
+        self,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+        max_delta_ratio: float = DEFAULT_MAX_DELTA_RATIO
+    ):
+        """
+        Inicializa o serviço
+        
+        Parâmetros:
+            snapshot_interval: Deltas publicados entre dois snapshots completos
+            max_delta_ratio: Fração de atributos alterados acima da qual publica snapshot
+        """
         self.hash_generator = HashGeneratorService()
+        self.fingerprint_service = AttributeFingerprintService()
+        self.snapshot_interval = snapshot_interval
+        self.max_delta_ratio = max_delta_ratio
 
     def decide_event_action(self, event: Event, existing_asset: Optional[Asset]) -> EventDecision:
         """
@@ -19,21 +41,54 @@ class EventDecisionService:
             existing_asset: Asset existente (se houver)
             
         Retorno:
-            EventDecision contendo a decisão e os dados do asset
+            EventDecision contendo a decisão, os dados do asset e a mudança de atributos
         """
         current_time = datetime.now(UTC)
         event_hash = self.hash_generator.generate_hash(event)
+        metadata = event.metadata or {}
+        attributes = metadata.get('attributes') or []
+        indexed_field_list = metadata.get('indexed_field_list') or []
+        fingerprints = self.fingerprint_service.fingerprints(attributes)
         
         if not existing_asset:
             # Cria um novo asset usando o método de fábrica
-            new_asset = Asset.create_from_event(event, event_hash, current_time)
-            return EventDecision.upsert(new_asset)
+            new_asset = Asset.create_from_event(event, event_hash, current_time, fingerprints)
+            return EventDecision.upsert(new_asset, AttributeChange.snapshot(attributes, indexed_field_list))
             
         if existing_asset.has_changed(event_hash):
-            # Atualiza o asset existente
-            existing_asset.update_from_event(event, event_hash, current_time)
-            return EventDecision.upsert(existing_asset)
+            # Atualiza o asset existente, publicando só os atributos alterados quando possível
+            change = self._attribute_change(existing_asset, attributes, indexed_field_list, fingerprints)
+            existing_asset.update_from_event(
+                event, event_hash, current_time, fingerprints, snapshot=change.is_snapshot
+            )
+            return EventDecision.upsert(existing_asset, change)
             
         # Apenas atualização de timestamp
         existing_asset.updated_at = current_time
         return EventDecision.no_action(existing_asset)
+
+    def _attribute_change(
+        self,
+        asset: Asset,
+        attributes: List[Dict[str, Any]],
+        indexed_field_list: List[Dict[str, Any]],
+        fingerprints: Dict[str, str]
+    ) -> AttributeChange:
+        """
+        Escolhe entre delta e snapshot para a mudança do asset
+        
+        Publica snapshot quando não há fingerprints para comparar (asset
+        anterior ao delta ou tabela acima do orçamento do item), quando o
+        intervalo de snapshots foi atingido, quando nenhum atributo mudou (a
+        mudança está em outro metadado) ou quando a maioria dos atributos mudou.
+        """
+        snapshot = AttributeChange.snapshot(attributes, indexed_field_list)
+        if not asset.attribute_fingerprints or not fingerprints:
+            return snapshot
+        if asset.deltas_since_snapshot + 1 >= self.snapshot_interval:
+            return snapshot
+        added, modified, removed = self.fingerprint_service.diff(asset.attribute_fingerprints, fingerprints)
+        changed = len(added) + len(modified) + len(removed)
+        if changed == 0 or changed > self.max_delta_ratio * len(fingerprints):
+            return snapshot
+        return AttributeChange.delta(attributes, indexed_field_list, added, modified, removed)
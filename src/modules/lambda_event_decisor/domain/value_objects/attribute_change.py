@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+# Tipos de mudança publicados no evento de upsert
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+
+@dataclass(frozen=True)
+class AttributeChange:
+    """
+    Mudança de atributos enviada no evento de upsert.
+
+    Um snapshot traz todos os atributos do asset; um delta traz apenas a
+    definição dos atributos adicionados e modificados, e os nomes dos removidos.
+    """
+    change_type: str
+    attributes: List[Dict[str, Any]]
+    indexed_field_list: List[Dict[str, Any]] = field(default_factory=list)
+    added_attributes: List[str] = field(default_factory=list)
+    modified_attributes: List[str] = field(default_factory=list)
+    removed_attributes: List[str] = field(default_factory=list)
+
+    @classmethod
+    def snapshot(cls, attributes: List[Dict[str, Any]], indexed_field_list: List[Dict[str, Any]]) -> 'AttributeChange':
+        return cls(change_type=SNAPSHOT, attributes=list(attributes), indexed_field_list=list(indexed_field_list))
+
+    @classmethod
+    def delta(
+        cls,
+        attributes: List[Dict[str, Any]],
+        indexed_field_list: List[Dict[str, Any]],
+        added: List[str],
+        modified: List[str],
+        removed: List[str]
+    ) -> 'AttributeChange':
+        """
+        Cria um delta a partir da lista completa de atributos do evento
+        
+        Parâmetros:
+            attributes: Todos os atributos do evento
+            indexed_field_list: Índices do asset (enviados sempre, por serem pequenos)
+            added: Nomes dos atributos adicionados
+            modified: Nomes dos atributos modificados
+            removed: Nomes dos atributos removidos
+            
+        Retorno:
+            AttributeChange com apenas os atributos adicionados e modificados
+        """
+        changed = set(added) | set(modified)
+        return cls(
+            change_type=DELTA,
+            attributes=[attr for attr in attributes if attr.get('attribute_name') in changed],
+            indexed_field_list=list(indexed_field_list),
+            added_attributes=sorted(added),
+            modified_attributes=sorted(modified),
+            removed_attributes=sorted(removed)
+        )
+
+    @property
+    def is_snapshot(self) -> bool:
+        return self.change_type == SNAPSHOT
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Campos da mudança no payload do evento de upsert"""
+        return {
+            'change_type': self.change_type,
+            'attributes': self.attributes,
+            'indexed_field_list': self.indexed_field_list,
+            'added_attributes': self.added_attributes,
+            'modified_attributes': self.modified_attributes,
+            'removed_attributes': self.removed_attributes
+        }
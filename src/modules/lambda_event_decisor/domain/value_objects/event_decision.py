@@ -2,15 +2,17 @@ from dataclasses import dataclass
 from typing import Optional
 from ..entities.asset import Asset
 from ..enums.event_action import EventAction
+from .attribute_change import AttributeChange
 
 @dataclass
 class EventDecision:
     action: EventAction
     asset: Asset
+    change: Optional[AttributeChange] = None
     
     @classmethod
-    def upsert(cls, asset: Asset) -> 'EventDecision':
-        return cls(action=EventAction.UPSERT, asset=asset)
+    def upsert(cls, asset: Asset, change: Optional[AttributeChange] = None) -> 'EventDecision':
+        return cls(action=EventAction.UPSERT, asset=asset, change=change)
     
     @classmethod
     def drop(cls, asset: Asset) -> 'EventDecision':
@@ -1,10 +1,10 @@
 import json
 import os
-import boto3
 from typing import Dict, Any
 
 from ..application.use_cases.process_event import ProcessEventUseCase
 from ..infrastructure.repositories.dynamodb_asset_repository import DynamoDBAssetRepository
+from ...shared.aws import get_client
 
 def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -77,7 +77,7 @@ def _send_to_queue(queue_url: str, message: Dict) -> None:
         queue_url: URL da fila SQS
         message: Mensagem a ser enviada
     """
-    sqs = boto3.client('sqs')
+    sqs = get_client('sqs')
     sqs.send_message(
         QueueUrl=queue_url,
         MessageBody=json.dumps(message)
@@ -5,6 +5,8 @@ from ...domain.interfaces.event_queue_producer import EventQueueProducer
 from ...domain.interfaces.event_storage import EventStorage
 from ...domain.entities.asset import Asset
 from ...domain.enums.event_action import EventAction
+from ...domain.value_objects.attribute_change import AttributeChange
+from ....shared.aws import get_client
 
 class SQSEventProducer(EventQueueProducer):
     """
@@ -29,20 +31,25 @@ class SQSEventProducer(EventQueueProducer):
         self.upsert_queue_url = upsert_queue_url
         self.drop_queue_url = drop_queue_url
         self.event_storage = event_storage
-        self.sqs = sqs_client or boto3.client('sqs')
+        self.sqs = sqs_client or get_client('sqs')
         
-    def send_upsert_event(self, asset: Asset) -> None:
+    def send_upsert_event(self, asset: Asset, change: Optional[AttributeChange] = None) -> None:
         """
         Armazena e envia um evento de upsert
         
         Parâmetros:
             asset: Asset a ser enviado
+            change: Mudança de atributos (snapshot ou delta) a incluir no evento (opcional)
         """
-        # Prepara o payload completo
+        # Prepara o payload: um delta leva só os atributos alterados. O hash segue
+        # também no nível do evento, de onde os produtores Kafka leem o cabeçalho hash_value
         payload = {
             'event_type': str(EventAction.UPSERT),
-            'asset': asset.to_dict()
+            'asset': asset.to_dict(),
+            'hash_value': asset.hash_value
         }
+        if change is not None:
+            payload.update(change.to_dict())
         
         # Armazena no S3 e obtém a localização
         event_location = self.event_storage.store_event('upsert', payload)
@@ -65,10 +72,12 @@ class SQSEventProducer(EventQueueProducer):
         Parâmetros:
             assets: Lista de assets a serem enviados
         """
-        # Prepara o payload completo
+        # Prepara o payload completo; o hash no nível do evento (cabeçalho hash_value)
+        # só identifica o asset quando o drop é de um único asset
         payload = {
             'event_type': str(EventAction.DROP),
-            'assets': [asset.to_dict() for asset in assets]
+            'assets': [asset.to_dict() for asset in assets],
+            'hash_value': assets[0].hash_value if len(assets) == 1 else None
         }
         
         # Armazena no S3 e obtém a localização
@@ -1,7 +1,15 @@
 from pynamodb.models import Model
-from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute
+from pynamodb.attributes import NumberAttribute, UnicodeAttribute, UTCDateTimeAttribute
 from datetime import datetime
+import os
 from ...domain.entities.asset import Asset
+from .fingerprints_attribute import FingerprintsAttribute
+from ....shared.aws import (
+    DEFAULT_MAX_POOL_CONNECTIONS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MAX_ATTEMPTS
+)
 
 class AssetModel(Model):
     """
@@ -10,6 +18,11 @@ class AssetModel(Model):
     class Meta:
         table_name = None  # Será definido dinamicamente
         region = 'us-east-1'  # Região padrão, pode ser sobrescrita
+        # O PynamoDB cria seu próprio cliente botocore; usa os mesmos parâmetros da factory compartilhada
+        max_pool_connections = int(os.getenv('AWS_MAX_POOL_CONNECTIONS', DEFAULT_MAX_POOL_CONNECTIONS))
+        connect_timeout_seconds = float(os.getenv('AWS_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT))
+        read_timeout_seconds = float(os.getenv('AWS_READ_TIMEOUT', DEFAULT_READ_TIMEOUT))
+        max_retry_attempts = int(os.getenv('AWS_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS))
     
     # Chaves da tabela
     pk = UnicodeAttribute(hash_key=True)
@@ -25,6 +38,9 @@ class AssetModel(Model):
     correlation_id = UnicodeAttribute()
     created_at = UTCDateTimeAttribute()
     updated_at = UTCDateTimeAttribute()
+    # Estado do delta de atributos (ausente em itens gravados antes do delta)
+    attribute_fingerprints = FingerprintsAttribute(null=True)
+    deltas_since_snapshot = NumberAttribute(default=0)
     
     @classmethod
     def from_entity(cls, asset: Asset) -> 'AssetModel':
@@ -42,7 +58,9 @@ class AssetModel(Model):
             hash_value=asset.hash_value,
             correlation_id=asset.correlation_id,
             created_at=asset.created_at,
-            updated_at=asset.updated_at
+            updated_at=asset.updated_at,
+            attribute_fingerprints=asset.attribute_fingerprints or None,
+            deltas_since_snapshot=asset.deltas_since_snapshot
         )
     
     def to_entity(self) -> Asset:
@@ -58,5 +76,7 @@ class AssetModel(Model):
             hash_value=self.hash_value,
             correlation_id=self.correlation_id,
             created_at=self.created_at,
-            updated_at=self.updated_at
+            updated_at=self.updated_at,
+            attribute_fingerprints=self.attribute_fingerprints or {},
+            deltas_since_snapshot=int(self.deltas_since_snapshot or 0)
         ) 
\ No newline at end of file
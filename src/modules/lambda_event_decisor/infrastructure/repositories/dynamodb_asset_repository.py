@@ -72,7 +72,9 @@ class DynamoDBAssetRepository(AssetRepository):
             hash_value=item.hash_value,
             correlation_id=item.correlation_id,
             created_at=item.created_at,
-            updated_at=item.updated_at
+            updated_at=item.updated_at,
+            attribute_fingerprints=item.attribute_fingerprints or {},
+            deltas_since_snapshot=int(item.deltas_since_snapshot or 0)
         )
     
     def _to_dynamo_item(self, asset: Asset) -> AssetModel:
@@ -91,7 +93,9 @@ class DynamoDBAssetRepository(AssetRepository):
             hash_value=asset.hash_value,
             correlation_id=asset.correlation_id,
             created_at=asset.created_at,
-            updated_at=asset.updated_at
+            updated_at=asset.updated_at,
+            attribute_fingerprints=asset.attribute_fingerprints or None,
+            deltas_since_snapshot=asset.deltas_since_snapshot
         )
 
     def get_by_keys(self, partition_key: str, sort_key: str) -> Optional[Asset]:
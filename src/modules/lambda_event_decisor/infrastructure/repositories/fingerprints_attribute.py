@@ -0,0 +1,60 @@
+import zlib
+from typing import Dict
+from pynamodb.attributes import BinaryAttribute
+from ...domain.services.attribute_fingerprint_service import FINGERPRINT_BYTES
+
+# Separador dos nomes de atributos (não ocorre em nomes de colunas)
+NAME_SEPARATOR = b'\x00'
+
+def pack_fingerprints(fingerprints: Dict[str, str]) -> bytes:
+    """
+    Codifica os fingerprints de forma compacta
+    
+    Os nomes (ordenados e separados por NUL) são seguidos dos fingerprints em
+    binário, na mesma ordem, e o conjunto é comprimido com zlib: uma tabela de
+    1.500 colunas ocupa poucos KB no item.
+    
+    Parâmetros:
+        fingerprints: Nome do atributo -> fingerprint em hexadecimal
+        
+    Retorno:
+        Bytes comprimidos
+    """
+    names = sorted(fingerprints)
+    content = (
+        len(names).to_bytes(4, 'big')
+        + NAME_SEPARATOR.join(name.encode('utf-8') for name in names)
+        + b''.join(bytes.fromhex(fingerprints[name]) for name in names)
+    )
+    return zlib.compress(content)
+
+def unpack_fingerprints(data: bytes) -> Dict[str, str]:
+    """
+    Decodifica os fingerprints gerados por pack_fingerprints
+    
+    Parâmetros:
+        data: Bytes comprimidos
+        
+    Retorno:
+        Nome do atributo -> fingerprint em hexadecimal
+    """
+    content = zlib.decompress(data)
+    count = int.from_bytes(content[:4], 'big')
+    if not count:
+        return {}
+    digests = content[len(content) - count * FINGERPRINT_BYTES:]
+    names = content[4:len(content) - count * FINGERPRINT_BYTES].split(NAME_SEPARATOR)
+    return {
+        name.decode('utf-8'): digests[index * FINGERPRINT_BYTES:(index + 1) * FINGERPRINT_BYTES].hex()
+        for index, name in enumerate(names)
+    }
+
+class FingerprintsAttribute(BinaryAttribute):
+    """
+    Atributo PynamoDB com os fingerprints dos atributos de um asset, codificados de forma compacta
+    """
+    def serialize(self, value: Dict[str, str]) -> str:
+        return super().serialize(pack_fingerprints(value))
+
+    def deserialize(self, value: str) -> Dict[str, str]:
+        return unpack_fingerprints(super().deserialize(value))
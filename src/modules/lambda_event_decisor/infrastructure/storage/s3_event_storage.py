@@ -4,6 +4,7 @@ from datetime import datetime, UTC
 from typing import Dict, Optional
 import boto3
 from ...domain.interfaces.event_storage import EventStorage
+from ....shared.aws import get_client
 
 class S3EventStorage(EventStorage):
     """
@@ -22,7 +23,7 @@ class S3EventStorage(EventStorage):
             s3_client: Cliente boto3 S3 (opcional, para injeção em testes)
         """
         self.bucket = bucket_name
-        self.s3 = s3_client or boto3.client('s3')
+        self.s3 = s3_client or get_client('s3')
         
     def store_event(self, event_type: str, payload: Dict) -> str:
         """
@@ -1,14 +1,28 @@
 """
 Handler principal para o lambda de decisão de eventos.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import asyncio
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from ddtrace import tracer
 
 from ....shared.config.lambda_config import lambda_handler
+from ....shared.tracing.datadog_config import active_span, traced_span
+from ....shared.aws.prewarm import prewarm_on_init
 from ...container import EventDecisionContainer
 
+# Container reaproveitado entre invocações do mesmo ambiente de execução
+_container: Optional[EventDecisionContainer] = None
+
+def get_container() -> EventDecisionContainer:
+    """Retorna o container do processo, criando-o na primeira chamada."""
+    global _container
+    if _container is None:
+        _container = EventDecisionContainer()
+    return _container
+
+# Abre as conexões durante a fase de init (quando PREWARM_CONNECTIONS=true)
+prewarm_on_init()
+
 @lambda_handler(service_name="event_decisor")
 async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     """
@@ -22,21 +36,22 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         Dict contendo o resultado do processamento
     """
     try:
-        with tracer.current_span() as span:
-            # Inicializa container
-            container = EventDecisionContainer()
+        with active_span() as span:
+            # Obtém o container do processo
+            container = get_container()
             span.set_tag("container_initialized", True)
             
+            records = event.get('Records', [])
             results = []
-            # Processa cada registro do evento
-            for record in event.get('Records', []):
-                with tracer.trace("process_event") as event_span:
-                    event_span.set_tag("event_source", record.get('eventSource', 'unknown'))
-                    
+            # Um span por lote, com contadores agregados
+            with traced_span("process_event_batch") as batch_span:
+                for record in records:
                     result = await container.process_event_use_case.execute(record)
                     results.append(result)
-                    
-                    event_span.set_tag("processing_status", "success")
+                
+                batch_span.set_tag("records_count", len(records))
+                batch_span.set_tag("records_processed", len(results))
+                batch_span.set_tag("processing_status", "success")
             
             response = {
                 'statusCode': 200,
@@ -52,7 +67,7 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
             return response
             
     except Exception as e:
-        with tracer.current_span() as span:
+        with active_span() as span:
             span.set_tag("error", True)
             span.set_tag("error_type", type(e).__name__)
             span.set_tag("error_message", str(e))
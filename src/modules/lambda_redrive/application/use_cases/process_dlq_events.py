@@ -1,5 +1,7 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 from ...domain.interfaces.dlq_repository import DLQRepository
+from ...domain.entities.dlq_event import DLQEvent
+from ....shared.aws.queue_drain import DrainSettings, drain
 
 class ProcessDLQEventsUseCase:
     def __init__(self, dlq_repository: DLQRepository):
@@ -25,28 +27,102 @@ class ProcessDLQEventsUseCase:
             try:
                 # Obtém eventos da DLQ
                 events = self.dlq_repository.get_events(dlq_url)
-                
-                for event in events:
-                    try:
-                        if event.has_exceeded_retries:
-                            # Se excedeu o número de tentativas, descarta o evento
-                            self.dlq_repository.delete_from_dlq(event)
-                            results['discarded'] += 1
-                        else:
-                            # Move o evento para a fila original
-                            self.dlq_repository.move_to_original_queue(event)
-                            # Remove da DLQ após mover
-                            self.dlq_repository.delete_from_dlq(event)
-                            results['processed'] += 1
-                    except Exception as e:
-                        results['errors'].append({
-                            'message_id': event.message_id,
-                            'error': str(e)
-                        })
+                self._process_events(dlq_url, events, results)
             except Exception as e:
                 results['errors'].append({
                     'queue_url': dlq_url,
                     'error': str(e)
                 })
         
-        return results 
\ No newline at end of file
+        return results
+
+    def drain(
+        self,
+        dlq_urls: List[str],
+        remaining_time_ms: Callable[[], int],
+        settings: Optional[DrainSettings] = None
+    ) -> Dict:
+        """
+        Processa cada DLQ até esvaziá-la ou esgotar o tempo da invocação
+        
+        As filas são drenadas em sequência; filas não alcançadas dentro do
+        orçamento ficam para a próxima execução.
+        
+        Parâmetros:
+            dlq_urls: Lista de URLs das filas DLQ a serem processadas
+            remaining_time_ms: Tempo restante da invocação (context.get_remaining_time_in_millis)
+            settings: Parâmetros da drenagem (opcional, padrão lido do ambiente)
+        
+        Retorno:
+            Dicionário com o resultado agregado e o relatório de cada fila em 'drain'
+        """
+        results = {
+            'processed': 0,
+            'discarded': 0,
+            'errors': [],
+            'drain': {}
+        }
+        
+        for dlq_url in dlq_urls:
+            report = drain(
+                receive=lambda wait_time_seconds, url=dlq_url: self.dlq_repository.get_events(
+                    url, wait_time_seconds=wait_time_seconds
+                ),
+                process=lambda events, url=dlq_url: self._process_events(url, events, results),
+                remaining_time_ms=remaining_time_ms,
+                settings=settings,
+                name=dlq_url,
+                # Lote pré-buscado e não processado volta à DLQ sem esperar o visibility timeout
+                release=lambda events, url=dlq_url: self.dlq_repository.release_events(url, events)
+            )
+            if report.error:
+                results['errors'].append({
+                    'queue_url': dlq_url,
+                    'error': report.error
+                })
+            results['drain'][dlq_url] = report.to_dict()
+        
+        return results
+
+    def _process_events(self, dlq_url: str, events: List[DLQEvent], results: Dict) -> None:
+        """
+        Reenvia ou descarta os eventos de um lote da DLQ
+        
+        Os eventos reenviados ou descartados são removidos da DLQ em lote, pelos
+        receipt handles do recebimento; só contam como processados ou descartados
+        depois de removidos.
+        
+        Parâmetros:
+            dlq_url: URL da fila DLQ dos eventos
+            events: Eventos recebidos da DLQ
+            results: Resultado do processamento (atualizado)
+        """
+        handled = []
+        for event in events:
+            try:
+                if event.has_exceeded_retries:
+                    # Se excedeu o número de tentativas, descarta o evento
+                    handled.append((event, 'discarded'))
+                else:
+                    # Move o evento para a fila original
+                    self.dlq_repository.move_to_original_queue(event)
+                    handled.append((event, 'processed'))
+            except Exception as e:
+                results['errors'].append({
+                    'message_id': event.message_id,
+                    'error': str(e)
+                })
+        
+        if not handled:
+            return
+        
+        # Remove da DLQ os eventos movidos ou descartados
+        failures = self.dlq_repository.delete_events(dlq_url, [event for event, _ in handled])
+        for event, outcome in handled:
+            if event.message_id in failures:
+                results['errors'].append({
+                    'message_id': event.message_id,
+                    'error': failures[event.message_id]
+                })
+            else:
+                results[outcome] += 1
@@ -36,12 +36,19 @@ class RedriveContainer(DependencyContainer):
         Cria o repositório DLQ com TTL de 15 minutos
         TTL menor pois lida com mensagens de erro que precisam ser reprocessadas
         """
-        return self._get_or_create(
+        return self.get_or_create(
             'sqs_dlq_repository',
             lambda: SQSDLQRepository(),
             ttl_minutes=self.DLQ_REPOSITORY_TTL
         )
         
+    @property
+    def process_dlq_events_use_case(self) -> ProcessDLQEventsUseCase:
+        """
+        Caso de uso montado com as dependências em cache
+        """
+        return self.create_use_case()
+        
     def create_use_case(self) -> ProcessDLQEventsUseCase:
         """
         Cria o caso de uso principal
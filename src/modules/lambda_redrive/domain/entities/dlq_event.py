@@ -8,6 +8,7 @@ class DLQEvent:
     original_queue_url: str
     body: Dict
     retry_count: int = 0
+    receipt_handle: Optional[str] = None
     
     @property
     def has_exceeded_retries(self) -> bool:
@@ -1,16 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 from ..entities.dlq_event import DLQEvent
 
 class DLQRepository(ABC):
     @abstractmethod
-    def get_events(self, queue_url: str, max_messages: int = 10) -> List[DLQEvent]:
+    def get_events(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> List[DLQEvent]:
         """
         Obtém eventos da DLQ
         
         Parâmetros:
             queue_url: URL da fila DLQ
             max_messages: Número máximo de mensagens a serem obtidas
+            wait_time_seconds: Espera do long polling (0 = short polling)
         """
         pass
     
@@ -32,4 +33,29 @@ class DLQRepository(ABC):
         Parâmetros:
             event: Evento a ser removido
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def delete_events(self, queue_url: str, events: List[DLQEvent]) -> Dict[str, str]:
+        """
+        Remove um lote de eventos da DLQ
+        
+        Parâmetros:
+            queue_url: URL da fila DLQ
+            events: Eventos a serem removidos
+            
+        Retorno:
+            Mapa message_id -> erro dos eventos que não puderam ser removidos
+        """
+        pass
+
+    @abstractmethod
+    def release_events(self, queue_url: str, events: List[DLQEvent]) -> None:
+        """
+        Devolve à DLQ, visíveis imediatamente, eventos recebidos e não processados
+        
+        Parâmetros:
+            queue_url: URL da fila DLQ
+            events: Eventos a serem devolvidos
+        """
+        pass
@@ -1,19 +1,22 @@
 import json
+from typing import List, Dict, Optional
 import boto3
-from typing import List, Dict
 from ...domain.entities.dlq_event import DLQEvent
 from ...domain.interfaces.dlq_repository import DLQRepository
+from ....shared.aws import get_client
+from ....shared.aws.sqs_batch import delete_message_batch, release_message_batch
 
 class SQSDLQRepository(DLQRepository):
-    def __init__(self):
-        self.sqs = boto3.client('sqs')
+    def __init__(self, sqs_client: Optional[boto3.client] = None):
+        self.sqs = sqs_client or get_client('sqs')
     
-    def get_events(self, queue_url: str, max_messages: int = 10) -> List[DLQEvent]:
+    def get_events(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> List[DLQEvent]:
         response = self.sqs.receive_message(
             QueueUrl=queue_url,
             MaxNumberOfMessages=max_messages,
             MessageAttributeNames=['All'],
-            AttributeNames=['All']
+            AttributeNames=['All'],
+            WaitTimeSeconds=wait_time_seconds
         )
         
         events = []
@@ -36,7 +39,8 @@ class SQSDLQRepository(DLQRepository):
                 queue_url=queue_url,
                 original_queue_url=original_queue_url,
                 body=json.loads(message['Body']),
-                retry_count=retry_count
+                retry_count=retry_count,
+                receipt_handle=message.get('ReceiptHandle')
             ))
         
         return events
@@ -61,21 +65,25 @@ class SQSDLQRepository(DLQRepository):
             }
         )
     
+    def release_events(self, queue_url: str, events: List[DLQEvent]) -> None:
+        # Visibilidade zerada: os eventos voltam à DLQ sem esperar o visibility timeout
+        release_message_batch(self.sqs, queue_url, [event.receipt_handle for event in events if event.receipt_handle])
+    
     def delete_from_dlq(self, event: DLQEvent) -> None:
-        # Obtém o receipt handle da mensagem
-        response = self.sqs.receive_message(
+        # Usa o receipt handle do recebimento: a mensagem está invisível e não seria recebida de novo
+        if not event.receipt_handle:
+            raise ValueError(f"Evento {event.message_id} sem receipt handle")
+        self.sqs.delete_message(
             QueueUrl=event.queue_url,
-            MaxNumberOfMessages=1,
-            MessageAttributeNames=['All'],
-            AttributeNames=['All'],
-            VisibilityTimeout=30,
-            WaitTimeSeconds=0
+            ReceiptHandle=event.receipt_handle
         )
-        
-        for message in response.get('Messages', []):
-            if message['MessageId'] == event.message_id:
-                self.sqs.delete_message(
-                    QueueUrl=event.queue_url,
-                    ReceiptHandle=message['ReceiptHandle']
-                )
-                break 
\ No newline at end of file
+    
+    def delete_events(self, queue_url: str, events: List[DLQEvent]) -> Dict[str, str]:
+        # Remove em grupos de 10 via DeleteMessageBatch; falhas reportadas por message_id
+        message_ids = {event.receipt_handle: event.message_id for event in events if event.receipt_handle}
+        result = delete_message_batch(self.sqs, queue_url, list(message_ids))
+        failures = {message_ids[handle]: error for handle, error in result.failed.items()}
+        for event in events:
+            if not event.receipt_handle:
+                failures[event.message_id] = "Evento sem receipt handle"
+        return failures
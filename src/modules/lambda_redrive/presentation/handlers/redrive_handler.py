@@ -1,14 +1,32 @@
 """
 Handler principal para o lambda de redrive.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from ddtrace import tracer
 import os
 
 from ....shared.config.lambda_config import lambda_handler
+from ....shared.tracing.datadog_config import active_span, traced_span
+from ....shared.aws.prewarm import prewarm_on_init
+from ....shared.aws.queue_drain import DrainSettings
 from ...container import RedriveContainer
 
+# Container reaproveitado entre invocações do mesmo ambiente de execução
+_container: Optional[RedriveContainer] = None
+
+def get_container() -> RedriveContainer:
+    """Retorna o container do processo, criando-o na primeira chamada."""
+    global _container
+    if _container is None:
+        _container = RedriveContainer(dict(os.environ))
+    return _container
+
+# Parâmetros do modo de drenagem, lidos uma vez por ambiente de execução
+drain_settings = DrainSettings.from_env()
+
+# Abre as conexões durante a fase de init (quando PREWARM_CONNECTIONS=true)
+prewarm_on_init()
+
 @lambda_handler(service_name="redrive_processor")
 async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     """
@@ -22,9 +40,9 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         Dict contendo o resultado do processamento
     """
     try:
-        with tracer.current_span() as span:
-            # Inicializa container com variáveis de ambiente
-            container = RedriveContainer(dict(os.environ))
+        with active_span() as span:
+            # Obtém o container do processo
+            container = get_container()
             span.set_tag("container_initialized", True)
             
             # Obtém as URLs das DLQs do evento ou do container
@@ -34,19 +52,28 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
             results = []
             # Processa cada DLQ
             for dlq_url in dlq_urls:
-                with tracer.trace("process_dlq") as dlq_span:
+                with traced_span("process_dlq") as dlq_span:
                     dlq_span.set_tag("dlq_url", dlq_url)
                     
-                    # Processa os eventos da DLQ
-                    result = await container.process_dlq_events_use_case.execute(dlq_url)
+                    if drain_settings.enabled:
+                        # Drena a DLQ enquanto houver mensagens e tempo na invocação
+                        result = container.process_dlq_events_use_case.drain(
+                            [dlq_url],
+                            remaining_time_ms=context.get_remaining_time_in_millis,
+                            settings=drain_settings
+                        )
+                        dlq_span.set_tag("drain_stop_reason", result['drain'][dlq_url]['stop_reason'])
+                    else:
+                        # Processa um lote de eventos da DLQ
+                        result = container.process_dlq_events_use_case.execute([dlq_url])
                     results.append(result)
                     
                     dlq_span.set_tag("processing_status", "success")
-                    dlq_span.set_tag("messages_processed", len(result.get('messages', [])))
+                    dlq_span.set_tag("messages_processed", result['processed'] + result['discarded'])
             
             # Combina os resultados
             combined_result = {
-                'total_processed': sum(len(r.get('messages', [])) for r in results),
+                'total_processed': sum(r['processed'] + r['discarded'] for r in results),
                 'dlqs_processed': len(results),
                 'results_per_dlq': results
             }
@@ -66,7 +93,7 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
             return response
             
     except Exception as e:
-        with tracer.current_span() as span:
+        with active_span() as span:
             span.set_tag("error", True)
             span.set_tag("error_type", type(e).__name__)
             span.set_tag("error_message", str(e))
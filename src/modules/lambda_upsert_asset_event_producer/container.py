@@ -1,33 +1,72 @@
 """
 Container de dependências para o lambda upsert_asset_event_producer.
 """
-from typing import Dict
+from typing import Dict, Optional
 from modules.shared.container.dependency_container import DependencyContainer
+from modules.shared.kafka.batch_publisher import exactly_once_enabled, kafka_producer_config
+from modules.shared.kafka.chunking import chunk_max_bytes, chunking_enabled
+from modules.shared.kafka.dedupe_ledger import DedupeLedger, dedupe_ledger_from_env
+from modules.shared.kafka.passthrough import passthrough_enabled
+from modules.shared.kafka.routing_headers import header_fields
+from modules.shared.serialization.json_stream import streaming_parse_enabled
+from modules.shared.serialization.schema_registry import SchemaRegistry, binary_topic, schema_registry_from_env
 from .infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
 from .infrastructure.storage.s3_event_reader import S3EventReader
 from .infrastructure.producers.kafka_event_producer import KafkaEventProducer
 from .application.use_cases.process_upsert_events import ProcessUpsertEventsUseCase
 
-class UpsertEventContainer:
+class UpsertEventContainer(DependencyContainer):
     """Container de dependências para o lambda upsert_asset_event_producer."""
+    # Constantes para TTL do cache
+    KAFKA_PRODUCER_TTL = 30  # 30 minutos
+    EVENT_READER_TTL = 60    # 1 hora
     
-    def __init__(self):
-        # Inicializa componentes de infraestrutura
-        self.event_reader = S3EventReader()
-        self.message_consumer = SQSMessageConsumer(self.event_reader)
-        self.event_producer = KafkaEventProducer()
+    def __init__(self, env_vars: Dict[str, str]):
+        """
+        Inicializa o container
         
-        # Inicializa caso de uso
-        self.process_upsert_events_use_case = ProcessUpsertEventsUseCase(
-            self.message_consumer,
-            self.event_producer
-        )
+        Parâmetros:
+            env_vars: Variáveis de ambiente necessárias:
+                - UPSERT_QUEUE_URL
+                - KAFKA_TOPIC
+                - KAFKA_BOOTSTRAP_SERVERS
+            Opcionais do modo exactly-once:
+                - KAFKA_EXACTLY_ONCE
+                - DEDUPE_TABLE_NAME
+                - DEDUPE_TTL_HOURS
+            Opcional do modo passthrough:
+                - KAFKA_PASSTHROUGH
+            Opcional da leitura incremental:
+                - S3_STREAMING_PARSE
+            Opcionais da cópia binária (Avro):
+                - KAFKA_BINARY_TOPIC
+                - SCHEMA_REGISTRY_PATH
+        """
+        required_vars = [
+            'UPSERT_QUEUE_URL',
+            'KAFKA_TOPIC',
+            'KAFKA_BOOTSTRAP_SERVERS'
+        ]
+        
+        # Valida variáveis de ambiente
+        for var in required_vars:
+            if var not in env_vars:
+                raise ValueError(f"Variável de ambiente {var} não encontrada")
+                
+        super().__init__(env_vars)
+        
+    @property
+    def process_upsert_events_use_case(self) -> ProcessUpsertEventsUseCase:
+        """
+        Caso de uso montado com as dependências em cache
+        """
+        return self.create_use_case()
 
     def create_event_reader(self) -> S3EventReader:
         """
         Cria o leitor de eventos do S3 com TTL de 1 hora
         """
-        return self._get_or_create(
+        return self.get_or_create(
             's3_event_reader',
             lambda: S3EventReader(),
             ttl_minutes=self.EVENT_READER_TTL
@@ -38,10 +77,12 @@ class UpsertEventContainer:
         Cria o consumidor de mensagens SQS
         Usa o mesmo TTL do event_reader pois depende dele
         """
-        return self._get_or_create(
+        return self.get_or_create(
             'sqs_message_consumer',
             lambda: SQSMessageConsumer(
-                event_reader=self.create_event_reader()
+                event_reader=self.create_event_reader(),
+                passthrough=passthrough_enabled(self.env),
+                streaming=streaming_parse_enabled(self.env)
             ),
             ttl_minutes=self.EVENT_READER_TTL
         )
@@ -50,14 +91,43 @@ class UpsertEventContainer:
         """
         Cria o produtor de eventos Kafka com TTL de 30 minutos
         """
-        return self._get_or_create(
+        return self.get_or_create(
             'kafka_event_producer',
             lambda: KafkaEventProducer(
-                bootstrap_servers=self.env['KAFKA_BOOTSTRAP_SERVERS']
+                bootstrap_servers=self.env['KAFKA_BOOTSTRAP_SERVERS'],
+                # Eventos de upsert carregam listas de atributos repetitivas: gzip por padrão
+                producer_config=kafka_producer_config(
+                    {'KAFKA_COMPRESSION_TYPE': 'gzip', **self.env},
+                    transactional_id_prefix='upsert-asset-event-producer'
+                ),
+                binary_topic=binary_topic(self.env),
+                schema_registry=self.create_schema_registry(),
+                chunking=chunking_enabled(self.env),
+                chunk_max_bytes=chunk_max_bytes(self.env),
+                header_fields=header_fields(self.env)
             ),
-            ttl_minutes=self.KAFKA_PRODUCER_TTL
+            ttl_minutes=self.KAFKA_PRODUCER_TTL,
+            on_close=lambda producer: producer.close()
         )
         
+    def create_schema_registry(self) -> Optional[SchemaRegistry]:
+        """
+        Cria o registro de esquemas da cópia binária dos eventos
+        Sem TTL: os ids registrados valem por toda a vida do ambiente
+        """
+        if binary_topic(self.env) is None:
+            return None
+        return self.get_or_create('schema_registry', lambda: schema_registry_from_env(self.env)[1])
+        
+    def create_dedupe_ledger(self) -> Optional[DedupeLedger]:
+        """
+        Cria o registro de deduplicação do modo exactly-once
+        Sem TTL: as chaves registradas valem por toda a vida do ambiente
+        """
+        if not exactly_once_enabled(self.env):
+            return None
+        return self.get_or_create('dedupe_ledger', lambda: dedupe_ledger_from_env(self.env))
+        
     def create_use_case(self) -> ProcessUpsertEventsUseCase:
         """
         Cria o caso de uso principal
@@ -65,5 +135,7 @@ class UpsertEventContainer:
         """
         return ProcessUpsertEventsUseCase(
             message_queue=self.create_message_consumer(),
-            event_producer=self.create_event_producer()
+            event_producer=self.create_event_producer(),
+            dedupe_ledger=self.create_dedupe_ledger(),
+            dedupe_scope='upsert'
         ) 
\ No newline at end of file
@@ -1,7 +1,54 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
+from ....shared.kafka.passthrough import SchemaValidationError, check_optional_fields, require_fields
+from ....shared.serialization.codegen import decoder_for, encoder_for
 
-@dataclass
+# Campos obrigatórios do payload e seus tipos
+EVENT_FIELDS = {
+    'correlation_id': str,
+    'status': str,
+    'asset_name': str,
+    'asset_parent_name': str,
+    'asset_counts': (str, int),
+    'aws_account_number': str,
+    'technology_service_name': str,
+    'asset_type': str,
+    'instance_technology_name': str,
+    'attributes': list,
+    'indexed_field_list': list
+}
+ATTRIBUTE_FIELDS = {
+    'attribute_name': str,
+    'data_type': str,
+    'is_primary_key': bool,
+    'is_nullable': bool,
+    'default_value': (str, type(None)),
+    'comment_description': (str, type(None))
+}
+INDEXED_FIELD_FIELDS = {
+    'indexed_field_composition': list
+}
+# Campos opcionais da mudança de atributos (ausentes em eventos anteriores ao delta)
+CHANGE_FIELDS = {
+    'change_type': str,
+    'added_attributes': list,
+    'modified_attributes': list,
+    'removed_attributes': list
+}
+
+# Campos opcionais repassados aos cabeçalhos de roteamento
+ROUTING_FIELDS = {
+    'hash_value': (str, type(None))
+}
+
+# Versão do esquema do corpo das mensagens (cabeçalho schema_version): 2 com a mudança de atributos
+SCHEMA_VERSION = '2'
+
+# Tipos de mudança: snapshot traz todos os atributos; delta, só os adicionados e modificados
+SNAPSHOT = 'snapshot'
+DELTA = 'delta'
+
+@dataclass(slots=True)
 class Attribute:
     attribute_name: str
     data_type: str
@@ -10,11 +57,11 @@ class Attribute:
     default_value: Optional[str]
     comment_description: str
 
-@dataclass
+@dataclass(slots=True)
 class IndexedField:
     indexed_field_composition: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class UpsertEvent:
     correlation_id: str
     status: str
@@ -27,26 +74,47 @@ class UpsertEvent:
     instance_technology_name: str
     attributes: List[Attribute]
     indexed_field_list: List[IndexedField]
+    change_type: str = SNAPSHOT
+    added_attributes: List[str] = field(default_factory=list)
+    modified_attributes: List[str] = field(default_factory=list)
+    removed_attributes: List[str] = field(default_factory=list)
+    # Hash do decisor: segue apenas no cabeçalho de roteamento, fora do corpo
+    hash_value: Optional[str] = field(default=None, metadata={'encode': False})
+
+    @property
+    def is_delta(self) -> bool:
+        """Indica se o evento traz apenas os atributos alterados"""
+        return self.change_type == DELTA
 
     @classmethod
     def from_dict(cls, data: Dict) -> 'UpsertEvent':
-        attributes = [
-            Attribute(**attr) for attr in data.get('attributes', [])
-        ]
-        indexed_fields = [
-            IndexedField(**field) for field in data.get('indexed_field_list', [])
-        ]
+        return _decode_upsert_event(data)
+
+    def to_dict(self) -> Dict:
+        """Converte o evento para dicionário (para serialização)"""
+        return _encode_upsert_event(self)
+
+    @staticmethod
+    def validate_schema(data: Dict) -> None:
+        """
+        Valida o payload decodificado contra o esquema do evento, sem construir a entidade
         
-        return cls(
-            correlation_id=data['correlation_id'],
-            status=data['status'],
-            asset_name=data['asset_name'],
-            asset_parent_name=data['asset_parent_name'],
-            asset_counts=data['asset_counts'],
-            aws_account_number=data['aws_account_number'],
-            technology_service_name=data['technology_service_name'],
-            asset_type=data['asset_type'],
-            instance_technology_name=data['instance_technology_name'],
-            attributes=attributes,
-            indexed_field_list=indexed_fields
-        ) 
\ No newline at end of file
+        Parâmetros:
+            data: Payload decodificado
+            
+        Raises:
+            SchemaValidationError: Se o payload não seguir o esquema
+        """
+        require_fields(data, EVENT_FIELDS)
+        check_optional_fields(data, CHANGE_FIELDS)
+        check_optional_fields(data, ROUTING_FIELDS)
+        if data.get('change_type', SNAPSHOT) not in (SNAPSHOT, DELTA):
+            raise SchemaValidationError(f"change_type: valor inválido ({data['change_type']})")
+        for index, attr in enumerate(data['attributes']):
+            require_fields(attr, ATTRIBUTE_FIELDS, f"attributes[{index}].")
+        for index, field in enumerate(data['indexed_field_list']):
+            require_fields(field, INDEXED_FIELD_FIELDS, f"indexed_field_list[{index}].")
+
+# Funções especializadas geradas uma única vez por processo
+_decode_upsert_event = decoder_for(UpsertEvent)
+_encode_upsert_event = encoder_for(UpsertEvent)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, Iterator
 
 class EventStorageReader(ABC):
     """
@@ -20,4 +20,38 @@ class EventStorageReader(ABC):
             EventNotFoundError: Se o evento não for encontrado
             InvalidLocationError: Se a localização for inválida
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def read_raw(self, event_location: str) -> bytes:
+        """
+        Lê os bytes originais de um evento armazenado, sem decodificá-los
+        
+        Parâmetros:
+            event_location: Localização do evento (ex: s3://bucket/key)
+            
+        Retorno:
+            bytes: Conteúdo do evento
+            
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a localização for inválida
+        """
+        pass
+
+    @abstractmethod
+    def read_stream(self, event_location: str) -> Iterator[bytes]:
+        """
+        Lê um evento armazenado em blocos de bytes, sem carregá-lo inteiro em memória
+        
+        Parâmetros:
+            event_location: Localização do evento (ex: s3://bucket/key)
+            
+        Retorno:
+            Iterator[bytes]: Blocos do conteúdo do evento
+            
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a localização for inválida
+        """
+        pass
@@ -1,16 +1,49 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Sequence, Tuple
 from ..entities.upsert_event import UpsertEvent
+from ....shared.aws.queue_drain import ReceivedBatch
 
 class MessageQueue(ABC):
     @abstractmethod
-    def receive_messages(self, queue_url: str, max_messages: int = 10) -> List[Dict]:
+    def receive_messages(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> List[Dict]:
         """
         Recebe mensagens da fila SQS
         
         Parâmetros:
             queue_url: URL da fila SQS
             max_messages: Número máximo de mensagens a serem recebidas
+            wait_time_seconds: Espera do long polling (0 = short polling)
+        """
+        pass
+
+    def receive_batch(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> ReceivedBatch:
+        """
+        Recebe mensagens da fila SQS com a contagem bruta de mensagens recebidas
+        
+        Implementações que descartam mensagens ao carregá-las devem sobrescrever
+        este método: a drenagem decide se a fila está vazia por essa contagem.
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            max_messages: Número máximo de mensagens a serem recebidas
+            wait_time_seconds: Espera do long polling (0 = short polling)
+            
+        Retorno:
+            Mensagens carregadas e o total recebido
+        """
+        messages = self.receive_messages(queue_url, max_messages, wait_time_seconds)
+        return ReceivedBatch(messages, len(messages))
+    
+    @abstractmethod
+    def load_records(self, records: List[Dict]) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Carrega os eventos dos registros SQS entregues pelo trigger da Lambda
+        
+        Parâmetros:
+            records: Registros SQS do evento Lambda
+            
+        Retorno:
+            Mensagens carregadas e o mapa messageId -> erro das demais
         """
         pass
     
@@ -23,4 +56,32 @@ class MessageQueue(ABC):
             queue_url: URL da fila SQS
             receipt_handle: Receipt handle da mensagem
         """
-        pass 
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def delete_messages(self, queue_url: str, receipt_handles: Sequence[str]) -> Dict[str, str]:
+        """
+        Remove um lote de mensagens da fila SQS
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            receipt_handles: Receipt handles das mensagens
+            
+        Retorno:
+            Mapa receipt handle -> erro das mensagens não removidas
+        """
+        pass
+
+    @abstractmethod
+    def release_messages(self, queue_url: str, receipt_handles: Sequence[str]) -> Dict[str, str]:
+        """
+        Devolve à fila SQS, visíveis imediatamente, mensagens recebidas e não processadas
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            receipt_handles: Receipt handles das mensagens
+            
+        Retorno:
+            Mapa receipt handle -> erro das mensagens não liberadas
+        """
+        pass
@@ -1,46 +1,90 @@
-import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 from kafka import KafkaProducer
 from ...domain.interfaces.event_producer import EventProducer
-from ...domain.entities.upsert_event import UpsertEvent
+from ...domain.entities.upsert_event import SCHEMA_VERSION, UpsertEvent
+from ....shared.kafka.batch_publisher import BatchPublisher, OutboundMessage, PublishResult, kafka_producer_config
+from ....shared.kafka.keys import event_asset_key
+from ....shared.kafka.passthrough import PassthroughEvent
+from ....shared.kafka.binary_copy import BinaryCopyPublisher
+from ....shared.kafka.routing_headers import DEFAULT_HEADER_FIELDS, RoutingHeaders
+from ....shared.serialization.avro import avro_schema
+from ....shared.serialization.schema_registry import SchemaRegistry
+
+# Esquema Avro dos eventos publicados no tópico binário
+EVENT_SCHEMA = avro_schema(UpsertEvent, namespace='assets.events')
 
 class KafkaEventProducer(EventProducer):
-    def __init__(self, bootstrap_servers: str):
+    def __init__(
+        self,
+        bootstrap_servers: str,
+        producer_config: Optional[Dict[str, Any]] = None,
+        binary_topic: Optional[str] = None,
+        schema_registry: Optional[SchemaRegistry] = None,
+        chunking: bool = False,
+        chunk_max_bytes: Optional[int] = None,
+        header_fields: Sequence[str] = DEFAULT_HEADER_FIELDS
+    ):
+        """
+        Inicializa o produtor
+        
+        Parâmetros:
+            bootstrap_servers: Endereços dos brokers Kafka
+            producer_config: Parâmetros adicionais do KafkaProducer (opcional, padrão lido do ambiente)
+            binary_topic: Tópico que recebe a cópia Avro dos eventos publicados (opcional)
+            schema_registry: Registro de esquemas da cópia Avro (obrigatório com binary_topic)
+            chunking: Divide em partes, pelos atributos, os eventos acima do limite do broker (opcional)
+            chunk_max_bytes: Tamanho máximo de cada parte (opcional, padrão o limite do produtor)
+            header_fields: Cabeçalhos de roteamento publicados em cada mensagem (opcional)
+        """
+        # Os valores são serializados pelo publicador, que valida o tamanho antes do envio
         self.producer = KafkaProducer(
             bootstrap_servers=bootstrap_servers,
-            value_serializer=lambda v: json.dumps(v).encode('utf-8')
+            **(producer_config if producer_config is not None else kafka_producer_config())
+        )
+        self.publisher = BatchPublisher(
+            self.producer,
+            chunk_field='attributes' if chunking else None,
+            chunk_max_bytes=chunk_max_bytes
         )
+        self.binary_copy = (
+            BinaryCopyPublisher(self.producer, binary_topic, schema_registry, EVENT_SCHEMA)
+            if binary_topic else None
+        )
+        self.routing_headers = RoutingHeaders('upsert', SCHEMA_VERSION, header_fields)
+
+    def _to_dict(self, event: UpsertEvent) -> Dict[str, Any]:
+        # Converte o evento para dicionário com o encoder gerado da entidade
+        return event.to_dict()
     
     def produce_event(self, topic: str, event: UpsertEvent) -> None:
-        # Converte o evento para dicionário
-        event_dict = {
-            'correlation_id': event.correlation_id,
-            'status': event.status,
-            'asset_name': event.asset_name,
-            'asset_parent_name': event.asset_parent_name,
-            'asset_counts': event.asset_counts,
-            'aws_account_number': event.aws_account_number,
-            'technology_service_name': event.technology_service_name,
-            'asset_type': event.asset_type,
-            'instance_technology_name': event.instance_technology_name,
-            'attributes': [
-                {
-                    'attribute_name': attr.attribute_name,
-                    'data_type': attr.data_type,
-                    'is_primary_key': attr.is_primary_key,
-                    'is_nullable': attr.is_nullable,
-                    'default_value': attr.default_value,
-                    'comment_description': attr.comment_description
-                }
-                for attr in event.attributes
-            ],
-            'indexed_field_list': [
-                {
-                    'indexed_field_composition': field.indexed_field_composition
-                }
-                for field in event.indexed_field_list
-            ]
-        }
-        
-        # Envia o evento para o tópico Kafka
-        self.producer.send(topic, event_dict)
-        self.producer.flush() 
+        # Envia um único evento e aguarda a confirmação do broker
+        result = self.produce_events(topic, [(0, event)])
+        if not result.all_delivered:
+            raise RuntimeError(f"Falha ao publicar evento: {result.failed[0]}")
+
+    def produce_events(self, topic: str, events: Sequence[Tuple[Any, UpsertEvent]]) -> PublishResult:
+        # Envia o lote inteiro com um único flush, chaveado pela identidade do asset
+        messages = [
+            OutboundMessage(key, self._value(event), event_asset_key(event), self._headers(key, event))
+            for key, event in events
+        ]
+        result = self.publisher.publish(topic, messages)
+        if self.binary_copy is not None and result.delivered:
+            # Migração de formato: o tópico JSON segue como fonte da verdade
+            self.binary_copy.publish(messages, result.delivered)
+        return result
+
+    def _value(self, event: Union[UpsertEvent, PassthroughEvent]) -> Any:
+        # Eventos em passthrough seguem com os bytes originais do payload
+        return event.payload if isinstance(event, PassthroughEvent) else self._to_dict(event)
+
+    def _headers(self, key: Any, event: Union[UpsertEvent, PassthroughEvent]) -> Optional[List[Tuple[str, bytes]]]:
+        # Chaves de deduplicação seguem no cabeçalho para consumidores idempotentes
+        headers = [('dedupe_id', key.encode('utf-8'))] if isinstance(key, str) else []
+        # Metadados de roteamento: consumidores filtram sem decodificar o corpo
+        headers.extend(self.routing_headers(event))
+        return headers or None
+
+    def close(self) -> None:
+        # Libera as conexões com os brokers
+        self.producer.close() 
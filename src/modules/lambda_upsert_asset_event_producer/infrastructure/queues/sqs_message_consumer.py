@@ -1,8 +1,17 @@
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 import boto3
+from aws_lambda_powertools import Logger
 from ...domain.interfaces.message_queue import MessageQueue
 from ...domain.interfaces.event_storage_reader import EventStorageReader
+from ..storage.streaming_event_encoder import encode_event_stream
+from ....shared.aws import get_client
+from ....shared.aws.sqs_batch import delete_message_batch, release_message_batch
+from ....shared.aws.concurrent_fetch import fetch_all
+from ....shared.aws.queue_drain import ReceivedBatch
+from ....shared.logging.histogram import LatencyHistogram, log_histogram
+
+logger = Logger()
 
 class SQSMessageConsumer(MessageQueue):
     """
@@ -11,7 +20,10 @@ class SQSMessageConsumer(MessageQueue):
     def __init__(
         self,
         event_reader: EventStorageReader,
-        sqs_client: Optional[boto3.client] = None
+        sqs_client: Optional[boto3.client] = None,
+        fetch_concurrency: Optional[int] = None,
+        passthrough: bool = False,
+        streaming: bool = False
     ):
         """
         Inicializa o consumidor
@@ -19,53 +31,140 @@ class SQSMessageConsumer(MessageQueue):
         Parâmetros:
             event_reader: Leitor de eventos do storage
             sqs_client: Cliente boto3 SQS (opcional, para injeção em testes)
+            fetch_concurrency: Leituras simultâneas do S3 (opcional, padrão S3_FETCH_CONCURRENCY)
+            passthrough: Se True, 'Body' traz os bytes originais do S3, sem decodificação
+            streaming: Se True, o payload é lido do S3 em blocos e 'Body' traz o evento de
+                passthrough já validado, com memória limitada independentemente do número de atributos
         """
         self.event_reader = event_reader
-        self.sqs = sqs_client or boto3.client('sqs')
+        self.sqs = sqs_client or get_client('sqs')
+        self.fetch_concurrency = fetch_concurrency
+        self.passthrough = passthrough
+        self.streaming = streaming
         
-    def receive_messages(self, queue_url: str, max_messages: int = 10) -> List[Dict]:
+    def receive_messages(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> List[Dict]:
         """
         Recebe mensagens da fila e carrega seus eventos do S3
         
         Parâmetros:
             queue_url: URL da fila SQS
             max_messages: Número máximo de mensagens a receber
+            wait_time_seconds: Espera do long polling (0 = short polling)
             
         Retorno:
             Lista de mensagens com eventos carregados do S3
         """
+        return self.receive_batch(queue_url, max_messages, wait_time_seconds).items
+
+    def receive_batch(self, queue_url: str, max_messages: int = 10, wait_time_seconds: int = 0) -> ReceivedBatch:
+        """
+        Recebe mensagens da fila e carrega seus eventos do S3, mantendo a contagem bruta
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            max_messages: Número máximo de mensagens a receber
+            wait_time_seconds: Espera do long polling (0 = short polling)
+            
+        Retorno:
+            Mensagens carregadas e o total recebido, inclusive as que falharam ao carregar
+        """
         # Recebe mensagens do SQS
         response = self.sqs.receive_message(
             QueueUrl=queue_url,
             MaxNumberOfMessages=max_messages,
-            MessageAttributeNames=['All']
+            MessageAttributeNames=['All'],
+            WaitTimeSeconds=wait_time_seconds
         )
         
         messages = response.get('Messages', [])
-        loaded_messages = []
+        loaded_messages, failures = self._load_messages(messages)
+        for message_id, error in failures.items():
+            # Log do erro; as demais mensagens seguem normalmente
+            logger.warning("Erro ao carregar evento", extra={
+                'message_id': message_id,
+                'error': str(error)
+            })
+                
+        return ReceivedBatch(loaded_messages, len(messages))
+
+    def load_records(self, records: List[Dict]) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Carrega do S3 os eventos dos registros SQS entregues pelo trigger da Lambda
+        
+        Parâmetros:
+            records: Registros SQS do evento Lambda (messageId, receiptHandle, body, ...)
+            
+        Retorno:
+            Mensagens carregadas, no mesmo formato de receive_messages, e o mapa
+            messageId -> erro das mensagens que não puderam ser carregadas
+        """
+        return self._load_messages([
+            {
+                'MessageId': record['messageId'],
+                'ReceiptHandle': record.get('receiptHandle'),
+                'Body': record['body'],
+                'Attributes': record.get('attributes', {}),
+                'MessageAttributes': record.get('messageAttributes', {})
+            }
+            for record in records
+        ])
+
+    def _load_messages(self, messages: List[Dict]) -> Tuple[List[Dict], Dict[str, str]]:
+        """
+        Lê do S3, em paralelo, o evento referenciado por cada mensagem
+        
+        Parâmetros:
+            messages: Mensagens SQS no formato da API (MessageId, ReceiptHandle, Body)
+            
+        Retorno:
+            Mensagens carregadas, na ordem de entrada, e o mapa MessageId -> erro
+        """
+        located = []
+        failures: Dict[str, str] = {}
         
         for message in messages:
             try:
                 # Carrega o corpo da mensagem
                 body = json.loads(message['Body'])
-                
-                # Lê o evento completo do S3
-                event_location = body['event_location']
-                event_data = self.event_reader.read_event(event_location)
-                
-                # Adiciona dados do SQS que precisamos preservar
-                loaded_messages.append({
-                    'MessageId': message['MessageId'],
-                    'ReceiptHandle': message['ReceiptHandle'],
-                    'Body': event_data
-                })
+                located.append((message, body['event_location']))
                 
             except Exception as e:
-                # Log do erro e continua processando outras mensagens
-                print(f"Erro ao carregar evento: {str(e)}")
+                failures[message.get('MessageId')] = str(e)
+        
+        # Lê os eventos completos do S3 em paralelo, na ordem das mensagens
+        histogram = LatencyHistogram()
+        outcomes = fetch_all(
+            [location for _, location in located],
+            self._fetch_function(),
+            max_workers=self.fetch_concurrency,
+            histogram=histogram
+        )
+        log_histogram(logger, "s3_event_fetch_ms", histogram)
+        
+        loaded_messages = []
+        for (message, _), outcome in zip(located, outcomes):
+            if outcome.error is not None:
+                # Falhas de leitura afetam apenas a própria mensagem
+                failures[message.get('MessageId')] = str(outcome.error)
                 continue
                 
-        return loaded_messages
+            # Adiciona dados do SQS que precisamos preservar
+            loaded_messages.append({
+                'MessageId': message['MessageId'],
+                'ReceiptHandle': message['ReceiptHandle'],
+                'Body': outcome.value,
+                'MessageAttributes': message.get('MessageAttributes', {})
+            })
+                
+        return loaded_messages, failures
+        
+    def _fetch_function(self):
+        """Função de leitura do S3 conforme o modo do consumidor"""
+        if self.streaming:
+            return lambda location: encode_event_stream(self.event_reader.read_stream(location))
+        if self.passthrough:
+            return self.event_reader.read_raw
+        return self.event_reader.read_event
         
     def delete_message(self, queue_url: str, receipt_handle: str) -> None:
         """
@@ -78,4 +177,30 @@ class SQSMessageConsumer(MessageQueue):
         self.sqs.delete_message(
             QueueUrl=queue_url,
             ReceiptHandle=receipt_handle
-        ) 
\ No newline at end of file
+        )
+
+    def delete_messages(self, queue_url: str, receipt_handles: Sequence[str]) -> Dict[str, str]:
+        """
+        Remove um lote de mensagens da fila via DeleteMessageBatch (grupos de 10)
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            receipt_handles: Receipt handles das mensagens
+            
+        Retorno:
+            Mapa receipt handle -> erro das mensagens não removidas
+        """
+        return delete_message_batch(self.sqs, queue_url, receipt_handles).failed
+
+    def release_messages(self, queue_url: str, receipt_handles: Sequence[str]) -> Dict[str, str]:
+        """
+        Devolve mensagens à fila via ChangeMessageVisibilityBatch (VisibilityTimeout=0)
+        
+        Parâmetros:
+            queue_url: URL da fila SQS
+            receipt_handles: Receipt handles das mensagens
+            
+        Retorno:
+            Mapa receipt handle -> erro das mensagens não liberadas
+        """
+        return release_message_batch(self.sqs, queue_url, receipt_handles).failed
@@ -1,8 +1,10 @@
 import json
-from typing import Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 import boto3
 from botocore.exceptions import ClientError
 from ...domain.interfaces.event_storage_reader import EventStorageReader
+from ....shared.aws import get_client
+from ....shared.serialization.json_stream import DEFAULT_CHUNK_SIZE
 
 class EventNotFoundError(Exception):
     """Erro lançado quando o evento não é encontrado no S3"""
@@ -23,7 +25,7 @@ class S3EventReader(EventStorageReader):
         Parâmetros:
             s3_client: Cliente boto3 S3 (opcional, para injeção em testes)
         """
-        self.s3 = s3_client or boto3.client('s3')
+        self.s3 = s3_client or get_client('s3')
         
     def read_event(self, event_location: str) -> Dict:
         """
@@ -39,6 +41,53 @@ class S3EventReader(EventStorageReader):
             EventNotFoundError: Se o evento não for encontrado
             InvalidLocationError: Se a URI for inválida
         """
+        # Decodifica o conteúdo JSON
+        return json.loads(self.read_raw(event_location))
+
+    def read_raw(self, event_location: str) -> bytes:
+        """
+        Lê os bytes originais de um evento do S3, sem decodificá-los
+        
+        Parâmetros:
+            event_location: URI do objeto no S3 (s3://bucket/key)
+            
+        Retorno:
+            bytes: Conteúdo do objeto
+            
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a URI for inválida
+        """
+        return self._get_object(event_location)['Body'].read()
+
+    def read_stream(self, event_location: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Lê um evento do S3 em blocos, sem carregá-lo inteiro em memória
+        
+        Parâmetros:
+            event_location: URI do objeto no S3 (s3://bucket/key)
+            chunk_size: Tamanho dos blocos em bytes
+            
+        Retorno:
+            Iterator[bytes]: Blocos do conteúdo do objeto
+            
+        Raises:
+            EventNotFoundError: Se o evento não for encontrado
+            InvalidLocationError: Se a URI for inválida
+        """
+        # O GetObject acontece aqui, antes do primeiro bloco: erros de leitura surgem na chamada
+        return self._get_object(event_location)['Body'].iter_chunks(chunk_size)
+
+    def _get_object(self, event_location: str) -> Dict[str, Any]:
+        """
+        Executa o GetObject do evento
+        
+        Parâmetros:
+            event_location: URI do objeto no S3 (s3://bucket/key)
+            
+        Retorno:
+            Resposta do GetObject, com o corpo ainda não lido
+        """
         try:
             # Extrai bucket e key da URI
             if not event_location.startswith('s3://'):
@@ -48,18 +97,14 @@ class S3EventReader(EventStorageReader):
             bucket, key = path.split('/', 1)
             
             # Lê o objeto do S3
-            response = self.s3.get_object(
+            return self.s3.get_object(
                 Bucket=bucket,
                 Key=key
             )
             
-            # Decodifica o conteúdo JSON
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
-            
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchKey':
                 raise EventNotFoundError(f"Evento não encontrado: {event_location}")
             raise
         except (ValueError, IndexError):
-            raise InvalidLocationError(f"URI inválida: {event_location}") 
\ No newline at end of file
+            raise InvalidLocationError(f"URI inválida: {event_location}")
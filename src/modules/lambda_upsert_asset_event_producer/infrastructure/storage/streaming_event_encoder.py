@@ -0,0 +1,62 @@
+from typing import Any, Dict, Iterable
+from ...domain.entities.upsert_event import (
+    ATTRIBUTE_FIELDS,
+    CHANGE_FIELDS,
+    DELTA,
+    EVENT_FIELDS,
+    INDEXED_FIELD_FIELDS,
+    ROUTING_FIELDS,
+    SNAPSHOT
+)
+from ....shared.kafka.passthrough import (
+    PassthroughEvent,
+    SchemaValidationError,
+    check_optional_fields,
+    require_fields
+)
+from ....shared.serialization.json_stream import JsonStreamWriter, stream_object
+
+# Campos com listas potencialmente enormes, lidos item a item
+STREAMED_FIELDS = ('attributes',)
+
+def encode_event_stream(chunks: Iterable[bytes]) -> PassthroughEvent:
+    """
+    Converte o payload de um evento de upsert, lido em blocos, no valor da mensagem Kafka
+    
+    Os atributos são decodificados, validados e reescritos um a um: nem o
+    texto original nem a lista completa de atributos ficam em memória, apenas
+    o JSON compacto de saída. A validação equivale à de UpsertEvent.validate_schema.
+    
+    Parâmetros:
+        chunks: Blocos de bytes do payload
+        
+    Retorno:
+        Evento de passthrough com o JSON compacto do payload
+        
+    Raises:
+        SchemaValidationError: Se o payload não seguir o esquema
+        StreamParseError: Se o payload não for JSON válido
+    """
+    writer = JsonStreamWriter()
+    header: Dict[str, Any] = {}
+    for key, value in stream_object(chunks, STREAMED_FIELDS):
+        if key in STREAMED_FIELDS and not isinstance(value, list):
+            writer.begin_array(key)
+            for index, attr in enumerate(value):
+                require_fields(attr, ATTRIBUTE_FIELDS, f"{key}[{index}].")
+                writer.item(attr)
+            writer.end_array()
+            # Presença registrada para a validação dos campos obrigatórios
+            header[key] = []
+        else:
+            writer.field(key, value)
+            header[key] = value
+    
+    require_fields(header, EVENT_FIELDS)
+    check_optional_fields(header, CHANGE_FIELDS)
+    check_optional_fields(header, ROUTING_FIELDS)
+    if header.get('change_type', SNAPSHOT) not in (SNAPSHOT, DELTA):
+        raise SchemaValidationError(f"change_type: valor inválido ({header['change_type']})")
+    for index, field in enumerate(header['indexed_field_list']):
+        require_fields(field, INDEXED_FIELD_FIELDS, f"indexed_field_list[{index}].")
+    return PassthroughEvent.from_payload(writer.getvalue(), header)
@@ -1,13 +1,33 @@
 """
 Handler principal para o lambda de upsert de assets.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import os
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from ddtrace import tracer
 
 from ....shared.config.lambda_config import lambda_handler
+from ....shared.tracing.datadog_config import active_span, traced_span
+from ....shared.aws.prewarm import prewarm_on_init
+from ....shared.routing.sqs_source_router import batch_item_failures, event_source_mode_enabled
+from ....shared.aws.queue_drain import DrainSettings
 from ...container import UpsertEventContainer
 
+# Container reaproveitado entre invocações do mesmo ambiente de execução
+_container: Optional[UpsertEventContainer] = None
+
+def get_container() -> UpsertEventContainer:
+    """Retorna o container do processo, criando-o na primeira chamada."""
+    global _container
+    if _container is None:
+        _container = UpsertEventContainer(dict(os.environ))
+    return _container
+
+# Parâmetros do modo de drenagem, lidos uma vez por ambiente de execução
+drain_settings = DrainSettings.from_env()
+
+# Abre as conexões durante a fase de init (quando PREWARM_CONNECTIONS=true)
+prewarm_on_init(kafka_producer_factory=lambda: get_container().create_event_producer().producer)
+
 @lambda_handler(service_name="upsert_asset_producer")
 async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     """
@@ -21,50 +41,76 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         Dict contendo o resultado do processamento
     """
     try:
-        with tracer.current_span() as span:
-            # Inicializa container
-            container = UpsertEventContainer()
+        with active_span() as span:
+            # Obtém o container do processo
+            container = get_container()
             span.set_tag("container_initialized", True)
             
-            results = []
-            # Processa cada registro do evento
-            for record in event.get('Records', []):
-                with tracer.trace("process_upsert_event") as event_span:
-                    # Extrai informações do evento DynamoDB
-                    dynamodb_data = record.get('dynamodb', {})
-                    event_name = record.get('eventName', 'UNKNOWN')
-                    
-                    event_span.set_tag("event_name", event_name)
-                    event_span.set_tag("sequence_number", dynamodb_data.get('SequenceNumber', 'unknown'))
-                    
-                    result = await container.process_upsert_events_use_case.execute(record)
-                    results.append(result)
-                    
-                    event_span.set_tag("processing_status", "success")
+            records = event.get('Records', [])
+            # Um span por lote, com contadores agregados
+            with traced_span("process_upsert_batch") as batch_span:
+                if event_source_mode_enabled():
+                    # Processa os registros entregues pelo trigger; a Lambda remove os demais da fila
+                    result = container.process_upsert_events_use_case.process_records(
+                        records,
+                        kafka_topic=container.env['KAFKA_TOPIC']
+                    )
+                elif drain_settings.enabled:
+                    # Drena a fila enquanto houver mensagens e tempo na invocação
+                    result = container.process_upsert_events_use_case.drain(
+                        queue_url=container.env['UPSERT_QUEUE_URL'],
+                        kafka_topic=container.env['KAFKA_TOPIC'],
+                        remaining_time_ms=context.get_remaining_time_in_millis,
+                        settings=drain_settings
+                    )
+                    batch_span.set_tag("drain_stop_reason", result['drain']['stop_reason'])
+                    batch_span.set_tag("drain_batches", result['drain']['batches'])
+                else:
+                    # Publica as mensagens da fila em um único lote (um flush por invocação)
+                    result = container.process_upsert_events_use_case.execute(
+                        queue_url=container.env['UPSERT_QUEUE_URL'],
+                        kafka_topic=container.env['KAFKA_TOPIC']
+                    )
+                
+                batch_span.set_tag("records_count", len(records))
+                batch_span.set_tag("records_processed", result['processed'])
+                batch_span.set_tag("records_failed", len(result['errors']))
+                batch_span.set_tag("processing_status", "success")
             
             response = {
                 'statusCode': 200,
                 'body': {
                     'message': 'Eventos processados com sucesso',
-                    'processed_count': len(results)
+                    'processed_count': result['processed'],
+                    'errors': result['errors']
                 }
             }
+            if 'drain' in result:
+                response['body']['drain'] = result['drain']
+            if 'batch_item_failures' in result:
+                response.update(batch_item_failures(result['batch_item_failures']))
             
             span.set_tag("processing_status", "success")
-            span.set_tag("events_processed", len(results))
+            span.set_tag("events_processed", result['processed'])
             
             return response
             
     except Exception as e:
-        with tracer.current_span() as span:
+        with active_span() as span:
             span.set_tag("error", True)
             span.set_tag("error_type", type(e).__name__)
             span.set_tag("error_message", str(e))
             
-        return {
+        response = {
             'statusCode': 500,
             'body': {
                 'error': str(e),
                 'message': 'Erro ao processar eventos'
             }
-        } 
\ No newline at end of file
+        }
+        if event_source_mode_enabled():
+            # Sem resultado confiável, todo o lote volta para a fila
+            response.update(batch_item_failures(
+                record.get('messageId') for record in event.get('Records', [])
+            ))
+        return response 
\ No newline at end of file
@@ -3,17 +3,20 @@ Exemplo de handler Lambda com tracing Datadog.
 """
 from typing import Dict, Any
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from ddtrace import tracer
 
 from ...shared.config.lambda_config import lambda_handler
+from ...shared.tracing.datadog_config import datadog_trace, active_span
 from ...shared.routing.event_router import EventRouter
 from ...shared.events.interfaces import EventType
 from ...shared.events.validators import SQSEventValidator
 
-# Inicializa o router
-router = EventRouter()
+# Timeout da auditoria: não deve entrar no caminho crítico do processamento
+AUDIT_TIMEOUT_SECONDS = 1.0
 
-@tracer.wrap(service="example_processor", name="process_message")
+# Inicializa o router em modo fan-out: process_message e audit_message rodam concorrentemente
+router = EventRouter(fan_out=True)
+
+@datadog_trace(service="example_processor", name="process_message")
 async def process_message(event: Dict[str, Any], context: LambdaContext, metadata: Any) -> Dict[str, Any]:
     """
     Processa uma mensagem.
@@ -26,7 +29,7 @@ async def process_message(event: Dict[str, Any], context: LambdaContext, metadat
     Returns:
         Resultado do processamento
     """
-    with tracer.current_span() as span:
+    with active_span() as span:
         # Adiciona tags ao span
         span.set_tag("event_source", metadata.source)
         span.set_tag("event_type", metadata.event_type.value)
@@ -41,7 +44,7 @@ async def process_message(event: Dict[str, Any], context: LambdaContext, metadat
         span.set_tag("result_status", "success")
         return result
 
-@tracer.wrap(service="example_processor", name="audit_message")
+@datadog_trace(service="example_processor", name="audit_message")
 async def audit_message(event: Dict[str, Any], context: LambdaContext, metadata: Any) -> Dict[str, Any]:
     """
     Audita uma mensagem.
@@ -54,7 +57,7 @@ async def audit_message(event: Dict[str, Any], context: LambdaContext, metadata:
     Returns:
         Resultado da auditoria
     """
-    with tracer.current_span() as span:
+    with active_span() as span:
         # Adiciona tags ao span
         span.set_tag("event_source", metadata.source)
         span.set_tag("event_type", metadata.event_type.value)
@@ -78,7 +81,8 @@ router.register(
 
 router.register(
     event_type=EventType.SQS,
-    handler=audit_message
+    handler=audit_message,
+    timeout=AUDIT_TIMEOUT_SECONDS
 )
 
 @lambda_handler(service_name="example_lambda")
@@ -104,7 +108,7 @@ async def handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, An
         "timestamp": results[0].get("timestamp") if results else None
     }
     
-    with tracer.current_span() as span:
+    with active_span() as span:
         span.set_tag("processing_status", "success")
         span.set_tag("messages_processed", len(combined_result["message_ids"]))
     
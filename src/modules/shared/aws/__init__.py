@@ -3,27 +3,115 @@ Módulo compartilhado para funcionalidades AWS.
 Contém classes e utilitários para interação com serviços AWS.
 """
 
-from typing import Dict, Any, Optional
+import os
+import threading
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+import boto3
+from botocore.config import Config
+
+# Parâmetros padrão da configuração dos clientes (podem ser sobrescritos por variáveis de ambiente)
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_CONNECT_TIMEOUT = 2
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def build_client_config() -> Config:
+    """
+    Monta a configuração botocore compartilhada por todos os clientes.
+
+    Usa pool de conexões dimensionado para concorrência, TCP keep-alive para
+    reaproveitar conexões entre invocações e retry adaptativo.
+
+    Returns:
+        Configuração botocore
+    """
+    return Config(
+        max_pool_connections=int(os.getenv('AWS_MAX_POOL_CONNECTIONS', DEFAULT_MAX_POOL_CONNECTIONS)),
+        connect_timeout=float(os.getenv('AWS_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)),
+        read_timeout=float(os.getenv('AWS_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)),
+        tcp_keepalive=True,
+        retries={
+            'mode': 'adaptive',
+            'max_attempts': int(os.getenv('AWS_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS))
+        }
+    )
+
+
 class AWSClientCache:
     """
-    Cache para clientes AWS com TTL.
+    Factory e cache de clientes AWS.
+
+    Mantém uma única sessão boto3 e um cliente por (serviço, região), todos
+    criados com a mesma configuração de pool e keep-alive. Entradas genéricas
+    registradas via set() continuam sujeitas ao TTL.
     """
-    def __init__(self, ttl_minutes: int = 60):
+    def __init__(self, ttl_minutes: int = 60, config: Optional[Config] = None):
         self._cache: Dict[str, Any] = {}
         self._last_access: Dict[str, datetime] = {}
         self._ttl = timedelta(minutes=ttl_minutes)
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._config = config
+        self._session: Optional[boto3.session.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> boto3.session.Session:
+        """Sessão boto3 compartilhada (criada sob demanda)."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = boto3.session.Session()
+        return self._session
+
+    @property
+    def config(self) -> Config:
+        """Configuração botocore usada na criação dos clientes."""
+        if self._config is None:
+            self._config = build_client_config()
+        return self._config
+
+    def client(self, service_name: str, region_name: Optional[str] = None) -> Any:
+        """
+        Retorna o cliente do serviço, criando-o apenas na primeira chamada.
+
+        Args:
+            service_name: Nome do serviço AWS (ex: 's3', 'sqs')
+            region_name: Região (opcional, usa a região padrão da sessão)
+
+        Returns:
+            Cliente boto3 reutilizável
+        """
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        # A criação de clientes a partir da mesma sessão não é thread-safe
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if self._session is None:
+                    self._session = boto3.session.Session()
+                client = self._session.client(
+                    service_name,
+                    region_name=region_name,
+                    config=self.config
+                )
+                self._clients[key] = client
+        return client
 
     def get(self, key: str) -> Optional[Any]:
         if key not in self._cache:
             return None
-        
+
         if datetime.now() - self._last_access[key] > self._ttl:
             del self._cache[key]
             del self._last_access[key]
             return None
-        
+
         self._last_access[key] = datetime.now()
         return self._cache[key]
 
@@ -32,5 +120,26 @@ class AWSClientCache:
         self._last_access[key] = datetime.now()
 
     def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._session = None
         self._cache.clear()
-        self._last_access.clear() 
\ No newline at end of file
+        self._last_access.clear()
+
+
+# Cache de clientes do processo, reaproveitado entre invocações da Lambda
+client_cache = AWSClientCache()
+
+
+def get_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """
+    Obtém um cliente AWS a partir do cache compartilhado do processo.
+
+    Args:
+        service_name: Nome do serviço AWS
+        region_name: Região (opcional)
+
+    Returns:
+        Cliente boto3
+    """
+    return client_cache.client(service_name, region_name)
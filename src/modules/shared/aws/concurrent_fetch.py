@@ -0,0 +1,90 @@
+"""
+Busca concorrente de objetos com pool de threads limitado.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence, TypeVar, Union
+
+from ..logging.histogram import LatencyHistogram
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Número padrão de buscas simultâneas (um lote SQS tem até 10 mensagens)
+DEFAULT_FETCH_CONCURRENCY = 10
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+class FetchOutcome(NamedTuple):
+    """
+    Resultado da busca de um item.
+
+    Attributes:
+        value: Valor retornado pela busca (None em caso de erro)
+        error: Exceção lançada pela busca (None em caso de sucesso)
+        elapsed_ms: Duração da busca em milissegundos
+    """
+    value: object
+    error: Optional[BaseException]
+    elapsed_ms: float
+
+def fetch_concurrency() -> int:
+    """Concorrência configurada em S3_FETCH_CONCURRENCY (mínimo 1)."""
+    return max(1, int(os.getenv('S3_FETCH_CONCURRENCY', DEFAULT_FETCH_CONCURRENCY)))
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Retorna o pool do processo, reaproveitado entre invocações.
+
+    O pool só é recriado se a concorrência pedida mudar.
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+            _executor_workers = max_workers
+        return _executor
+
+def fetch_all(
+    items: Sequence[T],
+    fetch: Callable[[T], R],
+    max_workers: Optional[int] = None,
+    histogram: Optional[LatencyHistogram] = None
+) -> List[FetchOutcome]:
+    """
+    Executa a busca de cada item em paralelo, preservando a ordem de entrada.
+
+    Erros são isolados por item: uma busca com falha não interrompe as demais
+    e é devolvida no FetchOutcome correspondente.
+
+    Args:
+        items: Itens a buscar
+        fetch: Função de busca de um item
+        max_workers: Buscas simultâneas (opcional, padrão S3_FETCH_CONCURRENCY)
+        histogram: Histograma onde registrar a latência de cada busca (opcional)
+
+    Returns:
+        Um FetchOutcome por item, na ordem de entrada
+    """
+    def timed(item: T) -> FetchOutcome:
+        start = time.perf_counter()
+        try:
+            value: Union[R, None] = fetch(item)
+            error = None
+        except Exception as e:
+            value, error = None, e
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if histogram is not None:
+            histogram.record(elapsed_ms)
+        return FetchOutcome(value, error, elapsed_ms)
+
+    workers = max_workers or fetch_concurrency()
+    if len(items) <= 1 or workers == 1:
+        return [timed(item) for item in items]
+    return list(_get_executor(workers).map(timed, items))
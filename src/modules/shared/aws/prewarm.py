@@ -0,0 +1,133 @@
+"""
+Pré-aquecimento de conexões durante a fase de init da Lambda.
+
+Abre as conexões HTTPS dos clientes compartilhados (S3, SQS, DynamoDB) e carrega
+os metadados do tópico Kafka antes da primeira invocação, para que DNS, TCP e TLS
+não sejam pagos dentro da requisição.
+"""
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from aws_lambda_powertools import Logger
+
+from . import get_client
+
+logger = Logger()
+
+# Alvos já aquecidos neste processo (vários handlers podem ser importados juntos)
+_warmed: set = set()
+_report: Dict[str, float] = {}
+
+QUEUE_URL_VARS = [
+    'UPSERT_QUEUE_URL',
+    'DROP_QUEUE_URL',
+    'UPSERT_QUEUE_DLQ_URL',
+    'DROP_QUEUE_DLQ_URL'
+]
+
+
+def prewarm_enabled() -> bool:
+    """Indica se o pré-aquecimento está habilitado (PREWARM_CONNECTIONS=true)."""
+    return os.getenv('PREWARM_CONNECTIONS', 'false').lower() == 'true'
+
+
+def _build_steps(kafka_producer_factory: Optional[Callable[[], Any]]) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    Monta a lista de passos de aquecimento a partir das variáveis de ambiente.
+
+    Args:
+        kafka_producer_factory: Função que retorna o KafkaProducer usado pela Lambda
+
+    Returns:
+        Lista de (nome do passo, função)
+    """
+    steps = []
+
+    bucket = os.getenv('EVENTS_BUCKET_NAME')
+    if bucket:
+        steps.append((f"s3:{bucket}", lambda: get_client('s3').head_bucket(Bucket=bucket)))
+
+    for var in QUEUE_URL_VARS:
+        queue_url = os.getenv(var)
+        if queue_url:
+            steps.append((
+                f"sqs:{var}",
+                lambda url=queue_url: get_client('sqs').get_queue_attributes(
+                    QueueUrl=url,
+                    AttributeNames=['QueueArn']
+                )
+            ))
+
+    table_name = os.getenv('DYNAMODB_TABLE_NAME')
+    if table_name:
+        steps.append((
+            f"dynamodb:{table_name}",
+            lambda: get_client('dynamodb').describe_table(TableName=table_name)
+        ))
+
+    topic = os.getenv('KAFKA_TOPIC')
+    if topic and kafka_producer_factory is not None:
+        steps.append((f"kafka:{topic}", lambda: kafka_producer_factory().partitions_for(topic)))
+
+    return steps
+
+
+def prewarm_connections(kafka_producer_factory: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Executa os passos de aquecimento ainda não executados neste processo.
+
+    Falhas são isoladas por passo e apenas registradas: o aquecimento nunca
+    deve impedir a inicialização da Lambda.
+
+    Args:
+        kafka_producer_factory: Função que retorna o KafkaProducer a aquecer (opcional)
+
+    Returns:
+        Tempo gasto em cada passo, em milissegundos
+    """
+    timings: Dict[str, float] = {}
+
+    for name, step in _build_steps(kafka_producer_factory):
+        if name in _warmed:
+            continue
+        _warmed.add(name)
+
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning("Falha no pré-aquecimento", extra={
+                "step": name,
+                "error": str(e),
+                "error_type": type(e).__name__
+            })
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+    if timings:
+        _report.update(timings)
+        logger.info("Conexões pré-aquecidas", extra={
+            "prewarm_ms": timings,
+            "prewarm_total_ms": round(sum(timings.values()), 2)
+        })
+
+    return timings
+
+
+def prewarm_on_init(kafka_producer_factory: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Ponto de entrada chamado na importação dos handlers (fase de init).
+
+    Args:
+        kafka_producer_factory: Função que retorna o KafkaProducer a aquecer (opcional)
+
+    Returns:
+        Tempo gasto em cada passo executado, ou dicionário vazio se desabilitado
+    """
+    if not prewarm_enabled():
+        return {}
+    return prewarm_connections(kafka_producer_factory)
+
+
+def get_prewarm_report() -> Dict[str, float]:
+    """Retorna o tempo acumulado de cada passo de aquecimento executado no processo."""
+    return dict(_report)
@@ -0,0 +1,243 @@
+"""
+Drenagem de filas com orçamento de tempo.
+
+Mantém o ciclo receber -> processar enquanto houver mensagens e tempo
+restante na invocação, buscando o próximo lote em paralelo ao processamento
+do lote atual.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, Sequence, Tuple, TypeVar, Union
+from aws_lambda_powertools import Logger
+
+from ..logging.logger import log_metric
+
+logger = Logger()
+T = TypeVar('T')
+
+# Margem padrão reservada para encerrar a invocação (flush, logs, resposta)
+DEFAULT_SAFETY_MARGIN_MS = 15000
+# Espera padrão do long polling; uma espera sem mensagens indica fila vazia
+DEFAULT_WAIT_TIME_SECONDS = 2
+# Limite do long polling do SQS
+MAX_WAIT_TIME_SECONDS = 20
+
+STOP_QUEUE_EMPTY = 'queue_empty'
+STOP_TIME_BUDGET = 'time_budget'
+STOP_MAX_BATCHES = 'max_batches'
+STOP_ERROR = 'error'
+
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_lock = threading.Lock()
+
+@dataclass(frozen=True)
+class DrainSettings:
+    """
+    Parâmetros do modo de drenagem.
+
+    Attributes:
+        enabled: Se a drenagem está habilitada
+        safety_margin_ms: Tempo mínimo restante para iniciar um novo lote
+        wait_time_seconds: Espera do long polling de cada recebimento
+        max_batches: Limite de lotes por invocação (None = sem limite)
+    """
+    enabled: bool = False
+    safety_margin_ms: int = DEFAULT_SAFETY_MARGIN_MS
+    wait_time_seconds: int = DEFAULT_WAIT_TIME_SECONDS
+    max_batches: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> 'DrainSettings':
+        """
+        Lê QUEUE_DRAIN_ENABLED, DRAIN_SAFETY_MARGIN_MS, DRAIN_WAIT_TIME_SECONDS
+        e DRAIN_MAX_BATCHES.
+        """
+        max_batches = os.getenv('DRAIN_MAX_BATCHES')
+        return cls(
+            enabled=os.getenv('QUEUE_DRAIN_ENABLED', 'false').lower() == 'true',
+            safety_margin_ms=int(os.getenv('DRAIN_SAFETY_MARGIN_MS', DEFAULT_SAFETY_MARGIN_MS)),
+            wait_time_seconds=min(
+                MAX_WAIT_TIME_SECONDS,
+                max(0, int(os.getenv('DRAIN_WAIT_TIME_SECONDS', DEFAULT_WAIT_TIME_SECONDS)))
+            ),
+            max_batches=int(max_batches) if max_batches else None
+        )
+
+@dataclass(frozen=True)
+class ReceivedBatch(Generic[T]):
+    """
+    Lote recebido da fila, com a contagem bruta de mensagens.
+
+    Mensagens recebidas que não puderam ser carregadas (ex: evento ausente no
+    S3) não entram em items, mas contam em received: um lote sem itens com
+    received > 0 não indica fila vazia.
+
+    Attributes:
+        items: Mensagens carregadas, entregues a process
+        received: Mensagens recebidas da fila, inclusive as que falharam ao carregar
+    """
+    items: Sequence[T]
+    received: int
+
+def _unpack(batch: Union[ReceivedBatch[T], Sequence[T]]) -> Tuple[Sequence[T], int]:
+    """Itens e contagem bruta de um lote recebido (uma sequência simples conta seus itens)."""
+    if isinstance(batch, ReceivedBatch):
+        return batch.items, batch.received
+    return batch, len(batch)
+
+@dataclass
+class DrainReport:
+    """
+    Resultado de uma drenagem.
+
+    Attributes:
+        batches: Lotes processados
+        messages: Mensagens recebidas e processadas
+        skipped: Mensagens recebidas que não chegaram a process (falha ao carregar)
+        elapsed_ms: Duração da drenagem
+        stop_reason: Motivo da parada (queue_empty, time_budget, max_batches ou error)
+        abandoned: Mensagens pré-buscadas e não processadas, devolvidas à fila por release quando fornecido
+            (sem ele, voltam só após o visibility timeout)
+        error: Descrição do erro quando stop_reason é 'error'
+    """
+    batches: int = 0
+    messages: int = 0
+    skipped: int = 0
+    elapsed_ms: float = 0.0
+    stop_reason: str = STOP_QUEUE_EMPTY
+    abandoned: int = 0
+    error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Mensagens processadas por segundo."""
+        return round(self.messages / (self.elapsed_ms / 1000), 2) if self.elapsed_ms else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável da drenagem."""
+        report = {
+            'batches': self.batches,
+            'messages': self.messages,
+            'skipped': self.skipped,
+            'elapsed_ms': round(self.elapsed_ms, 2),
+            'messages_per_second': self.throughput,
+            'stop_reason': self.stop_reason,
+            'abandoned': self.abandoned
+        }
+        if self.error:
+            report['error'] = self.error
+        return report
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """Thread dedicada à pré-busca, reaproveitada entre invocações."""
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='drain-prefetch')
+        return _prefetch_executor
+
+def drain(
+    receive: Callable[[int], Union[ReceivedBatch[T], Sequence[T]]],
+    process: Callable[[Sequence[T]], Any],
+    remaining_time_ms: Callable[[], int],
+    settings: Optional[DrainSettings] = None,
+    name: str = 'queue',
+    release: Optional[Callable[[Sequence[T]], Any]] = None
+) -> DrainReport:
+    """
+    Recebe e processa lotes até a fila esvaziar ou o tempo acabar.
+
+    O próximo recebimento é iniciado em paralelo ao processamento do lote atual.
+    Um novo lote só é iniciado (e só é pré-buscado) se o tempo restante, já
+    descontada a espera do long polling, for maior que a margem de segurança.
+    Um lote pré-buscado que não chega a ser processado (parada por tempo,
+    limite de lotes ou erro) é entregue a release, que deve torná-lo visível
+    na fila de novo; sem isso, cada parada deixaria um lote invisível até o
+    visibility timeout, consumindo uma tentativa a caminho da DLQ.
+
+    A fila é considerada vazia quando um recebimento não traz nenhuma mensagem;
+    um lote em que todas as mensagens falharam ao carregar não para a drenagem.
+
+    Args:
+        receive: Recebe um lote (sequência ou ReceivedBatch, com a contagem bruta de
+            mensagens); recebe a espera do long polling em segundos
+        process: Processa um lote recebido
+        remaining_time_ms: Tempo restante da invocação (ex: context.get_remaining_time_in_millis)
+        settings: Parâmetros da drenagem (opcional, padrão lido do ambiente)
+        name: Nome da fila nos logs
+        release: Devolve à fila um lote recebido e não processado (opcional)
+
+    Returns:
+        Relatório com lotes, mensagens, vazão e motivo da parada
+    """
+    settings = settings or DrainSettings.from_env()
+    report = DrainReport()
+    start = time.perf_counter()
+    executor = _get_prefetch_executor()
+
+    def has_budget() -> bool:
+        return remaining_time_ms() - settings.wait_time_seconds * 1000 > settings.safety_margin_ms
+
+    def receive_next() -> Optional[Future]:
+        if not has_budget():
+            return None
+        return executor.submit(receive, settings.wait_time_seconds)
+
+    upcoming = receive_next()
+    try:
+        while True:
+            if upcoming is None:
+                report.stop_reason = STOP_TIME_BUDGET
+                break
+            batch, received = _unpack(upcoming.result())
+            upcoming = None
+            if not received:
+                report.stop_reason = STOP_QUEUE_EMPTY
+                break
+            report.skipped += received - len(batch)
+
+            limit_reached = settings.max_batches is not None and report.batches + 1 >= settings.max_batches
+            # Pré-busca do próximo lote enquanto o atual é processado
+            upcoming = None if limit_reached else receive_next()
+
+            if batch:
+                process(batch)
+            report.batches += 1
+            report.messages += len(batch)
+
+            if limit_reached:
+                report.stop_reason = STOP_MAX_BATCHES
+                break
+            if not has_budget():
+                report.stop_reason = STOP_TIME_BUDGET
+                break
+    except Exception as e:
+        report.stop_reason = STOP_ERROR
+        report.error = f"{type(e).__name__}: {e}"
+        logger.warning("Drenagem interrompida por erro", extra={"queue": name, "error": report.error})
+
+    if upcoming is not None:
+        # Lote pré-buscado que não será processado: devolvido à fila imediatamente
+        try:
+            abandoned, _ = _unpack(upcoming.result())
+        except Exception:
+            abandoned = []
+        report.abandoned = len(abandoned)
+        if abandoned and release is not None:
+            try:
+                release(abandoned)
+            except Exception as e:
+                logger.warning("Falha ao devolver lote pré-buscado à fila", extra={
+                    "queue": name,
+                    "abandoned": report.abandoned,
+                    "error": f"{type(e).__name__}: {e}"
+                })
+
+    report.elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info("Drenagem concluída", extra={"queue": name, **report.to_dict()})
+    log_metric(logger, "queue_drain_messages", report.messages, "Count")
+    log_metric(logger, "queue_drain_throughput", report.throughput, "Count/Second")
+    return report
@@ -0,0 +1,128 @@
+"""
+Operações em lote do SQS.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from aws_lambda_powertools import Logger
+
+from ..logging.logger import log_metric
+
+logger = Logger()
+
+# Limite de entradas por chamada DeleteMessageBatch e ChangeMessageVisibilityBatch
+DELETE_BATCH_LIMIT = 10
+
+@dataclass
+class AckResult:
+    """
+    Resultado da confirmação (remoção) de um lote de mensagens.
+
+    Attributes:
+        deleted: Receipt handles removidos (ou liberados, em release_message_batch)
+        failed: Mapa receipt handle -> descrição do erro
+    """
+    deleted: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def all_deleted(self) -> bool:
+        """Indica se todas as mensagens foram removidas."""
+        return not self.failed
+
+def delete_message_batch(sqs_client: Any, queue_url: str, receipt_handles: Iterable[str]) -> AckResult:
+    """
+    Remove mensagens da fila em grupos de 10 via DeleteMessageBatch.
+
+    Entradas com falha do lado do SQS (SenderFault=false) são reenviadas uma vez;
+    as demais falhas são reportadas por receipt handle, sem interromper os
+    grupos seguintes.
+
+    Args:
+        sqs_client: Cliente boto3 SQS
+        queue_url: URL da fila
+        receipt_handles: Receipt handles das mensagens a remover
+
+    Returns:
+        Resultado com as mensagens removidas e as falhas
+    """
+    result, calls = _batch_request(sqs_client.delete_message_batch, queue_url, receipt_handles, {})
+    if result.failed:
+        logger.warning("Falha ao remover mensagens do SQS", extra={
+            "queue_url": queue_url,
+            "failed": len(result.failed)
+        })
+    log_metric(logger, "sqs_delete_batch_calls", calls, "Count")
+    return result
+
+def release_message_batch(sqs_client: Any, queue_url: str, receipt_handles: Iterable[str]) -> AckResult:
+    """
+    Devolve mensagens recebidas e não processadas à fila (VisibilityTimeout=0).
+
+    Usa ChangeMessageVisibilityBatch em grupos de 10, com o mesmo reenvio das
+    falhas do lado do SQS que delete_message_batch. As mensagens ficam visíveis
+    imediatamente, em vez de aguardar o visibility timeout.
+
+    Args:
+        sqs_client: Cliente boto3 SQS
+        queue_url: URL da fila
+        receipt_handles: Receipt handles das mensagens a liberar
+
+    Returns:
+        Resultado com as mensagens liberadas e as falhas
+    """
+    result, calls = _batch_request(
+        sqs_client.change_message_visibility_batch,
+        queue_url,
+        receipt_handles,
+        {'VisibilityTimeout': 0}
+    )
+    if result.failed:
+        logger.warning("Falha ao liberar mensagens do SQS", extra={
+            "queue_url": queue_url,
+            "failed": len(result.failed)
+        })
+    log_metric(logger, "sqs_release_batch_calls", calls, "Count")
+    return result
+
+def _batch_request(
+    operation: Callable[..., Dict[str, Any]],
+    queue_url: str,
+    receipt_handles: Iterable[str],
+    entry_fields: Dict[str, Any]
+) -> Tuple[AckResult, int]:
+    """Executa a operação em lote do SQS em grupos de 10, retornando o resultado e o número de chamadas."""
+    result = AckResult()
+    handles = list(dict.fromkeys(receipt_handles))
+    calls = 0
+
+    for start in range(0, len(handles), DELETE_BATCH_LIMIT):
+        pending = handles[start:start + DELETE_BATCH_LIMIT]
+        for attempt in range(2):
+            calls += 1
+            try:
+                response = operation(
+                    QueueUrl=queue_url,
+                    Entries=[
+                        {'Id': str(index), 'ReceiptHandle': handle, **entry_fields}
+                        for index, handle in enumerate(pending)
+                    ]
+                )
+            except Exception as e:
+                for handle in pending:
+                    result.failed[handle] = f"{type(e).__name__}: {e}"
+                break
+
+            retry = []
+            for entry in response.get('Successful', []):
+                result.deleted.append(pending[int(entry['Id'])])
+            for entry in response.get('Failed', []):
+                handle = pending[int(entry['Id'])]
+                if not entry.get('SenderFault', False) and attempt == 0:
+                    retry.append(handle)
+                else:
+                    result.failed[handle] = f"{entry.get('Code')}: {entry.get('Message', '')}".rstrip(': ')
+            if not retry:
+                break
+            pending = retry
+
+    return result, calls
@@ -0,0 +1,107 @@
+"""
+Inicialização única do runtime da Lambda.
+
+Executa, uma única vez por processo e durante a fase de init, a configuração
+do Datadog e o congelamento das gerações do GC, para que as invocações não
+paguem nenhum custo de configuração.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+import gc
+import os
+import threading
+import time
+from aws_lambda_powertools import Logger
+
+from ..logging.logger import log_metric
+from ..tracing.datadog_config import configure_datadog
+
+logger = Logger()
+
+_lock = threading.Lock()
+_report: Optional["BootstrapReport"] = None
+
+@dataclass(frozen=True)
+class BootstrapReport:
+    """
+    Custo da inicialização do runtime.
+
+    Attributes:
+        duration_ms: Tempo total da inicialização em milissegundos
+        steps_ms: Tempo de cada passo em milissegundos
+        gc_frozen: Indica se as gerações do GC foram congeladas
+        frozen_objects: Objetos movidos para a geração permanente
+    """
+    duration_ms: float
+    steps_ms: Dict[str, float] = field(default_factory=dict)
+    gc_frozen: bool = False
+    frozen_objects: int = 0
+
+def gc_freeze_enabled() -> bool:
+    """Indica se o congelamento do GC está habilitado (RUNTIME_FREEZE_GC, default true)."""
+    return os.getenv('RUNTIME_FREEZE_GC', 'true').lower() == 'true'
+
+def bootstrap_runtime() -> BootstrapReport:
+    """
+    Inicializa o runtime uma única vez por processo.
+
+    Chamadas seguintes (de outros handlers importados no mesmo processo ou de
+    invocações quentes) retornam o relatório da primeira execução sem refazer
+    nenhum passo.
+
+    Returns:
+        Relatório com o custo da inicialização
+    """
+    global _report
+    if _report is not None:
+        return _report
+
+    with _lock:
+        if _report is not None:
+            return _report
+
+        steps: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        step_start = time.perf_counter()
+        configure_datadog()
+        steps['datadog'] = round((time.perf_counter() - step_start) * 1000, 2)
+
+        frozen_objects = 0
+        freeze = gc_freeze_enabled()
+        if freeze:
+            # Objetos criados no init (módulos, clientes, containers) deixam de ser
+            # percorridos pelas coletas das invocações
+            step_start = time.perf_counter()
+            gc.collect()
+            gc.freeze()
+            frozen_objects = gc.get_freeze_count()
+            steps['gc_freeze'] = round((time.perf_counter() - step_start) * 1000, 2)
+
+        _report = BootstrapReport(
+            duration_ms=round((time.perf_counter() - start) * 1000, 2),
+            steps_ms=steps,
+            gc_frozen=freeze,
+            frozen_objects=frozen_objects
+        )
+
+    logger.info("Runtime inicializado", extra={
+        "bootstrap_ms": _report.duration_ms,
+        "bootstrap_steps_ms": _report.steps_ms,
+        "gc_frozen_objects": _report.frozen_objects
+    })
+    log_metric(logger, "bootstrap_ms", _report.duration_ms, "Milliseconds")
+    return _report
+
+def freeze_init_objects() -> None:
+    """
+    Congela os objetos criados desde a inicialização (ex: handlers importados depois dela).
+
+    gc.freeze apenas move as gerações para a geração permanente, sem percorrê-las.
+    """
+    if gc_freeze_enabled():
+        gc.freeze()
+
+def get_bootstrap_report() -> Optional[BootstrapReport]:
+    """Retorna o relatório da inicialização, ou None se ela ainda não ocorreu."""
+    return _report
@@ -5,39 +5,42 @@ from typing import Any, Callable, Dict
 from functools import wraps
 import asyncio
 from aws_lambda_powertools import Logger
-from ddtrace import patch_all, tracer
-from ..tracing.datadog_config import configure_datadog, datadog_trace
+from ..tracing.datadog_config import datadog_trace, active_span
+from .bootstrap import bootstrap_runtime, freeze_init_objects, get_bootstrap_report
 
 logger = Logger()
 
 def setup_lambda():
     """
     Configura o ambiente Lambda com Datadog e outras ferramentas.
-    Deve ser chamado no início de cada função Lambda.
+
+    Idempotente: delega para bootstrap_runtime, que executa a configuração
+    uma única vez por processo.
     """
-    # Configura o Datadog
-    configure_datadog()
-    
-    # Configura outras ferramentas necessárias
-    logger.info("Lambda configurado com Datadog")
+    return bootstrap_runtime()
 
 def lambda_handler(service_name: str):
     """
     Decorator para handlers Lambda com suporte a Datadog.
+
+    A inicialização do runtime acontece na decoração (fase de init), não a
+    cada invocação.
     
     Args:
         service_name: Nome do serviço para o trace
     """
     def decorator(handler: Callable):
+        if get_bootstrap_report() is None:
+            bootstrap_runtime()
+        else:
+            freeze_init_objects()
+
         @wraps(handler)
         @datadog_trace(service=service_name, name="lambda_handler")
         async def wrapper(event: Dict[str, Any], context: Any):
             try:
-                # Configura o ambiente
-                setup_lambda()
-                
                 # Adiciona contexto ao trace
-                with tracer.current_span() as span:
+                with active_span() as span:
                     span.set_tag("function_name", context.function_name)
                     span.set_tag("function_version", context.function_version)
                     span.set_tag("aws_request_id", context.aws_request_id)
@@ -47,7 +50,7 @@ def lambda_handler(service_name: str):
                 
             except Exception as e:
                 # Registra erro no trace
-                with tracer.current_span() as span:
+                with active_span() as span:
                     span.set_tag("error", True)
                     span.set_tag("error_type", type(e).__name__)
                     span.set_tag("error_message", str(e))
@@ -1,104 +1,312 @@
 """
 Container base para injeção de dependências.
 """
-from typing import Dict, Any, TypeVar, Callable, Optional
-from datetime import datetime, timedelta
-import boto3
+from typing import Dict, Any, TypeVar, Callable, List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import inspect
+import threading
+import time
+import weakref
 from aws_lambda_powertools import Logger
 
+from ..logging.logger import log_metric
+
 logger = Logger()
 T = TypeVar('T')
 
+# Instância retirada do container e ainda não encerrada: (chave, instância, hook)
+Detached = Tuple[str, Any, Optional[Callable[[Any], None]]]
+
 class DependencyContainer:
-    """Container base para injeção de dependências com suporte a cache."""
-    
-    def __init__(self):
-        """Inicializa o container."""
-        self._instances: Dict[str, Any] = {}
-        self._last_access: Dict[str, datetime] = {}
-        self._ttl_minutes: Dict[str, int] = {}
-    
-    def register(self, key: str, instance: Any, ttl_minutes: Optional[int] = None) -> None:
+    """
+    Container base para injeção de dependências com suporte a cache.
+
+    A construção de cada chave é single-flight (uma única construção mesmo com
+    chamadas concorrentes de threads ou tasks asyncio), o TTL usa relógio
+    monotônico e o número de instâncias é limitado com despejo LRU. Instâncias
+    despejadas ou expiradas são encerradas pelo hook de fechamento registrado,
+    sempre fora do lock global (um hook lento não bloqueia os demais acessos).
+    """
+
+    # Número máximo de instâncias mantidas (None = ilimitado)
+    MAX_ENTRIES: Optional[int] = 64
+
+    def __init__(
+        self,
+        env_vars: Optional[Dict[str, str]] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o container.
+
+        Args:
+            env_vars: Variáveis de ambiente usadas pelas factories (opcional)
+            max_entries: Limite de instâncias (opcional, padrão MAX_ENTRIES)
+            clock: Relógio monotônico em segundos (injetável em testes)
+        """
+        self.env: Dict[str, str] = dict(env_vars or {})
+        self._instances: "OrderedDict[str, Any]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._ttl_seconds: Dict[str, float] = {}
+        self._close_hooks: Dict[str, Callable[[Any], None]] = {}
+        self._build_times_ms: Dict[str, float] = {}
+        self._max_entries = max_entries if max_entries is not None else self.MAX_ENTRIES
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._async_key_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def register(
+        self,
+        key: str,
+        instance: Any,
+        ttl_minutes: Optional[int] = None,
+        on_close: Optional[Callable[[Any], None]] = None
+    ) -> None:
         """
         Registra uma instância no container.
-        
+
         Args:
             key: Chave única para a instância
             instance: Instância a ser registrada
             ttl_minutes: Tempo de vida em minutos (opcional)
+            on_close: Hook chamado quando a instância expira ou é despejada (opcional)
         """
-        self._instances[key] = instance
-        self._last_access[key] = datetime.now()
-        if ttl_minutes is not None:
-            self._ttl_minutes[key] = ttl_minutes
-            
+        detached: List[Detached] = []
+        with self._lock:
+            if key in self._instances and self._instances[key] is not instance:
+                detached.append(self._detach(key))
+
+            self._instances[key] = instance
+            self._instances.move_to_end(key)
+            self._last_access[key] = self._clock()
+            if ttl_minutes is not None:
+                self._ttl_seconds[key] = ttl_minutes * 60
+            if on_close is not None:
+                self._close_hooks[key] = on_close
+
+            detached.extend(self._evict_overflow())
+
+        for entry in detached:
+            self._close(entry)
+
         logger.debug(f"Instância registrada", extra={
             "key": key,
             "type": type(instance).__name__,
             "ttl": ttl_minutes
         })
-    
+
     def get(self, key: str) -> Optional[Any]:
         """
         Recupera uma instância do container.
-        
+
         Args:
             key: Chave da instância
-            
+
         Returns:
             Instância registrada ou None se não encontrada ou expirada
         """
-        if key not in self._instances:
-            return None
-            
-        # Verifica TTL
-        if key in self._ttl_minutes:
-            now = datetime.now()
-            ttl = timedelta(minutes=self._ttl_minutes[key])
-            if now - self._last_access[key] > ttl:
-                self._remove(key)
+        with self._lock:
+            if key not in self._instances:
                 return None
-                
-        self._last_access[key] = datetime.now()
-        return self._instances[key]
-    
-    def get_or_create(self, key: str, factory: Callable[[], T], ttl_minutes: Optional[int] = None) -> T:
+
+            # Verifica TTL
+            now = self._clock()
+            ttl = self._ttl_seconds.get(key)
+            if ttl is None or now - self._last_access[key] <= ttl:
+                self._last_access[key] = now
+                self._instances.move_to_end(key)
+                return self._instances[key]
+
+            expired = self._detach(key)
+
+        self._close(expired)
+        return None
+
+    def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], T],
+        ttl_minutes: Optional[int] = None,
+        on_close: Optional[Callable[[T], None]] = None
+    ) -> T:
         """
         Recupera uma instância do container ou cria uma nova se não existir.
-        
+
+        Chamadas concorrentes para a mesma chave aguardam uma única construção.
+
         Args:
             key: Chave da instância
             factory: Função factory para criar nova instância
             ttl_minutes: Tempo de vida em minutos (opcional)
-            
+            on_close: Hook chamado quando a instância expira ou é despejada (opcional)
+
+        Returns:
+            Instância existente ou nova
+        """
+        instance = self.get(key)
+        if instance is not None:
+            return instance
+
+        with self._key_lock(key):
+            instance = self.get(key)
+            if instance is None:
+                start = time.perf_counter()
+                instance = factory()
+                self._record_build_time(key, start)
+                self.register(key, instance, ttl_minutes, on_close)
+
+        return instance
+
+    async def get_or_create_async(
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        ttl_minutes: Optional[int] = None,
+        on_close: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Versão assíncrona de get_or_create, aceitando factories síncronas ou corrotinas.
+
+        Tasks do mesmo event loop aguardam a construção em andamento em vez de
+        iniciar outra.
+
+        Args:
+            key: Chave da instância
+            factory: Função factory (pode retornar um awaitable)
+            ttl_minutes: Tempo de vida em minutos (opcional)
+            on_close: Hook chamado quando a instância expira ou é despejada (opcional)
+
         Returns:
             Instância existente ou nova
         """
         instance = self.get(key)
-        if instance is None:
-            instance = factory()
-            self.register(key, instance, ttl_minutes)
-            
+        if instance is not None:
+            return instance
+
+        async with self._async_key_lock(key):
+            instance = self.get(key)
+            if instance is None:
+                start = time.perf_counter()
+                instance = factory()
+                if inspect.isawaitable(instance):
+                    instance = await instance
+                self._record_build_time(key, start)
+                self.register(key, instance, ttl_minutes, on_close)
+
         return instance
-    
+
+    def get_build_metrics(self) -> Dict[str, float]:
+        """
+        Retorna o tempo da última construção de cada chave.
+
+        Returns:
+            Dicionário chave -> tempo de construção em milissegundos
+        """
+        with self._lock:
+            return dict(self._build_times_ms)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Retorna o lock de construção da chave (um por chave)."""
+        with self._lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def _async_key_lock(self, key: str) -> asyncio.Lock:
+        """Retorna o lock asyncio da chave para o event loop corrente."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            locks = self._async_key_locks.setdefault(loop, {})
+            lock = locks.get(key)
+            if lock is None:
+                lock = locks[key] = asyncio.Lock()
+            return lock
+
+    def _record_build_time(self, key: str, start: float) -> None:
+        """Registra o tempo de construção da chave."""
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        with self._lock:
+            self._build_times_ms[key] = elapsed_ms
+        log_metric(logger, f"dependency_build_ms.{key}", elapsed_ms, "Milliseconds")
+
+    def _evict_overflow(self) -> List[Detached]:
+        """
+        Retira as instâncias menos usadas recentemente acima do limite.
+
+        Deve ser chamado com o lock global; o chamador encerra as instâncias
+        retornadas depois de liberá-lo.
+
+        Returns:
+            Instâncias retiradas, a encerrar
+        """
+        detached: List[Detached] = []
+        if self._max_entries is None:
+            return detached
+        while len(self._instances) > self._max_entries:
+            detached.append(self._detach(next(iter(self._instances))))
+        return detached
+
+    def _detach(self, key: str) -> Detached:
+        """
+        Retira uma instância do container sem encerrá-la (requer o lock global).
+
+        Args:
+            key: Chave da instância, presente no container
+
+        Returns:
+            Chave, instância e hook de fechamento
+        """
+        instance = self._instances.pop(key)
+        del self._last_access[key]
+        self._ttl_seconds.pop(key, None)
+        return key, instance, self._close_hooks.pop(key, None)
+
     def _remove(self, key: str) -> None:
         """
-        Remove uma instância do container.
-        
+        Remove uma instância do container, executando seu hook de fechamento.
+
         Args:
             key: Chave da instância
         """
-        if key in self._instances:
-            del self._instances[key]
-            del self._last_access[key]
-            if key in self._ttl_minutes:
-                del self._ttl_minutes[key]
-                
-            logger.debug(f"Instância removida", extra={"key": key})
-    
+        with self._lock:
+            if key not in self._instances:
+                return
+            detached = self._detach(key)
+
+        self._close(detached)
+
+    def _close(self, detached: Detached) -> None:
+        """
+        Executa o hook de fechamento de uma instância retirada (sem o lock global).
+
+        Args:
+            detached: Chave, instância e hook de fechamento
+        """
+        key, instance, on_close = detached
+        if on_close is not None:
+            try:
+                on_close(instance)
+            except Exception as e:
+                logger.warning("Erro ao encerrar instância", extra={
+                    "key": key,
+                    "error": str(e)
+                })
+
+        logger.debug(f"Instância removida", extra={"key": key})
+
     def clear(self) -> None:
         """Limpa todas as instâncias do container."""
-        self._instances.clear()
-        self._last_access.clear()
-        self._ttl_minutes.clear()
-        logger.debug("Container limpo") 
\ No newline at end of file
+        with self._lock:
+            keys = list(self._instances)
+        for key in keys:
+            self._remove(key)
+        with self._lock:
+            self._key_locks.clear()
+        logger.debug("Container limpo")
@@ -2,9 +2,9 @@
 Interfaces base para manipulação de eventos.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Protocol
+from typing import Dict, Any, List, Optional, Protocol
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 class EventType(Enum):
     """Tipos de eventos suportados."""
@@ -38,6 +38,37 @@ class EventValidator(Protocol):
         """
         ...
 
+@dataclass
+class BatchValidationResult:
+    """Resultado da validação de um lote de registros."""
+    total: int
+    invalid_indices: List[int] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        """True se o lote é bem formado e todos os registros são válidos."""
+        return self.error is None and not self.invalid_indices
+
+    @property
+    def valid_count(self) -> int:
+        """Quantidade de registros válidos."""
+        return self.total - len(self.invalid_indices)
+
+class BatchEventValidator(EventValidator, Protocol):
+    """Protocolo para validadores que verificam todos os registros de um lote."""
+    def validate_batch(self, event: Dict[str, Any]) -> BatchValidationResult:
+        """
+        Valida todos os registros de um evento em uma única passada.
+        
+        Args:
+            event: Evento com Records
+            
+        Returns:
+            Resultado com os índices dos registros inválidos
+        """
+        ...
+
 class EventStorage(ABC):
     """Interface base para armazenamento de eventos."""
     
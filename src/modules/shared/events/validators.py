@@ -1,17 +1,16 @@
 """
 Validadores padrão para diferentes tipos de eventos.
 """
-from typing import Dict, Any
-from ddtrace import tracer
-from .interfaces import EventValidator
-from ..tracing.datadog_config import datadog_trace, add_trace_context
+from typing import Dict, Any, Callable, Optional
+from .interfaces import EventValidator, BatchValidationResult
+from ..tracing.datadog_config import datadog_trace, add_trace_context, active_span
 
 class KinesisEventValidator(EventValidator):
     """Validador para eventos Kinesis."""
     
     @datadog_trace(service="event_validator", name="validate_kinesis")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "kinesis"})
             
             if not isinstance(event, dict) or 'Records' not in event:
@@ -41,7 +40,7 @@ class SQSEventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_sqs")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "sqs"})
             
             if not isinstance(event, dict) or 'Records' not in event:
@@ -71,7 +70,7 @@ class DynamoDBEventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_dynamodb")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "dynamodb"})
             
             if not isinstance(event, dict) or 'Records' not in event:
@@ -102,7 +101,7 @@ class S3EventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_s3")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "s3"})
             
             if not isinstance(event, dict) or 'Records' not in event:
@@ -133,7 +132,7 @@ class SNSEventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_sns")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "sns"})
             
             if not isinstance(event, dict) or 'Records' not in event:
@@ -164,7 +163,7 @@ class CloudWatchEventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_cloudwatch")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "cloudwatch"})
             
             result = (
@@ -185,7 +184,7 @@ class APIGatewayEventValidator(EventValidator):
     
     @datadog_trace(service="event_validator", name="validate_api_gateway")
     def validate(self, event: Dict[str, Any]) -> bool:
-        with tracer.current_span() as span:
+        with active_span() as span:
             add_trace_context(span, {"validator": "api_gateway"})
             
             result = (
@@ -199,4 +198,105 @@ class APIGatewayEventValidator(EventValidator):
             if not result:
                 span.set_tag("validation_error", "invalid_api_gateway_data")
             
-            return result 
\ No newline at end of file
+            return result 
+
+
+def _record_check(
+    event_source: Optional[str],
+    payload_key: str,
+    required_field: Optional[str] = None,
+    source_key: str = 'eventSource'
+) -> Callable[[Any], bool]:
+    """
+    Compila a verificação de um registro em uma função especializada.
+
+    Args:
+        event_source: Valor esperado de eventSource (None para não verificar)
+        payload_key: Chave que deve conter um dicionário (ex: 'kinesis', 'Sns')
+        required_field: Campo obrigatório dentro do payload (opcional)
+        source_key: Nome da chave de origem ('EventSource' no SNS)
+
+    Returns:
+        Função record -> bool
+    """
+    if event_source is None and required_field is not None:
+        def check(record: Any) -> bool:
+            payload = record.get(payload_key) if record.__class__ is dict else None
+            return payload.__class__ is dict and required_field in payload
+    elif required_field is not None:
+        def check(record: Any) -> bool:
+            if record.__class__ is not dict or record.get(source_key) != event_source:
+                return False
+            payload = record.get(payload_key)
+            return payload.__class__ is dict and required_field in payload
+    else:
+        def check(record: Any) -> bool:
+            return (
+                record.__class__ is dict and
+                record.get(source_key) == event_source and
+                record.get(payload_key).__class__ is dict
+            )
+    return check
+
+
+class RecordBatchValidator:
+    """
+    Validador de lotes que verifica todos os registros em uma única passada.
+
+    Não abre spans por registro nem por validação; retorna os índices dos
+    registros inválidos para que o chamador possa descartá-los ou reportá-los
+    individualmente.
+    """
+    check: Callable[[Any], bool]
+
+    def validate_batch(self, event: Dict[str, Any]) -> BatchValidationResult:
+        """
+        Valida todos os registros do evento.
+
+        Args:
+            event: Evento com Records
+
+        Returns:
+            Resultado com os índices dos registros inválidos
+        """
+        records = event.get('Records') if isinstance(event, dict) else None
+        if not isinstance(records, list) or not records:
+            return BatchValidationResult(total=0, error="missing_records")
+
+        check = self.check
+        invalid_indices = [index for index, record in enumerate(records) if not check(record)]
+        return BatchValidationResult(total=len(records), invalid_indices=invalid_indices)
+
+    def validate(self, event: Dict[str, Any]) -> bool:
+        """Compatibilidade com EventValidator: True apenas se todos os registros forem válidos."""
+        return self.validate_batch(event).is_valid
+
+
+class KinesisBatchValidator(RecordBatchValidator):
+    """Validador de lotes Kinesis."""
+    check = staticmethod(_record_check(None, 'kinesis', 'data'))
+
+
+def _is_sqs_record(record: Any) -> bool:
+    # O corpo SQS é uma string, então basta verificar a presença da chave
+    return record.__class__ is dict and record.get('eventSource') == 'aws:sqs' and 'body' in record
+
+
+class SQSBatchValidator(RecordBatchValidator):
+    """Validador de lotes SQS."""
+    check = staticmethod(_is_sqs_record)
+
+
+class DynamoDBBatchValidator(RecordBatchValidator):
+    """Validador de lotes DynamoDB Streams."""
+    check = staticmethod(_record_check('aws:dynamodb', 'dynamodb'))
+
+
+class S3BatchValidator(RecordBatchValidator):
+    """Validador de lotes S3."""
+    check = staticmethod(_record_check('aws:s3', 's3'))
+
+
+class SNSBatchValidator(RecordBatchValidator):
+    """Validador de lotes SNS."""
+    check = staticmethod(_record_check('aws:sns', 'Sns', source_key='EventSource'))
@@ -0,0 +1,408 @@
+"""
+Publicação de lotes no Kafka com um único flush.
+
+Todos os eventos de um lote são enviados sem bloqueio, de modo que o
+KafkaProducer pode agrupá-los (linger_ms/batch_size); o flush acontece uma
+vez por lote e o resultado de cada mensagem é obtido do seu future de entrega.
+
+Os valores são serializados pelo publicador, o que permite medir o tamanho de
+cada payload e rejeitar antes do envio os que excedem max_request_size. Com
+chunk_field configurado, esses payloads são divididos em partes (ver chunking).
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+import hashlib
+import json
+import os
+import time
+from aws_lambda_powertools import Logger
+from kafka import codec
+from kafka.errors import KafkaTimeoutError
+from kafka.partitioner import DefaultPartitioner
+
+from ..logging.logger import log_metric
+from .chunking import chunk_headers, new_chunk_id, split_event
+
+logger = Logger()
+
+# Parâmetros padrão do produtor (podem ser sobrescritos por variáveis de ambiente)
+DEFAULT_LINGER_MS = 5
+DEFAULT_BATCH_SIZE = 64 * 1024
+DEFAULT_FLUSH_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_REQUEST_SIZE = 1024 * 1024
+
+# Cabeçalhos do record batch e do record (v2) somados ao payload
+RECORD_OVERHEAD_BYTES = 128
+
+# Codecs suportados pelo kafka-python e a verificação da biblioteca correspondente
+COMPRESSION_CODECS: Dict[str, Callable[[], bool]] = {
+    'gzip': codec.has_gzip,
+    'snappy': codec.has_snappy,
+    'lz4': codec.has_lz4,
+    'zstd': codec.has_zstd
+}
+
+def resolve_compression_type(name: Optional[str]) -> Optional[str]:
+    """
+    Valida o codec de compressão configurado.
+
+    Codecs cuja biblioteca não está instalada no pacote da Lambda são
+    substituídos por gzip (sempre disponível) em vez de falhar na criação do produtor.
+
+    Args:
+        name: Nome do codec ('gzip', 'snappy', 'lz4', 'zstd', 'none' ou vazio)
+
+    Returns:
+        Codec a usar ou None para desabilitar a compressão
+
+    Raises:
+        ValueError: Se o codec não for suportado
+    """
+    if not name or name.lower() == 'none':
+        return None
+
+    name = name.lower()
+    has_codec = COMPRESSION_CODECS.get(name)
+    if has_codec is None:
+        raise ValueError(f"Codec de compressão não suportado: {name}")
+    if not has_codec():
+        logger.warning("Biblioteca do codec indisponível, usando gzip", extra={"compression_type": name})
+        return 'gzip'
+    return name
+
+def exactly_once_enabled(env: Optional[Mapping[str, str]] = None) -> bool:
+    """Indica se o modo exactly-once está habilitado (KAFKA_EXACTLY_ONCE=true)."""
+    env = os.environ if env is None else env
+    return env.get('KAFKA_EXACTLY_ONCE', 'false').lower() == 'true'
+
+def transactional_id(env: Mapping[str, str], default_prefix: str) -> str:
+    """
+    Monta o transactional.id do produtor.
+
+    O prefixo é estável por lambda (KAFKA_TRANSACTIONAL_ID_PREFIX ou o nome da
+    função). O sufixo identifica o ambiente de execução pelo log stream, que é
+    estável durante toda a vida do ambiente: execuções concorrentes não se
+    bloqueiam (fencing) e um produtor recriado no mesmo ambiente retoma o mesmo id.
+
+    Args:
+        env: Variáveis de ambiente
+        default_prefix: Prefixo usado quando não há configuração nem nome de função
+
+    Returns:
+        transactional.id
+    """
+    prefix = env.get('KAFKA_TRANSACTIONAL_ID_PREFIX') or env.get('AWS_LAMBDA_FUNCTION_NAME') or default_prefix
+    instance = env.get('AWS_LAMBDA_LOG_STREAM_NAME')
+    suffix = hashlib.sha1(instance.encode('utf-8')).hexdigest()[:12] if instance else '0'
+    return f"{prefix}-{suffix}"
+
+def kafka_producer_config(
+    env: Optional[Mapping[str, str]] = None,
+    transactional_id_prefix: str = 'asset-event-producer'
+) -> Dict[str, Any]:
+    """
+    Monta os parâmetros de batching, compressão e tamanho do KafkaProducer.
+
+    O batch_size é limitado a max_request_size para que um lote cheio nunca
+    ultrapasse o tamanho máximo de requisição. O particionador é fixado no
+    murmur2 (compatível com o cliente Java) para que a partição de cada chave
+    seja estável. No modo exactly-once o produtor é idempotente (acks=all) e
+    transacional.
+
+    Args:
+        env: Variáveis de ambiente (opcional, padrão os.environ). Lê KAFKA_LINGER_MS,
+            KAFKA_BATCH_SIZE, KAFKA_COMPRESSION_TYPE, KAFKA_MAX_REQUEST_SIZE e KAFKA_EXACTLY_ONCE.
+        transactional_id_prefix: Prefixo padrão do transactional.id
+
+    Returns:
+        Argumentos nomeados para o KafkaProducer
+    """
+    env = os.environ if env is None else env
+    max_request_size = int(env.get('KAFKA_MAX_REQUEST_SIZE', DEFAULT_MAX_REQUEST_SIZE))
+    config = {
+        'linger_ms': int(env.get('KAFKA_LINGER_MS', DEFAULT_LINGER_MS)),
+        'batch_size': min(int(env.get('KAFKA_BATCH_SIZE', DEFAULT_BATCH_SIZE)), max_request_size),
+        'compression_type': resolve_compression_type(env.get('KAFKA_COMPRESSION_TYPE')),
+        'max_request_size': max_request_size,
+        'partitioner': DefaultPartitioner()
+    }
+    if exactly_once_enabled(env):
+        config.update({
+            'enable_idempotence': True,
+            'acks': 'all',
+            'transactional_id': transactional_id(env, transactional_id_prefix)
+        })
+    return config
+
+def flush_timeout(env: Optional[Mapping[str, str]] = None) -> float:
+    """Timeout em segundos do flush de um lote (KAFKA_FLUSH_TIMEOUT_SECONDS)."""
+    env = os.environ if env is None else env
+    return float(env.get('KAFKA_FLUSH_TIMEOUT_SECONDS', DEFAULT_FLUSH_TIMEOUT_SECONDS))
+
+def json_serializer(value: Any) -> bytes:
+    """Serializa o valor em JSON compacto (UTF-8)."""
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+def _envelope_size(key: Optional[bytes], headers: Optional[List[Tuple[str, bytes]]]) -> int:
+    """Bytes da chave e dos cabeçalhos somados ao payload de uma mensagem."""
+    size = len(key) if key else 0
+    if headers:
+        size += sum(len(name) + len(header) for name, header in headers)
+    return size
+
+class OutboundMessage(NamedTuple):
+    """
+    Mensagem a publicar.
+
+    Attributes:
+        id: Identificador da mensagem no resultado da publicação
+        value: Valor a serializar (bytes são enviados sem serialização)
+        key: Chave de particionamento em bytes (opcional)
+        headers: Cabeçalhos da mensagem (opcional)
+    """
+    id: Hashable
+    value: Any
+    key: Optional[bytes] = None
+    headers: Optional[List[Tuple[str, bytes]]] = None
+
+@dataclass
+class PublishResult:
+    """
+    Resultado da publicação de um lote.
+
+    Attributes:
+        delivered: Ids das mensagens confirmadas pelo broker, na ordem de envio
+        failed: Id -> erro das mensagens não entregues
+        bytes_uncompressed: Bytes dos payloads enviados antes da compressão
+        bytes_compressed: Estimativa dos bytes após a compressão (None se indisponível)
+    """
+    delivered: List[Hashable] = field(default_factory=list)
+    failed: Dict[Hashable, str] = field(default_factory=dict)
+    bytes_uncompressed: int = 0
+    bytes_compressed: Optional[int] = None
+
+    @property
+    def all_delivered(self) -> bool:
+        """True se todas as mensagens do lote foram entregues."""
+        return not self.failed
+
+class PayloadTooLargeError(ValueError):
+    """Payload maior que o tamanho máximo de requisição do produtor."""
+    pass
+
+class BatchPublisher:
+    """
+    Publica lotes de mensagens em um tópico com um único flush por lote.
+
+    Com um produtor transacional (transactional_id configurado) cada lote é
+    uma transação: as mensagens aceitas são confirmadas juntas no commit, ou
+    nenhuma é visível aos consumidores read_committed.
+    """
+
+    def __init__(
+        self,
+        producer: Any,
+        flush_timeout_seconds: Optional[float] = None,
+        serializer: Callable[[Any], bytes] = json_serializer,
+        max_request_size: Optional[int] = None,
+        chunk_field: Optional[str] = None,
+        chunk_max_bytes: Optional[int] = None
+    ):
+        """
+        Inicializa o publicador.
+
+        Args:
+            producer: KafkaProducer já configurado (sem value_serializer)
+            flush_timeout_seconds: Timeout do flush (opcional, padrão KAFKA_FLUSH_TIMEOUT_SECONDS)
+            serializer: Função que converte o valor em bytes
+            max_request_size: Tamanho máximo de requisição (opcional, padrão o do produtor)
+            chunk_field: Lista pela qual payloads grandes são divididos em partes
+                (opcional; sem ele, são rejeitados)
+            chunk_max_bytes: Tamanho máximo de cada parte (opcional, padrão o limite de payload)
+        """
+        self.producer = producer
+        self.flush_timeout_seconds = (
+            flush_timeout_seconds if flush_timeout_seconds is not None else flush_timeout()
+        )
+        self.serializer = serializer
+        if max_request_size is None:
+            max_request_size = getattr(producer, 'config', {}).get('max_request_size', DEFAULT_MAX_REQUEST_SIZE)
+        self.max_payload_size = max_request_size - RECORD_OVERHEAD_BYTES
+        self.chunk_field = chunk_field
+        self.chunk_threshold = min(chunk_max_bytes or self.max_payload_size, self.max_payload_size)
+        self.transactional = bool(getattr(producer, 'config', {}).get('transactional_id'))
+        self._transactions_initialized = False
+
+    def publish(self, topic: str, messages: Iterable[OutboundMessage]) -> PublishResult:
+        """
+        Envia todas as mensagens, faz um único flush e coleta o resultado de cada entrega.
+
+        Args:
+            topic: Tópico de destino
+            messages: Mensagens do lote; o id de cada uma identifica seu resultado
+
+        Returns:
+            Mensagens entregues, falhas por id e volume em bytes
+        """
+        result = PublishResult()
+        futures = []
+        rejected = 0
+        chunked = 0
+        start = time.perf_counter()
+
+        if self.transactional:
+            self._begin_transaction()
+
+        for message_id, value, key, headers in messages:
+            try:
+                # Payloads já codificados (passthrough) seguem sem nova serialização
+                payload = value if isinstance(value, (bytes, bytearray)) else self.serializer(value)
+                overhead = _envelope_size(key, headers)
+                if self.chunk_field and len(payload) + overhead > self.chunk_threshold:
+                    parts = self._split(payload, overhead)
+                    if parts is not None:
+                        futures.append((message_id, self._send_parts(topic, parts, key, headers)))
+                        result.bytes_uncompressed += sum(len(part) for part in parts)
+                        chunked += 1
+                        continue
+                size = len(payload) + overhead
+                if size > self.max_payload_size:
+                    rejected += 1
+                    raise PayloadTooLargeError(
+                        f"payload de {size} bytes excede o limite de {self.max_payload_size} bytes"
+                    )
+                futures.append((message_id, [self.producer.send(topic, payload, key=key, headers=headers)]))
+                result.bytes_uncompressed += len(payload)
+            except Exception as e:
+                # Erros síncronos (serialização, tamanho, buffer cheio) afetam apenas a mensagem
+                result.failed[message_id] = f"{type(e).__name__}: {e}"
+
+        if self.transactional:
+            transaction_error = self._commit_transaction(topic)
+            if transaction_error is not None:
+                # Transação abortada: nenhuma mensagem do lote foi publicada
+                for message_id, _ in futures:
+                    result.failed[message_id] = transaction_error
+                futures = []
+        elif futures:
+            try:
+                self.producer.flush(timeout=self.flush_timeout_seconds)
+            except KafkaTimeoutError:
+                logger.warning("Timeout no flush do lote Kafka", extra={
+                    "topic": topic,
+                    "pending": sum(1 for _, sent in futures for future in sent if not future.is_done)
+                })
+
+        # Uma mensagem dividida só é entregue se todas as suas partes forem
+        for message_id, sent in futures:
+            error = None
+            for future in sent:
+                if not future.is_done:
+                    error = "delivery_timeout"
+                elif not future.succeeded():
+                    error = f"{type(future.exception).__name__}: {future.exception}"
+                if error is not None:
+                    break
+            if error is None:
+                result.delivered.append(message_id)
+            else:
+                result.failed[message_id] = error
+
+        compression_rate = self._compression_rate()
+        if compression_rate is not None:
+            result.bytes_compressed = int(result.bytes_uncompressed * compression_rate)
+
+        log_metric(logger, "kafka_batch_publish_ms", round((time.perf_counter() - start) * 1000, 2), "Milliseconds")
+        log_metric(logger, "kafka_batch_bytes_uncompressed", result.bytes_uncompressed, "Bytes")
+        if result.bytes_compressed is not None:
+            log_metric(logger, "kafka_batch_bytes_compressed", result.bytes_compressed, "Bytes")
+        if rejected:
+            log_metric(logger, "kafka_payloads_rejected", rejected, "Count")
+        if chunked:
+            log_metric(logger, "kafka_payloads_chunked", chunked, "Count")
+        if result.failed:
+            logger.warning("Mensagens Kafka não entregues", extra={
+                "topic": topic,
+                "delivered": len(result.delivered),
+                "failed": len(result.failed)
+            })
+
+        return result
+
+    def _split(self, payload: bytes, overhead: int) -> Optional[List[bytes]]:
+        """
+        Divide o payload em partes pelo campo chunk_field.
+
+        Returns:
+            Partes serializadas, ou None se o payload não tiver a lista a dividir
+        """
+        data = json.loads(payload)
+        if not isinstance(data, dict) or not isinstance(data.get(self.chunk_field), list):
+            return None
+        # Os cabeçalhos das partes também contam no tamanho da mensagem (reserva para até 6 dígitos de índice e total)
+        part_headers = chunk_headers(new_chunk_id(), 999999, 999999, self.chunk_field)
+        budget = self.chunk_threshold - overhead - _envelope_size(None, part_headers)
+        return split_event(data, self.chunk_field, budget, self.serializer)
+
+    def _send_parts(
+        self,
+        topic: str,
+        parts: List[bytes],
+        key: Optional[bytes],
+        headers: Optional[List[Tuple[str, bytes]]]
+    ) -> List[Any]:
+        """Envia as partes em ordem, com a mesma chave (mesma partição) e os cabeçalhos de parte."""
+        chunk_id = new_chunk_id()
+        return [
+            self.producer.send(
+                topic,
+                part,
+                key=key,
+                headers=list(headers or []) + chunk_headers(chunk_id, index, len(parts), self.chunk_field)
+            )
+            for index, part in enumerate(parts)
+        ]
+
+    def _begin_transaction(self) -> None:
+        """Inicia a transação do lote (registrando o transactional.id na primeira vez)."""
+        if not self._transactions_initialized:
+            self.producer.init_transactions()
+            self._transactions_initialized = True
+        self.producer.begin_transaction()
+
+    def _commit_transaction(self, topic: str) -> Optional[str]:
+        """
+        Confirma a transação do lote, abortando-a em caso de falha.
+
+        Returns:
+            None se confirmada, ou a descrição do erro
+        """
+        try:
+            # O commit envia as mensagens pendentes e aguarda todas as confirmações
+            self.producer.commit_transaction()
+            return None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            logger.warning("Transação Kafka abortada", extra={"topic": topic, "error": error})
+            try:
+                self.producer.abort_transaction()
+            except Exception as abort_error:
+                logger.warning("Falha ao abortar transação Kafka", extra={
+                    "topic": topic,
+                    "error": str(abort_error)
+                })
+            return error
+
+    def _compression_rate(self) -> Optional[float]:
+        """Taxa média de compressão (comprimido/original) reportada pelo produtor."""
+        metrics = getattr(self.producer, 'metrics', None)
+        if metrics is None:
+            return None
+        try:
+            rate = metrics().get('producer-metrics', {}).get('compression-rate-avg')
+        except Exception:
+            return None
+        # Sem lotes na janela de medição o kafka-python reporta NaN
+        if rate is None or rate != rate or rate <= 0:
+            return None
+        return rate
@@ -0,0 +1,64 @@
+"""
+Cópia binária (Avro) dos eventos publicados em JSON.
+
+Durante a migração do formato, o tópico JSON continua sendo a fonte da
+verdade: cada lote é publicado nele primeiro e as mensagens confirmadas são
+republicadas em um tópico paralelo, codificadas em Avro com o id do esquema
+no cabeçalho. Falhas na cópia são registradas, sem afetar o resultado do lote.
+"""
+from typing import Any, Hashable, Iterable, Sequence
+import json
+from aws_lambda_powertools import Logger
+
+from ..logging.logger import log_metric
+from ..serialization.avro import AvroSerializer, Schema
+from ..serialization.schema_registry import SchemaRegistry
+from .batch_publisher import BatchPublisher, OutboundMessage, PublishResult
+
+logger = Logger()
+
+def _decoded(value: Any) -> Any:
+    # Payloads em passthrough chegam como bytes JSON e precisam ser decodificados para a codificação Avro
+    return json.loads(value) if isinstance(value, (bytes, bytearray)) else value
+
+class BinaryCopyPublisher:
+    """Republica em Avro, em um tópico paralelo, as mensagens entregues no tópico JSON."""
+
+    def __init__(self, producer: Any, topic: str, registry: SchemaRegistry, schema: Schema):
+        """
+        Inicializa o publicador.
+
+        Args:
+            producer: KafkaProducer já configurado (compartilhado com a publicação JSON)
+            topic: Tópico binário
+            registry: Registro de esquemas
+            schema: Esquema Avro dos eventos (registrado sob '<tópico>-value')
+        """
+        self.topic = topic
+        self.serializer = AvroSerializer(registry, f"{topic}-value", schema)
+        self.publisher = BatchPublisher(producer, serializer=self.serializer)
+
+    def publish(self, messages: Sequence[OutboundMessage], delivered: Iterable[Hashable]) -> PublishResult:
+        """
+        Publica a cópia binária das mensagens entregues.
+
+        Args:
+            messages: Mensagens do lote JSON
+            delivered: Ids das mensagens confirmadas no tópico JSON
+
+        Returns:
+            Resultado da publicação binária
+        """
+        delivered = set(delivered)
+        result = self.publisher.publish(
+            self.topic,
+            (message._replace(value=_decoded(message.value)) for message in messages if message.id in delivered)
+        )
+        if result.failed:
+            log_metric(logger, "kafka_binary_copy_failed", len(result.failed), "Count")
+            logger.warning("Cópia binária incompleta", extra={
+                "topic": self.topic,
+                "failed": len(result.failed),
+                "sample_error": next(iter(result.failed.values()))
+            })
+        return result
@@ -0,0 +1,180 @@
+"""
+Divisão de eventos grandes em partes publicadas separadamente.
+
+Um evento cujo payload excede o limite de tamanho é dividido pela sua lista
+mais longa (ex: 'attributes'): cada parte é um evento completo, com os demais
+campos e uma fatia ordenada da lista. As partes levam nos cabeçalhos o id
+comum, o índice e o total de partes; como têm a mesma chave, caem na mesma
+partição e chegam em ordem. ChunkReassembler recompõe o evento no consumidor.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+import json
+import os
+import time
+import uuid
+
+# Cabeçalhos das partes
+CHUNK_ID_HEADER = 'chunk_id'
+CHUNK_INDEX_HEADER = 'chunk_index'
+CHUNK_COUNT_HEADER = 'chunk_count'
+CHUNK_FIELD_HEADER = 'chunk_field'
+
+Headers = Sequence[Tuple[str, bytes]]
+
+def chunking_enabled(env: Optional[Mapping[str, str]] = None) -> bool:
+    """Indica se a publicação em partes está habilitada (KAFKA_CHUNKING=true)."""
+    env = os.environ if env is None else env
+    return env.get('KAFKA_CHUNKING', 'false').lower() == 'true'
+
+def chunk_max_bytes(env: Optional[Mapping[str, str]] = None) -> Optional[int]:
+    """Tamanho máximo de cada parte (KAFKA_CHUNK_MAX_BYTES), se diferente do limite do produtor."""
+    env = os.environ if env is None else env
+    value = env.get('KAFKA_CHUNK_MAX_BYTES')
+    return int(value) if value else None
+
+class ChunkTooLargeError(ValueError):
+    """Um único item da lista, com os demais campos, já excede o limite de uma parte."""
+    pass
+
+def split_event(
+    data: Mapping[str, Any],
+    field: str,
+    max_bytes: int,
+    serializer: Callable[[Any], bytes]
+) -> List[bytes]:
+    """
+    Divide o evento em partes serializadas de até max_bytes.
+
+    Os itens da lista são distribuídos em ordem, preenchendo cada parte até o
+    limite; os demais campos são repetidos em todas as partes.
+
+    Args:
+        data: Evento decodificado
+        field: Campo com a lista a dividir
+        max_bytes: Tamanho máximo de cada parte serializada
+        serializer: Função que serializa cada parte
+
+    Returns:
+        Partes serializadas, em ordem
+
+    Raises:
+        ChunkTooLargeError: Se um item não couber sozinho em uma parte
+    """
+    items = data[field]
+    # Custo fixo de cada parte: os demais campos e a lista vazia
+    base_size = len(serializer({**data, field: []}))
+    parts: List[bytes] = []
+    start = 0
+    while start < len(items) or not parts:
+        end = start
+        size = base_size
+        while end < len(items):
+            item_size = len(serializer(items[end])) + (1 if end > start else 0)
+            if size + item_size > max_bytes:
+                break
+            size += item_size
+            end += 1
+        if end == start and start < len(items):
+            raise ChunkTooLargeError(
+                f"{field}[{start}] não cabe em uma parte de {max_bytes} bytes"
+            )
+        part = serializer({**data, field: items[start:end]})
+        # Com serializadores cujo tamanho não é a soma das partes, reduz a fatia pela metade
+        while len(part) > max_bytes and end - start > 1:
+            end = start + (end - start) // 2
+            part = serializer({**data, field: items[start:end]})
+        if len(part) > max_bytes:
+            raise ChunkTooLargeError(f"{field}[{start}] não cabe em uma parte de {max_bytes} bytes")
+        parts.append(part)
+        start = end
+    return parts
+
+def chunk_headers(chunk_id: str, index: int, count: int, field: str) -> List[Tuple[str, bytes]]:
+    """Cabeçalhos de uma parte."""
+    return [
+        (CHUNK_ID_HEADER, chunk_id.encode('utf-8')),
+        (CHUNK_INDEX_HEADER, str(index).encode('utf-8')),
+        (CHUNK_COUNT_HEADER, str(count).encode('utf-8')),
+        (CHUNK_FIELD_HEADER, field.encode('utf-8'))
+    ]
+
+def new_chunk_id() -> str:
+    """Id comum às partes de um evento."""
+    return uuid.uuid4().hex
+
+class ChunkReassembler:
+    """
+    Recompõe no consumidor os eventos publicados em partes.
+
+    Mensagens sem cabeçalhos de partes são devolvidas decodificadas
+    imediatamente. Partes são guardadas até a chegada de todas; eventos
+    incompletos há mais de ttl_seconds, ou além de max_pending, são descartados.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_pending: int = 1000,
+        deserializer: Callable[[bytes], Any] = json.loads,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o reassembler.
+
+        Args:
+            ttl_seconds: Tempo máximo de espera pelas partes de um evento
+            max_pending: Máximo de eventos incompletos guardados
+            deserializer: Função que decodifica o valor de cada mensagem
+            clock: Relógio (injetável em testes)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self.deserializer = deserializer
+        self.clock = clock
+        self._pending: "OrderedDict[str, Tuple[float, Dict[int, Any]]]" = OrderedDict()
+        self.expired = 0
+
+    def add(self, headers: Optional[Headers], value: bytes) -> Optional[Any]:
+        """
+        Adiciona uma mensagem recebida.
+
+        Args:
+            headers: Cabeçalhos da mensagem (ex: ConsumerRecord.headers)
+            value: Valor da mensagem
+
+        Returns:
+            Evento completo, ou None enquanto faltarem partes
+        """
+        fields = {name: header for name, header in headers or ()}
+        if CHUNK_ID_HEADER not in fields:
+            return self.deserializer(value)
+        chunk_id = fields[CHUNK_ID_HEADER].decode('utf-8')
+        index = int(fields[CHUNK_INDEX_HEADER])
+        count = int(fields[CHUNK_COUNT_HEADER])
+        field = fields[CHUNK_FIELD_HEADER].decode('utf-8')
+
+        self._evict()
+        _, parts = self._pending.setdefault(chunk_id, (self.clock(), {}))
+        parts[index] = self.deserializer(value)
+        if len(parts) < count:
+            return None
+
+        del self._pending[chunk_id]
+        event = dict(parts[0])
+        event[field] = [item for position in range(count) for item in parts[position][field]]
+        return event
+
+    @property
+    def pending(self) -> int:
+        """Eventos com partes ainda faltando."""
+        return len(self._pending)
+
+    def _evict(self) -> None:
+        deadline = self.clock() - self.ttl_seconds
+        while self._pending:
+            chunk_id, (started, _) = next(iter(self._pending.items()))
+            if started >= deadline and len(self._pending) < self.max_pending:
+                break
+            del self._pending[chunk_id]
+            self.expired += 1
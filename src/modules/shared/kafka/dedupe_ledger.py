@@ -0,0 +1,201 @@
+"""
+Registro de mensagens já publicadas (dedupe ledger).
+
+Guarda as chaves de deduplicação (derivadas do MessageId do SQS) das mensagens
+cuja publicação no Kafka foi confirmada, para que reentregas do SQS sejam
+reconhecidas e removidas da fila sem nova publicação.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+import time
+from aws_lambda_powertools import Logger
+
+from ..aws import get_client
+from .batch_publisher import exactly_once_enabled
+
+logger = Logger()
+
+# Retenção padrão do SQS (4 dias): reentregas não acontecem depois disso
+DEFAULT_DEDUPE_TTL_HOURS = 96
+
+# Limites das operações em lote do DynamoDB
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+MAX_UNPROCESSED_RETRIES = 3
+RETRY_BASE_DELAY_SECONDS = 0.05
+
+def dedupe_key(scope: str, message_id: str) -> str:
+    """
+    Monta a chave de deduplicação de uma mensagem SQS.
+
+    Args:
+        scope: Escopo da chave (ex: nome da lambda produtora)
+        message_id: MessageId da mensagem SQS
+
+    Returns:
+        Chave de deduplicação
+    """
+    return f"{scope}:{message_id}"
+
+def _chunks(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class DedupeLedger(ABC):
+    """Interface do registro de mensagens publicadas."""
+
+    @abstractmethod
+    def filter_seen(self, keys: Sequence[str]) -> Set[str]:
+        """
+        Retorna as chaves já registradas.
+
+        Args:
+            keys: Chaves de deduplicação do lote
+
+        Returns:
+            Subconjunto das chaves já publicadas
+        """
+        pass
+
+    @abstractmethod
+    def mark(self, keys: Sequence[str]) -> None:
+        """
+        Registra as chaves de mensagens publicadas.
+
+        Args:
+            keys: Chaves de deduplicação confirmadas
+        """
+        pass
+
+class InMemoryDedupeLedger(DedupeLedger):
+    """
+    Registro em memória, limitado ao ambiente de execução.
+
+    Cobre reentregas recebidas pelo mesmo processo; use DynamoDBDedupeLedger
+    para deduplicar entre ambientes de execução.
+    """
+
+    def __init__(
+        self,
+        ttl_hours: float = DEFAULT_DEDUPE_TTL_HOURS,
+        max_entries: int = 100_000,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._ttl_seconds = ttl_hours * 3600
+        self._max_entries = max_entries
+        self._clock = clock
+
+    def filter_seen(self, keys: Sequence[str]) -> Set[str]:
+        now = self._clock()
+        seen = set()
+        for key in keys:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                continue
+            if expires_at < now:
+                del self._entries[key]
+            else:
+                seen.add(key)
+        return seen
+
+    def mark(self, keys: Sequence[str]) -> None:
+        expires_at = self._clock() + self._ttl_seconds
+        for key in keys:
+            self._entries[key] = expires_at
+            self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+class DynamoDBDedupeLedger(DedupeLedger):
+    """
+    Registro em tabela DynamoDB.
+
+    A tabela tem chave de partição 'dedupe_key' (string) e TTL habilitado no
+    atributo 'expires_at'. Leituras usam BatchGetItem consistente e escritas
+    BatchWriteItem, com novas tentativas para itens não processados.
+    """
+
+    def __init__(self, table_name: str, ttl_hours: float = DEFAULT_DEDUPE_TTL_HOURS, dynamodb_client: Optional[Any] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            table_name: Nome da tabela
+            ttl_hours: Tempo de retenção das chaves em horas
+            dynamodb_client: Cliente boto3 DynamoDB (opcional, para injeção em testes)
+        """
+        self.table_name = table_name
+        self.ttl_seconds = int(ttl_hours * 3600)
+        self.dynamodb = dynamodb_client or get_client('dynamodb')
+
+    def filter_seen(self, keys: Sequence[str]) -> Set[str]:
+        seen: Set[str] = set()
+        for chunk in _chunks(list(dict.fromkeys(keys)), BATCH_GET_LIMIT):
+            request: Dict[str, Any] = {
+                self.table_name: {
+                    'Keys': [{'dedupe_key': {'S': key}} for key in chunk],
+                    'ProjectionExpression': 'dedupe_key',
+                    'ConsistentRead': True
+                }
+            }
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                if attempt:
+                    time.sleep(RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    seen.add(item['dedupe_key']['S'])
+                request = response.get('UnprocessedKeys') or {}
+                if not request:
+                    break
+            else:
+                # Chaves não lidas são tratadas como novas: na dúvida, publica
+                logger.warning("Chaves de deduplicação não lidas", extra={
+                    "table": self.table_name,
+                    "unprocessed": len(request[self.table_name]['Keys'])
+                })
+        return seen
+
+    def mark(self, keys: Sequence[str]) -> None:
+        expires_at = str(int(time.time()) + self.ttl_seconds)
+        for chunk in _chunks(list(dict.fromkeys(keys)), BATCH_WRITE_LIMIT):
+            request: Dict[str, List[Dict[str, Any]]] = {
+                self.table_name: [
+                    {'PutRequest': {'Item': {'dedupe_key': {'S': key}, 'expires_at': {'N': expires_at}}}}
+                    for key in chunk
+                ]
+            }
+            for attempt in range(MAX_UNPROCESSED_RETRIES + 1):
+                if attempt:
+                    time.sleep(RETRY_BASE_DELAY_SECONDS * 2 ** (attempt - 1))
+                response = self.dynamodb.batch_write_item(RequestItems=request)
+                request = response.get('UnprocessedItems') or {}
+                if not request:
+                    break
+            else:
+                logger.warning("Chaves de deduplicação não registradas", extra={
+                    "table": self.table_name,
+                    "unprocessed": len(request[self.table_name])
+                })
+
+def dedupe_ledger_from_env(env: Mapping[str, str]) -> Optional[DedupeLedger]:
+    """
+    Cria o registro de deduplicação configurado no ambiente.
+
+    O registro só é usado no modo exactly-once (KAFKA_EXACTLY_ONCE=true). Com
+    DEDUPE_TABLE_NAME o registro é persistido no DynamoDB; sem ela, fica em memória.
+
+    Args:
+        env: Variáveis de ambiente (KAFKA_EXACTLY_ONCE, DEDUPE_TABLE_NAME, DEDUPE_TTL_HOURS)
+
+    Returns:
+        Registro de deduplicação, ou None se o modo exactly-once estiver desabilitado
+    """
+    if not exactly_once_enabled(env):
+        return None
+    ttl_hours = float(env.get('DEDUPE_TTL_HOURS', DEFAULT_DEDUPE_TTL_HOURS))
+    table_name = env.get('DEDUPE_TABLE_NAME')
+    if table_name:
+        return DynamoDBDedupeLedger(table_name, ttl_hours=ttl_hours)
+    return InMemoryDedupeLedger(ttl_hours=ttl_hours)
@@ -0,0 +1,65 @@
+"""
+Chaves de mensagens Kafka por identidade do asset.
+
+Mensagens com a mesma chave vão sempre para a mesma partição (murmur2, o mesmo
+particionador do cliente Java), preservando a ordem dos eventos de cada asset.
+"""
+from typing import Any, Optional
+
+# Separador dos componentes da chave (escapado dentro dos componentes)
+KEY_SEPARATOR = '/'
+
+def _escape(part: Optional[Any]) -> str:
+    """Converte o componente em texto, escapando '%' e o separador."""
+    if part is None:
+        return ''
+    return str(part).replace('%', '%25').replace(KEY_SEPARATOR, '%2F')
+
+def asset_key(
+    technology_service_name: Optional[str],
+    instance_technology_name: Optional[str],
+    asset_parent_name: Optional[str],
+    asset_name: Optional[str],
+    aws_account_number: Optional[str]
+) -> bytes:
+    """
+    Monta a chave de particionamento de um asset.
+
+    A chave é estável entre processos e versões do produtor: depende apenas da
+    identidade do asset (tecnologia/instância/pai/asset/conta).
+
+    Args:
+        technology_service_name: Serviço de tecnologia (ex: 'rds')
+        instance_technology_name: Instância da tecnologia
+        asset_parent_name: Nome do asset pai (ex: database)
+        asset_name: Nome do asset
+        aws_account_number: Conta AWS
+
+    Returns:
+        Chave em UTF-8
+    """
+    return KEY_SEPARATOR.join((
+        _escape(technology_service_name),
+        _escape(instance_technology_name),
+        _escape(asset_parent_name),
+        _escape(asset_name),
+        _escape(aws_account_number)
+    )).encode('utf-8')
+
+def event_asset_key(event: Any) -> bytes:
+    """
+    Chave de particionamento de um evento de upsert ou drop.
+
+    Args:
+        event: Evento com os atributos de identidade do asset
+
+    Returns:
+        Chave em UTF-8
+    """
+    return asset_key(
+        event.technology_service_name,
+        event.instance_technology_name,
+        event.asset_parent_name,
+        event.asset_name,
+        event.aws_account_number
+    )
@@ -0,0 +1,101 @@
+"""
+Encaminhamento de payloads sem decodificação e recodificação (passthrough).
+
+O payload lido do S3 é validado uma única vez contra o esquema esperado e os
+bytes originais são publicados como valor da mensagem Kafka, sem construir as
+entidades de domínio nem serializar o evento novamente.
+"""
+from dataclasses import dataclass
+import os
+from typing import Any, Mapping, Optional, Tuple, Type, Union
+
+# Especificação de campo: tipo (ou tupla de tipos) aceito
+FieldSpec = Mapping[str, Union[Type, Tuple[Type, ...]]]
+
+# Campos de identidade do asset, usados na chave de particionamento
+IDENTITY_FIELDS = (
+    'technology_service_name',
+    'instance_technology_name',
+    'asset_parent_name',
+    'asset_name',
+    'aws_account_number'
+)
+
+class SchemaValidationError(ValueError):
+    """Erro lançado quando o payload não segue o esquema esperado."""
+    pass
+
+def passthrough_enabled(env: Optional[Mapping[str, str]] = None) -> bool:
+    """Indica se o modo passthrough está habilitado (KAFKA_PASSTHROUGH=true)."""
+    env = os.environ if env is None else env
+    return env.get('KAFKA_PASSTHROUGH', 'false').lower() == 'true'
+
+def require_fields(data: Any, spec: FieldSpec, path: str = '') -> None:
+    """
+    Verifica a presença e o tipo dos campos obrigatórios de um objeto.
+
+    Campos adicionais são aceitos e encaminhados sem alteração.
+
+    Args:
+        data: Objeto decodificado do payload
+        spec: Mapa campo -> tipo(s) aceito(s)
+        path: Caminho do objeto no payload, usado nas mensagens de erro
+
+    Raises:
+        SchemaValidationError: Se o objeto não for um dicionário, faltar um campo
+            ou um campo tiver tipo inválido
+    """
+    if not isinstance(data, dict):
+        raise SchemaValidationError(f"{path or 'payload'}: esperado objeto, recebido {type(data).__name__}")
+    for name, expected in spec.items():
+        if name not in data:
+            raise SchemaValidationError(f"{path}{name}: campo obrigatório ausente")
+        if not isinstance(data[name], expected):
+            raise SchemaValidationError(f"{path}{name}: tipo inválido ({type(data[name]).__name__})")
+
+def check_optional_fields(data: Mapping[str, Any], spec: FieldSpec, path: str = '') -> None:
+    """
+    Verifica o tipo dos campos opcionais presentes em um objeto já validado.
+
+    Args:
+        data: Objeto decodificado do payload
+        spec: Mapa campo -> tipo(s) aceito(s)
+        path: Caminho do objeto no payload, usado nas mensagens de erro
+
+    Raises:
+        SchemaValidationError: Se um campo presente tiver tipo inválido
+    """
+    for name, expected in spec.items():
+        if name in data and not isinstance(data[name], expected):
+            raise SchemaValidationError(f"{path}{name}: tipo inválido ({type(data[name]).__name__})")
+
+@dataclass(frozen=True)
+class PassthroughEvent:
+    """
+    Evento encaminhado com os bytes originais do payload.
+
+    Mantém apenas os campos de identidade do asset, necessários para a chave
+    de particionamento, e os demais campos usados nos cabeçalhos de roteamento.
+    """
+    payload: bytes
+    technology_service_name: str
+    instance_technology_name: str
+    asset_parent_name: str
+    asset_name: str
+    aws_account_number: str
+    asset_type: Optional[str] = None
+    hash_value: Optional[str] = None
+
+    @classmethod
+    def from_payload(cls, payload: bytes, data: Mapping[str, Any]) -> 'PassthroughEvent':
+        """
+        Cria o evento a partir do payload original e do seu conteúdo já validado.
+
+        Args:
+            payload: Bytes originais do payload
+            data: Payload decodificado
+
+        Returns:
+            Evento de passthrough
+        """
+        return cls(payload, *(data[name] for name in IDENTITY_FIELDS), data.get('asset_type'), data.get('hash_value'))
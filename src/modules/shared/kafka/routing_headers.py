@@ -0,0 +1,83 @@
+"""
+Metadados de roteamento nos cabeçalhos das mensagens Kafka.
+
+Consumidores que filtram ou roteiam eventos por tecnologia, conta ou tipo de
+asset leem os cabeçalhos do record em vez de decodificar o JSON do corpo. Os
+cabeçalhos publicados são configuráveis (KAFKA_HEADER_FIELDS); os valores são
+texto UTF-8 e campos ausentes no evento não geram cabeçalho.
+"""
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+import os
+
+# Cabeçalhos preenchidos pelo produtor, e não por campos do evento
+EVENT_TYPE_HEADER = 'event_type'
+SCHEMA_VERSION_HEADER = 'schema_version'
+
+# Cabeçalhos publicados por padrão
+DEFAULT_HEADER_FIELDS = (
+    'technology_service_name',
+    'aws_account_number',
+    'asset_type',
+    EVENT_TYPE_HEADER,
+    SCHEMA_VERSION_HEADER,
+    'hash_value'
+)
+
+def header_fields(env: Optional[Mapping[str, str]] = None) -> Tuple[str, ...]:
+    """
+    Cabeçalhos de roteamento configurados (KAFKA_HEADER_FIELDS).
+
+    A variável é uma lista separada por vírgulas; 'none' desabilita os
+    cabeçalhos de roteamento e a ausência da variável usa DEFAULT_HEADER_FIELDS.
+
+    Args:
+        env: Variáveis de ambiente (opcional, padrão os.environ)
+
+    Returns:
+        Nomes dos cabeçalhos, na ordem configurada
+    """
+    env = os.environ if env is None else env
+    value = env.get('KAFKA_HEADER_FIELDS')
+    if value is None or not value.strip():
+        return DEFAULT_HEADER_FIELDS
+    if value.strip().lower() == 'none':
+        return ()
+    return tuple(name.strip() for name in value.split(',') if name.strip())
+
+class RoutingHeaders:
+    """Monta os cabeçalhos de roteamento de cada evento publicado por um produtor."""
+
+    def __init__(self, event_type: str, schema_version: str, fields: Sequence[str] = DEFAULT_HEADER_FIELDS):
+        """
+        Inicializa o montador.
+
+        Args:
+            event_type: Tipo dos eventos do produtor (ex: 'upsert')
+            schema_version: Versão do esquema do corpo das mensagens
+            fields: Cabeçalhos a publicar: campos do evento, event_type ou schema_version
+        """
+        # Valores fixos do produtor codificados uma única vez
+        constants = {
+            EVENT_TYPE_HEADER: event_type.encode('utf-8'),
+            SCHEMA_VERSION_HEADER: schema_version.encode('utf-8')
+        }
+        self.fixed = [(name, constants[name]) for name in fields if name in constants]
+        self.fields = tuple(name for name in fields if name not in constants)
+
+    def __call__(self, event: Any) -> List[Tuple[str, bytes]]:
+        """
+        Cabeçalhos de roteamento do evento.
+
+        Args:
+            event: Evento (entidade ou passthrough) com os campos configurados como atributos
+
+        Returns:
+            Pares (nome, valor em UTF-8)
+        """
+        headers = []
+        for name in self.fields:
+            value = getattr(event, name, None)
+            if value is not None:
+                headers.append((name, str(value).encode('utf-8')))
+        headers.extend(self.fixed)
+        return headers
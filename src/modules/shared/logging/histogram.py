@@ -0,0 +1,92 @@
+"""
+Histograma de latência com buckets fixos.
+"""
+from bisect import bisect_left
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+from aws_lambda_powertools import Logger
+
+from .logger import log_metric
+
+# Limites superiores dos buckets em milissegundos (o último bucket é aberto)
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class LatencyHistogram:
+    """
+    Histograma de latências em milissegundos, seguro para uso entre threads.
+
+    Mantém apenas a contagem por bucket, a soma e o máximo: o custo por
+    observação é constante e não depende do número de amostras.
+    """
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """
+        Inicializa o histograma.
+
+        Args:
+            buckets_ms: Limites superiores dos buckets, em ordem crescente
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts: List[int] = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float) -> None:
+        """
+        Registra uma observação.
+
+        Args:
+            elapsed_ms: Latência em milissegundos
+        """
+        with self._lock:
+            self.counts[bisect_left(self.buckets_ms, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """
+        Estima um percentil pelo limite superior do bucket que o contém.
+
+        Args:
+            quantile: Quantil entre 0 e 1 (ex: 0.99)
+
+        Returns:
+            Latência estimada em milissegundos, ou None sem observações
+        """
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.buckets_ms[index] if index < len(self.buckets_ms) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumo serializável: buckets, contagem, média, p50, p99 e máximo."""
+        buckets = {f"le_{bound}": count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets['le_inf'] = self.counts[-1]
+        return {
+            'buckets': buckets,
+            'count': self.count,
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 2)
+        }
+
+def log_histogram(logger: Logger, name: str, histogram: LatencyHistogram) -> None:
+    """
+    Loga o resumo de um histograma como métrica.
+
+    Args:
+        logger: Logger do Powertools
+        name: Nome da métrica
+        histogram: Histograma a registrar
+    """
+    if histogram.count:
+        log_metric(logger, name, histogram.to_dict(), "Milliseconds")
@@ -2,9 +2,136 @@
 Configuração e utilitários de logging.
 """
 from typing import Dict, Any, Optional
+from dataclasses import dataclass
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.logging import correlation_paths
 import json
+import logging
+import os
+import random
+
+TRUNCATION_MARKER = "...<truncated>"
+
+# Encoder dos eventos logados (valores não serializáveis viram texto)
+_LOG_ENCODER = json.JSONEncoder(default=str)
+
+@dataclass(frozen=True)
+class EventLogPolicy:
+    """
+    Política de log de eventos recebidos.
+
+    Attributes:
+        sample_rate: Fração dos eventos que são logados (0.0 a 1.0)
+        max_bytes: Tamanho máximo do conteúdo logado, em bytes UTF-8; o excedente é truncado
+        include_bodies: Se False, lotes com Records são logados apenas como resumo
+    """
+    sample_rate: float = 1.0
+    max_bytes: int = 4096
+    include_bodies: bool = False
+
+    @classmethod
+    def from_env(cls) -> 'EventLogPolicy':
+        """
+        Cria a política a partir das variáveis de ambiente
+        EVENT_LOG_SAMPLE_RATE, EVENT_LOG_MAX_BYTES e EVENT_LOG_INCLUDE_BODIES.
+        """
+        return cls(
+            sample_rate=float(os.getenv('EVENT_LOG_SAMPLE_RATE', cls.sample_rate)),
+            max_bytes=int(os.getenv('EVENT_LOG_MAX_BYTES', cls.max_bytes)),
+            include_bodies=os.getenv('EVENT_LOG_INCLUDE_BODIES', 'false').lower() == 'true'
+        )
+
+_event_log_policy: Optional[EventLogPolicy] = None
+
+def get_event_log_policy() -> EventLogPolicy:
+    """Retorna a política de log de eventos do processo (lida do ambiente na primeira chamada)."""
+    global _event_log_policy
+    if _event_log_policy is None:
+        _event_log_policy = EventLogPolicy.from_env()
+    return _event_log_policy
+
+def set_event_log_policy(policy: Optional[EventLogPolicy]) -> None:
+    """Define a política de log de eventos (None volta a ler do ambiente)."""
+    global _event_log_policy
+    _event_log_policy = policy
+
+def _truncate(text: str, max_bytes: int) -> str:
+    """Trunca um texto para no máximo max_bytes bytes UTF-8, marcando o corte."""
+    data = text.encode('utf-8')
+    if len(data) <= max_bytes:
+        return text
+    # Um caractere multibyte cortado ao meio é descartado
+    return data[:max_bytes].decode('utf-8', 'ignore') + TRUNCATION_MARKER
+
+def _dumps_limited(value: Any, max_bytes: int) -> str:
+    """
+    Serializa um valor em JSON incrementalmente, parando logo após exceder max_bytes.
+
+    Args:
+        value: Valor a serializar
+        max_bytes: Tamanho máximo, em bytes UTF-8, de interesse
+
+    Returns:
+        JSON completo, ou um prefixo com mais de max_bytes bytes (a truncar)
+    """
+    chunks = []
+    size = 0
+    for chunk in _LOG_ENCODER.iterencode(value):
+        chunks.append(chunk)
+        size += len(chunk.encode('utf-8'))
+        if size > max_bytes:
+            break
+    return ''.join(chunks)
+
+def summarize_event(event: Any, policy: Optional[EventLogPolicy] = None) -> Any:
+    """
+    Monta a representação de um evento para log, respeitando o limite de tamanho.
+
+    Lotes com Records viram um resumo com contagem de registros por origem; com
+    include_bodies, os registros são serializados um a um até atingir max_bytes,
+    sem serializar o lote inteiro. Demais eventos são serializados só até o limite.
+
+    Args:
+        event: Evento recebido
+        policy: Política de log (opcional, usa a do processo)
+
+    Returns:
+        Resumo do evento ou texto truncado
+    """
+    policy = policy or get_event_log_policy()
+
+    records = event.get('Records') if isinstance(event, dict) else None
+    if isinstance(records, list):
+        sources: Dict[str, int] = {}
+        for record in records:
+            if isinstance(record, dict):
+                source = record.get('eventSource') or record.get('EventSource') or 'unknown'
+            else:
+                source = 'unknown'
+            sources[source] = sources.get(source, 0) + 1
+        summary: Dict[str, Any] = {"records_count": len(records), "event_sources": sources}
+
+        if policy.include_bodies:
+            parts = []
+            remaining = policy.max_bytes
+            for record in records:
+                if remaining <= 0:
+                    break
+                try:
+                    text = _dumps_limited(record, remaining)
+                except Exception:
+                    text = str(record)
+                parts.append(_truncate(text, remaining))
+                remaining -= len(text.encode('utf-8'))
+            summary["records"] = parts
+            summary["records_logged"] = len(parts)
+        return summary
+
+    try:
+        text = _dumps_limited(event, policy.max_bytes)
+    except Exception:
+        text = str(event)
+    return _truncate(text, policy.max_bytes)
 
 def setup_logger(service: str, level: str = "INFO") -> Logger:
     """
@@ -23,26 +150,36 @@ def setup_logger(service: str, level: str = "INFO") -> Logger:
         correlation_id_path=correlation_paths.API_GATEWAY_REST
     )
 
-def log_event(logger: Logger, event: Dict[str, Any], level: str = "INFO") -> None:
+def log_event(
+    logger: Logger,
+    event: Dict[str, Any],
+    level: str = "INFO",
+    policy: Optional[EventLogPolicy] = None
+) -> None:
     """
     Loga um evento com formatação adequada.
     
+    A serialização só acontece quando o nível está habilitado e o evento foi
+    amostrado; o conteúdo segue a política de log (resumo/truncamento).
+    
     Args:
         logger: Logger do Powertools
         event: Evento a ser logado
         level: Nível do log (default: INFO)
+        policy: Política de log (opcional, usa a do processo)
     """
-    try:
-        # Tenta formatar o evento como JSON
-        event_str = json.dumps(event, indent=2)
-    except:
-        event_str = str(event)
+    if not logger.isEnabledFor(logging.getLevelName(level.upper())):
+        return
+    
+    policy = policy or get_event_log_policy()
+    if policy.sample_rate < 1.0 and random.random() >= policy.sample_rate:
+        return
     
     log_method = getattr(logger, level.lower())
     log_method(
         "Evento recebido",
         extra={
-            "event": event_str
+            "event": summarize_event(event, policy)
         }
     )
 
@@ -1,111 +1,235 @@
 """
 Roteador de eventos para diferentes handlers.
 """
-from typing import Dict, Any, Callable, Optional, List
+from typing import Dict, Any, Callable, Optional, List, Tuple
 from datetime import datetime
+import asyncio
 from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.typing import LambdaContext
-from ddtrace import tracer
 
 from ..events.interfaces import EventType, EventMetadata, EventValidator
-from ..logging.logger import log_event
-from ..tracing.datadog_config import datadog_trace, add_trace_context
+from ..logging.logger import log_event, summarize_event
+from ..tracing.datadog_config import datadog_trace, add_trace_context, active_span, traced_span
 
 logger = Logger()
 
+# Tabela de despacho por eventSource dos registros
+EVENT_SOURCE_TYPES: Dict[str, EventType] = {
+    'aws:kinesis': EventType.KINESIS,
+    'aws:sqs': EventType.SQS,
+    'aws:dynamodb': EventType.DYNAMODB,
+    'aws:s3': EventType.S3,
+    'aws:sns': EventType.SNS
+}
+
+# Prefixos de ARN usados quando o registro não informa eventSource
+ARN_PREFIX_TYPES: Tuple[Tuple[str, EventType], ...] = (
+    ('arn:aws:kinesis:', EventType.KINESIS),
+    ('arn:aws:sqs:', EventType.SQS),
+    ('arn:aws:dynamodb:', EventType.DYNAMODB),
+    ('arn:aws:s3:', EventType.S3),
+    ('arn:aws:sns:', EventType.SNS)
+)
+
+# Limite de ARNs memorizados (uma função costuma ter poucas origens)
+MAX_CACHED_ARNS = 1024
+
 class EventValidationError(Exception):
     """Erro de validação de evento."""
-    pass
+
+    def __init__(self, message: str, invalid_indices: Optional[List[int]] = None):
+        super().__init__(message)
+        self.invalid_indices = invalid_indices or []
 
 class HandlerNotFoundError(Exception):
     """Erro de handler não encontrado."""
     pass
 
 class EventRouter:
-    """Roteador de eventos para diferentes handlers."""
-    
-    def __init__(self):
+    """
+    Roteador de eventos para diferentes handlers.
+
+    Por padrão os handlers de um mesmo tipo são executados em sequência e a
+    primeira falha interrompe o roteamento. No modo fan-out eles são executados
+    concorrentemente e falhas ou timeouts de um handler viram um resultado de
+    erro, sem afetar os demais.
+
+    Validadores de lote (com validate_batch) verificam todos os registros; com
+    drop_invalid_records os registros inválidos são descartados e reportados
+    em vez de rejeitar o lote inteiro. Registros de origem não reconhecida (ou
+    que nem são objetos) entram no mesmo conjunto de inválidos; os índices
+    reportados são sempre relativos ao lote original.
+    """
+
+    def __init__(
+        self,
+        fan_out: bool = False,
+        handler_timeout: Optional[float] = None,
+        drop_invalid_records: bool = False
+    ):
+        """
+        Inicializa o roteador.
+
+        Args:
+            fan_out: Executa os handlers de um tipo concorrentemente, isolando falhas
+            handler_timeout: Timeout padrão em segundos por handler (opcional)
+            drop_invalid_records: Descarta registros inválidos em vez de rejeitar o lote
+        """
         self._routes: Dict[EventType, List[Callable]] = {}
         self._validators: Dict[EventType, List[EventValidator]] = {}
-    
+        self._timeouts: Dict[EventType, List[Optional[float]]] = {}
+        self._arn_cache: Dict[str, EventType] = {}
+        self._fan_out = fan_out
+        self._handler_timeout = handler_timeout
+        self._drop_invalid_records = drop_invalid_records
+
     @datadog_trace(service="event_router", name="register_handler")
-    def register(self, event_type: EventType, handler: Callable, validator: Optional[EventValidator] = None) -> None:
+    def register(
+        self,
+        event_type: EventType,
+        handler: Callable,
+        validator: Optional[EventValidator] = None,
+        timeout: Optional[float] = None
+    ) -> None:
         """
         Registra um handler para um tipo de evento.
-        
+
         Args:
             event_type: Tipo do evento
             handler: Função handler para processar o evento
             validator: Validador opcional para o evento
+            timeout: Timeout em segundos do handler (opcional, sobrescreve o padrão do roteador)
         """
         if event_type not in self._routes:
             self._routes[event_type] = []
             self._validators[event_type] = []
-            
+            self._timeouts[event_type] = []
+
         self._routes[event_type].append(handler)
+        self._timeouts[event_type].append(timeout if timeout is not None else self._handler_timeout)
         if validator:
             self._validators[event_type].append(validator)
-            
-        with tracer.current_span() as span:
+
+        with active_span() as span:
             add_trace_context(span, {
                 "event_type": event_type.value,
                 "handler_name": handler.__name__,
                 "has_validator": validator is not None
             })
-            
+
         logger.info("Handler registrado", extra={
             "event_type": event_type.value,
             "handler": handler.__name__,
             "has_validator": validator is not None
         })
-    
-    @datadog_trace(service="event_router", name="detect_event_type")
+
+    def _detect_record_type(self, record: Dict[str, Any]) -> Optional[EventType]:
+        """
+        Detecta o tipo de um registro pela tabela de despacho.
+
+        A decisão é memorizada por eventSourceARN, de modo que registros da
+        mesma origem são classificados com uma única consulta ao dicionário.
+
+        Args:
+            record: Registro do evento
+
+        Returns:
+            Tipo do registro ou None
+        """
+        if not isinstance(record, dict):
+            return None
+        arn = record.get('eventSourceARN')
+        if arn is not None:
+            cached = self._arn_cache.get(arn)
+            if cached is not None:
+                return cached
+
+        if 'kinesis' in record:
+            detected_type = EventType.KINESIS
+        else:
+            detected_type = EVENT_SOURCE_TYPES.get(record.get('eventSource') or record.get('EventSource'))
+            if detected_type is None and arn is not None:
+                for prefix, event_type in ARN_PREFIX_TYPES:
+                    if arn.startswith(prefix):
+                        detected_type = event_type
+                        break
+
+        if arn is not None and detected_type is not None and len(self._arn_cache) < MAX_CACHED_ARNS:
+            self._arn_cache[arn] = detected_type
+
+        return detected_type
+
     def _detect_event_type(self, event: Dict[str, Any]) -> Optional[EventType]:
         """
         Detecta o tipo do evento baseado em sua estrutura.
-        
+
         Args:
             event: Evento a ser analisado
-            
+
         Returns:
             Tipo do evento detectado ou None
         """
-        detected_type = None
-        
         if 'Records' in event:
-            record = event['Records'][0]
-            if 'kinesis' in record:
-                detected_type = EventType.KINESIS
-            elif 'eventSource' in record:
-                if record['eventSource'] == 'aws:sqs':
-                    detected_type = EventType.SQS
-                elif record['eventSource'] == 'aws:dynamodb':
-                    detected_type = EventType.DYNAMODB
-                elif record['eventSource'] == 'aws:s3':
-                    detected_type = EventType.S3
-                elif record['eventSource'] == 'aws:sns':
-                    detected_type = EventType.SNS
-        elif 'detail-type' in event and 'source' in event:
-            detected_type = EventType.CLOUDWATCH
-        elif 'requestContext' in event and 'httpMethod' in event:
-            detected_type = EventType.API_GATEWAY
-            
-        with tracer.current_span() as span:
-            add_trace_context(span, {
-                "detected_event_type": detected_type.value if detected_type else "unknown"
-            })
-            
-        return detected_type
-    
-    @datadog_trace(service="event_router", name="extract_metadata")
+            records = event['Records']
+            return self._detect_record_type(records[0]) if records else None
+        if 'detail-type' in event and 'source' in event:
+            return EventType.CLOUDWATCH
+        if 'requestContext' in event and 'httpMethod' in event:
+            return EventType.API_GATEWAY
+        return None
+
+    def _split_records(self, records: List[Any]) -> Tuple[Dict[EventType, List[int]], List[int]]:
+        """
+        Separa um lote de registros em sub-lotes por tipo, preservando a ordem.
+
+        Args:
+            records: Registros do evento
+
+        Returns:
+            Dicionário tipo -> índices dos registros no lote, na ordem da primeira
+            ocorrência, e os índices dos registros de tipo não reconhecido
+        """
+        batches: Dict[EventType, List[int]] = {}
+        unrecognized: List[int] = []
+        for index, record in enumerate(records):
+            record_type = self._detect_record_type(record)
+            if record_type is None:
+                unrecognized.append(index)
+                continue
+            batch = batches.get(record_type)
+            if batch is None:
+                batch = batches[record_type] = []
+            batch.append(index)
+        return batches, unrecognized
+
+    def _reject_unrecognized(self, unrecognized: List[int], total: int) -> None:
+        """
+        Trata os registros de tipo não reconhecido como inválidos.
+
+        Com drop_invalid_records eles são descartados e reportados; caso
+        contrário, ou se nenhum registro do lote for reconhecido, o lote é rejeitado.
+
+        Raises:
+            EventValidationError: Se o lote for rejeitado
+        """
+        if not self._drop_invalid_records or len(unrecognized) == total:
+            raise EventValidationError(
+                f"Tipo de evento não reconhecido em {len(unrecognized)} de {total} registros",
+                unrecognized
+            )
+        logger.warning("Registros de tipo não reconhecido descartados", extra={
+            "invalid_indices": unrecognized,
+            "records_count": total
+        })
+
     def _extract_metadata(self, event: Dict[str, Any], event_type: EventType) -> EventMetadata:
         """
         Extrai metadados do evento.
-        
+
         Args:
             event: Evento
             event_type: Tipo do evento
-            
+
         Returns:
             Metadados do evento
         """
@@ -120,113 +244,243 @@ class EventRouter:
             source = event['source']
         elif 'requestContext' in event:
             source = 'api_gateway'
-            
-        metadata = EventMetadata(
+
+        return EventMetadata(
             event_type=event_type,
             source=source,
             timestamp=datetime.utcnow().isoformat(),
             version='1.0'
         )
-        
-        with tracer.current_span() as span:
-            add_trace_context(span, metadata.__dict__)
-            
-        return metadata
-    
-    @datadog_trace(service="event_router", name="validate_event")
-    def _validate_event(self, event: Dict[str, Any], event_type: EventType) -> None:
+
+    def _validate_event(
+        self,
+        event: Dict[str, Any],
+        event_type: EventType,
+        positions: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
         """
         Valida um evento usando os validadores registrados.
-        
+
         Args:
             event: Evento a ser validado
             event_type: Tipo do evento
-            
+            positions: Índice no lote original de cada registro do evento (opcional,
+                padrão a própria posição); usado para reportar os registros inválidos
+
+        Returns:
+            Evento validado (sem os registros inválidos, se o descarte estiver habilitado)
+
         Raises:
             EventValidationError: Se a validação falhar
         """
-        if event_type not in self._validators:
-            return
-            
-        with tracer.current_span() as span:
-            span.set_tag("validation_count", len(self._validators[event_type]))
-            
-        for validator in self._validators[event_type]:
-            if not validator.validate(event):
-                with tracer.current_span() as span:
-                    span.set_tag("validation_error", True)
-                    span.set_tag("validator_class", validator.__class__.__name__)
-                raise EventValidationError(f"Validação falhou para evento do tipo {event_type.value}")
-    
+        for validator in self._validators.get(event_type, ()):
+            validate_batch = getattr(validator, 'validate_batch', None)
+            if validate_batch is None:
+                if not validator.validate(event):
+                    raise EventValidationError(
+                        f"Validação falhou para evento do tipo {event_type.value} "
+                        f"({validator.__class__.__name__})"
+                    )
+                continue
+
+            result = validate_batch(event)
+            if result.is_valid:
+                continue
+
+            name = validator.__class__.__name__
+            invalid_indices = (
+                [positions[index] for index in result.invalid_indices] if positions is not None
+                else result.invalid_indices
+            )
+            if result.error is not None or not self._drop_invalid_records or result.valid_count == 0:
+                raise EventValidationError(
+                    f"Validação falhou para evento do tipo {event_type.value} ({name}): "
+                    f"{result.error or f'{len(result.invalid_indices)} de {result.total} registros inválidos'}",
+                    invalid_indices
+                )
+
+            logger.warning("Registros inválidos descartados", extra={
+                "event_type": event_type.value,
+                "validator": name,
+                "invalid_indices": invalid_indices,
+                "records_count": result.total
+            })
+            invalid = set(result.invalid_indices)
+            event = {
+                **event,
+                'Records': [record for index, record in enumerate(event['Records']) if index not in invalid]
+            }
+            if positions is not None:
+                positions = [position for index, position in enumerate(positions) if index not in invalid]
+
+        return event
+
+    async def _dispatch(
+        self,
+        event: Dict[str, Any],
+        event_type: EventType,
+        context: LambdaContext,
+        positions: Optional[List[int]] = None
+    ) -> List[Any]:
+        """
+        Valida e entrega um evento (ou sub-lote) aos handlers do seu tipo.
+
+        Args:
+            event: Evento contendo apenas registros do tipo informado
+            event_type: Tipo do evento
+            context: Contexto da execução Lambda
+            positions: Índice no lote original de cada registro do sub-lote (opcional)
+
+        Returns:
+            Lista com resultados dos handlers
+        """
+        handlers = self._routes.get(event_type)
+        if not handlers:
+            raise HandlerNotFoundError(f"Nenhum handler registrado para o tipo {event_type.value}")
+
+        event = self._validate_event(event, event_type, positions)
+        metadata = self._extract_metadata(event, event_type)
+
+        logger.info("Roteando evento", extra={
+            "event_type": event_type.value,
+            "handlers_count": len(handlers),
+            "records_count": len(event.get('Records', ())),
+            "metadata": metadata.__dict__
+        })
+
+        timeouts = self._timeouts[event_type]
+
+        if self._fan_out and len(handlers) > 1:
+            # gather preserva a ordem de registro nos resultados
+            return list(await asyncio.gather(*[
+                self._run_isolated(handler, timeout, event, context, metadata)
+                for handler, timeout in zip(handlers, timeouts)
+            ]))
+
+        results = []
+        for handler, timeout in zip(handlers, timeouts):
+            if self._fan_out:
+                results.append(await self._run_isolated(handler, timeout, event, context, metadata))
+            else:
+                results.append(await self._run_handler(handler, timeout, event, context, metadata))
+
+        return results
+
+    async def _run_handler(
+        self,
+        handler: Callable,
+        timeout: Optional[float],
+        event: Dict[str, Any],
+        context: LambdaContext,
+        metadata: EventMetadata
+    ) -> Any:
+        """
+        Executa um handler dentro do seu span, aplicando o timeout configurado.
+
+        Raises:
+            asyncio.TimeoutError: Se o handler exceder o timeout
+        """
+        with traced_span(f"handler.{handler.__name__}") as span:
+            add_trace_context(span, {
+                "handler_name": handler.__name__,
+                "event_type": metadata.event_type.value
+            })
+            if timeout is None:
+                return await handler(event, context, metadata)
+            return await asyncio.wait_for(handler(event, context, metadata), timeout)
+
+    async def _run_isolated(
+        self,
+        handler: Callable,
+        timeout: Optional[float],
+        event: Dict[str, Any],
+        context: LambdaContext,
+        metadata: EventMetadata
+    ) -> Any:
+        """
+        Executa um handler no modo fan-out, convertendo falhas em resultado de erro.
+
+        Returns:
+            Resultado do handler ou dicionário descrevendo a falha
+        """
+        try:
+            return await self._run_handler(handler, timeout, event, context, metadata)
+        except Exception as e:
+            error_type = "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+            logger.warning("Falha isolada em handler", extra={
+                "handler": handler.__name__,
+                "event_type": metadata.event_type.value,
+                "error_type": error_type,
+                "error": str(e)
+            })
+            return {
+                "handler": handler.__name__,
+                "error": str(e) or error_type,
+                "error_type": error_type
+            }
+
     @datadog_trace(service="event_router", name="route_event")
     async def route(self, event: Dict[str, Any], context: LambdaContext) -> List[Dict[str, Any]]:
         """
         Roteia um evento para os handlers apropriados.
-        
+
+        Lotes com registros de origens diferentes são separados em sub-lotes por
+        tipo, despachados concorrentemente; os resultados seguem a ordem de
+        primeira ocorrência de cada tipo no lote.
+
         Args:
             event: Evento a ser roteado
             context: Contexto da execução Lambda
-            
+
         Returns:
             Lista com resultados do processamento
-            
+
         Raises:
-            ValueError: Se o tipo do evento não for reconhecido
+            ValueError: Se o tipo de um evento sem registros não for reconhecido
             HandlerNotFoundError: Se não houver handler registrado
-            EventValidationError: Se a validação do evento falhar
+            EventValidationError: Se a validação do evento falhar (inclusive registros de
+                tipo não reconhecido, quando não descartados)
         """
         try:
-            event_type = self._detect_event_type(event)
-            if not event_type:
-                with tracer.current_span() as span:
-                    span.set_tag("error", "unknown_event_type")
-                raise ValueError("Tipo de evento não reconhecido")
-                
-            metadata = self._extract_metadata(event, event_type)
             log_event(logger, event)
-            
-            self._validate_event(event, event_type)
-            
-            handlers = self._routes.get(event_type, [])
-            if not handlers:
-                with tracer.current_span() as span:
-                    span.set_tag("error", "no_handlers_found")
-                raise HandlerNotFoundError(f"Nenhum handler registrado para o tipo {event_type.value}")
-            
-            with tracer.current_span() as span:
+
+            records = event.get('Records') if isinstance(event, dict) else None
+            if records:
+                batches, unrecognized = self._split_records(records)
+                if unrecognized:
+                    self._reject_unrecognized(unrecognized, len(records))
+            else:
+                event_type = self._detect_event_type(event)
+                if not event_type:
+                    raise ValueError("Tipo de evento não reconhecido")
+                batches = {event_type: None}
+                unrecognized = []
+
+            with active_span() as span:
                 add_trace_context(span, {
-                    "event_type": event_type.value,
-                    "handlers_count": len(handlers),
-                    "metadata": metadata.__dict__
+                    "event_types": lambda: ",".join(t.value for t in batches),
+                    "records_count": len(records) if records else 0
                 })
-            
-            logger.info("Roteando evento", extra={
-                "event_type": event_type.value,
-                "handlers_count": len(handlers),
-                "metadata": metadata.__dict__
-            })
-            
-            results = []
-            for handler in handlers:
-                with tracer.trace(f"handler.{handler.__name__}") as span:
-                    add_trace_context(span, {
-                        "handler_name": handler.__name__,
-                        "event_type": event_type.value
-                    })
-                    result = await handler(event, context, metadata)
-                    results.append(result)
-            
-            return results
-            
+
+            if len(batches) == 1 and not unrecognized:
+                event_type = next(iter(batches))
+                return await self._dispatch(event, event_type, context)
+
+            sub_results = await asyncio.gather(*[
+                self._dispatch({**event, 'Records': [records[index] for index in positions]}, event_type, context, positions)
+                for event_type, positions in batches.items()
+            ])
+            return [result for results in sub_results for result in results]
+
         except Exception as e:
-            with tracer.current_span() as span:
+            with active_span() as span:
                 span.set_tag("error", True)
                 span.set_tag("error_type", type(e).__name__)
                 span.set_tag("error_message", str(e))
-                
+
             logger.error("Erro ao rotear evento", extra={
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "event": event
+                "event": summarize_event(event)
             })
-            raise 
\ No newline at end of file
+            raise
@@ -0,0 +1,184 @@
+"""
+Roteamento de registros SQS pela fila de origem (eventSourceARN).
+"""
+from typing import Dict, Any, Callable, Iterable, Optional, List
+from urllib.parse import urlparse
+import asyncio
+import os
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from .event_router import HandlerNotFoundError
+
+logger = Logger()
+
+def queue_url_to_arn(queue_url: Optional[str]) -> Optional[str]:
+    """
+    Converte a URL de uma fila SQS no ARN correspondente.
+
+    Aceita os formatos https://sqs.<região>.amazonaws.com/<conta>/<fila> e
+    https://<região>.queue.amazonaws.com/<conta>/<fila>. Para hosts sem região
+    (ex: endpoints locais) usa AWS_REGION/AWS_DEFAULT_REGION.
+
+    Args:
+        queue_url: URL da fila
+
+    Returns:
+        ARN da fila ou None se a URL for inválida
+    """
+    if not queue_url:
+        return None
+
+    parsed = urlparse(queue_url)
+    path = parsed.path.strip('/').split('/')
+    if len(path) != 2:
+        return None
+    account, name = path
+
+    host = (parsed.hostname or '').split('.')
+    if len(host) > 2 and host[0] == 'sqs':
+        region = host[1]
+    elif len(host) > 2 and host[1] == 'queue':
+        region = host[0]
+    else:
+        region = os.getenv('AWS_REGION') or os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+    partition = 'aws-cn' if (parsed.hostname or '').endswith('.com.cn') else 'aws'
+    return f"arn:{partition}:sqs:{region}:{account}:{name}"
+
+def event_source_mode_enabled() -> bool:
+    """
+    Indica se os registros SQS do trigger são processados diretamente.
+
+    Com SQS_PROCESSING_MODE=event_source os handlers processam os registros
+    entregues pela Lambda e devolvem batchItemFailures (o event source mapping
+    precisa de ReportBatchItemFailures); com 'poll' (padrão) consultam a fila.
+    """
+    return os.getenv('SQS_PROCESSING_MODE', 'poll').lower() == 'event_source'
+
+def batch_item_failures(message_ids: Iterable[str]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Monta a resposta parcial de lote esperada pelo event source mapping.
+
+    Args:
+        message_ids: messageIds dos registros que devem voltar para a fila
+
+    Returns:
+        Dicionário {'batchItemFailures': [{'itemIdentifier': <messageId>}, ...]}
+    """
+    return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in dict.fromkeys(message_ids)]}
+
+def merge_batch_item_failures(results: Any) -> Optional[Dict[str, List[Dict[str, str]]]]:
+    """
+    Une os batchItemFailures dos resultados de sub-lotes.
+
+    Percorre listas aninhadas (resultados do EventRouter e do SQSSourceRouter)
+    e junta as falhas de todos os handlers, sem repetições.
+
+    Args:
+        results: Resultado (ou lista de resultados) dos handlers
+
+    Returns:
+        Resposta parcial de lote, ou None se nenhum resultado a informar
+    """
+    found = False
+    failures: List[str] = []
+    pending = [results]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            pending.extend(reversed(item))
+        elif isinstance(item, dict) and 'batchItemFailures' in item:
+            found = True
+            failures.extend(failure['itemIdentifier'] for failure in item['batchItemFailures'])
+    return batch_item_failures(failures) if found else None
+
+class SQSSourceRouter:
+    """
+    Encaminha registros SQS ao handler da fila de origem.
+
+    Cada registro é classificado pelo seu eventSourceARN em uma única passada,
+    sem serializar o corpo das mensagens. Lotes com registros de filas
+    diferentes são divididos por handler e despachados concorrentemente.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, Callable] = {}
+
+    def register(self, queue_arn: str, handler: Callable) -> None:
+        """
+        Registra o handler de uma fila.
+
+        Args:
+            queue_arn: ARN da fila SQS
+            handler: Handler Lambda (event, context) dos registros da fila
+        """
+        self._handlers[queue_arn] = handler
+        logger.info("Fila SQS registrada", extra={
+            "queue_arn": queue_arn,
+            "handler": getattr(handler, '__name__', type(handler).__name__)
+        })
+
+    def register_queue(self, env_prefix: str, handler: Callable) -> bool:
+        """
+        Registra o handler da fila configurada nas variáveis de ambiente.
+
+        Usa <prefixo>_ARN quando definido; caso contrário deriva o ARN de <prefixo>_URL.
+
+        Args:
+            env_prefix: Prefixo das variáveis (ex: 'UPSERT_QUEUE')
+            handler: Handler Lambda dos registros da fila
+
+        Returns:
+            True se a fila estava configurada e foi registrada
+        """
+        queue_arn = os.getenv(f"{env_prefix}_ARN") or queue_url_to_arn(os.getenv(f"{env_prefix}_URL"))
+        if not queue_arn:
+            return False
+        self.register(queue_arn, handler)
+        return True
+
+    def _split_by_handler(self, records: List[Dict[str, Any]]) -> Dict[Callable, List[Dict[str, Any]]]:
+        """
+        Agrupa os registros pelo handler da fila de origem, preservando a ordem.
+
+        Raises:
+            HandlerNotFoundError: Se algum registro vier de uma fila não registrada
+        """
+        batches: Dict[Callable, List[Dict[str, Any]]] = {}
+        for record in records:
+            queue_arn = record.get('eventSourceARN')
+            handler = self._handlers.get(queue_arn)
+            if handler is None:
+                raise HandlerNotFoundError(f"Nenhum handler registrado para a fila {queue_arn}")
+            batch = batches.get(handler)
+            if batch is None:
+                batch = batches[handler] = []
+            batch.append(record)
+        return batches
+
+    async def route(self, event: Dict[str, Any], context: LambdaContext, metadata: Any = None) -> List[Any]:
+        """
+        Roteia um evento SQS para os handlers das filas de origem.
+
+        Args:
+            event: Evento SQS
+            context: Contexto da execução Lambda
+            metadata: Metadados do evento (repassados pelo EventRouter, não utilizados)
+
+        Returns:
+            Lista com o resultado de cada handler, na ordem da primeira ocorrência
+
+        Raises:
+            HandlerNotFoundError: Se algum registro vier de uma fila não registrada
+        """
+        batches = self._split_by_handler(event.get('Records', []))
+
+        if len(batches) == 1:
+            handler = next(iter(batches))
+            return [await handler(event, context)]
+
+        return list(await asyncio.gather(*[
+            handler({**event, 'Records': records}, context)
+            for handler, records in batches.items()
+        ]))
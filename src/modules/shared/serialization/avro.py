@@ -0,0 +1,440 @@
+"""
+Codificação binária no formato Avro, sem dependências externas.
+
+Implementa o subconjunto da especificação Avro usado pelos eventos (null,
+boolean, int, long, float, double, string, bytes, array, map, enum, record e
+union), com o enquadramento do Confluent Schema Registry: um byte mágico 0,
+o id do esquema em 4 bytes big-endian e o corpo Avro. O esquema de cada
+mensagem é resolvido pelo id no registro (ver schema_registry).
+
+Os esquemas são compilados uma vez em funções de escrita e leitura por tipo,
+sem interpretar o esquema a cada mensagem.
+"""
+from dataclasses import MISSING, fields, is_dataclass
+import struct
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from .codegen import _list_item, _unwrap_optional
+from .schema_registry import SchemaRegistry
+
+# Enquadramento do Confluent Schema Registry: byte mágico + id do esquema
+MAGIC_BYTE = 0
+HEADER = struct.Struct('>bI')
+
+Schema = Union[str, Dict[str, Any], List[Any]]
+Writer = Callable[[bytearray, Any], None]
+Reader = Callable[[bytes, int], Tuple[Any, int]]
+
+_FLOAT = struct.Struct('<f')
+_DOUBLE = struct.Struct('<d')
+
+# Tipos Python dos campos de dataclass e o tipo Avro correspondente
+PRIMITIVE_TYPES = {str: 'string', bool: 'boolean', int: 'long', float: 'double', bytes: 'bytes'}
+
+class AvroEncodingError(ValueError):
+    """Valor incompatível com o esquema, ou mensagem binária inválida."""
+    pass
+
+def avro_schema(cls: Type, namespace: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Deriva o esquema Avro (record) de uma dataclass.
+
+    str, bool, int, float e bytes viram tipos primitivos, Optional[X] vira a
+    union ["null", X], List[X] vira array e dataclasses aninhadas viram records
+    (definidos na primeira ocorrência e referenciados pelo nome depois).
+    Campos com valor padrão levam o default no esquema.
+
+    Args:
+        cls: Dataclass
+        namespace: Namespace dos records (opcional)
+
+    Returns:
+        Esquema Avro em forma de dicionário
+
+    Raises:
+        TypeError: Se algum campo tiver tipo sem correspondente Avro
+    """
+    return _record_schema(cls, namespace, set())
+
+def _record_schema(cls: Type, namespace: Optional[str], defined: set) -> Dict[str, Any]:
+    defined.add(cls)
+    hints = typing.get_type_hints(cls)
+    schema: Dict[str, Any] = {'type': 'record', 'name': cls.__name__}
+    if namespace:
+        schema['namespace'] = namespace
+    schema['fields'] = []
+    for field in fields(cls):
+        if not field.metadata.get('encode', True):
+            continue
+        field_schema = {'name': field.name, 'type': _field_schema(hints[field.name], namespace, defined)}
+        # Valores padrão permitem ler mensagens de versões anteriores do esquema
+        if field.default is not MISSING and isinstance(field.default, (str, bool, int, float, type(None))):
+            field_schema['default'] = field.default
+        elif field.default_factory is list:
+            field_schema['default'] = []
+        schema['fields'].append(field_schema)
+    return schema
+
+def _field_schema(tp: Any, namespace: Optional[str], defined: set) -> Schema:
+    inner, optional = _unwrap_optional(tp)
+    if optional:
+        return ['null', _field_schema(inner, namespace, defined)]
+    if tp in PRIMITIVE_TYPES:
+        return PRIMITIVE_TYPES[tp]
+    item = _list_item(tp)
+    if item is not None:
+        return {'type': 'array', 'items': _field_schema(item, namespace, defined)}
+    if is_dataclass(tp):
+        if tp in defined:
+            return f"{namespace}.{tp.__name__}" if namespace else tp.__name__
+        return _record_schema(tp, namespace, defined)
+    raise TypeError(f"Tipo sem correspondente Avro: {tp!r}")
+
+# Escrita ----------------------------------------------------------------------
+
+def _write_long(buffer: bytearray, value: int) -> None:
+    value = (value << 1) ^ (value >> 63)
+    while value & ~0x7F:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _write_null(buffer: bytearray, value: Any) -> None:
+    if value is not None:
+        raise AvroEncodingError(f"esperado null, recebido {type(value).__name__}")
+
+def _write_boolean(buffer: bytearray, value: Any) -> None:
+    if value is not True and value is not False:
+        raise AvroEncodingError(f"esperado boolean, recebido {type(value).__name__}")
+    buffer.append(1 if value else 0)
+
+def _write_int(buffer: bytearray, value: Any) -> None:
+    if value.__class__ is not int:
+        raise AvroEncodingError(f"esperado long, recebido {type(value).__name__}")
+    _write_long(buffer, value)
+
+def _write_float(buffer: bytearray, value: Any) -> None:
+    buffer += _FLOAT.pack(value)
+
+def _write_double(buffer: bytearray, value: Any) -> None:
+    buffer += _DOUBLE.pack(value)
+
+def _write_string(buffer: bytearray, value: Any) -> None:
+    if value.__class__ is not str:
+        raise AvroEncodingError(f"esperado string, recebido {type(value).__name__}")
+    data = value.encode('utf-8')
+    _write_long(buffer, len(data))
+    buffer += data
+
+def _write_bytes(buffer: bytearray, value: Any) -> None:
+    if not isinstance(value, (bytes, bytearray)):
+        raise AvroEncodingError(f"esperado bytes, recebido {type(value).__name__}")
+    _write_long(buffer, len(value))
+    buffer += value
+
+# Leitura ----------------------------------------------------------------------
+
+def _read_long(data: bytes, pos: int) -> Tuple[int, int]:
+    shift = 0
+    result = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return (result >> 1) ^ -(result & 1), pos
+        shift += 7
+
+def _read_null(data: bytes, pos: int) -> Tuple[Any, int]:
+    return None, pos
+
+def _read_boolean(data: bytes, pos: int) -> Tuple[Any, int]:
+    return data[pos] == 1, pos + 1
+
+def _read_float(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _FLOAT.unpack_from(data, pos)[0], pos + 4
+
+def _read_double(data: bytes, pos: int) -> Tuple[Any, int]:
+    return _DOUBLE.unpack_from(data, pos)[0], pos + 8
+
+def _read_string(data: bytes, pos: int) -> Tuple[Any, int]:
+    size, pos = _read_long(data, pos)
+    return data[pos:pos + size].decode('utf-8'), pos + size
+
+def _read_bytes(data: bytes, pos: int) -> Tuple[Any, int]:
+    size, pos = _read_long(data, pos)
+    return bytes(data[pos:pos + size]), pos + size
+
+PRIMITIVES: Dict[str, Tuple[Writer, Reader]] = {
+    'null': (_write_null, _read_null),
+    'boolean': (_write_boolean, _read_boolean),
+    'int': (_write_int, _read_long),
+    'long': (_write_int, _read_long),
+    'float': (_write_float, _read_float),
+    'double': (_write_double, _read_double),
+    'string': (_write_string, _read_string),
+    'bytes': (_write_bytes, _read_bytes)
+}
+
+# Verificação de tipo usada para escolher o ramo de uma union
+BRANCH_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'null': lambda value: value is None,
+    'boolean': lambda value: value is True or value is False,
+    'int': lambda value: value.__class__ is int,
+    'long': lambda value: value.__class__ is int,
+    'float': lambda value: isinstance(value, (int, float)) and value is not True and value is not False,
+    'double': lambda value: isinstance(value, (int, float)) and value is not True and value is not False,
+    'string': lambda value: value.__class__ is str,
+    'bytes': lambda value: isinstance(value, (bytes, bytearray)),
+    'array': lambda value: isinstance(value, (list, tuple)),
+    'map': lambda value: isinstance(value, dict),
+    'record': lambda value: isinstance(value, dict),
+    'enum': lambda value: value.__class__ is str
+}
+
+# Compilação -------------------------------------------------------------------
+
+class _Compiler:
+    """Compila um esquema em funções de escrita e leitura, resolvendo tipos nomeados."""
+
+    def __init__(self):
+        self.named: Dict[str, Tuple[Writer, Reader, str]] = {}
+
+    def compile(self, schema: Schema, namespace: Optional[str] = None) -> Tuple[Writer, Reader, str]:
+        """Retorna (escrita, leitura, tipo) do esquema."""
+        if isinstance(schema, list):
+            return self._union(schema, namespace)
+        if isinstance(schema, str):
+            if schema in PRIMITIVES:
+                return (*PRIMITIVES[schema], schema)
+            name = schema if '.' in schema or not namespace else f"{namespace}.{schema}"
+            if name not in self.named and schema in self.named:
+                name = schema
+            if name not in self.named:
+                raise AvroEncodingError(f"tipo não definido no esquema: {schema}")
+            return self.named[name]
+        kind = schema['type']
+        if kind in PRIMITIVES:
+            return (*PRIMITIVES[kind], kind)
+        if kind == 'array':
+            return self._array(schema, namespace)
+        if kind == 'map':
+            return self._map(schema, namespace)
+        if kind == 'enum':
+            return self._enum(schema, namespace)
+        if kind == 'record':
+            return self._record(schema, namespace)
+        raise AvroEncodingError(f"tipo Avro não suportado: {kind}")
+
+    def _union(self, schema: List[Any], namespace: Optional[str]) -> Tuple[Writer, Reader, str]:
+        branches = [self.compile(branch, namespace) for branch in schema]
+        checks = [(index, BRANCH_CHECKS[kind], write) for index, (write, _, kind) in enumerate(branches)]
+
+        def write(buffer: bytearray, value: Any) -> None:
+            for index, check, write_branch in checks:
+                if check(value):
+                    _write_long(buffer, index)
+                    write_branch(buffer, value)
+                    return
+            raise AvroEncodingError(f"valor {type(value).__name__} não corresponde à union {schema}")
+
+        readers = [read for _, read, _ in branches]
+
+        def read(data: bytes, pos: int) -> Tuple[Any, int]:
+            index, pos = _read_long(data, pos)
+            return readers[index](data, pos)
+
+        return write, read, 'union'
+
+    def _array(self, schema: Dict[str, Any], namespace: Optional[str]) -> Tuple[Writer, Reader, str]:
+        write_item, read_item, _ = self.compile(schema['items'], namespace)
+
+        def write(buffer: bytearray, value: Any) -> None:
+            if value:
+                _write_long(buffer, len(value))
+                for item in value:
+                    write_item(buffer, item)
+            buffer.append(0)
+
+        def read(data: bytes, pos: int) -> Tuple[Any, int]:
+            items = []
+            count, pos = _read_long(data, pos)
+            while count:
+                if count < 0:
+                    # Bloco com tamanho em bytes (permitido pela especificação)
+                    count = -count
+                    _, pos = _read_long(data, pos)
+                for _ in range(count):
+                    item, pos = read_item(data, pos)
+                    items.append(item)
+                count, pos = _read_long(data, pos)
+            return items, pos
+
+        return write, read, 'array'
+
+    def _map(self, schema: Dict[str, Any], namespace: Optional[str]) -> Tuple[Writer, Reader, str]:
+        write_value, read_value, _ = self.compile(schema['values'], namespace)
+
+        def write(buffer: bytearray, value: Any) -> None:
+            if value:
+                _write_long(buffer, len(value))
+                for key, item in value.items():
+                    _write_string(buffer, key)
+                    write_value(buffer, item)
+            buffer.append(0)
+
+        def read(data: bytes, pos: int) -> Tuple[Any, int]:
+            items = {}
+            count, pos = _read_long(data, pos)
+            while count:
+                if count < 0:
+                    count = -count
+                    _, pos = _read_long(data, pos)
+                for _ in range(count):
+                    key, pos = _read_string(data, pos)
+                    items[key], pos = read_value(data, pos)
+                count, pos = _read_long(data, pos)
+            return items, pos
+
+        return write, read, 'map'
+
+    def _enum(self, schema: Dict[str, Any], namespace: Optional[str]) -> Tuple[Writer, Reader, str]:
+        symbols = list(schema['symbols'])
+        indexes = {symbol: index for index, symbol in enumerate(symbols)}
+
+        def write(buffer: bytearray, value: Any) -> None:
+            if value not in indexes:
+                raise AvroEncodingError(f"símbolo {value!r} fora do enum {schema['name']}")
+            _write_long(buffer, indexes[value])
+
+        def read(data: bytes, pos: int) -> Tuple[Any, int]:
+            index, pos = _read_long(data, pos)
+            return symbols[index], pos
+
+        self._define(schema, namespace, (write, read, 'enum'))
+        return write, read, 'enum'
+
+    def _record(self, schema: Dict[str, Any], namespace: Optional[str]) -> Tuple[Writer, Reader, str]:
+        namespace = schema.get('namespace', namespace)
+        writers: List[Tuple[str, Writer, Any]] = []
+        readers: List[Tuple[str, Reader]] = []
+
+        def write(buffer: bytearray, value: Any) -> None:
+            for name, write_field, default in writers:
+                field_value = value.get(name, default)
+                if field_value is _REQUIRED:
+                    raise AvroEncodingError(f"campo obrigatório ausente: {name}")
+                try:
+                    write_field(buffer, field_value)
+                except AvroEncodingError as e:
+                    raise AvroEncodingError(f"{name}: {e}") from None
+
+        def read(data: bytes, pos: int) -> Tuple[Any, int]:
+            value = {}
+            for name, read_field in readers:
+                value[name], pos = read_field(data, pos)
+            return value, pos
+
+        # Registrado antes dos campos para permitir records recursivos
+        self._define(schema, namespace, (write, read, 'record'))
+        for field in schema['fields']:
+            write_field, read_field, _ = self.compile(field['type'], namespace)
+            writers.append((field['name'], write_field, field.get('default', _REQUIRED)))
+            readers.append((field['name'], read_field))
+        return write, read, 'record'
+
+    def _define(self, schema: Dict[str, Any], namespace: Optional[str], compiled: Tuple[Writer, Reader, str]) -> None:
+        name = schema['name']
+        self.named[name if '.' in name or not namespace else f"{namespace}.{name}"] = compiled
+        self.named.setdefault(name, compiled)
+
+_REQUIRED = object()
+
+class AvroCodec:
+    """Codificador e decodificador Avro (sem enquadramento) de um esquema."""
+
+    def __init__(self, schema: Schema):
+        """
+        Compila o esquema.
+
+        Args:
+            schema: Esquema Avro em forma de dicionário, lista (union) ou nome primitivo
+        """
+        self.schema = schema
+        self._write, self._read, _ = _Compiler().compile(schema)
+
+    def encode(self, datum: Any) -> bytes:
+        """
+        Codifica o valor.
+
+        Raises:
+            AvroEncodingError: Se o valor não seguir o esquema
+        """
+        buffer = bytearray()
+        self._write(buffer, datum)
+        return bytes(buffer)
+
+    def decode(self, data: bytes, offset: int = 0) -> Any:
+        """
+        Decodifica o valor a partir do offset.
+
+        Raises:
+            AvroEncodingError: Se os bytes não corresponderem ao esquema
+        """
+        try:
+            value, _ = self._read(data, offset)
+        except (IndexError, struct.error, UnicodeDecodeError) as e:
+            raise AvroEncodingError(f"mensagem Avro inválida: {e}") from None
+        return value
+
+class AvroSerializer:
+    """
+    Serializador de mensagens Kafka no enquadramento do Confluent Schema Registry.
+
+    O esquema é registrado no primeiro uso, sob o subject informado; as
+    mensagens levam o id retornado pelo registro. A decodificação resolve o
+    esquema do escritor pelo id de cada mensagem, com cache dos codecs.
+    """
+
+    def __init__(self, registry: SchemaRegistry, subject: str, schema: Schema):
+        """
+        Inicializa o serializador.
+
+        Args:
+            registry: Registro de esquemas
+            subject: Subject do esquema (por convenção, '<tópico>-value')
+            schema: Esquema Avro das mensagens
+        """
+        self.registry = registry
+        self.subject = subject
+        self.codec = AvroCodec(schema)
+        self._schema_id: Optional[int] = None
+        self._readers: Dict[int, AvroCodec] = {}
+
+    @property
+    def schema_id(self) -> int:
+        """Id do esquema no registro (registrado na primeira consulta)."""
+        if self._schema_id is None:
+            self._schema_id = self.registry.register(self.subject, self.codec.schema)
+            self._readers[self._schema_id] = self.codec
+        return self._schema_id
+
+    def __call__(self, datum: Any) -> bytes:
+        """Codifica o valor com o cabeçalho do esquema (compatível com BatchPublisher.serializer)."""
+        return HEADER.pack(MAGIC_BYTE, self.schema_id) + self.codec.encode(datum)
+
+    def decode(self, message: bytes) -> Any:
+        """
+        Decodifica uma mensagem enquadrada, usando o esquema indicado pelo seu id.
+
+        Raises:
+            AvroEncodingError: Se a mensagem não tiver o enquadramento esperado
+        """
+        if len(message) < HEADER.size or message[0] != MAGIC_BYTE:
+            raise AvroEncodingError("mensagem sem o cabeçalho do schema registry")
+        _, schema_id = HEADER.unpack_from(message)
+        codec = self._readers.get(schema_id)
+        if codec is None:
+            codec = self._readers[schema_id] = AvroCodec(self.registry.get_schema(schema_id))
+        return codec.decode(message, HEADER.size)
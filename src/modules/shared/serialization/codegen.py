@@ -0,0 +1,227 @@
+"""
+Geração de funções de codificação e decodificação especializadas por dataclass.
+
+Para cada dataclass é gerado (uma única vez, e depois reaproveitado) o código
+Python de uma função que converte a instância em dicionário e de outra que
+constrói a instância a partir de um dicionário, com acesso direto aos campos,
+sem introspecção por chamada. Dataclasses aninhadas, listas de dataclasses,
+Optional e datetime são tratados no código gerado.
+"""
+from dataclasses import MISSING, fields, is_dataclass
+from datetime import datetime
+from functools import lru_cache
+import threading
+import types
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+_encoders: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+_decoders: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+_lock = threading.RLock()
+
+@lru_cache(maxsize=4096)
+def iso_datetime(value: datetime) -> str:
+    """isoformat com cache: datas repetidas (ex: created_at == updated_at) são formatadas uma vez."""
+    return value.isoformat()
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value: str) -> datetime:
+    """fromisoformat com cache."""
+    return datetime.fromisoformat(value)
+
+def _unwrap_optional(tp: Any) -> Tuple[Any, bool]:
+    """Retorna (tipo interno, é_optional) para Optional[X] / X | None."""
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        if len(args) == 1 and len(typing.get_args(tp)) == 2:
+            return args[0], True
+    return tp, False
+
+def _list_item(tp: Any) -> Optional[Any]:
+    """Tipo dos itens de List[X] / list[X], ou None se não for lista."""
+    if typing.get_origin(tp) in (list, List):
+        args = typing.get_args(tp)
+        return args[0] if args else Any
+    return None
+
+# Profundidade máxima de dataclasses aninhadas expandidas dentro da função gerada
+MAX_INLINE_DEPTH = 3
+
+class _Generator:
+    """Monta o código-fonte de uma função e o namespace com as dependências."""
+
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {'_iso': iso_datetime, '_parse_dt': parse_datetime}
+
+    def bind(self, prefix: str, value: Any) -> str:
+        name = f"_{prefix}_{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def encode_expr(self, tp: Any, expr: str, depth: int = 0) -> str:
+        inner, optional = _unwrap_optional(tp)
+        converted = self._encode_value(inner, expr, depth)
+        if optional and converted != expr:
+            return f"(None if {expr} is None else {converted})"
+        return converted
+
+    def encode_items(self, cls: Type, expr: str, depth: int) -> List[str]:
+        hints = typing.get_type_hints(cls)
+        return [
+            f"{field.name!r}: {self.encode_expr(hints[field.name], f'{expr}.{field.name}', depth)}"
+            for field in fields(cls)
+            if field.metadata.get('encode', True)
+        ]
+
+    def _encode_value(self, tp: Any, expr: str, depth: int) -> str:
+        if tp is datetime:
+            return f"_iso({expr})"
+        if is_dataclass(tp):
+            if depth < MAX_INLINE_DEPTH:
+                # Expande o dicionário no próprio código, sem chamada por item
+                return "{" + ", ".join(self.encode_items(tp, expr, depth + 1)) + "}"
+            return f"{self.bind('enc', encoder_for(tp))}({expr})"
+        item = _list_item(tp)
+        if item is not None:
+            var = f"_v{depth}"
+            item_expr = self.encode_expr(item, var, depth)
+            if item_expr != var:
+                return f"[{item_expr} for {var} in {expr}]"
+        return expr
+
+    def decode_expr(self, tp: Any, expr: str, depth: int = 0) -> str:
+        inner, optional = _unwrap_optional(tp)
+        converted = self._decode_value(inner, expr, depth)
+        if optional and converted != expr:
+            return f"(None if {expr} is None else {converted})"
+        return converted
+
+    def decode_call(self, cls: Type, values: Dict[str, str], depth: int) -> str:
+        """Chamada do construtor com argumentos posicionais (mais barata que por nome)."""
+        hints = typing.get_type_hints(cls)
+        args = []
+        for field in fields(cls):
+            if not field.init:
+                continue
+            value = self.decode_expr(hints[field.name], values[field.name], depth)
+            args.append(f"{field.name}={value}" if field.kw_only else value)
+        return f"{self.bind('cls', cls)}({', '.join(args)})"
+
+    def _decode_value(self, tp: Any, expr: str, depth: int) -> str:
+        if tp is datetime:
+            return f"(_parse_dt({expr}) if {expr}.__class__ is str else {expr})"
+        if is_dataclass(tp):
+            if depth < MAX_INLINE_DEPTH and _inlinable(tp):
+                values = {field.name: f"{expr}[{field.name!r}]" for field in fields(tp)}
+                return self.decode_call(tp, values, depth + 1)
+            return f"{self.bind('dec', decoder_for(tp))}({expr})"
+        item = _list_item(tp)
+        if item is not None:
+            var = f"_v{depth}"
+            item_expr = self.decode_expr(item, var, depth)
+            if item_expr != var:
+                return f"[{item_expr} for {var} in {expr}]"
+        return expr
+
+    def compile(self, name: str, source: str) -> Callable:
+        exec(compile(source, f"<codegen {name}>", 'exec'), self.namespace)
+        function = self.namespace[name]
+        function.__source__ = source
+        return function
+
+def _inlinable(cls: Type) -> bool:
+    """
+    Indica se a decodificação da dataclass pode ser expandida em uma expressão.
+
+    Só campos obrigatórios, com valor lido direto da chave e sem conversão
+    nem valor padrão a tratar, são expandidos; os demais casos usam a função
+    gerada da classe.
+    """
+    hints = typing.get_type_hints(cls)
+    for field in fields(cls):
+        if not field.init:
+            return False
+        if field.default is not MISSING or field.default_factory is not MISSING:
+            return False
+        inner = _unwrap_optional(hints[field.name])[0]
+        if inner is datetime or is_dataclass(inner) or _list_item(inner) is not None:
+            return False
+    return True
+
+def encoder_for(cls: Type) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Retorna a função que converte instâncias da dataclass em dicionário.
+
+    O dicionário segue a ordem de declaração dos campos; datetime vira string
+    ISO 8601 e dataclasses aninhadas (inclusive em listas) são convertidas
+    recursivamente. Campos declarados com field(metadata={'encode': False})
+    ficam fora do dicionário.
+
+    Args:
+        cls: Dataclass
+
+    Returns:
+        Função gerada (cacheada por classe)
+    """
+    encoder = _encoders.get(cls)
+    if encoder is not None:
+        return encoder
+    with _lock:
+        if cls not in _encoders:
+            generator = _Generator()
+            items = ",\n        ".join(generator.encode_items(cls, 'obj', 0))
+            name = f"encode_{cls.__name__}"
+            source = f"def {name}(obj):\n    return {{\n        {items}\n    }}\n"
+            _encoders[cls] = generator.compile(name, source)
+        return _encoders[cls]
+
+def decoder_for(cls: Type) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Retorna a função que constrói instâncias da dataclass a partir de um dicionário.
+
+    Campos obrigatórios ausentes lançam KeyError; campos com valor padrão e
+    listas ausentes assumem o padrão (lista vazia). Chaves desconhecidas são
+    ignoradas.
+
+    Args:
+        cls: Dataclass
+
+    Returns:
+        Função gerada (cacheada por classe)
+    """
+    decoder = _decoders.get(cls)
+    if decoder is not None:
+        return decoder
+    with _lock:
+        if cls not in _decoders:
+            hints = typing.get_type_hints(cls)
+            generator = _Generator()
+            lines = []
+            values = {}
+            for index, field in enumerate(fields(cls)):
+                if not field.init:
+                    continue
+                tp = hints[field.name]
+                local = f"_f{index}"
+                if field.default is not MISSING:
+                    lines.append(f"{local} = data.get({field.name!r}, {generator.bind('default', field.default)})")
+                elif field.default_factory is not MISSING:
+                    factory = generator.bind('factory', field.default_factory)
+                    lines.append(f"{local} = data[{field.name!r}] if {field.name!r} in data else {factory}()")
+                elif _list_item(_unwrap_optional(tp)[0]) is not None:
+                    lines.append(f"{local} = data.get({field.name!r}) or []")
+                elif generator.decode_expr(tp, local) == local:
+                    # Valor usado como está: lido direto na chamada do construtor
+                    local = f"data[{field.name!r}]"
+                else:
+                    lines.append(f"{local} = data[{field.name!r}]")
+                values[field.name] = local
+            name = f"decode_{cls.__name__}"
+            source = (
+                f"def {name}(data):\n"
+                + "".join(f"    {line}\n" for line in lines)
+                + f"    return {generator.decode_call(cls, values, 0)}\n"
+            )
+            _decoders[cls] = generator.compile(name, source)
+        return _decoders[cls]
@@ -0,0 +1,227 @@
+"""
+Leitura e escrita incremental de JSON.
+
+stream_object percorre um objeto JSON a partir de blocos de bytes (por
+exemplo, o corpo de um objeto S3 lido em partes) e entrega cada campo assim
+que ele é decodificado; os campos indicados em streamed_keys, quando são
+listas, são entregues item a item. JsonStreamWriter monta o JSON compacto de
+saída campo a campo e item a item. Juntos, permitem converter payloads com
+listas muito grandes sem manter em memória o texto original nem a lista
+decodificada inteira.
+"""
+from typing import Any, Collection, Iterable, Iterator, Mapping, Optional, Tuple
+import codecs
+import json
+import os
+import re
+
+# Tamanho dos blocos lidos do corpo do objeto
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+\-]*')
+_decoder = json.JSONDecoder()
+
+def streaming_parse_enabled(env: Optional[Mapping[str, str]] = None) -> bool:
+    """Indica se a leitura incremental dos payloads está habilitada (S3_STREAMING_PARSE=true)."""
+    env = os.environ if env is None else env
+    return env.get('S3_STREAMING_PARSE', 'false').lower() == 'true'
+
+class StreamParseError(ValueError):
+    """JSON inválido ou truncado."""
+    pass
+
+def _may_continue(value: Any, text: str, end: int) -> bool:
+    """Indica se o valor decodificado pode continuar no próximo bloco."""
+    if end == len(text):
+        return True
+    # Números cortados no meio da fração ou do expoente: o resto do buffer é só a parte já lida
+    return (
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        and _NUMBER_TAIL.match(text, end).end() == len(text)
+    )
+
+class _Reader:
+    """Texto decodificado sob demanda, a partir de blocos de bytes UTF-8."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Lê o próximo bloco, descartando o texto já consumido. Retorna False no fim do stream."""
+        if self.eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self.eof = True
+            decoded = self._utf8.decode(b'', final=True)
+        else:
+            decoded = self._utf8.decode(chunk)
+        self.text = self.text[self.pos:] + decoded
+        self.pos = 0
+        return chunk is not None or bool(decoded)
+
+    def peek(self) -> str:
+        """Próximo caractere significativo (ignorando espaços), ou '' no fim do stream."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise StreamParseError(f"esperado {char!r}, encontrado {found or 'fim do payload'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """
+        Decodifica o próximo valor JSON completo.
+
+        Se o valor ainda não estiver inteiro no buffer, lê mais blocos (até
+        dobrar o buffer, para que valores longos custem tempo linear) e tenta
+        de novo. Um valor que termina exatamente no fim do buffer também é
+        relido, pois números e literais podem continuar no próximo bloco; o
+        mesmo vale para um número seguido apenas de caracteres numéricos até o
+        fim do buffer (ex: '12.' ou '1e-' cortados na fronteira do bloco).
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                if self.eof or not _may_continue(value, self.text, end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise StreamParseError(str(e)) from None
+            target = 2 * (len(self.text) - self.pos) + 1
+            while len(self.text) - self.pos < target and self.fill():
+                pass
+
+    def items(self) -> Iterator[Any]:
+        """Itens de uma lista JSON, um a um."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+def stream_object(chunks: Iterable[bytes], streamed_keys: Collection[str] = ()) -> Iterator[Tuple[str, Any]]:
+    """
+    Percorre os campos de um objeto JSON lido em blocos.
+
+    Para os campos em streamed_keys cujo valor é uma lista, o valor entregue é
+    um iterador sobre os itens, que deve ser consumido antes de avançar para o
+    próximo campo (itens não consumidos são descartados). Os demais campos são
+    entregues já decodificados.
+
+    Args:
+        chunks: Blocos de bytes UTF-8 do payload
+        streamed_keys: Campos cujas listas são entregues item a item
+
+    Returns:
+        Iterador de pares (campo, valor)
+
+    Raises:
+        StreamParseError: Se o payload não for um objeto JSON válido
+    """
+    reader = _Reader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise StreamParseError(f"chave inválida: {key!r}")
+            reader.expect(':')
+            if key in streamed_keys and reader.peek() == '[':
+                items = reader.items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+                continue
+            reader.expect('}')
+            break
+    if reader.peek():
+        raise StreamParseError("conteúdo após o fim do objeto")
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+class JsonStreamWriter:
+    """
+    Monta um objeto JSON compacto campo a campo.
+
+    A saída é idêntica à de json.dumps(..., separators=(',', ':')) aplicada
+    ao objeto completo, sem que o objeto precise existir inteiro em memória.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray(b'{')
+        self._fields = 0
+        self._items: Optional[int] = None
+
+    def field(self, key: str, value: Any) -> None:
+        """Escreve um campo com seu valor."""
+        self._key(key)
+        self._buffer += _dumps(value)
+
+    def begin_array(self, key: str) -> None:
+        """Abre um campo do tipo lista; os itens são escritos com item()."""
+        self._key(key)
+        self._buffer += b'['
+        self._items = 0
+
+    def item(self, value: Any) -> None:
+        """Escreve um item da lista aberta."""
+        if self._items is None:
+            raise RuntimeError("nenhuma lista aberta")
+        if self._items:
+            self._buffer += b','
+        self._buffer += _dumps(value)
+        self._items += 1
+
+    def end_array(self) -> None:
+        """Fecha a lista aberta."""
+        self._buffer += b']'
+        self._items = None
+
+    def getvalue(self) -> bytes:
+        """Retorna o objeto JSON completo."""
+        if self._items is not None:
+            raise RuntimeError("lista não fechada")
+        # Fecha o objeto no próprio buffer: uma única cópia para bytes
+        self._buffer += b'}'
+        try:
+            return bytes(self._buffer)
+        finally:
+            del self._buffer[-1]
+
+    def __len__(self) -> int:
+        return len(self._buffer) + 1
+
+    def _key(self, key: str) -> None:
+        if self._items is not None:
+            raise RuntimeError("lista não fechada")
+        if self._fields:
+            self._buffer += b','
+        self._buffer += _dumps(key) + b':'
+        self._fields += 1
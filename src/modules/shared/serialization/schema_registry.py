@@ -0,0 +1,153 @@
+"""
+Registro de esquemas das mensagens binárias.
+
+Cada esquema registrado recebe um id numérico, que segue no cabeçalho de
+cada mensagem; consumidores resolvem o esquema do escritor pelo id. A
+interface permite plugar um registro remoto; o registro local persiste os
+esquemas em um arquivo JSON (usado em testes e em pacotes com os esquemas
+pré-registrados).
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import json
+import os
+import threading
+
+class SchemaNotFoundError(KeyError):
+    """Id de esquema desconhecido no registro."""
+    pass
+
+def canonical_schema(schema: Any) -> str:
+    """Forma canônica do esquema (JSON compacto e com chaves ordenadas), usada para comparação."""
+    return json.dumps(schema, sort_keys=True, separators=(',', ':'))
+
+class SchemaRegistry(ABC):
+    """Interface do registro de esquemas."""
+
+    @abstractmethod
+    def register(self, subject: str, schema: Any) -> int:
+        """
+        Registra o esquema sob o subject, retornando o id existente se já registrado.
+
+        Args:
+            subject: Subject do esquema
+            schema: Esquema
+
+        Returns:
+            Id do esquema
+        """
+        pass
+
+    @abstractmethod
+    def get_schema(self, schema_id: int) -> Any:
+        """
+        Retorna o esquema registrado com o id.
+
+        Args:
+            schema_id: Id do esquema
+
+        Returns:
+            Esquema
+
+        Raises:
+            SchemaNotFoundError: Se o id não estiver registrado
+        """
+        pass
+
+class InMemorySchemaRegistry(SchemaRegistry):
+    """Registro em memória, com ids sequenciais a partir de 1."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._schemas: Dict[int, Any] = {}
+        self._ids: Dict[str, int] = {}
+        self._subjects: Dict[str, List[int]] = {}
+
+    def register(self, subject: str, schema: Any) -> int:
+        canonical = canonical_schema(schema)
+        with self._lock:
+            schema_id = self._ids.get(canonical)
+            if schema_id is None:
+                schema_id = self._ids[canonical] = len(self._schemas) + 1
+                self._schemas[schema_id] = json.loads(canonical)
+            versions = self._subjects.setdefault(subject, [])
+            if schema_id not in versions:
+                versions.append(schema_id)
+                self._persist()
+            return schema_id
+
+    def get_schema(self, schema_id: int) -> Any:
+        try:
+            return self._schemas[schema_id]
+        except KeyError:
+            raise SchemaNotFoundError(schema_id) from None
+
+    def versions(self, subject: str) -> List[int]:
+        """Ids registrados sob o subject, do mais antigo ao mais recente."""
+        return list(self._subjects.get(subject, []))
+
+    def _persist(self) -> None:
+        """Chamado após cada novo registro; o registro em memória não persiste nada."""
+        pass
+
+class LocalSchemaRegistry(InMemorySchemaRegistry):
+    """
+    Registro persistido em um arquivo JSON local.
+
+    O arquivo é lido na criação e reescrito (de forma atômica) a cada novo
+    registro. Registrar um esquema já presente não escreve no arquivo, de modo
+    que um arquivo somente leitura com os esquemas pré-registrados funciona
+    no pacote da Lambda.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa o registro.
+
+        Args:
+            path: Caminho do arquivo (criado no primeiro registro se não existir)
+        """
+        super().__init__()
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                content = json.load(f)
+            for entry in content.get('schemas', []):
+                schema_id = int(entry['id'])
+                self._schemas[schema_id] = entry['schema']
+                self._ids[canonical_schema(entry['schema'])] = schema_id
+            for subject, versions in content.get('subjects', {}).items():
+                self._subjects[subject] = [int(schema_id) for schema_id in versions]
+
+    def _persist(self) -> None:
+        content = {
+            'schemas': [{'id': schema_id, 'schema': schema} for schema_id, schema in sorted(self._schemas.items())],
+            'subjects': self._subjects
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+def binary_topic(env: Mapping[str, str]) -> Optional[str]:
+    """Tópico que recebe a cópia binária (Avro) dos eventos (KAFKA_BINARY_TOPIC), se configurado."""
+    return env.get('KAFKA_BINARY_TOPIC') or None
+
+def schema_registry_from_env(env: Mapping[str, str]) -> Tuple[Optional[str], Optional[SchemaRegistry]]:
+    """
+    Cria o registro de esquemas da publicação binária configurada no ambiente.
+
+    Com SCHEMA_REGISTRY_PATH o registro é persistido no arquivo; sem ela,
+    fica em memória (os ids valem apenas para o próprio ambiente de execução).
+
+    Args:
+        env: Variáveis de ambiente (KAFKA_BINARY_TOPIC, SCHEMA_REGISTRY_PATH)
+
+    Returns:
+        (tópico binário, registro), ou (None, None) se a publicação binária estiver desabilitada
+    """
+    topic = binary_topic(env)
+    if topic is None:
+        return None, None
+    path = env.get('SCHEMA_REGISTRY_PATH')
+    return topic, LocalSchemaRegistry(path) if path else InMemorySchemaRegistry()
@@ -1,40 +1,155 @@
 """
 Configuração do Datadog para tracing distribuído.
 """
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
 from ddtrace import patch_all, tracer
 from aws_lambda_powertools import Logger
 from functools import wraps
 import os
+import random
 import asyncio
 
 logger = Logger()
 
+# Profundidade marcada em traces descartados pela amostragem
+UNSAMPLED = -1
+
+@dataclass(frozen=True)
+class TracingPolicy:
+    """
+    Política de tracing.
+
+    Attributes:
+        enabled: Habilita a criação de spans pelo datadog_trace
+        sample_rate: Fração dos traces iniciados que são registrados (decidida na raiz)
+        max_depth: Profundidade máxima de spans aninhados criados pelo datadog_trace
+    """
+    enabled: bool = True
+    sample_rate: float = 1.0
+    max_depth: int = 8
+
+    @classmethod
+    def from_env(cls) -> "TracingPolicy":
+        """Monta a política a partir de DD_TRACE_ENABLED, TRACE_SAMPLE_RATE e TRACE_MAX_DEPTH."""
+        return cls(
+            enabled=os.getenv('DD_TRACE_ENABLED', 'true').lower() == 'true',
+            sample_rate=min(max(float(os.getenv('TRACE_SAMPLE_RATE', 1.0)), 0.0), 1.0),
+            max_depth=int(os.getenv('TRACE_MAX_DEPTH', 8))
+        )
+
+    def sample(self) -> bool:
+        """Decide se um novo trace deve ser registrado."""
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+_policy = TracingPolicy.from_env()
+
+# Profundidade de spans do datadog_trace no contexto atual (UNSAMPLED se descartado)
+_span_depth: ContextVar[int] = ContextVar('datadog_span_depth', default=0)
+
+def get_tracing_policy() -> TracingPolicy:
+    """Retorna a política de tracing em uso."""
+    return _policy
+
+def set_tracing_policy(policy: TracingPolicy) -> None:
+    """
+    Substitui a política de tracing.
+
+    Funções decoradas enquanto o tracing estava desabilitado permanecem sem
+    instrumentação.
+
+    Args:
+        policy: Nova política
+    """
+    global _policy
+    _policy = policy
+
+class _NoopSpan:
+    """Span nulo usado quando o trace não é registrado."""
+
+    def set_tag(self, key: str, value: Any = None) -> None:
+        pass
+
+    def set_tags(self, tags: Dict[str, Any]) -> None:
+        pass
+
+    def set_metric(self, key: str, value: float) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+def _is_recording() -> bool:
+    """Indica se o contexto atual pertence a um trace registrado."""
+    return _policy.enabled and _span_depth.get() != UNSAMPLED
+
+@contextmanager
+def active_span() -> Iterator[Any]:
+    """
+    Fornece o span ativo sem encerrá-lo ao sair do bloco.
+
+    Yields:
+        Span corrente ou NOOP_SPAN se não houver trace registrado
+    """
+    span = tracer.current_span() if _is_recording() else None
+    yield span if span is not None else NOOP_SPAN
+
+@contextmanager
+def traced_span(name: str, **kwargs: Any) -> Iterator[Any]:
+    """
+    Abre um span filho respeitando a política (desabilitado ou não amostrado gera NOOP_SPAN).
+
+    Args:
+        name: Nome do span
+        **kwargs: Argumentos repassados para tracer.trace (service, resource...)
+
+    Yields:
+        Span criado ou NOOP_SPAN
+    """
+    if not _is_recording():
+        yield NOOP_SPAN
+        return
+    with tracer.trace(name, **kwargs) as span:
+        yield span
+
 def configure_datadog():
     """
     Configura o Datadog para tracing.
-    Deve ser chamado no início da aplicação.
+
+    Deve ser chamado uma única vez por processo (ver bootstrap_runtime). O
+    endereço do agente é lido pelo ddtrace de DD_AGENT_HOST/DD_TRACE_AGENT_PORT;
+    valores já definidos no ambiente são preservados.
     """
-    # Configura variáveis de ambiente do Datadog
-    os.environ['DD_TRACE_ENABLED'] = 'true'
-    os.environ['DD_LOGS_INJECTION'] = 'true'
-    os.environ['DD_RUNTIME_METRICS_ENABLED'] = 'true'
+    if not _policy.enabled:
+        logger.info("Tracing desabilitado; Datadog não configurado")
+        return
+
+    # Configura variáveis de ambiente do Datadog sem sobrescrever o ambiente da função
+    os.environ.setdefault('DD_LOGS_INJECTION', 'true')
+    os.environ.setdefault('DD_RUNTIME_METRICS_ENABLED', 'true')
     
     # Patch automático de bibliotecas comuns
     patch_all()
     
-    # Configura o tracer
-    tracer.configure(
-        hostname=os.getenv('DD_AGENT_HOST', 'localhost'),
-        port=int(os.getenv('DD_TRACE_AGENT_PORT', 8126)),
-        enabled=True
-    )
-    
     logger.info("Datadog configurado para tracing")
 
+def _tag_lambda_context(span: Any, kwargs: Dict[str, Any]) -> None:
+    """Adiciona ao span as informações do contexto AWS Lambda, se disponível."""
+    context = kwargs.get('context')
+    if context is not None:
+        span.set_tag('function_name', context.function_name)
+        span.set_tag('function_version', context.function_version)
+        span.set_tag('memory_limit', context.memory_limit_in_mb)
+        span.set_tag('aws_request_id', context.aws_request_id)
+
 def datadog_trace(service: Optional[str] = None, name: Optional[str] = None, resource: Optional[str] = None):
     """
     Decorator para adicionar tracing do Datadog em funções.
+
+    Com o tracing desabilitado na importação a função é retornada sem wrapper.
+    A amostragem é decidida no primeiro span do trace e herdada pelos spans
+    aninhados; acima de max_depth a função é executada sem span próprio.
     
     Args:
         service: Nome do serviço (opcional)
@@ -42,40 +157,46 @@ def datadog_trace(service: Optional[str] = None, name: Optional[str] = None, res
         resource: Nome do recurso (opcional)
     """
     def decorator(func):
+        if not _policy.enabled:
+            return func
+
+        span_name = name or func.__name__
+
+        def _enter() -> Tuple[Optional[Token], bool]:
+            """Avança a profundidade do contexto e indica se este nível deve abrir span."""
+            policy = _policy
+            depth = _span_depth.get()
+            if not policy.enabled or depth == UNSAMPLED or depth >= policy.max_depth:
+                return None, False
+            if depth == 0 and not policy.sample():
+                return _span_depth.set(UNSAMPLED), False
+            return _span_depth.set(depth + 1), True
+
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            span_name = name or func.__name__
-            with tracer.trace(
-                span_name,
-                service=service,
-                resource=resource
-            ) as span:
-                # Adiciona informações do contexto AWS Lambda se disponível
-                if 'context' in kwargs:
-                    context = kwargs['context']
-                    span.set_tag('function_name', context.function_name)
-                    span.set_tag('function_version', context.function_version)
-                    span.set_tag('memory_limit', context.memory_limit_in_mb)
-                    span.set_tag('aws_request_id', context.aws_request_id)
-                
-                return await func(*args, **kwargs)
+            token, record = _enter()
+            try:
+                if not record:
+                    return await func(*args, **kwargs)
+                with tracer.trace(span_name, service=service, resource=resource) as span:
+                    _tag_lambda_context(span, kwargs)
+                    return await func(*args, **kwargs)
+            finally:
+                if token is not None:
+                    _span_depth.reset(token)
                 
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            span_name = name or func.__name__
-            with tracer.trace(
-                span_name,
-                service=service,
-                resource=resource
-            ) as span:
-                if 'context' in kwargs:
-                    context = kwargs['context']
-                    span.set_tag('function_name', context.function_name)
-                    span.set_tag('function_version', context.function_version)
-                    span.set_tag('memory_limit', context.memory_limit_in_mb)
-                    span.set_tag('aws_request_id', context.aws_request_id)
-                
-                return func(*args, **kwargs)
+            token, record = _enter()
+            try:
+                if not record:
+                    return func(*args, **kwargs)
+                with tracer.trace(span_name, service=service, resource=resource) as span:
+                    _tag_lambda_context(span, kwargs)
+                    return func(*args, **kwargs)
+            finally:
+                if token is not None:
+                    _span_depth.reset(token)
         
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
     return decorator
@@ -83,16 +204,24 @@ def datadog_trace(service: Optional[str] = None, name: Optional[str] = None, res
 def add_trace_context(span: Any, metadata: Dict[str, Any]) -> None:
     """
     Adiciona contexto ao span atual.
+
+    A serialização é preguiçosa: nada é convertido se o span não for
+    registrado, e valores callable só são avaliados quando o são.
     
     Args:
         span: Span do Datadog
         metadata: Dicionário com metadados para adicionar ao span
     """
+    if span is None or span is NOOP_SPAN:
+        return
+
     for key, value in metadata.items():
+        if callable(value):
+            value = value()
         if isinstance(value, (str, int, float, bool)):
             span.set_tag(key, value)
         else:
             try:
                 span.set_tag(key, str(value))
-            except:
-                logger.warning(f"Não foi possível adicionar tag {key} ao span") 
\ No newline at end of file
+            except Exception:
+                logger.warning(f"Não foi possível adicionar tag {key} ao span")
@@ -0,0 +1,171 @@
+import json
+import pytest
+from src.modules.lambda_event_decisor.domain.entities.event import Event
+from src.modules.lambda_event_decisor.domain.services.event_decision_service import EventDecisionService
+from src.modules.lambda_event_decisor.infrastructure.producers.sqs_event_producer import SQSEventProducer
+from src.modules.lambda_event_decisor.infrastructure.repositories.fingerprints_attribute import (
+    FingerprintsAttribute,
+    pack_fingerprints,
+    unpack_fingerprints
+)
+from src.modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import UpsertEvent
+from src.modules.shared.kafka.passthrough import SchemaValidationError
+
+def attribute(index, data_type='varchar'):
+    return {
+        'attribute_name': f'col_{index}',
+        'data_type': data_type,
+        'is_primary_key': index == 0,
+        'is_nullable': index != 0,
+        'default_value': None,
+        'comment_description': f'coluna {index}'
+    }
+
+def table_event(attributes, correlation_id='c-1', indexes=(('col_0',),)):
+    return Event(
+        technology_name='rds',
+        instance_technology_name='postgres',
+        asset_parent_name='db',
+        asset_name='orders',
+        aws_account_number='123456789012',
+        status='completed',
+        correlation_id=correlation_id,
+        metadata={
+            'attributes': attributes,
+            'indexed_field_list': [{'indexed_field_composition': list(columns)} for columns in indexes]
+        }
+    )
+
+WIDE_TABLE = [attribute(index) for index in range(1500)]
+
+@pytest.fixture
+def service():
+    return EventDecisionService(snapshot_interval=3)
+
+@pytest.fixture
+def stored(service):
+    return service.decide_event_action(table_event(WIDE_TABLE), None).asset
+
+def test_new_asset_is_published_as_snapshot_with_fingerprints(service):
+    decision = service.decide_event_action(table_event(WIDE_TABLE), None)
+
+    assert decision.is_upsert() and decision.change.is_snapshot
+    assert len(decision.change.attributes) == 1500
+    assert len(decision.asset.attribute_fingerprints) == 1500
+
+def test_single_column_change_publishes_only_that_column(service, stored):
+    attributes = list(WIDE_TABLE)
+    attributes[42] = attribute(42, 'text')
+
+    decision = service.decide_event_action(table_event(attributes, 'c-2'), stored)
+
+    change = decision.change
+    assert change.change_type == 'delta'
+    assert change.attributes == [attribute(42, 'text')]
+    assert change.modified_attributes == ['col_42']
+    assert change.added_attributes == [] and change.removed_attributes == []
+    assert change.indexed_field_list == [{'indexed_field_composition': ['col_0']}]
+    assert decision.asset.deltas_since_snapshot == 1
+    assert len(json.dumps(change.to_dict())) < len(json.dumps(WIDE_TABLE)) / 100
+
+def test_added_and_removed_columns_are_listed(service, stored):
+    attributes = WIDE_TABLE[1:] + [attribute(1500)]
+
+    change = service.decide_event_action(table_event(attributes, 'c-2'), stored).change
+
+    assert change.added_attributes == ['col_1500']
+    assert change.removed_attributes == ['col_0']
+    assert [attr['attribute_name'] for attr in change.attributes] == ['col_1500']
+
+def test_snapshot_is_published_periodically(service, stored):
+    change_types = []
+    for version in range(4):
+        attributes = list(WIDE_TABLE)
+        attributes[1] = attribute(1, f'varchar({version})')
+        decision = service.decide_event_action(table_event(attributes, f'c-{version}'), stored)
+        change_types.append(decision.change.change_type)
+
+    assert change_types == ['delta', 'delta', 'snapshot', 'delta']
+    assert stored.deltas_since_snapshot == 1
+
+def test_snapshot_when_most_columns_change(service, stored):
+    attributes = [attribute(index, 'text') for index in range(1500)]
+
+    assert service.decide_event_action(table_event(attributes, 'c-2'), stored).change.is_snapshot
+
+def test_snapshot_when_only_non_attribute_metadata_changes(service, stored):
+    event = table_event(WIDE_TABLE, indexes=(('col_0',), ('col_1', 'col_2')))
+
+    decision = service.decide_event_action(event, stored)
+
+    assert decision.change.is_snapshot and len(decision.change.indexed_field_list) == 2
+
+def test_snapshot_for_assets_stored_without_fingerprints(service, stored):
+    stored.attribute_fingerprints = {}
+    attributes = list(WIDE_TABLE)
+    attributes[3] = attribute(3, 'text')
+
+    decision = service.decide_event_action(table_event(attributes, 'c-2'), stored)
+
+    assert decision.change.is_snapshot and len(decision.asset.attribute_fingerprints) == 1500
+
+def test_unchanged_event_is_not_published(service, stored):
+    assert service.decide_event_action(table_event(WIDE_TABLE), stored).is_no_action()
+
+def test_fingerprints_fit_the_item_budget(stored):
+    packed = pack_fingerprints(stored.attribute_fingerprints)
+
+    assert unpack_fingerprints(packed) == stored.attribute_fingerprints
+    assert len(packed) < 20 * 1024
+    assert unpack_fingerprints(pack_fingerprints({})) == {}
+    attribute_type = FingerprintsAttribute()
+    assert attribute_type.deserialize(attribute_type.serialize({'a': '00ff00ff00ff00ff'})) == {'a': '00ff00ff00ff00ff'}
+
+def test_fingerprints_stay_out_of_the_published_asset(stored):
+    assert 'attribute_fingerprints' not in stored.to_dict()
+    assert 'deltas_since_snapshot' not in stored.to_dict()
+
+class RecordingStorage:
+    def __init__(self):
+        self.payloads = []
+
+    def store_event(self, event_type, payload):
+        self.payloads.append(payload)
+        return 's3://bucket/events/upsert/1.json'
+
+class RecordingSQS:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append(json.loads(MessageBody))
+
+def test_sqs_producer_stores_the_change_with_the_asset(service, stored):
+    attributes = list(WIDE_TABLE)
+    attributes[7] = attribute(7, 'text')
+    decision = service.decide_event_action(table_event(attributes, 'c-2'), stored)
+    storage = RecordingStorage()
+
+    SQSEventProducer('upsert-url', 'drop-url', storage, sqs_client=RecordingSQS()).send_upsert_event(
+        decision.asset, decision.change
+    )
+
+    payload = storage.payloads[0]
+    assert payload['asset']['correlation_id'] == 'c-2'
+    assert payload['change_type'] == 'delta' and payload['modified_attributes'] == ['col_7']
+
+def test_upsert_event_reads_delta_fields():
+    data = {
+        'correlation_id': 'c-1', 'status': 'completed', 'asset_name': 'orders', 'asset_parent_name': 'db',
+        'asset_counts': '1', 'aws_account_number': '123456789012', 'technology_service_name': 'rds',
+        'asset_type': 'table', 'instance_technology_name': 'postgres',
+        'attributes': [attribute(7, 'text')], 'indexed_field_list': [],
+        'change_type': 'delta', 'modified_attributes': ['col_7'], 'removed_attributes': ['col_9']
+    }
+
+    UpsertEvent.validate_schema(data)
+    event = UpsertEvent.from_dict(data)
+
+    assert event.is_delta and event.removed_attributes == ['col_9'] and event.added_attributes == []
+    with pytest.raises(SchemaValidationError, match='change_type'):
+        UpsertEvent.validate_schema({**data, 'change_type': 'partial'})
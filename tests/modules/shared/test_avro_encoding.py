@@ -0,0 +1,174 @@
+import json
+import pytest
+from kafka.future import Future
+from src.modules.shared.serialization.avro import AvroCodec, AvroEncodingError, AvroSerializer, avro_schema
+from src.modules.shared.serialization.schema_registry import (
+    InMemorySchemaRegistry,
+    LocalSchemaRegistry,
+    SchemaNotFoundError,
+    schema_registry_from_env
+)
+from src.modules.shared.kafka.batch_publisher import BatchPublisher
+from src.modules.shared.kafka.binary_copy import BinaryCopyPublisher
+from src.modules.shared.kafka.passthrough import PassthroughEvent
+from src.modules.shared.kafka.routing_headers import RoutingHeaders
+from src.modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import SCHEMA_VERSION, UpsertEvent
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.producers.kafka_event_producer import (
+    EVENT_SCHEMA,
+    KafkaEventProducer
+)
+
+def upsert_body(asset_name='orders', columns=2):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': asset_name,
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f'col_{i}',
+                'data_type': 'varchar',
+                'is_primary_key': i == 0,
+                'is_nullable': i != 0,
+                'default_value': None if i else 'nextval()',
+                'comment_description': 'coluna ção'
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': ['col_0']}],
+        'change_type': 'snapshot',
+        'added_attributes': [],
+        'modified_attributes': [],
+        'removed_attributes': []
+    }
+
+class RecordingKafkaProducer:
+    config = {}
+
+    def __init__(self, fail_topics=()):
+        self.sent = []
+        self.fail_topics = fail_topics
+
+    def send(self, topic, value, key=None, headers=None):
+        future = Future()
+        if topic in self.fail_topics:
+            future.failure(RuntimeError('broker indisponível'))
+        else:
+            future.success(None)
+        self.sent.append((topic, value, key))
+        return future
+
+    def flush(self, timeout=None):
+        pass
+
+def build_producer(registry, fail_topics=()):
+    producer = KafkaEventProducer.__new__(KafkaEventProducer)
+    producer.producer = RecordingKafkaProducer(fail_topics)
+    producer.publisher = BatchPublisher(producer.producer, flush_timeout_seconds=1)
+    producer.binary_copy = BinaryCopyPublisher(producer.producer, 'assets-avro', registry, EVENT_SCHEMA)
+    producer.routing_headers = RoutingHeaders('upsert', SCHEMA_VERSION)
+    return producer
+
+def test_schema_is_derived_from_the_dataclass():
+    attribute = EVENT_SCHEMA['fields'][9]['type']['items']
+
+    assert EVENT_SCHEMA['name'] == 'UpsertEvent' and EVENT_SCHEMA['namespace'] == 'assets.events'
+    assert {'name': 'default_value', 'type': ['null', 'string']} in attribute['fields']
+    assert {'name': 'is_primary_key', 'type': 'boolean'} in attribute['fields']
+
+def test_event_round_trip_is_smaller_than_json():
+    body = upsert_body(columns=50)
+    codec = AvroCodec(EVENT_SCHEMA)
+
+    encoded = codec.encode(body)
+
+    assert codec.decode(encoded) == body
+    assert len(encoded) < len(json.dumps(body, separators=(',', ':')).encode('utf-8')) / 2
+
+@pytest.mark.parametrize('schema,value', [
+    ('long', -(2 ** 63)),
+    ('long', 2 ** 63 - 1),
+    ('double', 1.5),
+    ('bytes', b'\x00\xff'),
+    ({'type': 'map', 'values': 'long'}, {'a': 1, 'b': -300}),
+    ({'type': 'enum', 'name': 'Status', 'symbols': ['running', 'completed']}, 'completed'),
+    (['null', 'long', 'string'], 'x')
+])
+def test_primitive_and_complex_types_round_trip(schema, value):
+    codec = AvroCodec(schema)
+
+    assert codec.decode(codec.encode(value)) == value
+
+def test_values_outside_the_schema_are_rejected_with_field_path():
+    body = upsert_body()
+    body['asset_counts'] = 1
+
+    with pytest.raises(AvroEncodingError, match='asset_counts'):
+        AvroCodec(EVENT_SCHEMA).encode(body)
+
+def test_serializer_frames_messages_with_registered_schema_id():
+    registry = InMemorySchemaRegistry()
+    registry.register('other-value', 'string')
+    serializer = AvroSerializer(registry, 'assets-avro-value', EVENT_SCHEMA)
+
+    message = serializer(upsert_body())
+
+    assert message[:5] == b'\x00\x00\x00\x00\x02'
+    assert AvroSerializer(registry, 'assets-avro-value', 'string').decode(message) == upsert_body()
+    assert registry.versions('assets-avro-value') == [2]
+
+def test_local_registry_persists_ids_and_reuses_existing_schemas(tmp_path):
+    path = str(tmp_path / 'schemas.json')
+    registry = LocalSchemaRegistry(path)
+    schema_id = registry.register('assets-avro-value', EVENT_SCHEMA)
+
+    reloaded = LocalSchemaRegistry(path)
+
+    assert reloaded.get_schema(schema_id) == EVENT_SCHEMA
+    assert reloaded.register('assets-avro-value', EVENT_SCHEMA) == schema_id
+    assert reloaded.register('drops-avro-value', 'string') == schema_id + 1
+    with pytest.raises(SchemaNotFoundError):
+        reloaded.get_schema(99)
+
+def test_registry_is_only_created_with_a_binary_topic(tmp_path):
+    assert schema_registry_from_env({}) == (None, None)
+    topic, registry = schema_registry_from_env({
+        'KAFKA_BINARY_TOPIC': 'assets-avro',
+        'SCHEMA_REGISTRY_PATH': str(tmp_path / 'schemas.json')
+    })
+    assert topic == 'assets-avro' and isinstance(registry, LocalSchemaRegistry)
+
+def test_producer_publishes_json_and_binary_copy_of_delivered_events():
+    registry = InMemorySchemaRegistry()
+    producer = build_producer(registry)
+    passthrough = PassthroughEvent.from_payload(json.dumps(upsert_body('raw')).encode('utf-8'), upsert_body('raw'))
+
+    result = producer.produce_events('assets', [('m-1', UpsertEvent.from_dict(upsert_body())), ('m-2', passthrough)])
+
+    assert result.delivered == ['m-1', 'm-2']
+    topics = [topic for topic, _, _ in producer.producer.sent]
+    assert topics == ['assets', 'assets', 'assets-avro', 'assets-avro']
+    binary = [value for topic, value, _ in producer.producer.sent if topic == 'assets-avro']
+    decoded = [producer.binary_copy.serializer.decode(value) for value in binary]
+    assert decoded == [upsert_body(), upsert_body('raw')]
+    # Mesma chave de particionamento nos dois tópicos
+    assert producer.producer.sent[0][2] == producer.producer.sent[2][2]
+
+def test_binary_copy_failures_do_not_affect_json_result():
+    producer = build_producer(InMemorySchemaRegistry(), fail_topics=('assets-avro',))
+
+    result = producer.produce_events('assets', [('m-1', UpsertEvent.from_dict(upsert_body()))])
+
+    assert result.delivered == ['m-1'] and result.all_delivered
+
+def test_undelivered_events_are_not_copied():
+    producer = build_producer(InMemorySchemaRegistry(), fail_topics=('assets',))
+
+    result = producer.produce_events('assets', [('m-1', UpsertEvent.from_dict(upsert_body()))])
+
+    assert result.failed and [topic for topic, _, _ in producer.producer.sent] == ['assets']
@@ -0,0 +1,41 @@
+import pytest
+from src.modules.shared.aws import AWSClientCache, build_client_config
+
+@pytest.fixture
+def client_cache(aws_credentials):
+    return AWSClientCache()
+
+def test_client_is_reused_per_service_and_region(client_cache):
+    """O mesmo cliente deve ser retornado para o mesmo (serviço, região)."""
+    sqs = client_cache.client('sqs')
+
+    assert client_cache.client('sqs') is sqs
+    assert client_cache.client('sqs', 'eu-west-1') is not sqs
+    assert client_cache.client('s3') is not sqs
+
+def test_clients_share_session_and_config(client_cache):
+    """Todos os clientes usam a mesma sessão e a configuração ajustada."""
+    sqs = client_cache.client('sqs')
+    s3 = client_cache.client('s3')
+
+    assert sqs.meta.config.max_pool_connections == s3.meta.config.max_pool_connections
+    assert sqs.meta.config.tcp_keepalive is True
+    assert sqs.meta.config.retries['mode'] == 'adaptive'
+    assert client_cache.session is client_cache.session
+
+def test_config_reads_environment(monkeypatch):
+    """Os parâmetros do pool podem ser ajustados por variáveis de ambiente."""
+    monkeypatch.setenv('AWS_MAX_POOL_CONNECTIONS', '7')
+    monkeypatch.setenv('AWS_READ_TIMEOUT', '3')
+
+    config = build_client_config()
+
+    assert config.max_pool_connections == 7
+    assert config.read_timeout == 3
+
+def test_clear_drops_cached_clients(client_cache):
+    """clear() descarta os clientes para que sejam recriados."""
+    sqs = client_cache.client('sqs')
+    client_cache.clear()
+
+    assert client_cache.client('sqs') is not sqs
@@ -0,0 +1,123 @@
+import pytest
+from src.modules.shared.events.validators import (
+    SQSBatchValidator,
+    KinesisBatchValidator,
+    DynamoDBBatchValidator,
+    S3BatchValidator,
+    SNSBatchValidator
+)
+from src.modules.shared.routing.event_router import EventRouter, EventValidationError
+from src.modules.shared.events.interfaces import EventType
+
+def sqs_record(message_id):
+    return {
+        'messageId': message_id,
+        'body': '{}',
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': 'arn:aws:sqs:us-east-1:123456789012:upsert-queue'
+    }
+
+@pytest.fixture
+def context():
+    class LambdaContext:
+        function_name = "test-function"
+        function_version = "1"
+        memory_limit_in_mb = 128
+        aws_request_id = "test-request-id"
+    return LambdaContext()
+
+def test_batch_validator_reports_every_invalid_record():
+    """Registros inválidos em qualquer posição são reportados por índice."""
+    records = [sqs_record('1'), {'eventSource': 'aws:sqs'}, sqs_record('3'), 'invalid']
+
+    result = SQSBatchValidator().validate_batch({'Records': records})
+
+    assert result.total == 4
+    assert result.invalid_indices == [1, 3]
+    assert result.valid_count == 2
+    assert not result.is_valid
+
+def test_batch_validator_rejects_missing_records():
+    result = KinesisBatchValidator().validate_batch({'Records': []})
+
+    assert result.error == "missing_records"
+    assert not KinesisBatchValidator().validate({})
+
+@pytest.mark.parametrize("validator, record", [
+    (KinesisBatchValidator(), {'eventSource': 'aws:kinesis', 'kinesis': {'data': 'e30='}}),
+    (DynamoDBBatchValidator(), {'eventSource': 'aws:dynamodb', 'dynamodb': {}}),
+    (S3BatchValidator(), {'eventSource': 'aws:s3', 's3': {}}),
+    (SNSBatchValidator(), {'EventSource': 'aws:sns', 'Sns': {}})
+])
+def test_batch_validators_accept_valid_records(validator, record):
+    assert validator.validate({'Records': [record, record]})
+    assert validator.validate_batch({'Records': [record, {'other': 1}]}).invalid_indices == [1]
+
+async def test_router_rejects_batch_with_invalid_indices_by_default(context):
+    router = EventRouter()
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+
+    with pytest.raises(EventValidationError) as exc_info:
+        await router.route({'Records': [sqs_record('1'), {'eventSource': 'aws:sqs'}]}, context)
+
+    assert exc_info.value.invalid_indices == [1]
+
+async def test_router_drops_invalid_records_when_enabled(context):
+    router = EventRouter(drop_invalid_records=True)
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+
+    results = await router.route({'Records': [
+        sqs_record('1'),
+        {'eventSource': 'aws:sqs', 'messageId': 'broken'},
+        sqs_record('3')
+    ]}, context)
+
+    assert results == [['1', '3']]
+
+async def test_router_fails_when_every_record_is_invalid(context):
+    router = EventRouter(drop_invalid_records=True)
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+
+    with pytest.raises(EventValidationError):
+        await router.route({'Records': [{'eventSource': 'aws:sqs'}]}, context)
+
+async def test_router_reports_indices_relative_to_the_original_batch(context):
+    """Em lotes mistos os índices inválidos apontam para o lote original."""
+    router = EventRouter()
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+    router.register(EventType.KINESIS, _echo_handler, KinesisBatchValidator())
+
+    with pytest.raises(EventValidationError) as exc_info:
+        await router.route({'Records': [
+            sqs_record('1'),
+            {'eventSource': 'aws:kinesis', 'kinesis': {'data': 'e30='}},
+            sqs_record('3'),
+            {'eventSource': 'aws:kinesis'}
+        ]}, context)
+
+    assert exc_info.value.invalid_indices == [3]
+
+async def test_router_drops_unrecognized_records_when_enabled(context):
+    router = EventRouter(drop_invalid_records=True)
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+
+    results = await router.route({'Records': [
+        sqs_record('1'),
+        'invalid',
+        {'eventSource': 'aws:unknown'},
+        sqs_record('4')
+    ]}, context)
+
+    assert results == [['1', '4']]
+
+async def test_router_rejects_unrecognized_records_by_default(context):
+    router = EventRouter()
+    router.register(EventType.SQS, _echo_handler, SQSBatchValidator())
+
+    with pytest.raises(EventValidationError) as exc_info:
+        await router.route({'Records': [sqs_record('1'), None, {'eventSource': 'aws:unknown'}]}, context)
+
+    assert exc_info.value.invalid_indices == [1, 2]
+
+async def _echo_handler(event, context, metadata):
+    return [record['messageId'] for record in event['Records']]
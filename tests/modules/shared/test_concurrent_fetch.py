@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+import pytest
+from src.modules.shared.aws.concurrent_fetch import fetch_all
+from src.modules.shared.logging.histogram import LatencyHistogram
+from src.modules.lambda_drop_asset_event_producer.infrastructure.queues import sqs_message_consumer as drop_consumer
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.queues import sqs_message_consumer as upsert_consumer
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
+
+def test_results_keep_input_order_and_isolate_errors():
+    def fetch(item):
+        time.sleep(0.01 * (5 - item))
+        if item == 2:
+            raise ValueError("objeto inválido")
+        return item * 10
+
+    outcomes = fetch_all([0, 1, 2, 3, 4], fetch, max_workers=5)
+
+    assert [outcome.value for outcome in outcomes] == [0, 10, None, 30, 40]
+    assert isinstance(outcomes[2].error, ValueError)
+    assert all(outcome.error is None for index, outcome in enumerate(outcomes) if index != 2)
+
+def test_concurrency_is_bounded():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fetch(item):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return item
+
+    fetch_all(list(range(9)), fetch, max_workers=3)
+
+    assert peak == 3
+
+def test_histogram_records_every_fetch():
+    histogram = LatencyHistogram(buckets_ms=(1, 50))
+
+    fetch_all([0.0, 0.0, 0.01], time.sleep, max_workers=3, histogram=histogram)
+
+    summary = histogram.to_dict()
+    assert summary['count'] == 3
+    assert summary['buckets']['le_1'] == 2
+    assert summary['buckets']['le_50'] == 1
+    assert summary['p50_ms'] == 1
+    assert summary['p99_ms'] == 50
+
+class FakeSQS:
+    def receive_message(self, **kwargs):
+        return {'Messages': [
+            {'MessageId': f'm-{i}', 'ReceiptHandle': f'r-{i}', 'Body': json.dumps({'event_location': f's3://bucket/{i}'})}
+            for i in range(4)
+        ] + [{'MessageId': 'm-bad', 'ReceiptHandle': 'r-bad', 'Body': 'not json'}]}
+
+class SlowReader:
+    def read_event(self, event_location):
+        key = event_location.rsplit('/', 1)[1]
+        time.sleep(0.05)
+        if key == '1':
+            raise FileNotFoundError(event_location)
+        return {'key': key}
+
+def test_consumer_reads_payloads_concurrently_in_message_order():
+    consumer = SQSMessageConsumer(event_reader=SlowReader(), sqs_client=FakeSQS(), fetch_concurrency=4)
+
+    start = time.perf_counter()
+    messages = consumer.receive_messages('queue-url')
+    elapsed = time.perf_counter() - start
+
+    assert [message['MessageId'] for message in messages] == ['m-0', 'm-2', 'm-3']
+    assert [message['Body'] for message in messages] == [{'key': '0'}, {'key': '2'}, {'key': '3'}]
+    assert elapsed < 0.15
+
+@pytest.mark.parametrize("module", [upsert_consumer, drop_consumer])
+def test_load_failures_are_logged_with_the_message_id(module, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(module.logger, 'warning', lambda message, extra: warnings.append((message, extra)))
+    consumer = module.SQSMessageConsumer(event_reader=SlowReader(), sqs_client=FakeSQS(), fetch_concurrency=4)
+
+    consumer.receive_messages('queue-url')
+
+    assert sorted(extra['message_id'] for _, extra in warnings) == ['m-1', 'm-bad']
+    assert all(message == "Erro ao carregar evento" and extra['error'] for message, extra in warnings)
@@ -0,0 +1,74 @@
+import json
+import pytest
+from src.modules.lambda_event_decisor.container import EventDecisionContainer
+from src.modules.lambda_event_decisor.domain.entities.event import Event
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = json.loads(Body)
+
+class FakeSQS:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append((QueueUrl, json.loads(MessageBody)))
+
+def attribute(name, data_type='varchar'):
+    return {
+        'attribute_name': name,
+        'data_type': data_type,
+        'is_primary_key': False,
+        'is_nullable': True,
+        'default_value': None,
+        'comment_description': None
+    }
+
+def table_event(attributes, correlation_id):
+    return Event(
+        technology_name='rds',
+        instance_technology_name='postgres',
+        asset_parent_name='db',
+        asset_name='orders',
+        aws_account_number='123456789012',
+        status='completed',
+        correlation_id=correlation_id,
+        metadata={'attributes': attributes, 'indexed_field_list': []}
+    )
+
+@pytest.fixture
+def container(monkeypatch):
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('EVENTS_BUCKET_NAME', 'events')
+    monkeypatch.setenv('UPSERT_QUEUE_URL', 'upsert-queue')
+    monkeypatch.setenv('DROP_QUEUE_URL', 'drop-queue')
+    monkeypatch.setenv('UPSERT_SNAPSHOT_INTERVAL', '5')
+    container = EventDecisionContainer()
+    container.event_storage.s3 = FakeS3()
+    container.event_producer.sqs = FakeSQS()
+    return container
+
+def test_container_wires_snapshot_interval_from_env(container):
+    assert container.event_decision_service.snapshot_interval == 5
+    assert container.process_event_use_case.decision_service is container.event_decision_service
+
+def test_changed_asset_is_published_as_delta_through_the_container(container, monkeypatch):
+    attributes = [attribute(f'col_{index}') for index in range(10)]
+    stored = container.event_decision_service.decide_event_action(table_event(attributes, 'c-1'), None).asset
+    saved = []
+    monkeypatch.setattr(container.asset_repository, 'find_by_event', lambda event: stored)
+    monkeypatch.setattr(container.asset_repository, 'save', saved.append)
+
+    changed = list(attributes)
+    changed[3] = attribute('col_3', 'text')
+    container.process_event_use_case.execute(table_event(changed, 'c-2'))
+
+    assert saved[0].deltas_since_snapshot == 1
+    queue_url, message = container.event_producer.sqs.messages[0]
+    assert queue_url == 'upsert-queue' and message['event_type'] == 'upsert'
+    payload = next(iter(container.event_storage.s3.objects.values()))
+    assert payload['change_type'] == 'delta'
+    assert payload['modified_attributes'] == ['col_3']
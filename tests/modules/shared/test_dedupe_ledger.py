@@ -0,0 +1,208 @@
+import json
+from src.modules.shared.kafka.batch_publisher import BatchPublisher, OutboundMessage, PublishResult, kafka_producer_config
+from src.modules.shared.kafka.dedupe_ledger import (
+    DynamoDBDedupeLedger,
+    InMemoryDedupeLedger,
+    dedupe_key,
+    dedupe_ledger_from_env
+)
+from src.modules.lambda_drop_asset_event_producer.application.use_cases.process_drop_events import ProcessDropEventsUseCase
+from kafka.future import Future
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_in_memory_ledger_filters_marked_keys_until_expiry():
+    clock = FakeClock()
+    ledger = InMemoryDedupeLedger(ttl_hours=1, clock=clock)
+
+    ledger.mark(['a', 'b'])
+
+    assert ledger.filter_seen(['a', 'c']) == {'a'}
+    clock.now = 3601
+    assert ledger.filter_seen(['a', 'b']) == set()
+
+def test_in_memory_ledger_evicts_oldest_entries():
+    ledger = InMemoryDedupeLedger(max_entries=2)
+
+    ledger.mark(['a', 'b', 'c'])
+
+    assert ledger.filter_seen(['a', 'b', 'c']) == {'b', 'c'}
+
+class FakeDynamoDB:
+    """Cliente simulado: a primeira chamada de cada operação deixa um item pendente."""
+
+    def __init__(self):
+        self.items = {}
+        self.get_calls = 0
+        self.write_calls = 0
+
+    def batch_get_item(self, RequestItems):
+        self.get_calls += 1
+        (table, request), = RequestItems.items()
+        keys = request['Keys']
+        pending, keys = (keys[-1:], keys[:-1]) if self.get_calls == 1 and len(keys) > 1 else ([], keys)
+        found = [{'dedupe_key': key['dedupe_key']} for key in keys if key['dedupe_key']['S'] in self.items]
+        response = {'Responses': {table: found}}
+        if pending:
+            response['UnprocessedKeys'] = {table: {**request, 'Keys': pending}}
+        return response
+
+    def batch_write_item(self, RequestItems):
+        self.write_calls += 1
+        (table, requests), = RequestItems.items()
+        pending, requests = (requests[-1:], requests[:-1]) if self.write_calls == 1 and len(requests) > 1 else ([], requests)
+        for request in requests:
+            item = request['PutRequest']['Item']
+            self.items[item['dedupe_key']['S']] = item['expires_at']['N']
+        return {'UnprocessedItems': {table: pending}} if pending else {}
+
+def test_dynamodb_ledger_retries_unprocessed_items(monkeypatch):
+    monkeypatch.setattr('src.modules.shared.kafka.dedupe_ledger.time.sleep', lambda seconds: None)
+    client = FakeDynamoDB()
+    ledger = DynamoDBDedupeLedger('dedupe', dynamodb_client=client)
+
+    ledger.mark(['a', 'b'])
+
+    assert set(client.items) == {'a', 'b'}
+    assert client.write_calls == 2
+    assert ledger.filter_seen(['a', 'b', 'c']) == {'a', 'b'}
+    assert client.get_calls == 2
+
+def test_ledger_from_env_requires_exactly_once_mode():
+    assert dedupe_ledger_from_env({}) is None
+    assert isinstance(dedupe_ledger_from_env({'KAFKA_EXACTLY_ONCE': 'true'}), InMemoryDedupeLedger)
+
+def test_exactly_once_config_uses_stable_transactional_id():
+    env = {
+        'KAFKA_EXACTLY_ONCE': 'true',
+        'AWS_LAMBDA_FUNCTION_NAME': 'upsert-producer',
+        'AWS_LAMBDA_LOG_STREAM_NAME': '2026/10/19/[$LATEST]abc'
+    }
+
+    config = kafka_producer_config(env)
+
+    assert config['enable_idempotence'] is True
+    assert config['acks'] == 'all'
+    assert config['transactional_id'].startswith('upsert-producer-')
+    assert kafka_producer_config(env)['transactional_id'] == config['transactional_id']
+    assert 'transactional_id' not in kafka_producer_config({})
+
+class FakeTransactionalProducer:
+    """KafkaProducer transacional simulado."""
+
+    def __init__(self, commit_fails=False):
+        self.config = {'transactional_id': 'tx-1'}
+        self.commit_fails = commit_fails
+        self.calls = []
+        self.sent = []
+        self._pending = []
+
+    def init_transactions(self):
+        self.calls.append('init')
+
+    def begin_transaction(self):
+        self.calls.append('begin')
+
+    def send(self, topic, value, key=None, headers=None):
+        future = Future()
+        self.sent.append((value, headers))
+        self._pending.append(future)
+        return future
+
+    def commit_transaction(self):
+        if self.commit_fails:
+            raise RuntimeError("producer fenced")
+        self.calls.append('commit')
+        for future in self._pending:
+            future.success(None)
+        self._pending = []
+
+    def abort_transaction(self):
+        self.calls.append('abort')
+        self._pending = []
+
+    def flush(self, timeout=None):
+        raise AssertionError("flush não deve ser usado no modo transacional")
+
+def test_transactional_publisher_commits_each_batch():
+    producer = FakeTransactionalProducer()
+    publisher = BatchPublisher(producer, flush_timeout_seconds=1)
+
+    publisher.publish('topic', [OutboundMessage('a', 1, headers=[('dedupe_id', b'a')])])
+    result = publisher.publish('topic', [OutboundMessage('b', 2)])
+
+    assert producer.calls == ['init', 'begin', 'commit', 'begin', 'commit']
+    assert producer.sent[0] == (b'1', [('dedupe_id', b'a')])
+    assert result.delivered == ['b']
+
+def test_aborted_transaction_fails_whole_batch():
+    producer = FakeTransactionalProducer(commit_fails=True)
+
+    result = BatchPublisher(producer, flush_timeout_seconds=1).publish('topic', [
+        OutboundMessage('a', 1),
+        OutboundMessage('b', 2)
+    ])
+
+    assert producer.calls == ['init', 'begin', 'abort']
+    assert result.delivered == []
+    assert set(result.failed) == {'a', 'b'}
+    assert 'producer fenced' in result.failed['a']
+
+class FakeQueue:
+    def __init__(self, messages):
+        self.messages = messages
+        self.deleted = []
+        self.delete_batches = []
+
+    def receive_messages(self, queue_url, max_messages=10):
+        return self.messages
+
+    def delete_message(self, queue_url, receipt_handle):
+        self.deleted.append(receipt_handle)
+
+    def delete_messages(self, queue_url, receipt_handles):
+        self.delete_batches.append(list(receipt_handles))
+        self.deleted.extend(receipt_handles)
+        return {}
+
+class RecordingProducer:
+    def __init__(self):
+        self.batches = []
+
+    def produce_events(self, topic, events):
+        self.batches.append([key for key, _ in events])
+        return PublishResult(delivered=[key for key, _ in events])
+
+def drop_message(message_id, receipt_handle):
+    body = {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'orders',
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres'
+    }
+    return {'MessageId': message_id, 'ReceiptHandle': receipt_handle, 'Body': json.dumps(body)}
+
+def test_redelivered_messages_are_deleted_without_republishing():
+    ledger = InMemoryDedupeLedger()
+    producer = RecordingProducer()
+    use_case = ProcessDropEventsUseCase(FakeQueue([drop_message('m-1', 'r-1')]), producer, dedupe_ledger=ledger)
+
+    first = use_case.execute('queue-url', 'topic')
+    use_case.message_queue = FakeQueue([drop_message('m-1', 'r-1b'), drop_message('m-2', 'r-2')])
+    second = use_case.execute('queue-url', 'topic')
+
+    assert producer.batches == [[dedupe_key('drop', 'm-1')], [dedupe_key('drop', 'm-2')]]
+    assert first['processed'] == 1
+    assert second['duplicates_skipped'] == 1
+    assert second['processed'] == 1
+    assert use_case.message_queue.deleted == ['r-1b', 'r-2']
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+import pytest
+from src.modules.shared.container.dependency_container import DependencyContainer
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_get_or_create_is_single_flight_across_threads():
+    """Threads concorrentes constroem a dependência uma única vez."""
+    container = DependencyContainer()
+    builds = []
+
+    def factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(container.get_or_create('producer', factory)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
+
+@pytest.mark.asyncio
+async def test_get_or_create_async_is_single_flight():
+    """Tasks concorrentes aguardam a mesma construção assíncrona."""
+    container = DependencyContainer()
+    builds = []
+
+    async def factory():
+        builds.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*[
+        container.get_or_create_async('client', factory) for _ in range(5)
+    ])
+
+    assert len(builds) == 1
+    assert all(result is results[0] for result in results)
+
+def test_ttl_uses_monotonic_clock_and_closes_expired():
+    """Instâncias expiradas são removidas e encerradas pelo hook."""
+    clock = FakeClock()
+    container = DependencyContainer(clock=clock)
+    closed = []
+
+    container.register('producer', 'p1', ttl_minutes=1, on_close=closed.append)
+    clock.now = 30
+    assert container.get('producer') == 'p1'
+
+    clock.now = 30 + 61
+    assert container.get('producer') is None
+    assert closed == ['p1']
+
+def test_lru_eviction_calls_close_hook():
+    """Acima do limite, a instância menos usada é despejada e encerrada."""
+    container = DependencyContainer(max_entries=2)
+    closed = []
+
+    container.register('a', 'A', on_close=closed.append)
+    container.register('b', 'B', on_close=closed.append)
+    container.get('a')
+    container.register('c', 'C', on_close=closed.append)
+
+    assert closed == ['B']
+    assert container.get('a') == 'A'
+    assert container.get('b') is None
+
+def test_close_hooks_run_without_the_container_lock():
+    """Um hook de fechamento lento não bloqueia o acesso de outras threads ao container."""
+    container = DependencyContainer(max_entries=1)
+    reads = []
+
+    def close(instance):
+        reader = threading.Thread(target=lambda: reads.append(container.get('b')))
+        reader.start()
+        reader.join(timeout=1)
+        reads.append(reader.is_alive())
+
+    container.register('a', 'A', on_close=close)
+    container.register('b', 'B')
+
+    assert reads == ['B', False]
+
+def test_build_time_is_exposed_per_key():
+    """O tempo de construção de cada chave é exposto como métrica."""
+    container = DependencyContainer()
+    container.get_or_create('reader', lambda: object())
+
+    metrics = container.get_build_metrics()
+
+    assert set(metrics) == {'reader'}
+    assert metrics['reader'] >= 0
+
+def test_env_vars_are_available_to_subclasses():
+    """As variáveis de ambiente ficam disponíveis para as factories."""
+    container = DependencyContainer({'KAFKA_TOPIC': 'assets'})
+
+    assert container.env['KAFKA_TOPIC'] == 'assets'
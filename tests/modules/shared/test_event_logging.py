@@ -0,0 +1,102 @@
+import pytest
+from src.modules.shared.logging.logger import (
+    EventLogPolicy,
+    TRUNCATION_MARKER,
+    log_event,
+    summarize_event
+)
+
+def sqs_batch(size, body_size=100):
+    return {'Records': [
+        {'messageId': str(i), 'eventSource': 'aws:sqs', 'body': 'x' * body_size}
+        for i in range(size)
+    ]}
+
+class SpyLogger:
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.calls = []
+
+    def isEnabledFor(self, level):
+        return self.enabled
+
+    def info(self, message, extra=None):
+        self.calls.append(extra)
+
+def test_batches_are_summarized_without_bodies():
+    """Por padrão, lotes viram um resumo com contagem por origem."""
+    event = sqs_batch(3)
+    event['Records'].append({'eventSource': 'aws:kinesis', 'kinesis': {'data': 'e30='}})
+
+    summary = summarize_event(event, EventLogPolicy())
+
+    assert summary == {'records_count': 4, 'event_sources': {'aws:sqs': 3, 'aws:kinesis': 1}}
+
+def test_bodies_are_truncated_to_max_bytes():
+    """Com include_bodies, os registros são serializados até o limite."""
+    policy = EventLogPolicy(include_bodies=True, max_bytes=500)
+
+    summary = summarize_event(sqs_batch(100, body_size=200), policy)
+
+    assert summary['records_count'] == 100
+    assert summary['records_logged'] < 100
+    assert sum(len(part) for part in summary['records']) <= 500 + len(TRUNCATION_MARKER) * summary['records_logged']
+
+def test_non_batch_events_are_truncated():
+    event = {'detail-type': 'x', 'detail': {'payload': 'y' * 1000}}
+
+    text = summarize_event(event, EventLogPolicy(max_bytes=50))
+
+    assert text.endswith(TRUNCATION_MARKER)
+    assert len(text) == 50 + len(TRUNCATION_MARKER)
+
+def test_serialization_stops_at_the_byte_budget():
+    """Eventos grandes são serializados só até o limite, não por inteiro."""
+    serialized = []
+
+    class Item:
+        def __str__(self):
+            serialized.append(self)
+            return 'item'
+
+    text = summarize_event({'detail-type': 'x', 'detail': [Item() for _ in range(10000)]}, EventLogPolicy(max_bytes=100))
+
+    assert text.endswith(TRUNCATION_MARKER)
+    assert len(serialized) < 20
+
+def test_limit_is_measured_in_utf8_bytes():
+    event = {'detail': 'ç' * 100}
+    event['self'] = event
+
+    text = summarize_event(event, EventLogPolicy(max_bytes=51))
+
+    assert text.endswith(TRUNCATION_MARKER)
+    assert len(text[:-len(TRUNCATION_MARKER)].encode('utf-8')) <= 51
+
+def test_log_event_skips_serialization_when_level_disabled(mocker):
+    """Com o nível desabilitado nada é serializado."""
+    summarize = mocker.patch('src.modules.shared.logging.logger.summarize_event')
+    logger = SpyLogger(enabled=False)
+
+    log_event(logger, sqs_batch(10))
+
+    assert logger.calls == []
+    summarize.assert_not_called()
+
+def test_log_event_respects_sample_rate(mocker):
+    """Eventos fora da amostra não são logados."""
+    mocker.patch('src.modules.shared.logging.logger.random.random', return_value=0.9)
+    logger = SpyLogger()
+
+    log_event(logger, sqs_batch(1), policy=EventLogPolicy(sample_rate=0.5))
+    assert logger.calls == []
+
+    log_event(logger, sqs_batch(1), policy=EventLogPolicy(sample_rate=0.95))
+    assert logger.calls == [{'event': {'records_count': 1, 'event_sources': {'aws:sqs': 1}}}]
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv('EVENT_LOG_SAMPLE_RATE', '0.1')
+    monkeypatch.setenv('EVENT_LOG_MAX_BYTES', '1024')
+    monkeypatch.setenv('EVENT_LOG_INCLUDE_BODIES', 'true')
+
+    assert EventLogPolicy.from_env() == EventLogPolicy(sample_rate=0.1, max_bytes=1024, include_bodies=True)
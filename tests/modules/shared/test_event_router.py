@@ -0,0 +1,151 @@
+import pytest
+from src.modules.shared.routing.event_router import EventRouter, EventValidationError, HandlerNotFoundError
+from src.modules.shared.events.interfaces import EventType
+
+def sqs_record(message_id, queue='upsert-queue'):
+    return {
+        'messageId': message_id,
+        'body': '{}',
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': f'arn:aws:sqs:us-east-1:123456789012:{queue}'
+    }
+
+def kinesis_record(sequence):
+    return {
+        'eventSource': 'aws:kinesis',
+        'eventSourceARN': 'arn:aws:kinesis:us-east-1:123456789012:stream/asset-input',
+        'kinesis': {'data': 'e30=', 'sequenceNumber': sequence}
+    }
+
+@pytest.fixture
+def context():
+    class LambdaContext:
+        function_name = "test-function"
+        function_version = "1"
+        memory_limit_in_mb = 128
+        aws_request_id = "test-request-id"
+    return LambdaContext()
+
+def recording_handler(name, calls):
+    async def handler(event, context, metadata):
+        calls.append((name, [r.get('messageId') or r['kinesis']['sequenceNumber'] for r in event['Records']]))
+        return {'handler': name, 'count': len(event['Records'])}
+    handler.__name__ = name
+    return handler
+
+def test_detects_type_from_dispatch_table_and_caches_arn():
+    """O tipo é resolvido pelo eventSource e memorizado por ARN."""
+    router = EventRouter()
+    record = sqs_record('1')
+
+    assert router._detect_event_type({'Records': [record]}) == EventType.SQS
+    assert router._arn_cache[record['eventSourceARN']] == EventType.SQS
+
+def test_detects_type_from_arn_prefix_without_event_source():
+    """Sem eventSource, o prefixo do ARN define o tipo."""
+    router = EventRouter()
+    record = {'eventSourceARN': 'arn:aws:dynamodb:us-east-1:123:table/assets/stream/x'}
+
+    assert router._detect_event_type({'Records': [record]}) == EventType.DYNAMODB
+
+def test_detects_non_record_events():
+    router = EventRouter()
+
+    assert router._detect_event_type({'detail-type': 'x', 'source': 'aws.events', 'detail': {}}) == EventType.CLOUDWATCH
+    assert router._detect_event_type({'foo': 'bar'}) is None
+
+@pytest.mark.asyncio
+async def test_mixed_batch_is_split_per_type(context):
+    """Lotes mistos são separados em sub-lotes por tipo."""
+    router = EventRouter()
+    calls = []
+    router.register(EventType.SQS, recording_handler('sqs_handler', calls))
+    router.register(EventType.KINESIS, recording_handler('kinesis_handler', calls))
+
+    event = {'Records': [sqs_record('a'), kinesis_record('1'), sqs_record('b')]}
+    results = await router.route(event, context)
+
+    assert sorted(calls) == [('kinesis_handler', ['1']), ('sqs_handler', ['a', 'b'])]
+    assert results == [
+        {'handler': 'sqs_handler', 'count': 2},
+        {'handler': 'kinesis_handler', 'count': 1}
+    ]
+
+@pytest.mark.asyncio
+async def test_unknown_record_type_raises(context):
+    router = EventRouter()
+    router.register(EventType.SQS, recording_handler('sqs_handler', []))
+
+    with pytest.raises(EventValidationError) as exc_info:
+        await router.route({'Records': [sqs_record('a'), {'foo': 'bar'}]}, context)
+
+    assert exc_info.value.invalid_indices == [1]
+
+@pytest.mark.asyncio
+async def test_missing_handler_raises(context):
+    router = EventRouter()
+
+    with pytest.raises(HandlerNotFoundError):
+        await router.route({'Records': [kinesis_record('1')]}, context)
+
+@pytest.mark.asyncio
+async def test_fan_out_runs_handlers_concurrently_in_registration_order(context):
+    """No modo fan-out os handlers rodam juntos e os resultados seguem a ordem de registro."""
+    import asyncio
+    router = EventRouter(fan_out=True)
+    started = []
+
+    async def slow(event, context, metadata):
+        started.append('slow')
+        await asyncio.sleep(0.05)
+        return {'handler': 'slow'}
+
+    async def fast(event, context, metadata):
+        started.append('fast')
+        return {'handler': 'fast'}
+
+    router.register(EventType.SQS, slow)
+    router.register(EventType.SQS, fast)
+
+    results = await router.route({'Records': [sqs_record('a')]}, context)
+
+    assert started == ['slow', 'fast']
+    assert results == [{'handler': 'slow'}, {'handler': 'fast'}]
+
+@pytest.mark.asyncio
+async def test_fan_out_isolates_failures_and_timeouts(context):
+    """Falhas e timeouts de um handler não afetam os demais."""
+    import asyncio
+    router = EventRouter(fan_out=True)
+
+    async def process_message(event, context, metadata):
+        return {'processed': True}
+
+    async def audit_message(event, context, metadata):
+        await asyncio.sleep(1)
+
+    async def broken(event, context, metadata):
+        raise RuntimeError("falhou")
+
+    router.register(EventType.SQS, process_message)
+    router.register(EventType.SQS, audit_message, timeout=0.01)
+    router.register(EventType.SQS, broken)
+
+    results = await router.route({'Records': [sqs_record('a')]}, context)
+
+    assert results[0] == {'processed': True}
+    assert results[1]['error_type'] == 'timeout'
+    assert results[2] == {'handler': 'broken', 'error': 'falhou', 'error_type': 'RuntimeError'}
+
+@pytest.mark.asyncio
+async def test_sequential_mode_propagates_failures(context):
+    """Fora do modo fan-out a primeira falha interrompe o roteamento."""
+    router = EventRouter()
+
+    async def broken(event, context, metadata):
+        raise RuntimeError("falhou")
+
+    router.register(EventType.SQS, broken)
+
+    with pytest.raises(RuntimeError):
+        await router.route({'Records': [sqs_record('a')]}, context)
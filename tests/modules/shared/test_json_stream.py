@@ -0,0 +1,135 @@
+import json
+import pytest
+from src.modules.shared.serialization.json_stream import JsonStreamWriter, StreamParseError, stream_object
+from src.modules.shared.kafka.passthrough import PassthroughEvent, SchemaValidationError
+from src.modules.lambda_upsert_asset_event_producer.application.use_cases.process_upsert_events import ProcessUpsertEventsUseCase
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.storage.streaming_event_encoder import encode_event_stream
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+def upsert_body(columns=3):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'pedidos',
+        'asset_parent_name': 'db',
+        'asset_counts': 1,
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f'coluna_{i}',
+                'data_type': 'numeric(12,2)',
+                'is_primary_key': i == 0,
+                'is_nullable': True,
+                'default_value': None,
+                'comment_description': 'descrição ção 🚀'
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': ['coluna_0']}],
+        'extra': {'scale': 1.25e-3, 'flags': [True, False, None]}
+    }
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 100000])
+def test_fields_and_items_survive_any_chunk_boundary(size):
+    body = upsert_body()
+    data = json.dumps(body, indent=2, ensure_ascii=False).encode('utf-8')
+
+    parsed = {}
+    for key, value in stream_object(chunked(data, size), ('attributes',)):
+        parsed[key] = list(value) if key == 'attributes' else value
+
+    assert parsed == body
+
+def test_numbers_split_across_chunks_are_not_truncated():
+    assert dict(stream_object([b'{"a": 12', b'345, "b": tr', b'ue}'])) == {'a': 12345, 'b': True}
+
+MIXED_PAYLOAD = (
+    b'{"a": 12.5, "b": [1, 2], "c": -0.5e-3, "d": 1E+10, "e": -0, "f": 0.25,'
+    b' "g": [true, null, false], "h": {"x": -12.75e2}, "i": "fim"}'
+)
+
+@pytest.mark.parametrize('offset', range(1, len(MIXED_PAYLOAD)))
+def test_payload_split_at_any_byte_matches_json_loads(offset):
+    chunks = [MIXED_PAYLOAD[:offset], MIXED_PAYLOAD[offset:]]
+
+    parsed = {key: list(value) if key == 'b' else value for key, value in stream_object(chunks, ('b',))}
+
+    assert parsed == json.loads(MIXED_PAYLOAD)
+
+def test_unconsumed_items_are_skipped():
+    data = b'{"attributes": [1, 2, 3], "after": "x"}'
+
+    assert [key for key, _ in stream_object(chunked(data, 4), ('attributes',))] == ['attributes', 'after']
+
+@pytest.mark.parametrize('data', [b'[1]', b'{"a": 1', b'{"a": [1, 2}', b'{"a": 1} x', b'{1: 2}', b''])
+def test_invalid_payloads_raise(data):
+    with pytest.raises(StreamParseError):
+        # Itens não consumidos são percorridos (e validados) pelo próprio stream
+        for _ in stream_object(chunked(data, 2), ('a',)):
+            pass
+
+def test_writer_matches_compact_json():
+    body = upsert_body()
+    writer = JsonStreamWriter()
+    for key, value in body.items():
+        if key == 'attributes':
+            writer.begin_array(key)
+            for attr in value:
+                writer.item(attr)
+            writer.end_array()
+        else:
+            writer.field(key, value)
+
+    assert writer.getvalue() == json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+def test_encoder_produces_validated_compact_payload():
+    body = upsert_body(columns=50)
+
+    event = encode_event_stream(chunked(json.dumps(body, indent=4).encode('utf-8'), 256))
+
+    assert event.payload == json.dumps(body, separators=(',', ':')).encode('utf-8')
+    assert event.asset_name == 'pedidos'
+
+def test_encoder_reports_invalid_attribute_with_path():
+    body = upsert_body()
+    del body['attributes'][2]['data_type']
+
+    with pytest.raises(SchemaValidationError, match=r'attributes\[2\]\.data_type'):
+        encode_event_stream([json.dumps(body).encode('utf-8')])
+
+def test_encoder_requires_attributes():
+    body = upsert_body()
+    del body['attributes']
+
+    with pytest.raises(SchemaValidationError, match='attributes'):
+        encode_event_stream([json.dumps(body).encode('utf-8')])
+
+class StreamingReader:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def read_stream(self, event_location):
+        return iter(chunked(self.payloads[event_location.rsplit('/', 1)[1]], 10))
+
+class FakeSQS:
+    def receive_message(self, **kwargs):
+        return {'Messages': [
+            {'MessageId': f'm-{name}', 'ReceiptHandle': f'r-{name}', 'Body': json.dumps({'event_location': f's3://bucket/{name}'})}
+            for name in ('ok', 'broken')
+        ]}
+
+def test_streaming_consumer_delivers_encoded_events():
+    reader = StreamingReader({'ok': json.dumps(upsert_body()).encode('utf-8'), 'broken': b'{"attributes": ['})
+    consumer = SQSMessageConsumer(event_reader=reader, sqs_client=FakeSQS(), fetch_concurrency=2, streaming=True)
+
+    messages = consumer.receive_messages('queue-url')
+
+    assert [message['MessageId'] for message in messages] == ['m-ok']
+    assert isinstance(messages[0]['Body'], PassthroughEvent)
+    assert ProcessUpsertEventsUseCase._to_event(messages[0]['Body']) is messages[0]['Body']
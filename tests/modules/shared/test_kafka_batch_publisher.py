@@ -0,0 +1,184 @@
+import json
+import pytest
+from kafka.errors import KafkaTimeoutError
+from kafka.future import Future
+from kafka.partitioner import DefaultPartitioner
+from src.modules.shared.kafka.batch_publisher import (
+    BatchPublisher,
+    COMPRESSION_CODECS,
+    OutboundMessage,
+    PublishResult,
+    RECORD_OVERHEAD_BYTES,
+    kafka_producer_config,
+    resolve_compression_type
+)
+from src.modules.lambda_drop_asset_event_producer.application.use_cases.process_drop_events import ProcessDropEventsUseCase
+
+class FakeProducer:
+    """KafkaProducer simulado: o flush resolve os futures pendentes."""
+
+    def __init__(self, fail_values=(), reject_values=(), flush_times_out=False):
+        self.fail_values = set(fail_values)
+        self.reject_values = set(reject_values)
+        self.flush_times_out = flush_times_out
+        self.sent = []
+        self.flush_calls = 0
+        self._pending = []
+
+    def send(self, topic, value, key=None, headers=None):
+        if value in self.reject_values:
+            raise ValueError("serialização inválida")
+        future = Future()
+        self.sent.append((topic, value, key))
+        self._pending.append((value, future))
+        return future
+
+    def flush(self, timeout=None):
+        self.flush_calls += 1
+        if self.flush_times_out:
+            raise KafkaTimeoutError("flush")
+        for value, future in self._pending:
+            if value in self.fail_values:
+                future.failure(RuntimeError("broker indisponível"))
+            else:
+                future.success(value)
+        self._pending = []
+
+def test_publishes_batch_with_single_flush():
+    producer = FakeProducer()
+
+    result = BatchPublisher(producer, flush_timeout_seconds=1).publish('topic', [
+        OutboundMessage('a', 1),
+        OutboundMessage('b', 2),
+        OutboundMessage('c', 3)
+    ])
+
+    assert producer.flush_calls == 1
+    assert result.delivered == ['a', 'b', 'c']
+    assert result.all_delivered
+
+def test_reports_failed_deliveries_per_message():
+    producer = FakeProducer(fail_values={b'2'}, reject_values={b'3'})
+
+    result = BatchPublisher(producer, flush_timeout_seconds=1).publish('topic', [
+        OutboundMessage('a', 1),
+        OutboundMessage('b', 2),
+        OutboundMessage('c', 3)
+    ])
+
+    assert result.delivered == ['a']
+    assert set(result.failed) == {'b', 'c'}
+    assert 'broker indisponível' in result.failed['b']
+    assert result.failed['c'].startswith('ValueError')
+
+def test_flush_timeout_marks_pending_messages_as_failed():
+    producer = FakeProducer(flush_times_out=True)
+
+    result = BatchPublisher(producer, flush_timeout_seconds=0.01).publish('topic', [OutboundMessage('a', 1)])
+
+    assert result.delivered == []
+    assert result.failed == {'a': 'delivery_timeout'}
+
+def test_producer_config_from_env():
+    config = kafka_producer_config({'KAFKA_LINGER_MS': '20', 'KAFKA_BATCH_SIZE': '1024'})
+
+    assert isinstance(config['partitioner'], DefaultPartitioner)
+    assert config == {
+        'linger_ms': 20,
+        'batch_size': 1024,
+        'compression_type': None,
+        'max_request_size': 1024 * 1024,
+        'partitioner': config['partitioner']
+    }
+
+def test_batch_size_is_capped_by_max_request_size():
+    config = kafka_producer_config({'KAFKA_BATCH_SIZE': '500000', 'KAFKA_MAX_REQUEST_SIZE': '200000'})
+
+    assert config['batch_size'] == 200000
+
+def test_compression_type_validation(monkeypatch):
+    monkeypatch.setitem(COMPRESSION_CODECS, 'zstd', lambda: False)
+
+    assert resolve_compression_type('none') is None
+    assert resolve_compression_type('GZIP') == 'gzip'
+    assert resolve_compression_type('zstd') == 'gzip'
+    with pytest.raises(ValueError):
+        resolve_compression_type('brotli')
+
+def test_oversized_payload_is_rejected_before_send():
+    producer = FakeProducer()
+    publisher = BatchPublisher(producer, flush_timeout_seconds=1, max_request_size=RECORD_OVERHEAD_BYTES + 10)
+
+    result = publisher.publish('topic', [OutboundMessage('small', 1), OutboundMessage('big', 'x' * 100)])
+
+    assert result.delivered == ['small']
+    assert result.failed['big'].startswith('PayloadTooLargeError')
+    assert producer.sent == [('topic', b'1', None)]
+    assert result.bytes_uncompressed == 1
+
+def test_reports_compressed_bytes_from_producer_metrics():
+    producer = FakeProducer()
+    producer.metrics = lambda: {'producer-metrics': {'compression-rate-avg': 0.25}}
+
+    result = BatchPublisher(producer, flush_timeout_seconds=1).publish('topic', [OutboundMessage('a', 'x' * 98)])
+
+    assert result.bytes_uncompressed == 100
+    assert result.bytes_compressed == 25
+
+class FakeQueue:
+    def __init__(self, messages):
+        self.messages = messages
+        self.deleted = []
+        self.delete_batches = []
+
+    def receive_messages(self, queue_url, max_messages=10):
+        return self.messages
+
+    def delete_message(self, queue_url, receipt_handle):
+        self.deleted.append(receipt_handle)
+
+    def delete_messages(self, queue_url, receipt_handles):
+        self.delete_batches.append(list(receipt_handles))
+        self.deleted.extend(receipt_handles)
+        return {}
+
+class FakeEventProducer:
+    def __init__(self, failing_names):
+        self.failing_names = failing_names
+        self.batches = []
+
+    def produce_events(self, topic, events):
+        self.batches.append(list(events))
+        result = PublishResult()
+        for key, event in events:
+            if event.asset_name in self.failing_names:
+                result.failed[key] = "not delivered"
+            else:
+                result.delivered.append(key)
+        return result
+
+def drop_message(index, asset_name):
+    body = {
+        'correlation_id': f'c-{index}',
+        'status': 'completed',
+        'asset_name': asset_name,
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres'
+    }
+    return {'MessageId': f'm-{index}', 'ReceiptHandle': f'r-{index}', 'Body': json.dumps(body)}
+
+def test_use_case_deletes_only_delivered_messages():
+    queue = FakeQueue([drop_message(0, 'ok'), drop_message(1, 'broken'), drop_message(2, 'ok')])
+    producer = FakeEventProducer(failing_names={'broken'})
+
+    result = ProcessDropEventsUseCase(queue, producer).execute('queue-url', 'topic')
+
+    assert len(producer.batches) == 1
+    assert queue.deleted == ['r-0', 'r-2']
+    assert queue.delete_batches == [['r-0', 'r-2']]
+    assert result['processed'] == 2
+    assert result['errors'] == [{'message_id': 'm-1', 'error': 'not delivered'}]
@@ -0,0 +1,140 @@
+import json
+import pytest
+from kafka.future import Future
+from src.modules.shared.kafka.batch_publisher import BatchPublisher, OutboundMessage, RECORD_OVERHEAD_BYTES, json_serializer
+from src.modules.shared.kafka.chunking import (
+    CHUNK_COUNT_HEADER,
+    CHUNK_ID_HEADER,
+    CHUNK_INDEX_HEADER,
+    ChunkReassembler,
+    ChunkTooLargeError,
+    chunk_max_bytes,
+    chunking_enabled,
+    split_event
+)
+
+class RecordingProducer:
+    """KafkaProducer simulado que guarda valor, chave e cabeçalhos de cada envio."""
+
+    def __init__(self, fail_indexes=()):
+        self.fail_indexes = set(fail_indexes)
+        self.sent = []
+
+    def send(self, topic, value, key=None, headers=None):
+        future = Future()
+        if len(self.sent) in self.fail_indexes:
+            future.failure(RuntimeError("broker indisponível"))
+        else:
+            future.success(None)
+        self.sent.append((value, key, headers))
+        return future
+
+    def flush(self, timeout=None):
+        pass
+
+def wide_event(columns):
+    return {
+        'asset_name': 'orders',
+        'change_type': 'snapshot',
+        'attributes': [{'name': f'col_{index}', 'type': 'string'} for index in range(columns)]
+    }
+
+def test_split_event_keeps_fields_and_order_within_limit():
+    event = wide_event(200)
+
+    parts = split_event(event, 'attributes', 1024, json_serializer)
+
+    assert len(parts) > 1
+    assert all(len(part) <= 1024 for part in parts)
+    decoded = [json.loads(part) for part in parts]
+    assert all(part['asset_name'] == 'orders' for part in decoded)
+    assert [item for part in decoded for item in part['attributes']] == event['attributes']
+
+def test_split_event_rejects_item_larger_than_a_part():
+    event = {'asset_name': 'orders', 'attributes': [{'name': 'x' * 500}]}
+
+    with pytest.raises(ChunkTooLargeError):
+        split_event(event, 'attributes', 200, json_serializer)
+
+def test_oversized_event_is_published_in_parts_and_reassembled():
+    producer = RecordingProducer()
+    publisher = BatchPublisher(
+        producer,
+        flush_timeout_seconds=1,
+        max_request_size=RECORD_OVERHEAD_BYTES + 2048,
+        chunk_field='attributes'
+    )
+    event = wide_event(300)
+
+    result = publisher.publish('topic', [OutboundMessage('m1', event, b'orders', [('dedupe_id', b'm1')])])
+
+    assert result.delivered == ['m1']
+    assert len(producer.sent) > 1
+    assert {key for _, key, _ in producer.sent} == {b'orders'}
+    headers = [dict(sent_headers) for _, _, sent_headers in producer.sent]
+    assert len({h[CHUNK_ID_HEADER] for h in headers}) == 1
+    assert [int(h[CHUNK_INDEX_HEADER]) for h in headers] == list(range(len(headers)))
+    assert all(h['dedupe_id'] == b'm1' for h in headers)
+
+    reassembler = ChunkReassembler()
+    completed = [reassembler.add(sent_headers, value) for value, _, sent_headers in reversed(producer.sent)]
+    assert completed[:-1] == [None] * (len(completed) - 1)
+    assert completed[-1] == event
+    assert reassembler.pending == 0
+
+def test_passthrough_bytes_are_chunked_and_small_events_are_untouched():
+    producer = RecordingProducer()
+    publisher = BatchPublisher(producer, flush_timeout_seconds=1, chunk_field='attributes', chunk_max_bytes=1024)
+
+    result = publisher.publish('topic', [
+        OutboundMessage('small', wide_event(1)),
+        OutboundMessage('wide', json_serializer(wide_event(100)))
+    ])
+
+    assert result.delivered == ['small', 'wide']
+    assert producer.sent[0] == (json_serializer(wide_event(1)), None, None)
+    assert all(int(dict(headers)[CHUNK_COUNT_HEADER]) == len(producer.sent) - 1 for _, _, headers in producer.sent[1:])
+
+def test_event_fails_when_any_part_fails():
+    producer = RecordingProducer(fail_indexes={1})
+    publisher = BatchPublisher(producer, flush_timeout_seconds=1, chunk_field='attributes', chunk_max_bytes=1024)
+
+    result = publisher.publish('topic', [OutboundMessage('wide', wide_event(100))])
+
+    assert result.delivered == []
+    assert result.failed['wide'].startswith('RuntimeError')
+
+def test_without_chunk_field_oversized_event_is_rejected():
+    producer = RecordingProducer()
+    publisher = BatchPublisher(producer, flush_timeout_seconds=1, max_request_size=RECORD_OVERHEAD_BYTES + 1024)
+
+    result = publisher.publish('topic', [OutboundMessage('wide', wide_event(100))])
+
+    assert result.failed['wide'].startswith('PayloadTooLargeError')
+    assert producer.sent == []
+
+def test_reassembler_passes_through_plain_messages_and_expires_incomplete_events():
+    now = [0.0]
+    reassembler = ChunkReassembler(ttl_seconds=10, clock=lambda: now[0])
+    headers = [
+        ('chunk_id', b'abc'),
+        ('chunk_index', b'0'),
+        ('chunk_count', b'2'),
+        ('chunk_field', b'attributes')
+    ]
+
+    assert reassembler.add(None, b'{"a":1}') == {'a': 1}
+    assert reassembler.add(headers, b'{"attributes":[1]}') is None
+    now[0] = 11.0
+    assert reassembler.add([('other', b'x')], b'{}') == {}
+    assert reassembler.add(None, b'{}') == {}
+    assert reassembler.pending == 1
+    reassembler.add([('chunk_id', b'def')] + headers[1:], b'{"attributes":[1]}')
+    assert reassembler.pending == 1
+    assert reassembler.expired == 1
+
+def test_chunking_settings_from_env():
+    assert chunking_enabled({'KAFKA_CHUNKING': 'TRUE'})
+    assert not chunking_enabled({})
+    assert chunk_max_bytes({'KAFKA_CHUNK_MAX_BYTES': '4096'}) == 4096
+    assert chunk_max_bytes({}) is None
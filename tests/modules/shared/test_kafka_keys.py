@@ -0,0 +1,34 @@
+from kafka.partitioner.default import murmur2
+from src.modules.shared.kafka.keys import asset_key, event_asset_key
+from src.modules.lambda_drop_asset_event_producer.domain.entities.drop_event import DropEvent
+
+def drop_event(asset_name='orders', correlation_id='c-1'):
+    return DropEvent(
+        correlation_id=correlation_id,
+        status='completed',
+        asset_name=asset_name,
+        asset_parent_name='sales',
+        asset_counts='1',
+        aws_account_number='123456789012',
+        technology_service_name='rds',
+        asset_type='table',
+        instance_technology_name='postgres-prod'
+    )
+
+def test_asset_key_joins_identity_components():
+    assert asset_key('rds', 'postgres-prod', 'sales', 'orders', '123456789012') == (
+        b'rds/postgres-prod/sales/orders/123456789012'
+    )
+
+def test_asset_key_escapes_separator_and_handles_missing_parts():
+    assert asset_key('s3', None, 'bucket/prefix', '100%', '1') == b's3//bucket%2Fprefix/100%25/1'
+    assert asset_key('a/b', 'c', '', '', '') != asset_key('a', 'b/c', '', '', '')
+
+def test_event_key_ignores_non_identity_fields():
+    """Eventos do mesmo asset têm a mesma chave e, portanto, a mesma partição."""
+    first = event_asset_key(drop_event(correlation_id='c-1'))
+    second = event_asset_key(drop_event(correlation_id='c-2'))
+
+    assert first == second
+    assert (murmur2(first) & 0x7fffffff) % 12 == (murmur2(second) & 0x7fffffff) % 12
+    assert event_asset_key(drop_event(asset_name='customers')) != first
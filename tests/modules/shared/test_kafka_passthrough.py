@@ -0,0 +1,115 @@
+import json
+import pytest
+from kafka.future import Future
+from src.modules.shared.kafka.passthrough import PassthroughEvent, SchemaValidationError
+from src.modules.shared.kafka.keys import event_asset_key
+from src.modules.lambda_upsert_asset_event_producer.application.use_cases.process_upsert_events import ProcessUpsertEventsUseCase
+from src.modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import SCHEMA_VERSION, UpsertEvent
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.producers.kafka_event_producer import KafkaEventProducer
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
+from src.modules.shared.kafka.batch_publisher import BatchPublisher
+from src.modules.shared.kafka.routing_headers import RoutingHeaders
+
+def upsert_body(asset_name='orders'):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': asset_name,
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [{
+            'attribute_name': 'id',
+            'data_type': 'int',
+            'is_primary_key': True,
+            'is_nullable': False,
+            'default_value': None,
+            'comment_description': 'chave'
+        }],
+        'indexed_field_list': [{'indexed_field_composition': ['id']}]
+    }
+
+# Formatação original preservada: o passthrough não recodifica o payload
+RAW_PAYLOADS = {
+    'orders': json.dumps(upsert_body('orders'), indent=2).encode('utf-8'),
+    'invalid': json.dumps({**upsert_body('invalid'), 'attributes': [{'attribute_name': 'id'}]}).encode('utf-8')
+}
+
+class RawReader:
+    def read_event(self, event_location):
+        raise AssertionError("o modo passthrough não decodifica no consumidor")
+
+    def read_raw(self, event_location):
+        return RAW_PAYLOADS[event_location.rsplit('/', 1)[1]]
+
+class FakeSQS:
+    def __init__(self, names):
+        self.names = names
+        self.deleted = []
+
+    def receive_message(self, **kwargs):
+        return {'Messages': [
+            {'MessageId': f'm-{name}', 'ReceiptHandle': f'r-{name}', 'Body': json.dumps({'event_location': f's3://bucket/{name}'})}
+            for name in self.names
+        ]}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.deleted.extend(entry['ReceiptHandle'] for entry in Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries]}
+
+class RecordingKafkaProducer:
+    config = {}
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, topic, value, key=None, headers=None):
+        future = Future()
+        future.success(None)
+        self.sent.append((value, key))
+        return future
+
+    def flush(self, timeout=None):
+        pass
+
+def build_producer():
+    producer = KafkaEventProducer.__new__(KafkaEventProducer)
+    producer.producer = RecordingKafkaProducer()
+    producer.publisher = BatchPublisher(producer.producer, flush_timeout_seconds=1)
+    producer.binary_copy = None
+    producer.routing_headers = RoutingHeaders('upsert', SCHEMA_VERSION)
+    return producer
+
+def test_passthrough_forwards_original_bytes():
+    sqs = FakeSQS(['orders', 'invalid'])
+    consumer = SQSMessageConsumer(event_reader=RawReader(), sqs_client=sqs, passthrough=True)
+    producer = build_producer()
+
+    result = ProcessUpsertEventsUseCase(consumer, producer).execute('queue-url', 'topic')
+
+    assert result['processed'] == 1
+    assert sqs.deleted == ['r-orders']
+    assert 'attributes[0].data_type' in result['errors'][0]['error']
+    value, key = producer.producer.sent[0]
+    assert value == RAW_PAYLOADS['orders']
+    assert key == event_asset_key(UpsertEvent.from_dict(upsert_body('orders')))
+
+def test_decoded_bodies_are_not_parsed_again():
+    event = ProcessUpsertEventsUseCase._to_event(upsert_body())
+
+    assert isinstance(event, UpsertEvent)
+    assert event.attributes[0].attribute_name == 'id'
+
+def test_schema_validation_reports_field_path():
+    with pytest.raises(SchemaValidationError, match='asset_name'):
+        UpsertEvent.validate_schema({**upsert_body(), 'asset_name': 1})
+    with pytest.raises(SchemaValidationError, match=r'indexed_field_list\[0\]'):
+        UpsertEvent.validate_schema({**upsert_body(), 'indexed_field_list': [{}]})
+
+def test_passthrough_event_keeps_identity_fields():
+    event = PassthroughEvent.from_payload(b'{}', upsert_body())
+
+    assert event_asset_key(event) == event_asset_key(UpsertEvent.from_dict(upsert_body()))
@@ -0,0 +1,156 @@
+import json
+import pytest
+from kafka.future import Future
+from src.modules.lambda_event_decisor.domain.entities.event import Event
+from src.modules.lambda_event_decisor.domain.services.event_decision_service import EventDecisionService
+from src.modules.lambda_event_decisor.infrastructure.producers.sqs_event_producer import SQSEventProducer
+from src.modules.shared.kafka.batch_publisher import BatchPublisher
+from src.modules.shared.kafka.passthrough import PassthroughEvent, SchemaValidationError
+from src.modules.shared.kafka.routing_headers import DEFAULT_HEADER_FIELDS, RoutingHeaders, header_fields
+from src.modules.lambda_drop_asset_event_producer.domain.entities.drop_event import DropEvent
+from src.modules.lambda_drop_asset_event_producer.infrastructure.producers.kafka_event_producer import (
+    KafkaEventProducer as DropKafkaEventProducer
+)
+from src.modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import UpsertEvent
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.producers.kafka_event_producer import KafkaEventProducer
+
+def drop_body(**overrides):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'orders',
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        **overrides
+    }
+
+def upsert_body(**overrides):
+    return drop_body(attributes=[], indexed_field_list=[], **overrides)
+
+class RecordingKafkaProducer:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, topic, value, key=None, headers=None):
+        future = Future()
+        future.success(None)
+        self.sent.append((value, headers))
+        return future
+
+    def flush(self, timeout=None):
+        pass
+
+def build_producer(cls, event_type, fields=DEFAULT_HEADER_FIELDS):
+    producer = cls.__new__(cls)
+    producer.producer = RecordingKafkaProducer()
+    producer.publisher = BatchPublisher(producer.producer, flush_timeout_seconds=1)
+    producer.binary_copy = None
+    producer.routing_headers = RoutingHeaders(event_type, '1', fields)
+    return producer
+
+def test_upsert_messages_carry_routing_headers_without_hash_in_body():
+    producer = build_producer(KafkaEventProducer, 'upsert')
+    event = UpsertEvent.from_dict(upsert_body(hash_value='abc123'))
+
+    producer.produce_events('topic', [('dedupe-1', event)])
+
+    value, headers = producer.producer.sent[0]
+    assert headers == [
+        ('dedupe_id', b'dedupe-1'),
+        ('technology_service_name', b'rds'),
+        ('aws_account_number', b'123456789012'),
+        ('asset_type', b'table'),
+        ('hash_value', b'abc123'),
+        ('event_type', b'upsert'),
+        ('schema_version', b'1')
+    ]
+    assert 'hash_value' not in json.loads(value)
+
+def test_passthrough_events_expose_routing_fields():
+    producer = build_producer(DropKafkaEventProducer, 'drop', ('asset_type', 'hash_value'))
+    body = drop_body(hash_value='abc123')
+    event = PassthroughEvent.from_payload(json.dumps(body).encode('utf-8'), body)
+
+    producer.produce_events('topic', [(0, event)])
+
+    assert producer.producer.sent[0][1] == [('asset_type', b'table'), ('hash_value', b'abc123')]
+
+def test_missing_fields_are_skipped_and_empty_set_sends_no_headers():
+    event = DropEvent.from_dict(drop_body())
+
+    assert RoutingHeaders('drop', '1', ('hash_value', 'event_type'))(event) == [('event_type', b'drop')]
+
+    producer = build_producer(DropKafkaEventProducer, 'drop', ())
+    producer.produce_events('topic', [(0, event)])
+    assert producer.producer.sent[0][1] is None
+
+def test_header_fields_from_env():
+    assert header_fields({}) == DEFAULT_HEADER_FIELDS
+    assert header_fields({'KAFKA_HEADER_FIELDS': 'asset_type, event_type'}) == ('asset_type', 'event_type')
+    assert header_fields({'KAFKA_HEADER_FIELDS': 'none'}) == ()
+
+def test_hash_value_type_is_validated():
+    with pytest.raises(SchemaValidationError, match='hash_value'):
+        UpsertEvent.validate_schema(upsert_body(hash_value=1))
+    with pytest.raises(SchemaValidationError, match='hash_value'):
+        DropEvent.validate_schema(drop_body(hash_value=1))
+
+class RecordingStorage:
+    def __init__(self):
+        self.payloads = []
+
+    def store_event(self, event_type, payload):
+        self.payloads.append(payload)
+        return f's3://bucket/events/{event_type}/1.json'
+
+class RecordingSQS:
+    def send_message(self, QueueUrl, MessageBody):
+        pass
+
+def decided_asset():
+    event = Event(
+        technology_name='rds',
+        instance_technology_name='postgres',
+        asset_parent_name='db',
+        asset_name='orders',
+        aws_account_number='123456789012',
+        status='completed',
+        correlation_id='c-1',
+        metadata={
+            'attributes': [{
+                'attribute_name': 'id',
+                'data_type': 'int',
+                'is_primary_key': True,
+                'is_nullable': False,
+                'default_value': None,
+                'comment_description': None
+            }],
+            'indexed_field_list': []
+        }
+    )
+    return EventDecisionService().decide_event_action(event, None)
+
+def test_decisor_payload_hash_reaches_the_header():
+    """O hash gravado pelo decisor chega ao cabeçalho hash_value dos dois produtores."""
+    decision = decided_asset()
+    storage = RecordingStorage()
+    decisor = SQSEventProducer('upsert-url', 'drop-url', storage, sqs_client=RecordingSQS())
+    decisor.send_upsert_event(decision.asset, decision.change)
+    decisor.send_drop_event([decision.asset])
+    upsert_payload, drop_payload = storage.payloads
+    expected = ('hash_value', decision.asset.hash_value.encode('utf-8'))
+
+    # Campos do contrato dos produtores que o payload do decisor não traz
+    upsert = build_producer(KafkaEventProducer, 'upsert', ('hash_value',))
+    upsert.produce_events('topic', [(0, UpsertEvent.from_dict({**upsert_body(), **upsert_payload}))])
+    body = {**drop_body(), **drop_payload}
+    DropEvent.validate_schema(body)
+    drop = build_producer(DropKafkaEventProducer, 'drop', ('hash_value',))
+    drop.produce_events('topic', [(0, PassthroughEvent.from_payload(json.dumps(body).encode('utf-8'), body))])
+
+    assert upsert.producer.sent[0][1] == [expected]
+    assert drop.producer.sent[0][1] == [expected]
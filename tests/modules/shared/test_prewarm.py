@@ -0,0 +1,64 @@
+import pytest
+import boto3
+from src.modules.shared.aws import prewarm
+
+@pytest.fixture(autouse=True)
+def reset_prewarm_state():
+    prewarm._warmed.clear()
+    prewarm._report.clear()
+    yield
+    prewarm._warmed.clear()
+    prewarm._report.clear()
+
+@pytest.fixture
+def queue_url(sqs, monkeypatch):
+    url = boto3.client('sqs').create_queue(QueueName='upsert-queue')['QueueUrl']
+    monkeypatch.setenv('UPSERT_QUEUE_URL', url)
+    return url
+
+def test_prewarm_disabled_by_default(monkeypatch, queue_url):
+    """Sem PREWARM_CONNECTIONS nenhum passo é executado."""
+    monkeypatch.delenv('PREWARM_CONNECTIONS', raising=False)
+
+    assert prewarm.prewarm_on_init() == {}
+
+def test_prewarm_reports_time_per_step(monkeypatch, queue_url):
+    """Cada passo executado tem seu tempo reportado."""
+    monkeypatch.setenv('PREWARM_CONNECTIONS', 'true')
+    monkeypatch.setenv('KAFKA_TOPIC', 'assets')
+
+    class FakeProducer:
+        def __init__(self):
+            self.topics = []
+
+        def partitions_for(self, topic):
+            self.topics.append(topic)
+            return {0}
+
+    producer = FakeProducer()
+    timings = prewarm.prewarm_on_init(kafka_producer_factory=lambda: producer)
+
+    assert set(timings) == {'sqs:UPSERT_QUEUE_URL', 'kafka:assets'}
+    assert all(ms >= 0 for ms in timings.values())
+    assert producer.topics == ['assets']
+    assert prewarm.get_prewarm_report() == timings
+
+def test_prewarm_runs_each_step_once(monkeypatch, queue_url):
+    """Handlers importados juntos não repetem o aquecimento."""
+    monkeypatch.setenv('PREWARM_CONNECTIONS', 'true')
+
+    assert prewarm.prewarm_on_init() != {}
+    assert prewarm.prewarm_on_init() == {}
+
+def test_prewarm_failures_are_isolated(monkeypatch, queue_url):
+    """Falha em um passo não impede os demais nem a inicialização."""
+    monkeypatch.setenv('PREWARM_CONNECTIONS', 'true')
+    monkeypatch.setenv('KAFKA_TOPIC', 'assets')
+
+    def broken_factory():
+        raise RuntimeError("broker indisponível")
+
+    timings = prewarm.prewarm_on_init(kafka_producer_factory=broken_factory)
+
+    assert 'kafka:assets' in timings
+    assert 'sqs:UPSERT_QUEUE_URL' in timings
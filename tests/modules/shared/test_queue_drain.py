@@ -0,0 +1,266 @@
+import json
+import time
+import boto3
+from src.modules.shared.aws.queue_drain import (
+    DrainSettings,
+    ReceivedBatch,
+    STOP_ERROR,
+    STOP_MAX_BATCHES,
+    STOP_QUEUE_EMPTY,
+    STOP_TIME_BUDGET,
+    drain
+)
+from src.modules.shared.aws.sqs_batch import release_message_batch
+from src.modules.lambda_redrive.application.use_cases.process_dlq_events import ProcessDLQEventsUseCase
+from src.modules.lambda_upsert_asset_event_producer.application.use_cases.process_upsert_events import ProcessUpsertEventsUseCase
+from src.modules.lambda_upsert_asset_event_producer.infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
+from src.modules.lambda_redrive.domain.entities.dlq_event import DLQEvent
+from src.modules.lambda_redrive.infrastructure.repositories.sqs_dlq_repository import SQSDLQRepository
+
+SETTINGS = DrainSettings(enabled=True, safety_margin_ms=1000, wait_time_seconds=0)
+
+class FakeQueue:
+    """Fila simulada com lotes pré-definidos."""
+
+    def __init__(self, batches, receive_delay=0.0):
+        self.batches = list(batches)
+        self.receive_delay = receive_delay
+        self.wait_times = []
+
+    def receive(self, wait_time_seconds):
+        self.wait_times.append(wait_time_seconds)
+        time.sleep(self.receive_delay)
+        return self.batches.pop(0) if self.batches else []
+
+def test_drains_until_queue_is_empty():
+    queue = FakeQueue([[1, 2], [3], [4, 5]])
+    processed = []
+
+    report = drain(queue.receive, processed.extend, lambda: 60000, settings=SETTINGS)
+
+    assert processed == [1, 2, 3, 4, 5]
+    assert report.batches == 3
+    assert report.messages == 5
+    assert report.stop_reason == STOP_QUEUE_EMPTY
+    assert report.abandoned == 0
+
+def test_stops_when_remaining_time_reaches_safety_margin():
+    queue = FakeQueue([[1], [2], [3], [4]])
+    # Início, pré-busca do 2º lote e verificação após o 1º lote
+    remaining = iter([60000, 60000, 500, 500])
+
+    report = drain(queue.receive, lambda batch: None, lambda: next(remaining), settings=SETTINGS)
+
+    assert report.stop_reason == STOP_TIME_BUDGET
+    assert report.batches == 1
+    assert report.abandoned == 1
+
+def test_does_not_start_without_budget():
+    queue = FakeQueue([[1]])
+
+    report = drain(queue.receive, lambda batch: None, lambda: 100, settings=SETTINGS)
+
+    assert report.stop_reason == STOP_TIME_BUDGET
+    assert queue.wait_times == []
+
+def test_max_batches_and_errors_stop_the_loop():
+    queue = FakeQueue([[1], [2], [3]])
+    report = drain(queue.receive, lambda batch: None, lambda: 60000,
+                   settings=DrainSettings(enabled=True, safety_margin_ms=0, wait_time_seconds=0, max_batches=2))
+    assert report.stop_reason == STOP_MAX_BATCHES
+    assert report.batches == 2
+
+    def failing(batch):
+        raise RuntimeError("kafka indisponível")
+
+    report = drain(FakeQueue([[1]]).receive, failing, lambda: 60000, settings=SETTINGS)
+    assert report.stop_reason == STOP_ERROR
+    assert 'kafka indisponível' in report.error
+
+def test_next_batch_is_prefetched_while_processing():
+    queue = FakeQueue([[1], [2], [3]], receive_delay=0.03)
+    def process(batch):
+        time.sleep(0.03)
+
+    start = time.perf_counter()
+    report = drain(queue.receive, process, lambda: 60000, settings=SETTINGS)
+    elapsed = time.perf_counter() - start
+
+    assert report.batches == 3
+    # Sequencial seriam 4 recebimentos + 3 processamentos (~0,21 s)
+    assert elapsed < 0.18
+
+def test_abandoned_prefetched_batch_is_released():
+    queue = FakeQueue([[1], [2, 3]])
+    released = []
+    remaining = iter([60000, 60000])
+
+    report = drain(queue.receive, lambda batch: None, lambda: next(remaining, 0),
+                   settings=SETTINGS, release=released.append)
+
+    assert report.stop_reason == STOP_TIME_BUDGET
+    assert report.abandoned == 2
+    assert released == [[2, 3]]
+
+    def failing(batch):
+        raise RuntimeError("kafka indisponível")
+
+    released.clear()
+    report = drain(FakeQueue([[1], [2]]).receive, failing, lambda: 60000, settings=SETTINGS, release=released.append)
+    assert report.stop_reason == STOP_ERROR
+    assert released == [[2]]
+
+def test_batch_that_failed_to_load_does_not_mean_empty_queue():
+    queue = FakeQueue([ReceivedBatch([], 3), [1, 2], []])
+    processed = []
+
+    report = drain(queue.receive, processed.append, lambda: 60000, settings=SETTINGS)
+
+    assert processed == [[1, 2]]
+    assert report.stop_reason == STOP_QUEUE_EMPTY
+    assert report.messages == 2
+    assert report.skipped == 3
+
+class BatchedSQS:
+    """SQS simulado que entrega lotes pré-definidos de referências ao S3."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.deleted = []
+
+    def receive_message(self, **kwargs):
+        keys = self.batches.pop(0) if self.batches else []
+        return {'Messages': [
+            {'MessageId': key, 'ReceiptHandle': f'r-{key}', 'Body': json.dumps({'event_location': f's3://bucket/{key}'})}
+            for key in keys
+        ]}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        self.deleted.extend(entry['ReceiptHandle'] for entry in Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+class MissingObjectsReader:
+    def read_event(self, event_location):
+        if 'missing' in event_location:
+            raise FileNotFoundError(event_location)
+        return {'key': event_location}
+
+def test_use_case_drain_continues_past_a_batch_that_failed_to_load():
+    sqs = BatchedSQS([['missing-1', 'missing-2'], ['a', 'b']])
+    consumer = SQSMessageConsumer(event_reader=MissingObjectsReader(), sqs_client=sqs)
+    use_case = ProcessUpsertEventsUseCase(consumer, event_producer=None)
+    processed = []
+    use_case._process_batch = lambda queue_url, messages, kafka_topic, results: processed.extend(
+        message['MessageId'] for message in messages
+    )
+
+    result = use_case.drain('queue-url', 'topic', lambda: 60000, settings=SETTINGS)
+
+    assert processed == ['a', 'b']
+    assert result['drain']['stop_reason'] == STOP_QUEUE_EMPTY
+    assert result['drain']['skipped'] == 2
+
+class ReleaseRecordingSQS:
+    def __init__(self):
+        self.calls = []
+
+    def change_message_visibility_batch(self, QueueUrl, Entries):
+        self.calls.append((QueueUrl, Entries))
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+def test_release_sets_visibility_to_zero():
+    sqs = ReleaseRecordingSQS()
+
+    result = release_message_batch(sqs, 'queue-url', ['r-1', 'r-2'])
+
+    assert result.deleted == ['r-1', 'r-2']
+    assert sqs.calls == [('queue-url', [
+        {'Id': '0', 'ReceiptHandle': 'r-1', 'VisibilityTimeout': 0},
+        {'Id': '1', 'ReceiptHandle': 'r-2', 'VisibilityTimeout': 0}
+    ])]
+
+class FakeMessageQueue:
+    def __init__(self, batches):
+        self.queue = FakeQueue(batches)
+        self.released = []
+
+    def receive_messages(self, queue_url, max_messages=10, wait_time_seconds=0):
+        return self.queue.receive(wait_time_seconds)
+
+    def receive_batch(self, queue_url, max_messages=10, wait_time_seconds=0):
+        messages = self.receive_messages(queue_url, max_messages, wait_time_seconds)
+        return ReceivedBatch(messages, len(messages))
+
+    def delete_messages(self, queue_url, receipt_handles):
+        return {}
+
+    def release_messages(self, queue_url, receipt_handles):
+        self.released.append((queue_url, list(receipt_handles)))
+        return {}
+
+def test_use_case_drain_releases_abandoned_receipts():
+    message_queue = FakeMessageQueue([
+        [{'MessageId': 'm-1', 'ReceiptHandle': 'r-1', 'Body': {}}],
+        [{'MessageId': 'm-2', 'ReceiptHandle': 'r-2', 'Body': {}}, {'MessageId': 'm-3', 'ReceiptHandle': 'r-3', 'Body': {}}]
+    ])
+    remaining = iter([60000, 60000])
+
+    result = ProcessUpsertEventsUseCase(message_queue, event_producer=None).drain(
+        'queue-url', 'topic', lambda: next(remaining, 0), settings=SETTINGS
+    )
+
+    assert result['drain']['abandoned'] == 2
+    assert message_queue.released == [('queue-url', ['r-2', 'r-3'])]
+
+class FakeDLQRepository:
+    def __init__(self, batches):
+        self.queue = FakeQueue(batches)
+        self.moved = []
+
+    def get_events(self, queue_url, max_messages=10, wait_time_seconds=0):
+        return self.queue.receive(wait_time_seconds)
+
+    def move_to_original_queue(self, event):
+        self.moved.append(event.message_id)
+
+    def delete_from_dlq(self, event):
+        pass
+
+    def delete_events(self, queue_url, events):
+        return {}
+
+    def release_events(self, queue_url, events):
+        pass
+
+def dlq_event(message_id, retry_count=0):
+    return DLQEvent(message_id=message_id, queue_url='dlq', original_queue_url='queue', body={}, retry_count=retry_count)
+
+def test_redrive_drain_aggregates_all_batches():
+    repository = FakeDLQRepository([[dlq_event('a'), dlq_event('b')], [dlq_event('c', retry_count=99)]])
+
+    result = ProcessDLQEventsUseCase(repository).drain(['dlq'], lambda: 60000, settings=SETTINGS)
+
+    assert repository.moved == ['a', 'b']
+    assert result['processed'] == 2
+    assert result['discarded'] == 1
+    assert result['drain']['dlq']['batches'] == 2
+    assert result['drain']['dlq']['stop_reason'] == STOP_QUEUE_EMPTY
+
+def test_redrive_drain_empties_the_dlq(sqs):
+    client = boto3.client('sqs', region_name='us-east-1')
+    queue_url = client.create_queue(QueueName='upsert')['QueueUrl']
+    dlq_url = client.create_queue(QueueName='upsert-dlq')['QueueUrl']
+    for index in range(5):
+        client.send_message(QueueUrl=dlq_url, MessageBody=json.dumps({'index': index}), MessageAttributes={
+            'original_queue_url': {'DataType': 'String', 'StringValue': queue_url}
+        })
+
+    result = ProcessDLQEventsUseCase(SQSDLQRepository(sqs_client=client)).drain([dlq_url], lambda: 60000, settings=SETTINGS)
+
+    attributes = client.get_queue_attributes(QueueUrl=dlq_url, AttributeNames=['All'])['Attributes']
+    assert result['processed'] == 5 and result['errors'] == []
+    assert attributes['ApproximateNumberOfMessages'] == '0'
+    assert attributes['ApproximateNumberOfMessagesNotVisible'] == '0'
+    redriven = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10, MessageAttributeNames=['All'])
+    assert len(redriven['Messages']) == 5
+    assert {message['MessageAttributes']['retry_count']['StringValue'] for message in redriven['Messages']} == {'1'}
@@ -0,0 +1,65 @@
+import pytest
+from src.modules.shared.config import bootstrap
+from src.modules.shared.config.lambda_config import lambda_handler
+
+@pytest.fixture
+def fresh_bootstrap(monkeypatch):
+    calls = {"datadog": 0, "freeze": 0}
+
+    def fake_configure():
+        calls["datadog"] += 1
+
+    def fake_freeze():
+        calls["freeze"] += 1
+
+    monkeypatch.setattr(bootstrap, "_report", None)
+    monkeypatch.setattr(bootstrap, "configure_datadog", fake_configure)
+    monkeypatch.setattr(bootstrap.gc, "freeze", fake_freeze)
+    return calls
+
+@pytest.fixture
+def context():
+    class LambdaContext:
+        function_name = "test-function"
+        function_version = "1"
+        memory_limit_in_mb = 128
+        aws_request_id = "test-request-id"
+    return LambdaContext()
+
+def test_bootstrap_runs_once_per_process(fresh_bootstrap):
+    first = bootstrap.bootstrap_runtime()
+    second = bootstrap.bootstrap_runtime()
+
+    assert first is second
+    assert fresh_bootstrap == {"datadog": 1, "freeze": 1}
+    assert first.gc_frozen
+    assert set(first.steps_ms) == {"datadog", "gc_freeze"}
+    assert bootstrap.get_bootstrap_report() is first
+
+def test_bootstrap_skips_gc_freeze_when_disabled(fresh_bootstrap, monkeypatch):
+    monkeypatch.setenv("RUNTIME_FREEZE_GC", "false")
+
+    report = bootstrap.bootstrap_runtime()
+
+    assert not report.gc_frozen
+    assert fresh_bootstrap["freeze"] == 0
+    assert "gc_freeze" not in report.steps_ms
+
+async def test_lambda_handler_does_not_configure_per_invocation(fresh_bootstrap, context):
+    @lambda_handler(service_name="test")
+    async def handler(event, context):
+        return event
+
+    await handler({"n": 1}, context)
+    await handler({"n": 2}, context)
+
+    assert fresh_bootstrap["datadog"] == 1
+
+def test_later_handlers_only_refreeze(fresh_bootstrap):
+    bootstrap.bootstrap_runtime()
+
+    @lambda_handler(service_name="other")
+    async def handler(event, context):
+        return event
+
+    assert fresh_bootstrap == {"datadog": 1, "freeze": 2}
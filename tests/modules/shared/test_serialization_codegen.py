@@ -0,0 +1,100 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+import pytest
+from src.modules.shared.serialization.codegen import decoder_for, encoder_for
+from src.modules.lambda_upsert_asset_event_producer.domain.entities.upsert_event import UpsertEvent
+from src.modules.lambda_event_decisor.domain.entities.asset import Asset
+from src.modules.lambda_event_decisor.application.dtos.process_event_result import ProcessEventResult
+
+@dataclass(slots=True)
+class Child:
+    name: str
+    seen_at: Optional[datetime] = None
+
+@dataclass(slots=True)
+class Parent:
+    name: str
+    children: List[Child]
+    tags: List[str] = field(default_factory=list)
+
+def upsert_payload(columns=3):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': 'orders',
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres',
+        'attributes': [
+            {
+                'attribute_name': f'col_{i}',
+                'data_type': 'varchar',
+                'is_primary_key': i == 0,
+                'is_nullable': True,
+                'default_value': None,
+                'comment_description': ''
+            }
+            for i in range(columns)
+        ],
+        'indexed_field_list': [{'indexed_field_composition': ['col_0']}],
+        'change_type': 'snapshot',
+        'added_attributes': [],
+        'modified_attributes': [],
+        'removed_attributes': []
+    }
+
+def test_nested_round_trip_with_defaults_and_datetimes():
+    data = {'name': 'p', 'children': [{'name': 'c', 'seen_at': '2024-05-01T10:00:00'}, {'name': 'd'}], 'extra': 1}
+
+    parent = decoder_for(Parent)(data)
+
+    assert parent == Parent('p', [Child('c', datetime(2024, 5, 1, 10)), Child('d')], [])
+    assert encoder_for(Parent)(parent) == {
+        'name': 'p',
+        'children': [{'name': 'c', 'seen_at': '2024-05-01T10:00:00'}, {'name': 'd', 'seen_at': None}],
+        'tags': []
+    }
+
+def test_missing_required_field_raises_key_error():
+    with pytest.raises(KeyError):
+        decoder_for(Parent)({'children': []})
+
+def test_functions_are_generated_once_per_class():
+    assert encoder_for(Parent) is encoder_for(Parent)
+    assert 'obj.children' in encoder_for(Parent).__source__
+
+def test_upsert_event_round_trip_keeps_wire_format():
+    payload = upsert_payload()
+
+    event = UpsertEvent.from_dict(payload)
+
+    assert event.attributes[0].attribute_name == 'col_0'
+    assert event.to_dict() == payload
+    assert list(event.to_dict()) == list(payload)
+    assert not hasattr(event, '__dict__')
+
+def test_upsert_event_defaults_missing_lists():
+    payload = upsert_payload()
+    del payload['attributes'], payload['indexed_field_list']
+
+    event = UpsertEvent.from_dict(payload)
+
+    assert event.attributes == [] and event.indexed_field_list == []
+
+def test_asset_and_result_serialize_dates_in_iso_format():
+    timestamp = datetime(2024, 1, 2, 3, 4, 5)
+    asset = Asset('rds', 'postgres', 'db', 'orders', '123456789012', 'h', 'c-1', timestamp, timestamp)
+
+    result = ProcessEventResult('UPSERT', asset).to_dict()
+
+    assert result['event_type'] == 'UPSERT'
+    assert result['asset']['created_at'] == '2024-01-02T03:04:05'
+    assert result['asset'] == asset.to_dict()
+    assert set(result['asset']) == {
+        'technology_name', 'instance_technology_name', 'asset_parent_name', 'asset_name',
+        'aws_account_number', 'hash_value', 'correlation_id', 'created_at', 'updated_at'
+    }
@@ -0,0 +1,56 @@
+from src.modules.shared.aws.sqs_batch import DELETE_BATCH_LIMIT, delete_message_batch
+
+class FakeSQS:
+    """Cliente SQS simulado com falhas configuráveis por receipt handle."""
+
+    def __init__(self, sender_faults=(), transient_faults=()):
+        self.sender_faults = set(sender_faults)
+        self.transient_faults = set(transient_faults)
+        self.calls = []
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        assert len(Entries) <= DELETE_BATCH_LIMIT
+        self.calls.append([entry['ReceiptHandle'] for entry in Entries])
+        successful, failed = [], []
+        for entry in Entries:
+            handle = entry['ReceiptHandle']
+            if handle in self.sender_faults:
+                failed.append({'Id': entry['Id'], 'SenderFault': True, 'Code': 'ReceiptHandleIsInvalid'})
+            elif handle in self.transient_faults:
+                self.transient_faults.discard(handle)
+                failed.append({'Id': entry['Id'], 'SenderFault': False, 'Code': 'InternalError'})
+            else:
+                successful.append({'Id': entry['Id']})
+        return {'Successful': successful, 'Failed': failed}
+
+def test_deletes_in_groups_of_ten():
+    sqs = FakeSQS()
+    handles = [f'r-{i}' for i in range(23)]
+
+    result = delete_message_batch(sqs, 'queue-url', handles)
+
+    assert [len(call) for call in sqs.calls] == [10, 10, 3]
+    assert result.deleted == handles
+    assert result.all_deleted
+
+def test_reports_sender_faults_and_retries_transient_failures():
+    sqs = FakeSQS(sender_faults={'r-1'}, transient_faults={'r-2'})
+
+    result = delete_message_batch(sqs, 'queue-url', ['r-0', 'r-1', 'r-2'])
+
+    assert sqs.calls == [['r-0', 'r-1', 'r-2'], ['r-2']]
+    assert sorted(result.deleted) == ['r-0', 'r-2']
+    assert result.failed == {'r-1': 'ReceiptHandleIsInvalid'}
+
+def test_call_error_fails_only_its_group():
+    class BrokenSQS(FakeSQS):
+        def delete_message_batch(self, QueueUrl, Entries):
+            if Entries[0]['ReceiptHandle'] == 'r-0':
+                raise RuntimeError("throttled")
+            return super().delete_message_batch(QueueUrl, Entries)
+
+    handles = [f'r-{i}' for i in range(12)]
+    result = delete_message_batch(BrokenSQS(), 'queue-url', handles)
+
+    assert set(result.failed) == set(handles[:10])
+    assert result.deleted == handles[10:]
@@ -0,0 +1,101 @@
+import json
+from src.modules.shared.kafka.batch_publisher import PublishResult
+from src.modules.shared.kafka.dedupe_ledger import InMemoryDedupeLedger, dedupe_key
+from src.modules.shared.routing.sqs_source_router import (
+    batch_item_failures,
+    event_source_mode_enabled,
+    merge_batch_item_failures
+)
+from src.modules.lambda_drop_asset_event_producer.application.use_cases.process_drop_events import ProcessDropEventsUseCase
+from src.modules.lambda_drop_asset_event_producer.infrastructure.queues.sqs_message_consumer import SQSMessageConsumer
+
+def drop_body(asset_name):
+    return {
+        'correlation_id': 'c-1',
+        'status': 'completed',
+        'asset_name': asset_name,
+        'asset_parent_name': 'db',
+        'asset_counts': '1',
+        'aws_account_number': '123456789012',
+        'technology_service_name': 'rds',
+        'asset_type': 'table',
+        'instance_technology_name': 'postgres'
+    }
+
+def sqs_record(message_id, location):
+    return {
+        'messageId': message_id,
+        'receiptHandle': f'r-{message_id}',
+        'body': json.dumps({'event_location': location}),
+        'attributes': {'ApproximateReceiveCount': '1'},
+        'messageAttributes': {},
+        'eventSource': 'aws:sqs'
+    }
+
+class FakeReader:
+    def read_event(self, event_location):
+        asset_name = event_location.rsplit('/', 1)[1]
+        if asset_name == 'missing':
+            raise FileNotFoundError(event_location)
+        return drop_body(asset_name)
+
+class NoPollingSQS:
+    def receive_message(self, **kwargs):
+        raise AssertionError("o modo event source não consulta a fila")
+
+    def delete_message_batch(self, **kwargs):
+        raise AssertionError("o modo event source não remove mensagens")
+
+class FakeEventProducer:
+    def __init__(self, failing_names=()):
+        self.failing_names = set(failing_names)
+
+    def produce_events(self, topic, events):
+        result = PublishResult()
+        for key, event in events:
+            if event.asset_name in self.failing_names:
+                result.failed[key] = "not delivered"
+            else:
+                result.delivered.append(key)
+        return result
+
+def build_use_case(failing_names=(), dedupe_ledger=None):
+    consumer = SQSMessageConsumer(event_reader=FakeReader(), sqs_client=NoPollingSQS(), fetch_concurrency=4)
+    return ProcessDropEventsUseCase(consumer, FakeEventProducer(failing_names), dedupe_ledger=dedupe_ledger)
+
+def test_process_records_reports_only_failed_messages():
+    records = [
+        sqs_record('m-0', 's3://bucket/orders'),
+        sqs_record('m-1', 's3://bucket/missing'),
+        sqs_record('m-2', 's3://bucket/broken'),
+        {**sqs_record('m-3', ''), 'body': 'not json'}
+    ]
+
+    result = build_use_case(failing_names={'broken'}).process_records(records, 'topic')
+
+    assert result['processed'] == 1
+    assert result['batch_item_failures'] == ['m-1', 'm-2', 'm-3']
+    assert {error['message_id'] for error in result['errors']} == {'m-1', 'm-2', 'm-3'}
+
+def test_process_records_treats_redeliveries_as_success():
+    ledger = InMemoryDedupeLedger()
+    ledger.mark([dedupe_key('drop', 'm-0')])
+
+    result = build_use_case(dedupe_ledger=ledger).process_records([sqs_record('m-0', 's3://bucket/orders')], 'topic')
+
+    assert result['duplicates_skipped'] == 1
+    assert result['batch_item_failures'] == []
+
+def test_merge_batch_item_failures_across_sub_batches():
+    results = [
+        [{'statusCode': 200, **batch_item_failures(['a', 'b'])}, {'statusCode': 200, **batch_item_failures([])}],
+        {'statusCode': 200, **batch_item_failures(['b', 'c'])}
+    ]
+
+    assert merge_batch_item_failures(results) == batch_item_failures(['a', 'b', 'c'])
+    assert merge_batch_item_failures([{'statusCode': 200}]) is None
+
+def test_event_source_mode_from_env(monkeypatch):
+    assert not event_source_mode_enabled()
+    monkeypatch.setenv('SQS_PROCESSING_MODE', 'event_source')
+    assert event_source_mode_enabled()
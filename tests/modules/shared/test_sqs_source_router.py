@@ -0,0 +1,60 @@
+import pytest
+from src.modules.shared.routing.event_router import HandlerNotFoundError
+from src.modules.shared.routing.sqs_source_router import SQSSourceRouter, queue_url_to_arn
+
+UPSERT_ARN = 'arn:aws:sqs:us-east-1:123456789012:upsert-queue'
+DROP_ARN = 'arn:aws:sqs:us-east-1:123456789012:drop-queue'
+
+def record(message_id, queue_arn):
+    return {'messageId': message_id, 'body': '{"event_type": "UPSERT"}', 'eventSource': 'aws:sqs', 'eventSourceARN': queue_arn}
+
+def recording_handler(calls, name):
+    async def handler(event, context):
+        calls.append((name, [r['messageId'] for r in event['Records']]))
+        return {'handler': name}
+    return handler
+
+@pytest.mark.parametrize("queue_url, expected", [
+    ('https://sqs.us-east-1.amazonaws.com/123456789012/upsert-queue', UPSERT_ARN),
+    ('https://us-east-1.queue.amazonaws.com/123456789012/upsert-queue', UPSERT_ARN),
+    ('https://sqs.cn-north-1.amazonaws.com.cn/123456789012/q', 'arn:aws-cn:sqs:cn-north-1:123456789012:q'),
+    ('not-a-url', None),
+    (None, None),
+])
+def test_queue_url_to_arn(queue_url, expected):
+    assert queue_url_to_arn(queue_url) == expected
+
+def test_register_queue_from_environment(monkeypatch):
+    """O ARN é derivado da URL configurada ou lido de <prefixo>_ARN."""
+    monkeypatch.setenv('UPSERT_QUEUE_URL', 'https://sqs.us-east-1.amazonaws.com/123456789012/upsert-queue')
+    monkeypatch.setenv('DROP_QUEUE_ARN', DROP_ARN)
+    monkeypatch.delenv('UPSERT_QUEUE_DLQ_URL', raising=False)
+    monkeypatch.delenv('UPSERT_QUEUE_DLQ_ARN', raising=False)
+    router = SQSSourceRouter()
+
+    assert router.register_queue('UPSERT_QUEUE', recording_handler([], 'upsert'))
+    assert router.register_queue('DROP_QUEUE', recording_handler([], 'drop'))
+    assert not router.register_queue('UPSERT_QUEUE_DLQ', recording_handler([], 'dlq'))
+    assert set(router._handlers) == {UPSERT_ARN, DROP_ARN}
+
+@pytest.mark.asyncio
+async def test_routes_by_source_arn_and_splits_mixed_batches():
+    """Registros de filas diferentes vão para seus handlers, sem olhar o corpo."""
+    calls = []
+    router = SQSSourceRouter()
+    router.register(UPSERT_ARN, recording_handler(calls, 'upsert'))
+    router.register(DROP_ARN, recording_handler(calls, 'drop'))
+
+    event = {'Records': [record('1', DROP_ARN), record('2', UPSERT_ARN), record('3', DROP_ARN)]}
+    results = await router.route(event, context=None)
+
+    assert sorted(calls) == [('drop', ['1', '3']), ('upsert', ['2'])]
+    assert results == [{'handler': 'drop'}, {'handler': 'upsert'}]
+
+@pytest.mark.asyncio
+async def test_unknown_queue_raises():
+    router = SQSSourceRouter()
+    router.register(UPSERT_ARN, recording_handler([], 'upsert'))
+
+    with pytest.raises(HandlerNotFoundError):
+        await router.route({'Records': [record('1', DROP_ARN)]}, context=None)
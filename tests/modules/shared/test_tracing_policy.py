@@ -0,0 +1,107 @@
+import pytest
+from ddtrace import tracer
+from src.modules.shared.tracing import datadog_config
+from src.modules.shared.tracing.datadog_config import (
+    TracingPolicy,
+    NOOP_SPAN,
+    active_span,
+    add_trace_context,
+    datadog_trace,
+    set_tracing_policy,
+    traced_span
+)
+
+@pytest.fixture(autouse=True)
+def restore_policy():
+    original = datadog_config.get_tracing_policy()
+    yield
+    set_tracing_policy(original)
+
+def current_span_name():
+    span = tracer.current_span()
+    return span.name if span is not None else None
+
+def test_policy_from_env(monkeypatch):
+    monkeypatch.setenv('DD_TRACE_ENABLED', 'false')
+    monkeypatch.setenv('TRACE_SAMPLE_RATE', '0.25')
+    monkeypatch.setenv('TRACE_MAX_DEPTH', '3')
+
+    assert TracingPolicy.from_env() == TracingPolicy(enabled=False, sample_rate=0.25, max_depth=3)
+
+def test_decorator_is_identity_when_disabled():
+    """Com o tracing desabilitado a função é retornada sem wrapper."""
+    set_tracing_policy(TracingPolicy(enabled=False))
+
+    def func():
+        return 1
+
+    assert datadog_trace(name="func")(func) is func
+
+def test_sampled_trace_creates_span():
+    set_tracing_policy(TracingPolicy(sample_rate=1.0))
+
+    @datadog_trace(name="outer_op")
+    def outer():
+        return current_span_name()
+
+    assert outer() == "outer_op"
+
+def test_unsampled_trace_skips_nested_spans():
+    """A decisão de amostragem da raiz vale para todo o trace."""
+    set_tracing_policy(TracingPolicy(sample_rate=0.0))
+
+    @datadog_trace(name="inner_op")
+    def inner():
+        with active_span() as span:
+            return current_span_name(), span
+
+    @datadog_trace(name="outer_op")
+    def outer():
+        return inner()
+
+    name, span = outer()
+    assert name is None
+    assert span is NOOP_SPAN
+
+def test_depth_limit_collapses_deep_spans():
+    set_tracing_policy(TracingPolicy(max_depth=1))
+
+    @datadog_trace(name="inner_op")
+    def inner():
+        return current_span_name()
+
+    @datadog_trace(name="outer_op")
+    def outer():
+        return inner()
+
+    assert outer() == "outer_op"
+
+async def test_async_functions_follow_policy():
+    set_tracing_policy(TracingPolicy(sample_rate=0.0))
+
+    @datadog_trace(name="async_op")
+    async def operation():
+        with traced_span("child") as span:
+            return span
+
+    assert await operation() is NOOP_SPAN
+
+def test_add_trace_context_is_lazy_for_unrecorded_spans():
+    calls = []
+
+    add_trace_context(NOOP_SPAN, {"expensive": lambda: calls.append(1)})
+
+    assert calls == []
+
+def test_add_trace_context_evaluates_callables_for_recorded_spans():
+    class Span:
+        def __init__(self):
+            self.tags = {}
+
+        def set_tag(self, key, value):
+            self.tags[key] = value
+
+    span = Span()
+    add_trace_context(span, {"count": lambda: 3, "items": [1, 2]})
+
+    assert span.tags == {"count": 3, "items": "[1, 2]"}